@@ -27,163 +27,164 @@ from bpy.props import (
     PointerProperty,
 )
 from mathutils.bvhtree import BVHTree
-from mathutils import (
-    Vector,
-    Matrix,
-)
-from collections import deque
-from math import (
-    pow, cos,
-    pi, atan2,
-)
-from random import (
-    random as rand_val,
-    seed as rand_seed,
-)
+from math import pi
+import numpy as np
 import time
 
 
-def createIvyGeometry(IVY, growLeaves):
-    """Create the curve geometry for IVY"""
-    # Compute the local size and the gauss weight filter
-    # local_ivyBranchSize = IVY.ivyBranchSize  # * radius * IVY.ivySize
-    gaussWeight = (1.0, 2.0, 4.0, 7.0, 9.0, 10.0, 9.0, 7.0, 4.0, 2.0, 1.0)
+def ivyRootsNodes(IVY):
+    """Return the nodes sorted by root, with the start and count of each root"""
+    numNodes = IVY.numNodes
+    order = np.argsort(IVY.nodeRoot[:numNodes], kind='stable')
+    counts = np.bincount(IVY.nodeRoot[:numNodes], minlength=IVY.numRoots)
+    starts = np.cumsum(counts) - counts
+    return order, starts, counts
 
-    # Create a new curve and initialise it
-    curve = bpy.data.curves.new("IVY", type='CURVE')
-    curve.dimensions = '3D'
-    curve.bevel_depth = 1
-    curve.fill_mode = 'FULL'
-    curve.resolution_u = 4
 
-    if growLeaves:
-        # Create the ivy leaves
-        # Order location of the vertices
-        signList = ((-1.0, +1.0),
-                    (+1.0, +1.0),
-                    (+1.0, -1.0),
-                    (-1.0, -1.0),
-                    )
+def createIvyCurve(IVY, curve):
+    """Fill the curve with a spline for each root of IVY"""
+    order, starts, counts = ivyRootsNodes(IVY)
+    curve.splines.clear()
 
-        # Get the local size
-        # local_ivyLeafSize = IVY.ivyLeafSize  # * radius * IVY.ivySize
+    nodePos = IVY.nodePos[order]
+    nodeLength = IVY.nodeLength[order]
 
-        # Initialise the vertex and face lists
-        vertList = deque()
+    # Loop over all roots to generate its nodes
+    for root in np.flatnonzero(counts > 1).tolist():
+        start = starts[root]
+        end = start + counts[root]
+
+        # Calculate the local radius
+        local_ivyBranchRadius = 1.0 / (IVY.rootParents[root] + 1) + 1.0
+        prevIvyLength = 1.0 / nodeLength[end - 1]
+
+        splineVerts = np.ones((end - start, 4))
+        splineVerts[:, :3] = nodePos[start:end]
+
+        radiusConstant = local_ivyBranchRadius * IVY.ivyBranchSize
+        splineRadii = radiusConstant * (1.3 - nodeLength[start:end] * prevIvyLength)
+
+        # Add the poly curve and set coords and radii
+        newSpline = curve.splines.new(type='POLY')
+        newSpline.points.add(end - start - 1)
+        newSpline.points.foreach_set('co', splineVerts.ravel())
+        newSpline.points.foreach_set('radius', splineRadii)
+
+
+def createIvyLeaves(IVY):
+    """Return the (leaves, 4, 3) corners of the leaves of IVY"""
+    # Compute the gauss weight filter
+    gaussWeight = np.array((1.0, 2.0, 4.0, 7.0, 9.0, 10.0, 9.0, 7.0, 4.0, 2.0, 1.0))
+
+    # Order location of the vertices
+    signList = np.array(((-1.0, +1.0),
+                         (+1.0, +1.0),
+                         (+1.0, -1.0),
+                         (-1.0, -1.0),
+                         ))
+
+    rng = IVY.rng
+    order, starts, counts = ivyRootsNodes(IVY)
+    nodeRoot = IVY.nodeRoot[order]
+    nodePos = IVY.nodePos[order]
+    nodeLength = IVY.nodeLength[order]
+    nodeAdhesion = IVY.nodeAdhesion[order]
+
+    # Index of each node in its root, only the roots with more than one node grow leaves
+    numNodes = counts[nodeRoot]
+    nodeIndex = np.arange(len(order)) - starts[nodeRoot]
+    nodes = np.flatnonzero((numNodes > 1) & (nodeIndex < numNodes - 1))
+    nodeStart = starts[nodeRoot[nodes]]
+    numNodes = numNodes[nodes]
+    prevIvyLength = 1.0 / nodeLength[nodeStart + numNodes - 1]
+
+    # Smooth the adhesion vectors along the roots
+    idx = np.clip(nodeIndex[nodes, None] + np.arange(len(gaussWeight)) - 5, 0, numNodes[:, None] - 1)
+    smoothAdhesionVector = np.einsum('k,nkj->nj', gaussWeight, nodeAdhesion[idx + nodeStart[:, None]]) / 56.0
+    adhesionLength = np.sqrt((smoothAdhesionVector ** 2).sum(axis=1))
+    smoothAdhesionVector = normalized(smoothAdhesionVector)
+
+    # Find the weight
+    relLength = nodeLength[nodes] * prevIvyLength
+    weight = relLength ** 0.7
+
+    # Calculate the ground ivy and the new weight
+    groundIvy = np.maximum(0.0, -smoothAdhesionVector[:, 2])
+    weight += groundIvy * (1 - relLength) ** 2
+
+    # Find the alignment weight
+    alignmentWeight = adhesionLength
+
+    # Calculate the needed angles
+    phi = np.arctan2(smoothAdhesionVector[:, 1], smoothAdhesionVector[:, 0]) - pi / 2.0
+    theta = 0.5 * np.arccos(np.clip(-smoothAdhesionVector[:, 2], -1.0, 1.0))
+    theta[adhesionLength == 0.0] = 0.0
+
+    # Find the size weight
+    sizeWeight = 1.5 - (np.cos(2 * pi * weight) * 0.5 + 0.5)
+
+    # Randomise the angles
+    randomAngles = rng.random((len(nodes), 2)) - 0.5
+    phi += randomAngles[:, 0] * (1.3 - alignmentWeight)
+    theta += randomAngles[:, 1] * (1.1 - alignmentWeight)
+
+    # Calculate the leaf size
+    leafSize = IVY.ivyLeafSize * sizeWeight
+
+    # Ten leaf candidates along each node, grow the ones passing the probability
+    probability = rng.random((len(nodes), 10))
+    leafNode, leafStep = np.nonzero(probability * weight[:, None] > IVY.leafProbability)
+
+    # Find the leaf center
+    randomVector = rng.random((len(leafNode), 3)) - 0.5
+    node = nodes[leafNode]
+    center = (nodePos[node] + (nodePos[node + 1] - nodePos[node]) * (leafStep / 10.0)[:, None] +
+              IVY.ivyLeafSize * randomVector)
+
+    # Rotate the basis vectors around X by theta, then around Z by phi
+    phi = phi[leafNode]
+    theta = theta[leafNode]
+    leafSize = leafSize[leafNode, None]
+    basisVecX = np.stack((np.cos(phi), np.sin(phi), np.zeros_like(phi)), axis=1) * leafSize
+    basisVecY = np.stack((-np.sin(phi) * np.cos(theta),
+                          np.cos(phi) * np.cos(theta),
+                          np.sin(theta)), axis=1) * leafSize
+
+    return (signList[None, :, 0, None] * basisVecX[:, None] +
+            signList[None, :, 1, None] * basisVecY[:, None] +
+            center[:, None])
+
+
+def createIvyGeometry(IVY, growLeaves, newCurve=None):
+    """Create the curve geometry for IVY"""
+    if newCurve is None:
+        # Create a new curve and initialise it
+        curve = bpy.data.curves.new("IVY", type='CURVE')
+        curve.dimensions = '3D'
+        curve.bevel_depth = 1
+        curve.fill_mode = 'FULL'
+        curve.resolution_u = 4
 
-        # Store the methods for faster calling
-        addV = vertList.extend
-        rotMat = Matrix.Rotation
+        # Add the object and link to scene
+        newCurve = bpy.data.objects.new("IVY_Curve", curve)
+        bpy.context.collection.objects.link(newCurve)
 
-    # Loop over all roots to generate its nodes
-    for root in IVY.ivyRoots:
-        # Only grow if more than one node
-        numNodes = len(root.ivyNodes)
-        if numNodes > 1:
-            # Calculate the local radius
-            local_ivyBranchRadius = 1.0 / (root.parents + 1) + 1.0
-            prevIvyLength = 1.0 / root.ivyNodes[-1].length
-            splineVerts = [ax for n in root.ivyNodes for ax in n.pos.to_4d()]
-
-            radiusConstant = local_ivyBranchRadius * IVY.ivyBranchSize
-            splineRadii = [radiusConstant * (1.3 - n.length * prevIvyLength)
-                           for n in root.ivyNodes]
-
-            # Add the poly curve and set coords and radii
-            newSpline = curve.splines.new(type='POLY')
-            newSpline.points.add(len(splineVerts) // 4 - 1)
-            newSpline.points.foreach_set('co', splineVerts)
-            newSpline.points.foreach_set('radius', splineRadii)
-
-            # Loop over all nodes in the root
-            for i, n in enumerate(root.ivyNodes):
-                for k in range(len(gaussWeight)):
-                    idx = max(0, min(i + k - 5, numNodes - 1))
-                    n.smoothAdhesionVector += (gaussWeight[k] *
-                                               root.ivyNodes[idx].adhesionVector)
-                n.smoothAdhesionVector /= 56.0
-                n.adhesionLength = n.smoothAdhesionVector.length
-                n.smoothAdhesionVector.normalize()
-
-                if growLeaves and (i < numNodes - 1):
-                    node = root.ivyNodes[i]
-                    nodeNext = root.ivyNodes[i + 1]
-
-                    # Find the weight and normalize the smooth adhesion vector
-                    weight = pow(node.length * prevIvyLength, 0.7)
-
-                    # Calculate the ground ivy and the new weight
-                    groundIvy = max(0.0, -node.smoothAdhesionVector.z)
-                    weight += groundIvy * pow(1 - node.length *
-                                                              prevIvyLength, 2)
-
-                    # Find the alignment weight
-                    alignmentWeight = node.adhesionLength
-
-                    # Calculate the needed angles
-                    phi = atan2(node.smoothAdhesionVector.y,
-                                node.smoothAdhesionVector.x) - pi / 2.0
-
-                    theta = (0.5 *
-                        node.smoothAdhesionVector.angle(Vector((0, 0, -1)), 0))
-
-                    # Find the size weight
-                    sizeWeight = 1.5 - (cos(2 * pi * weight) * 0.5 + 0.5)
-
-                    # Randomise the angles
-                    phi += (rand_val() - 0.5) * (1.3 - alignmentWeight)
-                    theta += (rand_val() - 0.5) * (1.1 - alignmentWeight)
-
-                    # Calculate the leaf size an append the face to the list
-                    leafSize = IVY.ivyLeafSize * sizeWeight
-
-                    for j in range(10):
-                        # Generate the probability
-                        probability = rand_val()
-
-                        # If we need to grow a leaf, do so
-                        if (probability * weight) > IVY.leafProbability:
-
-                            # Generate the random vector
-                            randomVector = Vector((rand_val() - 0.5,
-                                                   rand_val() - 0.5,
-                                                   rand_val() - 0.5,
-                                                   ))
-
-                            # Find the leaf center
-                            center = (node.pos.lerp(nodeNext.pos, j / 10.0) +
-                                               IVY.ivyLeafSize * randomVector)
-
-                            # For each of the verts, rotate/scale and append
-                            basisVecX = Vector((1, 0, 0))
-                            basisVecY = Vector((0, 1, 0))
-
-                            horiRot = rotMat(theta, 3, 'X')
-                            vertRot = rotMat(phi, 3, 'Z')
-
-                            basisVecX.rotate(horiRot)
-                            basisVecY.rotate(horiRot)
-
-                            basisVecX.rotate(vertRot)
-                            basisVecY.rotate(vertRot)
-
-                            basisVecX *= leafSize
-                            basisVecY *= leafSize
-
-                            addV([k1 * basisVecX + k2 * basisVecY + center for
-                                                           k1, k2 in signList])
-
-    # Add the object and link to scene
-    newCurve = bpy.data.objects.new("IVY_Curve", curve)
-    bpy.context.collection.objects.link(newCurve)
+    createIvyCurve(IVY, newCurve.data)
 
     if growLeaves:
-        faceList = [[4 * i + l for l in range(4)] for i in
-                    range(len(vertList) // 4)]
+        # Create the ivy leaves
+        leaves = createIvyLeaves(IVY)
+        numLeaves = len(leaves)
 
         # Generate the new leaf mesh and link
         me = bpy.data.meshes.new('IvyLeaf')
-        me.from_pydata(vertList, [], faceList)
+        me.vertices.add(numLeaves * 4)
+        me.vertices.foreach_set('co', leaves.ravel())
+        me.loops.add(numLeaves * 4)
+        me.loops.foreach_set('vertex_index', np.arange(numLeaves * 4))
+        me.polygons.add(numLeaves)
+        me.polygons.foreach_set('loop_start', np.arange(0, numLeaves * 4, 4))
+        me.polygons.foreach_set('loop_total', np.full(numLeaves, 4))
         me.update(calc_edges=True)
         ob = bpy.data.objects.new('IvyLeaf', me)
         bpy.context.collection.objects.link(ob)
@@ -199,38 +200,38 @@ def createIvyGeometry(IVY, growLeaves):
 
         ob.parent = newCurve
 
+    return newCurve
 
-class IvyNode:
-    """ The basic class used for each point on the ivy which is grown."""
-    __slots__ = ('pos', 'primaryDir', 'adhesionVector', 'adhesionLength',
-                 'smoothAdhesionVector', 'length', 'floatingLength', 'climb')
 
-    def __init__(self):
-        self.pos = Vector((0, 0, 0))
-        self.primaryDir = Vector((0, 0, 1))
-        self.adhesionVector = Vector((0, 0, 0))
-        self.smoothAdhesionVector = Vector((0, 0, 0))
-        self.length = 0.0001
-        self.floatingLength = 0.0
-        self.climb = True
+def normalized(vectors):
+    length = np.sqrt((vectors ** 2).sum(axis=1))[:, None]
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0.0)
 
 
-class IvyRoot:
-    """ The class used to hold all ivy nodes growing from this root point."""
-    __slots__ = ('ivyNodes', 'alive', 'parents')
-
-    def __init__(self):
-        self.ivyNodes = deque()
-        self.alive = True
-        self.parents = 0
+def growArray(array, size):
+    # Double the capacity of the array when needed
+    if len(array) >= size:
+        return array
+    newArray = np.zeros((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    newArray[:len(array)] = array
+    return newArray
 
 
 class Ivy:
-    """ The class holding all parameters and ivy roots."""
-    __slots__ = ('ivyRoots', 'primaryWeight', 'randomWeight',
+    """
+    The class holding all parameters and ivy roots.
+
+    The nodes of all the roots are stored in arrays, in the order they are grown,
+    so each step advances all the living roots at once.
+    """
+    __slots__ = ('primaryWeight', 'randomWeight',
                  'gravityWeight', 'adhesionWeight', 'branchingProbability',
                  'leafProbability', 'ivySize', 'ivyLeafSize', 'ivyBranchSize',
-                 'maxFloatLength', 'maxAdhesionDistance', 'maxLength')
+                 'maxFloatLength', 'maxAdhesionDistance', 'maxLength', 'rng',
+                 'numNodes', 'nodePos', 'nodeAdhesion', 'nodeLength',
+                 'nodeFloatingLength', 'nodeRoot',
+                 'numRoots', 'rootLast', 'rootCount', 'rootPrimaryDir',
+                 'rootAlive', 'rootParents')
 
     def __init__(self,
                  primaryWeight=0.5,
@@ -243,9 +244,9 @@ class Ivy:
                  ivyLeafSize=0.02,
                  ivyBranchSize=0.001,
                  maxFloatLength=0.5,
-                 maxAdhesionDistance=1.0):
+                 maxAdhesionDistance=1.0,
+                 randomSeed=0):
 
-        self.ivyRoots = deque()
         self.primaryWeight = primaryWeight
         self.randomWeight = randomWeight
         self.gravityWeight = gravityWeight
@@ -258,6 +259,7 @@ class Ivy:
         self.maxFloatLength = maxFloatLength
         self.maxAdhesionDistance = maxAdhesionDistance
         self.maxLength = 0.0
+        self.rng = np.random.default_rng(randomSeed)
 
         # Normalize all the weights only on initialisation
         sums = self.primaryWeight + self.randomWeight + self.adhesionWeight
@@ -265,152 +267,192 @@ class Ivy:
         self.randomWeight /= sums
         self.adhesionWeight /= sums
 
+        self.numNodes = 0
+        self.nodePos = np.zeros((256, 3))
+        self.nodeAdhesion = np.zeros((256, 3))
+        self.nodeLength = np.zeros(256)
+        self.nodeFloatingLength = np.zeros(256)
+        self.nodeRoot = np.zeros(256, dtype=np.int32)
+
+        self.numRoots = 0
+        self.rootLast = np.zeros(16, dtype=np.int32)
+        self.rootCount = np.zeros(16, dtype=np.int32)
+        self.rootPrimaryDir = np.zeros((16, 3))
+        self.rootAlive = np.zeros(16, dtype=bool)
+        self.rootParents = np.zeros(16, dtype=np.int32)
+
+    def addNodes(self, roots, pos, adhesionVector, length, floatingLength):
+        # Append a node to each of the roots
+        sta = self.numNodes
+        end = sta + len(roots)
+        for attr in ('nodePos', 'nodeAdhesion', 'nodeLength', 'nodeFloatingLength', 'nodeRoot'):
+            setattr(self, attr, growArray(getattr(self, attr), end))
+        self.nodePos[sta:end] = pos
+        self.nodeAdhesion[sta:end] = adhesionVector
+        self.nodeLength[sta:end] = length
+        self.nodeFloatingLength[sta:end] = floatingLength
+        self.nodeRoot[sta:end] = roots
+        self.numNodes = end
+
+        self.rootLast[roots] = np.arange(sta, end)
+        self.rootCount[roots] += 1
+
+    def addRoot(self, pos, floatingLength=0.0, parents=0):
+        # Make a new root and its first node
+        root = self.numRoots
+        for attr in ('rootLast', 'rootCount', 'rootPrimaryDir', 'rootAlive', 'rootParents'):
+            setattr(self, attr, growArray(getattr(self, attr), root + 1))
+        self.rootPrimaryDir[root] = (0.0, 0.0, 1.0)
+        self.rootAlive[root] = True
+        self.rootParents[root] = parents
+        self.numRoots += 1
+
+        self.addNodes([root], [pos], (0.0, 0.0, 0.0), 0.0001, floatingLength)
+
     def seed(self, seedPos):
         # Seed the Ivy by making a new root and first node
-        tmpRoot = IvyRoot()
-        tmpIvy = IvyNode()
-        tmpIvy.pos = seedPos
+        self.addRoot(seedPos)
 
-        tmpRoot.ivyNodes.append(tmpIvy)
-        self.ivyRoots.append(tmpRoot)
+    def isAlive(self):
+        return bool(self.rootAlive[:self.numRoots].any())
 
-    def grow(self, ob, bvhtree):
+    def grow(self, bvhtree):
         # Determine the local sizes
         # local_ivySize = self.ivySize  # * radius
         # local_maxFloatLength = self.maxFloatLength  # * radius
         # local_maxAdhesionDistance = self.maxAdhesionDistance  # * radius
 
-        for root in self.ivyRoots:
-            # Make sure the root is alive, if not, skip
-            if not root.alive:
-                continue
-
-            # Get the last node in the current root
-            prevIvy = root.ivyNodes[-1]
-
-            # If the node is floating for too long, kill the root
-            if prevIvy.floatingLength > self.maxFloatLength:
-                root.alive = False
-
-            # Set the primary direction from the last node
-            primaryVector = prevIvy.primaryDir
-
-            # Make the random vector and normalize
-            randomVector = Vector((rand_val() - 0.5, rand_val() - 0.5,
-                                   rand_val() - 0.5)) + Vector((0, 0, 0.2))
-            randomVector.normalize()
-
-            # Calculate the adhesion vector
-            adhesionVector = adhesion(
-                    prevIvy.pos, bvhtree, self.maxAdhesionDistance)
-
-            # Calculate the growing vector
-            growVector = self.ivySize * (primaryVector * self.primaryWeight +
-                                          randomVector * self.randomWeight +
-                                          adhesionVector * self.adhesionWeight)
-
-            # Find the gravity vector
-            gravityVector = (self.ivySize * self.gravityWeight *
-                                                            Vector((0, 0, -1)))
-            gravityVector *= pow(prevIvy.floatingLength / self.maxFloatLength,
-                                 0.7)
-
-            # Determine the new position vector
-            newPos = prevIvy.pos + growVector + gravityVector
-
-            # Check for collisions with the object
-            climbing, newPos = collision(bvhtree, prevIvy.pos, newPos)
-
-            # Update the growing vector for any collisions
-            growVector = newPos - prevIvy.pos - gravityVector
-            growVector.normalize()
-
-            # Create a new IvyNode and set its properties
-            tmpNode = IvyNode()
-            tmpNode.climb = climbing
-            tmpNode.pos = newPos
-            tmpNode.primaryDir = prevIvy.primaryDir.lerp(growVector, 0.5)
-            tmpNode.primaryDir.normalize()
-            tmpNode.adhesionVector = adhesionVector
-            tmpNode.length = prevIvy.length + (newPos - prevIvy.pos).length
-
-            if tmpNode.length > self.maxLength:
-                self.maxLength = tmpNode.length
-
-            # If the node isn't climbing, update it's floating length
-            # Otherwise set it to 0
-            if not climbing:
-                tmpNode.floatingLength = prevIvy.floatingLength + (newPos -
-                                                            prevIvy.pos).length
-            else:
-                tmpNode.floatingLength = 0.0
-
-            root.ivyNodes.append(tmpNode)
-
-        # Loop through all roots to check if a new root is generated
-        for root in self.ivyRoots:
-            # Check the root is alive and isn't at high level of recursion
-            if (root.parents > 3) or (not root.alive):
-                continue
-
-            # Check to make sure there's more than 1 node
-            if len(root.ivyNodes) > 1:
-                # Loop through all nodes in root to check if new root is grown
-                for node in root.ivyNodes:
-                    # Set the last node of the root and find the weighting
-                    prevIvy = root.ivyNodes[-1]
-                    weight = 1.0 - (cos(2.0 * pi * node.length /
-                                        prevIvy.length) * 0.5 + 0.5)
-
-                    probability = rand_val()
-
-                    # Check if a new root is grown and if so, set its values
-                    if (probability * weight > self.branchingProbability):
-                        tmpNode = IvyNode()
-                        tmpNode.pos = node.pos
-                        tmpNode.floatingLength = node.floatingLength
-
-                        tmpRoot = IvyRoot()
-                        tmpRoot.parents = root.parents + 1
-
-                        tmpRoot.ivyNodes.append(tmpNode)
-                        self.ivyRoots.append(tmpRoot)
-                        return
+        # Only the living roots grow
+        roots = np.flatnonzero(self.rootAlive[:self.numRoots])
+        if len(roots):
+            self.growRoots(roots, bvhtree)
+        self.growBranch()
+
+    def growRoots(self, roots, bvhtree):
+        # Get the last node in the current roots
+        prevIvy = self.rootLast[roots]
+        prevPos = self.nodePos[prevIvy]
+        prevFloatingLength = self.nodeFloatingLength[prevIvy]
+
+        # If the node is floating for too long, kill the root
+        self.rootAlive[roots[prevFloatingLength > self.maxFloatLength]] = False
+
+        # Set the primary direction from the last node
+        primaryVector = self.rootPrimaryDir[roots]
+
+        # Make the random vector and normalize
+        randomVector = self.rng.random((len(roots), 3)) - 0.5
+        randomVector[:, 2] += 0.2
+        randomVector = normalized(randomVector)
+
+        # Calculate the adhesion vector
+        adhesionVector = adhesion(prevPos, bvhtree, self.maxAdhesionDistance)
+
+        # Calculate the growing vector
+        growVector = self.ivySize * (primaryVector * self.primaryWeight +
+                                     randomVector * self.randomWeight +
+                                     adhesionVector * self.adhesionWeight)
+
+        # Find the gravity vector
+        gravityVector = np.zeros_like(growVector)
+        if self.maxFloatLength > 0.0:
+            gravityVector[:, 2] = -(self.ivySize * self.gravityWeight *
+                                    (prevFloatingLength / self.maxFloatLength) ** 0.7)
+
+        # Determine the new position vector
+        newPos = prevPos + growVector + gravityVector
+
+        # Check for collisions with the object
+        climbing, newPos = collision(bvhtree, prevPos, newPos)
+
+        # Update the growing vector for any collisions
+        growVector = normalized(newPos - prevPos - gravityVector)
+
+        # Set the new primary direction and the node properties
+        self.rootPrimaryDir[roots] = normalized(primaryVector + (growVector - primaryVector) * 0.5)
+        stepLength = np.sqrt(((newPos - prevPos) ** 2).sum(axis=1))
+        length = self.nodeLength[prevIvy] + stepLength
+        self.maxLength = max(self.maxLength, length.max())
+
+        # If the node isn't climbing, update it's floating length
+        # Otherwise set it to 0
+        floatingLength = np.where(climbing, 0.0, prevFloatingLength + stepLength)
+
+        self.addNodes(roots, newPos, adhesionVector, length, floatingLength)
+
+    def growBranch(self):
+        # Check the roots are alive and aren't at high level of recursion,
+        # with more than 1 node
+        numRoots = self.numRoots
+        canBranch = (self.rootAlive[:numRoots] &
+                     (self.rootParents[:numRoots] <= 3) &
+                     (self.rootCount[:numRoots] > 1))
+        if not canBranch.any():
+            return
+
+        # Check all the nodes of these roots for a new root
+        nodes = np.flatnonzero(canBranch[self.nodeRoot[:self.numNodes]])
+        nodeRoot = self.nodeRoot[nodes]
+        weight = 1.0 - (np.cos(2.0 * pi * self.nodeLength[nodes] /
+                               self.nodeLength[self.rootLast[nodeRoot]]) * 0.5 + 0.5)
+
+        probability = self.rng.random(len(nodes))
+        branch = np.flatnonzero(probability * weight > self.branchingProbability)
+        if not len(branch):
+            return
+
+        # Only the first new root (by root and node order) is grown in each step
+        node = nodes[branch[np.lexsort((nodes[branch], nodeRoot[branch]))[0]]]
+        self.addRoot(self.nodePos[node],
+                     floatingLength=self.nodeFloatingLength[node],
+                     parents=self.rootParents[self.nodeRoot[node]] + 1)
 
 
 def adhesion(loc, bvhtree, max_l):
-    # Compute the adhesion vector by finding the nearest point
-    nearest_location, *_ = bvhtree.find_nearest(loc, max_l)
-    adhesion_vector = Vector((0.0, 0.0, 0.0))
-    if nearest_location is not None:
-        # Compute the distance to the nearest point
-        adhesion_vector = nearest_location - loc
-        distance = adhesion_vector.length
-        # If it's less than the maximum allowed and not 0, continue
-        if distance:
-            # Compute the direction vector between the closest point and loc
-            adhesion_vector.normalize()
-            adhesion_vector *= 1.0 - distance / max_l
-            # adhesion_vector *= getFaceWeight(ob.data, nearest_result[3])
+    # Compute the adhesion vectors by finding the nearest points
+    find_nearest = bvhtree.find_nearest
+    nearest_location = np.array(loc)
+    for i, co in enumerate(loc.tolist()):
+        location, *_ = find_nearest(co, max_l)
+        if location is not None:
+            nearest_location[i] = location
+
+    # Compute the distance to the nearest points
+    adhesion_vector = nearest_location - loc
+    distance = np.sqrt((adhesion_vector ** 2).sum(axis=1))
+    # If it's less than the maximum allowed and not 0, continue
+    # Compute the direction vector between the closest point and loc
+    adhesion_vector = normalized(adhesion_vector)
+    adhesion_vector *= (1.0 - distance / max_l)[:, None]
+    # adhesion_vector *= getFaceWeight(ob.data, nearest_result[3])
     return adhesion_vector
 
 
 def collision(bvhtree, pos, new_pos):
-    # Check for collision with the object
-    climbing = False
+    # Check for collisions with the object
+    climbing = np.zeros(len(pos), dtype=bool)
 
-    corrected_new_pos = new_pos
+    corrected_new_pos = new_pos.copy()
     direction = new_pos - pos
-
-    hit_location, hit_normal, *_ = bvhtree.ray_cast(pos, direction, direction.length)
-    # If there's a collision we need to check it
-    if hit_location is not None:
-        # Check whether the collision is going into the object
-        if direction.dot(hit_normal) < 0.0:
-            reflected_direction = (new_pos - hit_location).reflect(hit_normal)
-
-            corrected_new_pos = hit_location + reflected_direction
-            climbing = True
+    length = np.sqrt((direction ** 2).sum(axis=1))
+
+    ray_cast = bvhtree.ray_cast
+    for i, co, dir_co, dist in zip(range(len(pos)), pos.tolist(), direction.tolist(), length.tolist()):
+        if not dist:
+            continue
+        hit_location, hit_normal, *_ = ray_cast(co, dir_co, dist)
+        # If there's a collision we need to check it
+        if hit_location is not None:
+            hit_normal = np.array(hit_normal)
+            # Check whether the collision is going into the object
+            if direction[i].dot(hit_normal) < 0.0:
+                hit_location = np.array(hit_location)
+                hit_normal /= np.sqrt(hit_normal.dot(hit_normal))
+                offset = new_pos[i] - hit_location
+                reflected_direction = offset - 2.0 * offset.dot(hit_normal) * hit_normal
+
+                corrected_new_pos[i] = hit_location + reflected_direction
+                climbing[i] = True
 
     return climbing, corrected_new_pos
 
@@ -464,19 +506,48 @@ class IvyGen(Operator):
 
     def invoke(self, context, event):
         self.updateIvy = True
-        return self.execute(context)
-
-    def execute(self, context):
-        # scene = context.scene
         ivyProps = context.window_manager.ivy_gen_props
+        if self.defaultIvy or not ivyProps.growPreview:
+            return self.execute(context)
 
-        if not self.updateIvy:
+        if not self.startIvy(context):
+            return {"CANCELLED"}
+
+        # Grow from a timer, showing the branches after each time slice
+        self.ivyCurve = createIvyGeometry(self.IVY, False)
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # Stop growing, keeping the ivy grown so far
+            print("Halting Growth")
+        elif event.type != 'TIMER':
             return {'PASS_THROUGH'}
+        else:
+            timeSlice = time.time() + 0.1
+            while self.isGrowing() and time.time() < timeSlice:
+                self.growIvy()
+
+            if self.isGrowing():
+                createIvyCurve(self.IVY, self.ivyCurve.data)
+                return {'RUNNING_MODAL'}
+
+        context.window_manager.event_timer_remove(self.timer)
+        self.finishIvy(context, self.ivyCurve)
+        return {'FINISHED'}
+
+    def startIvy(self, context):
+        # scene = context.scene
+        ivyProps = context.window_manager.ivy_gen_props
 
         # assign the variables, check if it is default
         # Note: update the values if window_manager props defaults are changed
         randomSeed = ivyProps.randomSeed if not self.defaultIvy else 0
         maxTime = ivyProps.maxTime if not self.defaultIvy else 0
+        maxIterations = ivyProps.maxIterations if not self.defaultIvy else 0
         maxIvyLength = ivyProps.maxIvyLength if not self.defaultIvy else 1.0
         ivySize = ivyProps.ivySize if not self.defaultIvy else 0.02
         maxFloatLength = ivyProps.maxFloatLength if not self.defaultIvy else 0.5
@@ -489,14 +560,14 @@ class IvyGen(Operator):
         leafProbability = ivyProps.leafProbability if not self.defaultIvy else 0.35
         ivyBranchSize = ivyProps.ivyBranchSize if not self.defaultIvy else 0.001
         ivyLeafSize = ivyProps.ivyLeafSize if not self.defaultIvy else 0.02
-        growLeaves = ivyProps.growLeaves if not self.defaultIvy else True
+        self.growLeaves = ivyProps.growLeaves if not self.defaultIvy else True
 
         bpy.ops.object.mode_set(mode='EDIT', toggle=False)
         bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
 
         # Get the selected object
         ob = context.active_object
-        bvhtree = bvhtree_from_object(ob)
+        self.bvhtree = bvhtree_from_object(ob)
 
         # Check if the mesh has at least one polygon since some functions
         # are expecting them in the object's data (see T51753)
@@ -505,7 +576,7 @@ class IvyGen(Operator):
             self.report({'WARNING'},
                         "Mesh Object doesn't have at least one Face. "
                         "Operation Cancelled")
-            return {"CANCELLED"}
+            return False
 
         # Compute bounding sphere radius
         # radius = computeBoundingSphere(ob)  # Not needed anymore
@@ -513,11 +584,8 @@ class IvyGen(Operator):
         # Get the seeding point
         seedPoint = context.scene.cursor.location
 
-        # Fix the random seed
-        rand_seed(randomSeed)
-
-        # Make the new ivy
-        IVY = Ivy(
+        # Make the new ivy, with a fixed random seed
+        self.IVY = Ivy(
             primaryWeight=primaryWeight,
             randomWeight=randomWeight,
             gravityWeight=gravityWeight,
@@ -528,48 +596,63 @@ class IvyGen(Operator):
             ivyLeafSize=ivyLeafSize,
             ivyBranchSize=ivyBranchSize,
             maxFloatLength=maxFloatLength,
-            maxAdhesionDistance=maxAdhesionDistance
+            maxAdhesionDistance=maxAdhesionDistance,
+            randomSeed=randomSeed
             )
         # Generate first root and node
-        IVY.seed(seedPoint)
-
-        checkTime = False
-        maxLength = maxIvyLength  # * radius
-
-        # If we need to check time set the flag
-        if maxTime != 0.0:
-            checkTime = True
-
-        t = time.time()
-        startPercent = 0.0
-        checkAliveIter = [True, ]
-
-        # Grow until 200 roots is reached or backup counter exceeds limit
-        while (any(checkAliveIter) and
-               (IVY.maxLength < maxLength) and
-               (not checkTime or (time.time() - t < maxTime))):
-            # Grow the ivy for this iteration
-            IVY.grow(ob, bvhtree)
-
-            # Print the proportion of ivy growth to console
-            if (IVY.maxLength / maxLength * 100) > 10 * startPercent // 10:
-                print('%0.2f%% of Ivy nodes have grown' %
-                                         (IVY.maxLength / maxLength * 100))
-                startPercent += 10
-                if IVY.maxLength / maxLength > 1:
-                    print("Halting Growth")
-
-            # Make an iterator to check if all are alive
-            checkAliveIter = (r.alive for r in IVY.ivyRoots)
+        self.IVY.seed(seedPoint)
+
+        self.maxLength = maxIvyLength  # * radius
+        self.maxTime = maxTime
+        self.maxIterations = maxIterations
+        self.iterations = 0
+        self.startPercent = 0.0
+        self.startTime = time.time()
+        return True
 
+    def isGrowing(self):
+        # Grow until all roots are dead or a limit is reached
+        return (self.IVY.isAlive() and
+                (self.IVY.maxLength < self.maxLength) and
+                (not self.maxTime or (time.time() - self.startTime < self.maxTime)) and
+                (not self.maxIterations or (self.iterations < self.maxIterations)))
+
+    def growIvy(self):
+        # Grow the ivy for this iteration
+        IVY = self.IVY
+        IVY.grow(self.bvhtree)
+        self.iterations += 1
+
+        # Print the proportion of ivy growth to console
+        if (IVY.maxLength / self.maxLength * 100) > 10 * self.startPercent // 10:
+            print('%0.2f%% of Ivy nodes have grown' %
+                                     (IVY.maxLength / self.maxLength * 100))
+            self.startPercent += 10
+            if IVY.maxLength / self.maxLength > 1:
+                print("Halting Growth")
+
+    def finishIvy(self, context, ivyCurve=None):
         # Create the curve and leaf geometry
-        createIvyGeometry(IVY, growLeaves)
+        createIvyGeometry(self.IVY, self.growLeaves, ivyCurve)
         print("Geometry Generation Complete")
 
-        print("Ivy generated in %0.2f s" % (time.time() - t))
+        print("Ivy generated in %0.2f s" % (time.time() - self.startTime))
 
         self.updateIvy = False
         self.defaultIvy = False
+        self.IVY = self.bvhtree = None
+
+    def execute(self, context):
+        if not self.updateIvy:
+            return {'PASS_THROUGH'}
+
+        if not self.startIvy(context):
+            return {"CANCELLED"}
+
+        while self.isGrowing():
+            self.growIvy()
+
+        self.finishIvy(context)
 
         return {'FINISHED'}
 
@@ -605,6 +688,8 @@ class CURVE_PT_IvyGenPanel(Panel):
         col.label(text="Generation Settings:")
         col.prop(wm.ivy_gen_props, "randomSeed")
         col.prop(wm.ivy_gen_props, "maxTime")
+        col.prop(wm.ivy_gen_props, "maxIterations")
+        col.prop(wm.ivy_gen_props, "growPreview")
 
         col = layout.column(align=True)
         col.label(text="Size Settings:")
@@ -743,6 +828,20 @@ class IvyGenProperties(PropertyGroup):
         min=0.0,
         soft_max=10
     )
+    maxIterations: IntProperty(
+        name="Maximum Iterations",
+        description="The maximum number of growth steps "
+                    "(0 = Disabled)",
+        default=0,
+        min=0,
+        soft_max=1000
+    )
+    growPreview: BoolProperty(
+        name="Preview Growth",
+        description="Show the branches while the ivy grows, "
+                    "press Esc to stop growing early",
+        default=False
+    )
     growLeaves: BoolProperty(
         name="Grow Leaves",
         description="Grow leaves or not",
@@ -15,6 +15,8 @@ from math import floor
 from random import random, uniform, seed, choice, getstate, setstate, randint
 from collections import deque, OrderedDict
 
+import numpy as np
+
 tau = 2 * pi
 
 # Initialise the split error and axis vectors
@@ -193,6 +195,38 @@ def evalBezTan(p1, h1, h2, p2, t):
             ).normalized()
 
 
+# Evaluate the points and the unit tangents of arrays of bezier segments for the parameters t
+def evalBezArrays(p1, h1, h2, p2, t):
+    t = np.asarray(t, dtype=np.float64)[:, None]
+    coords = ((1 - t)**3) * p1 + (3 * t * (1 - t)**2) * h1 + (3 * (t**2) * (1 - t)) * h2 + (t**3) * p2
+    tangents = (
+            (-3 * (1 - t)**2) * p1 + (-6 * t * (1 - t) + 3 * (1 - t)**2) * h1 +
+            (-3 * (t**2) + 6 * t * (1 - t)) * h2 + (3 * t**2) * p2
+            )
+    length = np.sqrt((tangents ** 2).sum(axis=1))[:, None]
+    tangents = np.divide(tangents, length, out=np.zeros_like(tangents), where=length > 0.0)
+    return coords, tangents
+
+
+# Read the coordinates, handles and radius of the bezier points into arrays
+def bezierPointsArrays(points):
+    numPoints = len(points)
+    co = np.empty(numPoints * 3, dtype=np.float32)
+    handleLeft = np.empty(numPoints * 3, dtype=np.float32)
+    handleRight = np.empty(numPoints * 3, dtype=np.float32)
+    radius = np.empty(numPoints, dtype=np.float32)
+    points.foreach_get('co', co)
+    points.foreach_get('handle_left', handleLeft)
+    points.foreach_get('handle_right', handleRight)
+    points.foreach_get('radius', radius)
+    return (
+        co.reshape((-1, 3)).astype(np.float64),
+        handleLeft.reshape((-1, 3)).astype(np.float64),
+        handleRight.reshape((-1, 3)).astype(np.float64),
+        radius.astype(np.float64)
+        )
+
+
 # Determine the range of t values along a splines length where child stems are formed
 def findChildPoints(stemList, numChild):
     numPoints = sum([len(n.spline.bezier_points) for n in stemList])
@@ -260,35 +294,35 @@ def interpStem(stem, tVals, lPar, parRad, maxOffset, baseSize):
     checkBottom = stem.offsetLen / maxOffset
     checkTop = checkBottom + (stemLen / maxOffset)
 
-    # Loop through all the parametric values to be determined
-    tempList = deque()
-    for t in tVals:
-        if (t >= checkBottom) and (t <= checkTop) and (t < 1.0):
-            scaledT = (t - checkBottom) / (checkTop - checkBottom)
-            ofst = ((t - baseSize) / (checkTop - baseSize)) * (1 - baseSize) + baseSize
+    # Find all the parametric values to be determined at once
+    tVals = np.array(tVals, dtype=np.float64)
+    tVals = tVals[(tVals >= checkBottom) & (tVals <= checkTop) & (tVals < 1.0)]
+    scaledT = (tVals - checkBottom) / (checkTop - checkBottom)
+    ofsts = ((tVals - baseSize) / (checkTop - baseSize)) * (1 - baseSize) + baseSize
 
-            length = numSegs * scaledT
-            index = int(length)
-            tTemp = length - index
+    length = numSegs * scaledT
+    indices = length.astype(np.int32)
+    tTemps = length - indices
 
-            coord = evalBez(
-                        points[index].co, points[index].handle_right,
-                        points[index + 1].handle_left, points[index + 1].co, tTemp
-                        )
-            quat = (
-                evalBezTan(
-                    points[index].co, points[index].handle_right,
-                    points[index + 1].handle_left, points[index + 1].co, tTemp
-                    )
-                ).to_track_quat('Z', 'Y')
-            # Not sure if this is the parent radius at the child point or parent start radius
-            radius = (1 - tTemp) * points[index].radius + tTemp * points[index + 1].radius
+    co, handleLeft, handleRight, radii = bezierPointsArrays(points)
+    coords, tangents = evalBezArrays(
+                            co[indices], handleRight[indices],
+                            handleLeft[indices + 1], co[indices + 1], tTemps
+                            )
+    # Not sure if this is the parent radius at the child point or parent start radius
+    radii = (1 - tTemps) * radii[indices] + tTemps * radii[indices + 1]
 
-            tempList.append(
-                    childPoint(
-                        coord, quat, (parRad, radius), t, ofst, lPar,
-                        'bone' + (str(stem.splN).rjust(3, '0')) + '.' + (str(index).rjust(3, '0')))
-                    )
+    tempList = deque()
+    boneName = 'bone' + (str(stem.splN).rjust(3, '0')) + '.'
+    for t, ofst, index, coord, tangent, radius in zip(
+            tVals.tolist(), ofsts.tolist(), indices.tolist(),
+            coords.tolist(), tangents.tolist(), radii.tolist()):
+        quat = Vector(tangent).to_track_quat('Z', 'Y')
+        tempList.append(
+                childPoint(
+                    Vector(coord), quat, (parRad, radius), t, ofst, lPar,
+                    boneName + (str(index).rjust(3, '0')))
+                )
 
     # add stem at tip
     index = numSegs - 1
@@ -561,34 +595,35 @@ def growSpline(n, stem, numSplit, splitAng, splitAngV, splineList,
     # return splineList
 
 
-def genLeafMesh(leafScale, leafScaleX, leafScaleT, leafScaleV, loc, quat,
-                offset, index, downAngle, downAngleV, rotate, rotateV, oldRot,
-                bend, leaves, leafShape, leafangle, horzLeaves):
-    if leafShape == 'hex':
-        verts = [
-            Vector((0, 0, 0)), Vector((0.5, 0, 1 / 3)), Vector((0.5, 0, 2 / 3)),
-            Vector((0, 0, 1)), Vector((-0.5, 0, 2 / 3)), Vector((-0.5, 0, 1 / 3))
-            ]
-        edges = [[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [5, 0], [0, 3]]
-        faces = [[0, 1, 2, 3], [0, 3, 4, 5]]
-    elif leafShape == 'rect':
-        # verts = [Vector((1, 0, 0)), Vector((1, 0, 1)), Vector((-1, 0, 1)), Vector((-1, 0, 0))]
-        verts = [Vector((.5, 0, 0)), Vector((.5, 0, 1)), Vector((-.5, 0, 1)), Vector((-.5, 0, 0))]
-        edges = [[0, 1], [1, 2], [2, 3], [3, 0]]
-        faces = [[0, 1, 2, 3]]
-    elif leafShape == 'dFace':
-        verts = [Vector((.5, .5, 0)), Vector((.5, -.5, 0)), Vector((-.5, -.5, 0)), Vector((-.5, .5, 0))]
-        edges = [[0, 1], [1, 2], [2, 3], [3, 0]]
-        faces = [[0, 3, 2, 1]]
-    elif leafShape == 'dVert':
-        verts = [Vector((0, 0, 1))]
-        edges = []
-        faces = []
-
-    vertsList = []
-    facesList = []
-    normal = Vector((0, 0, 1))
-
+# Vertices and faces of each leaf shape, before it is scaled and rotated
+leafGeometry = {
+    'hex': (
+        ((0, 0, 0), (0.5, 0, 1 / 3), (0.5, 0, 2 / 3), (0, 0, 1), (-0.5, 0, 2 / 3), (-0.5, 0, 1 / 3)),
+        ((0, 1, 2, 3), (0, 3, 4, 5)),
+        ),
+    'rect': (
+        # ((1, 0, 0), (1, 0, 1), (-1, 0, 1), (-1, 0, 0)),
+        ((.5, 0, 0), (.5, 0, 1), (-.5, 0, 1), (-.5, 0, 0)),
+        ((0, 1, 2, 3),),
+        ),
+    'dFace': (
+        ((.5, .5, 0), (.5, -.5, 0), (-.5, -.5, 0), (-.5, .5, 0)),
+        ((0, 3, 2, 1),),
+        ),
+    'dVert': (
+        ((0, 0, 1),),
+        (),
+        ),
+    }
+
+
+def genLeafMatrix(leafScale, leafScaleX, leafScaleT, leafScaleV, loc, quat,
+                  offset, downAngle, downAngleV, rotate, rotateV, oldRot,
+                  bend, leaves, leafShape, leafangle, horzLeaves):
+    """
+    Find the matrix scaling and rotating the vertices of a leaf,
+    the vertices of all the leaves are transformed at once by genLeafVerts
+    """
     if leaves < 0:
         rotMat = Matrix.Rotation(oldRot, 3, 'Y')
     else:
@@ -660,52 +695,51 @@ def genLeafMesh(leafScale, leafScaleX, leafScaleT, leafScaleV, loc, quat,
 
         rotateZOrien2 = Matrix.Rotation(-orientation, 3, 'X')
 
-    # For each of the verts we now rotate and scale them, then append them to the list to be added to the mesh
-    for v in verts:
-        v.z *= leafScale
-        v.y *= leafScale
-        v.x *= leafScaleX * leafScale
+    # Scale the verts, then apply each of the rotations (the last one applied is the left most)
+    mat = Matrix.Diagonal((leafScaleX * leafScale, leafScale, leafScale))
+
+    mat = Euler((0, 0, radians(180))).to_matrix() @ mat
+
+    # leafangle
+    mat = Matrix.Rotation(radians(-leafangle), 3, 'X') @ mat
 
-        v.rotate(Euler((0, 0, radians(180))))
+    if rotate < 0:
+        mat = Euler((0, 0, radians(90))).to_matrix() @ mat
+        if oldRot < 0:
+            mat = Euler((0, 0, radians(180))).to_matrix() @ mat
 
-        # leafangle
-        v.rotate(Matrix.Rotation(radians(-leafangle), 3, 'X'))
+    if (leaves > 0) and (rotate > 0) and horzLeaves:
+        nRotMat = Matrix.Rotation(-oldRot + rotate, 3, 'Z')
+        mat = nRotMat @ mat
 
-        if rotate < 0:
-            v.rotate(Euler((0, 0, radians(90))))
-            if oldRot < 0:
-                v.rotate(Euler((0, 0, radians(180))))
+    if leaves > 0:
+        mat = downRotMat @ mat
 
-        if (leaves > 0) and (rotate > 0) and horzLeaves:
-            nRotMat = Matrix.Rotation(-oldRot + rotate, 3, 'Z')
-            v.rotate(nRotMat)
+    mat = quat.to_matrix() @ rotMat @ mat
 
-        if leaves > 0:
-            v.rotate(downRotMat)
+    if (bend != 0.0) and (leaves > 0):
+        # Correct the rotation
+        mat = rotateZOrien2 @ rotateX @ rotateZOrien @ rotateZ @ mat
 
-        v.rotate(rotMat)
-        v.rotate(quat)
+    return mat, oldRot
 
-        if (bend != 0.0) and (leaves > 0):
-            # Correct the rotation
-            v.rotate(rotateZ)
-            v.rotate(rotateZOrien)
-            v.rotate(rotateX)
-            v.rotate(rotateZOrien2)
+
+def genLeafVerts(leafShape, leafMats, leafLocs):
+    """
+    Return the vertices of all the leaves for their (n, 3, 3) matrices and (n, 3) locations,
+    with the vertex normals of the 'dVert' leaves (None for other shapes)
+    """
+    verts = np.array(leafGeometry[leafShape][0], dtype=np.float64)
+    leafVerts = np.einsum('nij,vj->nvi', leafMats, verts)
 
     if leafShape == 'dVert':
-        normal = verts[0]
-        normal.normalize()
-        v = loc
-        vertsList.append([v.x, v.y, v.z])
-    else:
-        for v in verts:
-            v += loc
-            vertsList.append([v.x, v.y, v.z])
-        for f in faces:
-            facesList.append([f[0] + index, f[1] + index, f[2] + index, f[3] + index])
+        normals = leafVerts[:, 0]
+        length = np.sqrt((normals ** 2).sum(axis=1))[:, None]
+        normals = np.divide(normals, length, out=normals.copy(), where=length > 0.0)
+        return leafLocs.copy(), normals
 
-    return vertsList, facesList, normal, oldRot
+    leafVerts += leafLocs[:, None]
+    return leafVerts.reshape((-1, 3)), None
 
 
 def create_armature(armAnim, leafP, cu, frameRate, leafMesh, leafObj, leafVertSize, leaves,
@@ -1604,42 +1638,25 @@ def addTree(props):
         enOb = bpy.data.objects.new('envelope', enCu)
         enOb.parent = treeOb
         bpy.context.scene.collection.objects.link(enOb)
-        newSpline = enCu.splines.new('BEZIER')
-        newPoint = newSpline.bezier_points[-1]
-        newPoint.co = Vector((0, 0, scaleVal))
-        (newPoint.handle_right_type, newPoint.handle_left_type) = (enHandle, enHandle)
-        # Set the coordinates by varying the z value, envelope will be aligned to the x-axis
-        for c in range(enNum):
-            newSpline.bezier_points.add(1)
-            newPoint = newSpline.bezier_points[-1]
-            ratioVal = (c + 1) / (enNum)
-            zVal = scaleVal - scaleVal * (1 - pruneBase) * ratioVal
-            newPoint.co = Vector(
-                            (
-                            scaleVal * pruneWidth *
-                            shapeRatio(9, ratioVal, pruneWidthPeak, prunePowerHigh, prunePowerLow),
-                            0, zVal
-                            )
-                        )
-            (newPoint.handle_right_type, newPoint.handle_left_type) = (enHandle, enHandle)
-        newSpline = enCu.splines.new('BEZIER')
-        newPoint = newSpline.bezier_points[-1]
-        newPoint.co = Vector((0, 0, scaleVal))
-        (newPoint.handle_right_type, newPoint.handle_left_type) = (enHandle, enHandle)
-        # Create a second envelope but this time on the y-axis
-        for c in range(enNum):
-            newSpline.bezier_points.add(1)
-            newPoint = newSpline.bezier_points[-1]
-            ratioVal = (c + 1) / (enNum)
-            zVal = scaleVal - scaleVal * (1 - pruneBase) * ratioVal
-            newPoint.co = Vector(
-                            (
-                            0, scaleVal * pruneWidth *
-                            shapeRatio(9, ratioVal, pruneWidthPeak, prunePowerHigh, prunePowerLow),
-                            zVal
-                            )
-                        )
-            (newPoint.handle_right_type, newPoint.handle_left_type) = (enHandle, enHandle)
+        # Set the coordinates by varying the z value, envelope will be aligned to the x-axis,
+        # then create a second envelope but this time on the y-axis
+        ratioVals = [(c + 1) / (enNum) for c in range(enNum)]
+        enWidth = np.array([
+            scaleVal * pruneWidth *
+            shapeRatio(9, ratioVal, pruneWidthPeak, prunePowerHigh, prunePowerLow)
+            for ratioVal in ratioVals
+            ])
+        for axis in range(2):
+            enCo = np.zeros((enNum + 1, 3))
+            enCo[0, 2] = scaleVal
+            enCo[1:, axis] = enWidth
+            enCo[1:, 2] = scaleVal - scaleVal * (1 - pruneBase) * np.array(ratioVals)
+
+            newSpline = enCu.splines.new('BEZIER')
+            newSpline.bezier_points.add(enNum)
+            newSpline.bezier_points.foreach_set('co', enCo.ravel())
+            for newPoint in newSpline.bezier_points:
+                (newPoint.handle_right_type, newPoint.handle_left_type) = (enHandle, enHandle)
 
     childP = []
     stemList = []
@@ -1723,9 +1740,8 @@ def addTree(props):
         levelCount.append(len(cu.splines))
 
     # If we need to add leaves, we do it here
-    leafVerts = []
-    leafFaces = []
-    leafNormals = []
+    leafMats = []
+    leafLocs = []
 
     leafMesh = None  # in case we aren't creating leaves, we'll still have the variable
 
@@ -1739,43 +1755,58 @@ def addTree(props):
             if leaves < 0:
                 oldRot = -leafRotate / 2
                 for g in range(abs(leaves)):
-                    (vertTemp, faceTemp, normal, oldRot) = genLeafMesh(
-                                                                leafScale, leafScaleX, leafScaleT,
-                                                                leafScaleV, cp.co, cp.quat, cp.offset,
-                                                                len(leafVerts), leafDownAngle, leafDownAngleV,
-                                                                leafRotate, leafRotateV,
-                                                                oldRot, bend, leaves, leafShape,
-                                                                leafangle, horzLeaves
-                                                                )
-                    leafVerts.extend(vertTemp)
-                    leafFaces.extend(faceTemp)
-                    leafNormals.extend(normal)
+                    (leafMat, oldRot) = genLeafMatrix(
+                                                leafScale, leafScaleX, leafScaleT,
+                                                leafScaleV, cp.co, cp.quat, cp.offset,
+                                                leafDownAngle, leafDownAngleV,
+                                                leafRotate, leafRotateV,
+                                                oldRot, bend, leaves, leafShape,
+                                                leafangle, horzLeaves
+                                                )
+                    leafMats.append(leafMat)
+                    leafLocs.append(cp.co)
                     leafP.append(cp)
             # Otherwise just add the leaves like splines
             else:
-                (vertTemp, faceTemp, normal, oldRot) = genLeafMesh(
-                                                            leafScale, leafScaleX, leafScaleT, leafScaleV,
-                                                            cp.co, cp.quat, cp.offset, len(leafVerts),
-                                                            leafDownAngle, leafDownAngleV, leafRotate,
-                                                            leafRotateV, oldRot, bend, leaves, leafShape,
-                                                            leafangle, horzLeaves
-                                                            )
-                leafVerts.extend(vertTemp)
-                leafFaces.extend(faceTemp)
-                leafNormals.extend(normal)
+                (leafMat, oldRot) = genLeafMatrix(
+                                            leafScale, leafScaleX, leafScaleT, leafScaleV,
+                                            cp.co, cp.quat, cp.offset,
+                                            leafDownAngle, leafDownAngleV, leafRotate,
+                                            leafRotateV, oldRot, bend, leaves, leafShape,
+                                            leafangle, horzLeaves
+                                            )
+                leafMats.append(leafMat)
+                leafLocs.append(cp.co)
                 leafP.append(cp)
 
-        # Create the leaf mesh and object, add geometry using from_pydata,
-        # edges are currently added by validating the mesh which isn't great
+        # Transform the vertices of all the leaves at once
+        numLeaves = len(leafP)
+        leafVerts, leafNormals = genLeafVerts(
+                                    leafShape,
+                                    np.array(leafMats, dtype=np.float64).reshape((-1, 3, 3)),
+                                    np.array(leafLocs, dtype=np.float64).reshape((-1, 3))
+                                    )
+        faces = np.array(leafGeometry[leafShape][1], dtype=np.int32).reshape((-1, 4))
+        numVerts = len(leafGeometry[leafShape][0])
+        leafFaces = (faces[None] + (np.arange(numLeaves, dtype=np.int32) * numVerts)[:, None, None]).reshape((-1, 4))
+
+        # Create the leaf mesh and object, add the geometry with array assignment
         leafMesh = bpy.data.meshes.new('leaves')
         leafObj = bpy.data.objects.new('leaves', leafMesh)
         bpy.context.scene.collection.objects.link(leafObj)
         leafObj.parent = treeOb
-        leafMesh.from_pydata(leafVerts, (), leafFaces)
+        leafMesh.vertices.add(len(leafVerts))
+        leafMesh.vertices.foreach_set('co', leafVerts.ravel())
+        leafMesh.loops.add(leafFaces.size)
+        leafMesh.loops.foreach_set('vertex_index', leafFaces.ravel())
+        leafMesh.polygons.add(len(leafFaces))
+        leafMesh.polygons.foreach_set('loop_start', np.arange(0, leafFaces.size, 4, dtype=np.int32))
+        leafMesh.polygons.foreach_set('loop_total', np.full(len(leafFaces), 4, dtype=np.int32))
+        leafMesh.update(calc_edges=len(leafFaces) > 0)
 
         # set vertex normals for dupliVerts
         if leafShape == 'dVert':
-            leafMesh.vertices.foreach_set('normal', leafNormals)
+            leafMesh.vertices.foreach_set('normal', leafNormals.ravel())
 
         # enable duplication
         if leafShape == 'dFace':
@@ -1797,36 +1828,21 @@ def addTree(props):
                 pass
 
         # add leaf UVs
-        if leafShape == 'rect':
+        if leafShape in {'rect', 'hex'}:
             leafMesh.uv_layers.new(name='leafUV')
             uvlayer = leafMesh.uv_layers.active.data
 
             u1 = .5 * (1 - leafScaleX)
             u2 = 1 - u1
 
-            for i in range(0, len(leafFaces)):
-                uvlayer[i * 4 + 0].uv = Vector((u2, 0))
-                uvlayer[i * 4 + 1].uv = Vector((u2, 1))
-                uvlayer[i * 4 + 2].uv = Vector((u1, 1))
-                uvlayer[i * 4 + 3].uv = Vector((u1, 0))
-
-        elif leafShape == 'hex':
-            leafMesh.uv_layers.new(name='leafUV')
-            uvlayer = leafMesh.uv_layers.active.data
-
-            u1 = .5 * (1 - leafScaleX)
-            u2 = 1 - u1
-
-            for i in range(0, int(len(leafFaces) / 2)):
-                uvlayer[i * 8 + 0].uv = Vector((.5, 0))
-                uvlayer[i * 8 + 1].uv = Vector((u1, 1 / 3))
-                uvlayer[i * 8 + 2].uv = Vector((u1, 2 / 3))
-                uvlayer[i * 8 + 3].uv = Vector((.5, 1))
-
-                uvlayer[i * 8 + 4].uv = Vector((.5, 0))
-                uvlayer[i * 8 + 5].uv = Vector((.5, 1))
-                uvlayer[i * 8 + 6].uv = Vector((u2, 2 / 3))
-                uvlayer[i * 8 + 7].uv = Vector((u2, 1 / 3))
+            if leafShape == 'rect':
+                leafUV = ((u2, 0), (u2, 1), (u1, 1), (u1, 0))
+            else:
+                leafUV = (
+                    (.5, 0), (u1, 1 / 3), (u1, 2 / 3), (.5, 1),
+                    (.5, 0), (.5, 1), (u2, 2 / 3), (u2, 1 / 3)
+                    )
+            uvlayer.foreach_set('uv', np.tile(np.array(leafUV).ravel(), numLeaves))
 
         leafMesh.validate()
 
@@ -1867,6 +1883,7 @@ def addTree(props):
         vert_radius = []
         vertexGroups = OrderedDict()
         lastVerts = []
+        numVerts = 0
 
         for i, curve in enumerate(cu.splines):
             points = curve.bezier_points
@@ -1880,7 +1897,7 @@ def addTree(props):
             level = min(level, 3)
 
             step = boneStep[level]
-            vindex = len(treeVerts)
+            vindex = numVerts
 
             p1 = points[0]
 
@@ -1891,11 +1908,12 @@ def addTree(props):
                 p_1 = cu.splines[pb].bezier_points[pn]
                 p_2 = cu.splines[pb].bezier_points[pn + 1]
                 p = evalBez(p_1.co, p_1.handle_right, p_2.handle_left, p_2.co, 1 - 1 / (resU + 1))
-                treeVerts.append(p)
+                treeVerts.append([p])
+                numVerts += 1
 
-                root_vert.append(False)
-                vert_radius.append((p1.radius * .75, p1.radius * .75))
-                treeEdges.append([vindex, vindex + 1])
+                root_vert.append([False])
+                vert_radius.append([p1.radius * .75])
+                treeEdges.append([(vindex, vindex + 1)])
                 vindex += 1
 
             if isend[i]:
@@ -1903,9 +1921,10 @@ def addTree(props):
                 vindex -= 1
             else:
                 # add first point
-                treeVerts.append(p1.co)
-                root_vert.append(True)
-                vert_radius.append((p1.radius, p1.radius))
+                treeVerts.append([p1.co])
+                numVerts += 1
+                root_vert.append([True])
+                vert_radius.append([p1.radius])
             """
             # add extra vertex for splits
             if issplit[i]:
@@ -1930,7 +1949,25 @@ def addTree(props):
             else:
                 g = False
 
-            for n, p2 in enumerate(points[1:]):
+            # Evaluate all the segments of the spline at once
+            numSegs = len(points) - 1
+            co, handleLeft, handleRight, radius = bezierPointsArrays(points)
+            pos = np.tile(np.arange(1, resU + 1) / resU, numSegs)
+            seg = np.repeat(np.arange(numSegs), resU)
+            p, _tangents = evalBezArrays(co[seg], handleRight[seg], handleLeft[seg + 1], co[seg + 1], pos)
+            treeVerts.append(p)
+            numVerts += len(p)
+            root_vert.append(np.zeros(len(p), dtype=bool))
+            vert_radius.append(radius[seg] + (radius[seg + 1] - radius[seg]) * pos)
+
+            # Each vertex is connected to the previous one
+            edges = np.arange(vindex + 1, vindex + 1 + len(p))
+            edges = np.stack((edges - 1, edges), axis=1)
+            if isend[i] and numSegs:
+                edges[0, 0] = parent
+            treeEdges.append(edges)
+
+            for n in range(numSegs):
                 if not g:
                     groupName = 'bone' + (str(i)).rjust(3, '0') + '.' + (str(n)).rjust(3, '0')
                     groupName = roundBone(groupName, step)
@@ -1944,30 +1981,24 @@ def addTree(props):
                     else:
                         vertexGroups[splineToBone[i]].append(vindex - 1)
 
-                for f in range(1, resU + 1):
-                    pos = f / resU
-                    p = evalBez(p1.co, p1.handle_right, p2.handle_left, p2.co, pos)
-                    radius = p1.radius + (p2.radius - p1.radius) * pos
-
-                    treeVerts.append(p)
-                    root_vert.append(False)
-                    vert_radius.append((radius, radius))
-
-                    if (isend[i]) and (n == 0) and (f == 1):
-                        edge = [parent, n * resU + f + vindex]
-                    else:
-                        edge = [n * resU + f + vindex - 1, n * resU + f + vindex]
-                        # add vert to group
-                        vertexGroups[groupName].append(n * resU + f + vindex - 1)
-                    treeEdges.append(edge)
-
-                vertexGroups[groupName].append(n * resU + resU + vindex)
+                # add verts to group
+                start = n * resU + vindex
+                if (isend[i]) and (n == 0):
+                    start += 1
+                vertexGroups[groupName].extend(range(start, n * resU + resU + vindex + 1))
 
-                p1 = p2
+            lastVerts.append(numVerts - 1)
 
-            lastVerts.append(len(treeVerts) - 1)
+        treeVerts = np.concatenate([np.array(v, dtype=np.float64).reshape((-1, 3)) for v in treeVerts])
+        treeEdges = np.concatenate([np.array(e, dtype=np.int32).reshape((-1, 2)) for e in treeEdges])
+        root_vert = np.concatenate(root_vert).astype(bool)
+        vert_radius = np.concatenate(vert_radius)
 
-        treeMesh.from_pydata(treeVerts, treeEdges, ())
+        treeMesh.vertices.add(len(treeVerts))
+        treeMesh.vertices.foreach_set('co', treeVerts.ravel())
+        treeMesh.edges.add(len(treeEdges))
+        treeMesh.edges.foreach_set('vertices', treeEdges.ravel())
+        treeMesh.update()
 
         for group in vertexGroups:
             treeObj.vertex_groups.new(name=group)
@@ -1990,8 +2021,7 @@ def addTree(props):
         if previewArm:
             skinMod.show_viewport = False
         skindata = treeObj.data.skin_vertices[0].data
-        for i, radius in enumerate(vert_radius):
-            skindata[i].radius = radius
-            skindata[i].use_root = root_vert[i]
+        skindata.foreach_set('radius', np.repeat(vert_radius, 2))
+        skindata.foreach_set('use_root', root_vert)
 
         print("mesh time", time.time() - t1)
@@ -36,6 +36,7 @@ Branched Path Tracing), size, and change their visibility.
 import os
 import bpy
 from amaranth import utils
+from bpy.app.handlers import persistent
 from bpy.types import (
         Operator,
         Panel,
@@ -84,6 +85,115 @@ class AMTH_store_data():
     count_image_node_unlinked = 0  # Unlinked Image nodes
 
 
+def iter_tree_nodes(tree, visited=None):
+    """Iterate over the nodes of a node tree and of the node groups nested in it"""
+    if visited is None:
+        visited = set()
+    if tree is None or tree in visited:
+        return
+    visited.add(tree)
+
+    for no in tree.nodes:
+        yield no
+        if no.type == 'GROUP' and no.node_tree:
+            yield from iter_tree_nodes(no.node_tree, visited)
+
+
+class AMTH_datablock_index():
+    # Reverse references between datablocks, built on first use and
+    # cleared by the depsgraph update and file load handlers
+    user_map = None                # bpy.data.user_map() result
+    material_objects = None        # Material -> objects using it
+    attribute_materials = None     # Attribute name -> materials with Attribute nodes
+    vcol_objects = None            # Vertex Color layer name -> mesh objects
+    image_exists = {}              # Image -> whether its file exists
+
+    @classmethod
+    def clear(cls):
+        cls.user_map = None
+        cls.material_objects = None
+        cls.attribute_materials = None
+        cls.vcol_objects = None
+        cls.image_exists = {}
+
+    @classmethod
+    def users(cls, id_data):
+        if cls.user_map is None:
+            cls.user_map = bpy.data.user_map()
+        return cls.user_map.get(id_data, ())
+
+    @classmethod
+    def users_through_groups(cls, id_data):
+        """Users of a datablock, including the users of node groups using it"""
+        found = set()
+        pending = [id_data]
+
+        while pending:
+            for user in cls.users(pending.pop()):
+                if user not in found:
+                    found.add(user)
+                    if isinstance(user, bpy.types.NodeTree):
+                        pending.append(user)
+        return found
+
+    @classmethod
+    def objects_using_material(cls, ma):
+        """Objects with the material in one of their slots, sorted by name"""
+        if cls.material_objects is None:
+            cls.material_objects = {}
+
+        objects = cls.material_objects.get(ma)
+        if objects is None:
+            # Objects linking the material directly, or through their data
+            candidates = set()
+            for user in cls.users(ma):
+                if isinstance(user, bpy.types.Object):
+                    candidates.add(user)
+                else:
+                    candidates.update(ob for ob in cls.users(user)
+                                      if isinstance(ob, bpy.types.Object) and ob.data == user)
+
+            objects = sorted((ob for ob in candidates if ma.name in ob.material_slots),
+                             key=lambda ob: ob.name)
+            cls.material_objects[ma] = objects
+        return objects
+
+    @classmethod
+    def materials_using_attribute(cls, attribute_name):
+        if cls.attribute_materials is None:
+            cls.attribute_materials = {}
+            for ma in bpy.data.materials:
+                if ma.node_tree:
+                    names = {no.attribute_name for no in iter_tree_nodes(ma.node_tree)
+                             if no.type == 'ATTRIBUTE'}
+                    for name in names:
+                        cls.attribute_materials.setdefault(name, []).append(ma)
+        return cls.attribute_materials.get(attribute_name, [])
+
+    @classmethod
+    def objects_with_vcol(cls, vcol_name):
+        if cls.vcol_objects is None:
+            cls.vcol_objects = {}
+            for ob in bpy.data.objects:
+                if ob.type == 'MESH':
+                    for v in ob.data.vertex_colors:
+                        cls.vcol_objects.setdefault(v.name, []).append(ob)
+        return cls.vcol_objects.get(vcol_name, [])
+
+    @classmethod
+    def image_path_exists(cls, im):
+        exists = cls.image_exists.get(im)
+        if exists is None:
+            exists = os.path.exists(bpy.path.abspath(im.filepath, library=im.library))
+            cls.image_exists[im] = exists
+        return exists
+
+
+@persistent
+def amth_datablock_index_clear(*args):
+    AMTH_datablock_index.clear()
+
+
 def call_update_datablock_type(self, context):
     try:
         # Note: this is pretty weak, but updates the operator enum selection
@@ -328,24 +438,24 @@ class AMTH_SCENE_OT_list_missing_node_links(Operator):
         libraries = []
 
         reset_global_storage(what="NODE_LINK")
+        index = AMTH_datablock_index
 
         for ma in bpy.data.materials:
             if not ma.node_tree:
                 continue
 
-            for no in ma.node_tree.nodes:
+            for no in iter_tree_nodes(ma.node_tree):
                 if no.type == "GROUP":
                     if not no.node_tree:
                         AMTH_store_data.count_groups += 1
 
                         users_ngroup = []
 
-                        for ob in bpy.data.objects:
-                            if ob.material_slots and ma.name in ob.material_slots:
-                                users_ngroup.append("%s%s%s" % (
-                                    "[L] " if ob.library else "",
-                                    "[F] " if ob.use_fake_user else "",
-                                    ob.name))
+                        for ob in index.objects_using_material(ma):
+                            users_ngroup.append("%s%s%s" % (
+                                "[L] " if ob.library else "",
+                                "[F] " if ob.use_fake_user else "",
+                                ob.name))
 
                         missing_groups.append(
                             "MA: %s%s%s [%s]%s%s%s\n" %
@@ -368,22 +478,17 @@ class AMTH_SCENE_OT_list_missing_node_links(Operator):
                                     not no.outputs["Alpha"].is_linked
 
                     if no.image:
-                        image_path_exists = os.path.exists(
-                                bpy.path.abspath(
-                                no.image.filepath,
-                                library=no.image.library)
-                                )
+                        image_path_exists = index.image_path_exists(no.image)
 
                     if outputs_empty or not no.image or not image_path_exists:
 
                         users_images = []
 
-                        for ob in bpy.data.objects:
-                            if ob.material_slots and ma.name in ob.material_slots:
-                                users_images.append("%s%s%s" % (
-                                    "[L] " if ob.library else "",
-                                    "[F] " if ob.use_fake_user else "",
-                                    ob.name))
+                        for ob in index.objects_using_material(ma):
+                            users_images.append("%s%s%s" % (
+                                "[L] " if ob.library else "",
+                                "[F] " if ob.use_fake_user else "",
+                                ob.name))
 
                         if outputs_empty:
                             AMTH_store_data.count_image_node_unlinked += 1
@@ -593,56 +698,44 @@ class AMTH_SCENE_OT_list_users_for_x(Operator):
         dtype = context.scene.amth_datablock_types
 
         reset_global_storage("XTYPE")
+        index = AMTH_datablock_index
 
         # IMAGE TYPE
         if dtype == 'IMAGE_DATA':
+            # Only the datablocks referencing the image (directly or through
+            # node groups) are inspected
+            owners = set()
+            for im in d.images:
+                if im.name == x:
+                    owners.update(index.users_through_groups(im))
+
             # Check Materials
             for ma in d.materials:
                 # Cycles
                 if utils.cycles_exists():
-                    if ma and ma.node_tree and ma.node_tree.nodes:
-                        materials = []
-
-                        for nd in ma.node_tree.nodes:
-                            if nd and nd.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'}:
-                                materials.append(nd)
-
-                            if nd and nd.type == 'GROUP':
-                                if nd.node_tree and nd.node_tree.nodes:
-                                    for ng in nd.node_tree.nodes:
-                                        if ng.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'}:
-                                            materials.append(ng)
-
-                            for no in materials:
-                                if no.image and no.image.name == x:
-                                    objects = []
-
-                                    for ob in d.objects:
-                                        if ma.name in ob.material_slots:
-                                            objects.append(ob.name)
-                                    links = False
-
-                                    for o in no.outputs:
-                                        if o.links:
-                                            links = True
-
-                                    name = '"{0}" {1}{2}'.format(
-                                            ma.name,
-                                            'in object: {0}'.format(objects) if objects else ' (unassigned)',
-                                            '' if links else ' (unconnected)')
+                    if ma in owners and ma.node_tree:
+                        for no in iter_tree_nodes(ma.node_tree):
+                            if no.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'} and \
+                                    no.image and no.image.name == x:
+                                objects = [ob.name for ob in index.objects_using_material(ma)]
+                                links = any(o.links for o in no.outputs)
+
+                                name = '"{0}" {1}{2}'.format(
+                                        ma.name,
+                                        'in object: {0}'.format(objects) if objects else ' (unassigned)',
+                                        '' if links else ' (unconnected)')
 
-                                    if name not in AMTH_store_data.users['MATERIAL']:
-                                        AMTH_store_data.users['MATERIAL'].append(name)
+                                if name not in AMTH_store_data.users['MATERIAL']:
+                                    AMTH_store_data.users['MATERIAL'].append(name)
 
             # Check Lights
             for la in d.lights:
                 # Cycles
                 if utils.cycles_exists():
-                    if la and la.node_tree and la.node_tree.nodes:
-                        for no in la.node_tree.nodes:
-                            if no and \
-                                   no.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'} and \
-                                   no.image and no.image.name == x:
+                    if la in owners and la.node_tree:
+                        for no in iter_tree_nodes(la.node_tree):
+                            if no.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'} and \
+                                    no.image and no.image.name == x:
                                 if la.name not in AMTH_store_data.users['LIGHT']:
                                     AMTH_store_data.users['LIGHT'].append(la.name)
 
@@ -650,25 +743,27 @@ class AMTH_SCENE_OT_list_users_for_x(Operator):
             for wo in d.worlds:
                 # Cycles
                 if utils.cycles_exists():
-                    if wo and wo.node_tree and wo.node_tree.nodes:
-                        for no in wo.node_tree.nodes:
-                            if no and \
-                                   no.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'} and \
-                                   no.image and no.image.name == x:
+                    if wo in owners and wo.node_tree:
+                        for no in iter_tree_nodes(wo.node_tree):
+                            if no.type in {'TEX_IMAGE', 'TEX_ENVIRONMENT'} and \
+                                    no.image and no.image.name == x:
                                 if wo.name not in AMTH_store_data.users['WORLD']:
                                     AMTH_store_data.users['WORLD'].append(wo.name)
 
             # Check Textures
             for te in d.textures:
-                if te and te.type == 'IMAGE' and te.image:
+                if te in owners and te.type == 'IMAGE' and te.image:
                     name = te.image.name
 
                     if name == x and \
                             name not in AMTH_store_data.users['TEXTURE']:
                         AMTH_store_data.users['TEXTURE'].append(te.name)
 
-            # Check Modifiers in Objects
             for ob in d.objects:
+                if ob not in owners and ob.data not in owners:
+                    continue
+
+                # Check Modifiers in Objects
                 for mo in ob.modifiers:
                     if mo.type in {'UV_PROJECT'}:
                         image = mo.image
@@ -678,9 +773,8 @@ class AMTH_SCENE_OT_list_users_for_x(Operator):
                             if name not in AMTH_store_data.users['MODIFIER']:
                                 AMTH_store_data.users['MODIFIER'].append(name)
 
-            # Check Background Images in Cameras
-            for ob in d.objects:
-                if ob and ob.type == 'CAMERA' and ob.data.background_images:
+                # Check Background Images in Cameras
+                if ob.type == 'CAMERA' and ob.data.background_images:
                     for bg in ob.data.background_images:
                         image = bg.image
 
@@ -690,9 +784,8 @@ class AMTH_SCENE_OT_list_users_for_x(Operator):
                             if name not in AMTH_store_data.users['OUTLINER_OB_CAMERA']:
                                 AMTH_store_data.users['OUTLINER_OB_CAMERA'].append(name)
 
-            # Check Empties type Image
-            for ob in d.objects:
-                if ob and ob.type == 'EMPTY' and ob.image_user:
+                # Check Empties type Image
+                if ob.type == 'EMPTY' and ob.image_user:
                     if ob.image_user.id_data.data:
                         image = ob.image_user.id_data.data
 
@@ -704,77 +797,51 @@ class AMTH_SCENE_OT_list_users_for_x(Operator):
 
             # Check the Compositor
             for sce in d.scenes:
-                if sce.node_tree and sce.node_tree.nodes:
-                    nodes = []
-                    for nd in sce.node_tree.nodes:
-                        if nd.type == 'IMAGE':
-                            nodes.append(nd)
-                        elif nd.type == 'GROUP':
-                            if nd.node_tree and nd.node_tree.nodes:
-                                for ng in nd.node_tree.nodes:
-                                    if ng.type == 'IMAGE':
-                                        nodes.append(ng)
-
-                        for no in nodes:
-                            if no.image and no.image.name == x:
-                                links = False
-
-                                for o in no.outputs:
-                                    if o.links:
-                                        links = True
-
-                                name = 'Node {0} in Compositor (Scene "{1}"){2}'.format(
-                                        no.name,
-                                        sce.name,
-                                        '' if links else ' (unconnected)')
-
-                                if name not in AMTH_store_data.users['NODETREE']:
-                                    AMTH_store_data.users['NODETREE'].append(name)
+                if sce in owners and sce.node_tree:
+                    for no in iter_tree_nodes(sce.node_tree):
+                        if no.type == 'IMAGE' and no.image and no.image.name == x:
+                            links = any(o.links for o in no.outputs)
+
+                            name = 'Node {0} in Compositor (Scene "{1}"){2}'.format(
+                                    no.name,
+                                    sce.name,
+                                    '' if links else ' (unconnected)')
+
+                            if name not in AMTH_store_data.users['NODETREE']:
+                                AMTH_store_data.users['NODETREE'].append(name)
         # MATERIAL TYPE
         if dtype == 'MATERIAL':
-            # Check Materials - Note: build an object_check list as only strings are stored
-            object_check = [d.objects[names] for names in AMTH_store_data.users['OBJECT_DATA'] if
-                            names in d.objects]
-            for ob in d.objects:
-                for ma in ob.material_slots:
-                    if ma.name == x:
-                        if ma not in object_check:
-                            AMTH_store_data.users['OBJECT_DATA'].append(ob.name)
+            for ma in d.materials:
+                if ma.name != x:
+                    continue
+
+                for ob in index.objects_using_material(ma):
+                    if ob.name not in AMTH_store_data.users['OBJECT_DATA']:
+                        AMTH_store_data.users['OBJECT_DATA'].append(ob.name)
 
-                        if ob.library:
-                            AMTH_store_data.libraries.append(ob.library.filepath)
+                    if ob.library:
+                        AMTH_store_data.libraries.append(ob.library.filepath)
         # VERTEX COLOR TYPE
         elif dtype == 'GROUP_VCOL':
             # Check VCOL in Meshes
-            for ob in bpy.data.objects:
-                if ob.type == 'MESH':
-                    for v in ob.data.vertex_colors:
-                        if v.name == x:
-                            name = '{0}'.format(ob.name)
+            for ob in index.objects_with_vcol(x):
+                name = '{0}'.format(ob.name)
 
-                            if name not in AMTH_store_data.users['MESH_DATA']:
-                                AMTH_store_data.users['MESH_DATA'].append(name)
+                if name not in AMTH_store_data.users['MESH_DATA']:
+                    AMTH_store_data.users['MESH_DATA'].append(name)
             # Check VCOL in Materials
-            for ma in d.materials:
-                # Cycles
-                if utils.cycles_exists():
-                    if ma and ma.node_tree and ma.node_tree.nodes:
-                        for no in ma.node_tree.nodes:
-                            if no and no.type in {'ATTRIBUTE'}:
-                                if no.attribute_name == x:
-                                    objects = []
-
-                                    for ob in d.objects:
-                                        if ma.name in ob.material_slots:
-                                            objects.append(ob.name)
-
-                                    if objects:
-                                        name = '{0} in object: {1}'.format(ma.name, objects)
-                                    else:
-                                        name = '{0} (unassigned)'.format(ma.name)
+            # Cycles
+            if utils.cycles_exists():
+                for ma in index.materials_using_attribute(x):
+                    objects = [ob.name for ob in index.objects_using_material(ma)]
+
+                    if objects:
+                        name = '{0} in object: {1}'.format(ma.name, objects)
+                    else:
+                        name = '{0} (unassigned)'.format(ma.name)
 
-                                    if name not in AMTH_store_data.users['MATERIAL']:
-                                        AMTH_store_data.users['MATERIAL'].append(name)
+                    if name not in AMTH_store_data.users['MATERIAL']:
+                        AMTH_store_data.users['MATERIAL'].append(name)
 
         AMTH_store_data.libraries = sorted(list(set(AMTH_store_data.libraries)))
 
@@ -1267,11 +1334,12 @@ def fill_missing_images_props(context, refresh=False):
             index = image_state.find(key)
             if index != -1:
                 image_state.remove(index)
+        AMTH_datablock_index.clear()
 
     for im in bpy.data.images:
         if im.type not in ("UV_TEST", "RENDER_RESULT", "COMPOSITING"):
             if not im.packed_file and \
-                    not os.path.exists(bpy.path.abspath(im.filepath, library=im.library)):
+                    not AMTH_datablock_index.image_path_exists(im):
                 text_l = "{}{} [{}]{}".format("[L] " if im.library else "", im.name,
                     im.users, " [F]" if im.use_fake_user else "")
                 prop = image_state.add()
@@ -1370,10 +1438,18 @@ def register():
             type=AMTH_MissingImagesStateProp
             )
 
+    bpy.app.handlers.depsgraph_update_post.append(amth_datablock_index_clear)
+    bpy.app.handlers.load_post.append(amth_datablock_index_clear)
+
 
 def unregister():
     clear()
 
+    for handler in (bpy.app.handlers.depsgraph_update_post, bpy.app.handlers.load_post):
+        if amth_datablock_index_clear in handler:
+            handler.remove(amth_datablock_index_clear)
+    AMTH_datablock_index.clear()
+
     for cls in classes:
         bpy.utils.unregister_class(cls)
 
@@ -21,11 +21,13 @@ if "bpy" in locals():
     importlib.reload(mesh_ant_displace)
     importlib.reload(ant_functions)
     importlib.reload(ant_noise)
+    importlib.reload(ant_noise_batch)
 else:
     from ant_landscape import add_mesh_ant_landscape
     from ant_landscape import mesh_ant_displace
     from ant_landscape import ant_functions
     from ant_landscape import ant_noise
+    from ant_landscape import ant_noise_batch
 
 import bpy
 
@@ -174,6 +176,7 @@ class AntNoiseSettingsPanel(bpy.types.Panel):
             box.prop_search(ant, "texture_block", bpy.data, "textures")
         else:
             box.prop(ant, "basis_type")
+        box.prop(ant, "fast_noise", toggle=True)
 
         col = box.column(align=True)
         col.prop(ant, "random_seed")
@@ -888,6 +891,12 @@ class AntLandscapePropertiesGroup(bpy.types.PropertyGroup):
         default=False,
         description="Remove doubles"
     )
+    fast_noise: BoolProperty(
+        name="Fast Noise",
+        default=False,
+        description="Evaluate the noise with NumPy noise bases, much faster on big grids. "
+                    "The noise looks alike, but differs from the default noise"
+    )
     refresh: BoolProperty(
         name="Refresh",
         default=False,
@@ -528,6 +528,12 @@ class AntAddLandscape(bpy.types.Operator):
         default=False,
         description="Remove doubles"
     )
+    fast_noise: BoolProperty(
+        name="Fast Noise",
+        default=False,
+        description="Evaluate the noise with NumPy noise bases, much faster on big grids. "
+                    "The noise looks alike, but differs from the default noise"
+    )
     show_main_settings: BoolProperty(
         name="Main Settings",
         default=True,
@@ -651,7 +657,8 @@ class AntAddLandscape(bpy.types.Operator):
             self.fx_loc_y,
             self.fx_height,
             self.fx_offset,
-            self.fx_invert
+            self.fx_invert,
+            self.fast_noise
         ]
 
         scene = context.scene
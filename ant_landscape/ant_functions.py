@@ -19,12 +19,13 @@ from bpy.props import (
 from math import (
     sin, cos, pi,
 )
-from .ant_noise import noise_gen
+import numpy as np
+from .ant_noise_batch import noise_gen_batch
 
 # ------------------------------------------------------------
 # Create a new mesh (object) from verts/edges/faces.
-# verts/edges/faces ... List of vertices/edges/faces for the
-#                    new mesh (as used in from_pydata).
+# verts/edges/faces ... Array of vertex coordinates and array of
+#                    faces (vertex indices, same number for each face).
 # name ... Name of the new mesh (& object)
 
 from bpy_extras import object_utils
@@ -33,77 +34,70 @@ from bpy_extras import object_utils
 def create_mesh_object(context, verts, edges, faces, name):
     # Create new mesh
     mesh = bpy.data.meshes.new(name)
-    # Make a mesh from a list of verts/edges/faces.
-    mesh.from_pydata(verts, [], faces)
+    # Fill the mesh with all verts/faces at once.
+    verts = np.asarray(verts, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int32)
+    num_verts = len(verts)
+    num_faces, face_size = faces.shape
+    mesh.vertices.add(num_verts)
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(num_faces * face_size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(num_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, num_faces * face_size, face_size, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(num_faces, face_size, dtype=np.int32))
     # Update mesh geometry after adding stuff.
-    mesh.update()
+    mesh.update(calc_edges=True)
     return object_utils.object_data_add(context, mesh, operator=None)
 
 
+def quad_faces(A, B, C, D, tri):
+    # Faces from the corner index arrays of quads
+    if not tri:
+        return np.stack((A, B, C, D), axis=-1).reshape(-1, 4)
+    else:
+        return np.stack((np.stack((A, B, D), axis=-1), np.stack((B, C, D), axis=-1)), axis=-2).reshape(-1, 3)
+
+
 # Generate XY Grid
 def grid_gen(sub_d_x, sub_d_y, tri, meshsize_x, meshsize_y, props, water_plane, water_level):
-    verts = []
-    faces = []
-    vappend = verts.append
-    fappend = faces.append
-    for i in range(0, sub_d_x):
-        x = meshsize_x * (i / (sub_d_x - 1) - 1 / 2)
-        for j in range(0, sub_d_y):
-            y = meshsize_y * (j / (sub_d_y - 1) - 1 / 2)
-            if not water_plane:
-                z = noise_gen((x, y, 0), props)
-            else:
-                z = water_level
-            vappend((x, y, z))
-
-            if i > 0 and j > 0:
-                A = i * sub_d_y + (j - 1)
-                B = i * sub_d_y + j
-                C = (i - 1) * sub_d_y + j
-                D = (i - 1) * sub_d_y + (j - 1)
-                if not tri:
-                    fappend((A, B, C, D))
-                else:
-                    fappend((A, B, D))
-                    fappend((B, C, D))
+    x = meshsize_x * (np.arange(sub_d_x) / (sub_d_x - 1) - 1 / 2)
+    y = meshsize_y * (np.arange(sub_d_y) / (sub_d_y - 1) - 1 / 2)
+    x, y = np.meshgrid(x, y, indexing='ij')
+    if not water_plane:
+        z = noise_gen_batch(x, y, 0, props)
+    else:
+        z = np.full_like(x, water_level)
+    verts = np.stack((x, y, z), axis=-1).reshape(-1, 3)
+
+    i, j = np.meshgrid(np.arange(1, sub_d_x), np.arange(1, sub_d_y), indexing='ij')
+    A = i * sub_d_y + (j - 1)
+    B = i * sub_d_y + j
+    C = (i - 1) * sub_d_y + j
+    D = (i - 1) * sub_d_y + (j - 1)
+    faces = quad_faces(A.ravel(), B.ravel(), C.ravel(), D.ravel(), tri)
 
     return verts, faces
 
 
 # Generate UV Sphere
 def sphere_gen(sub_d_x, sub_d_y, tri, meshsize, props, water_plane, water_level):
-    verts = []
-    faces = []
-    vappend = verts.append
-    fappend = faces.append
     sub_d_x += 1
     sub_d_y += 1
-    for i in range(0, sub_d_x):
-        for j in range(0, sub_d_y):
-            u = sin(j * pi * 2 / (sub_d_y - 1)) * cos(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
-            v = cos(j * pi * 2 / (sub_d_y - 1)) * cos(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
-            w = sin(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
-            if water_plane:
-                h = water_level
-            else:
-                h = noise_gen((u, v, w), props) / meshsize
-            vappend(((u + u * h), (v + v * h), (w + w * h)))
-
-    count = 0
-    for i in range(0, sub_d_y * (sub_d_x - 1)):
-        if count < sub_d_y - 1:
-            A = i + 1
-            B = i
-            C = (i + sub_d_y)
-            D = (i + sub_d_y) + 1
-            if tri:
-                fappend((A, B, D))
-                fappend((B, C, D))
-            else:
-                fappend((A, B, C, D))
-            count = count + 1
-        else:
-            count = 0
+    i, j = np.meshgrid(np.arange(sub_d_x), np.arange(sub_d_y), indexing='ij')
+    u = np.sin(j * pi * 2 / (sub_d_y - 1)) * np.cos(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
+    v = np.cos(j * pi * 2 / (sub_d_y - 1)) * np.cos(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
+    w = np.sin(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
+    if water_plane:
+        h = water_level
+    else:
+        h = noise_gen_batch(u, v, w, props) / meshsize
+    verts = np.stack(((u + u * h), (v + v * h), (w + w * h)), axis=-1).reshape(-1, 3)
+
+    # skip the last vertex of each ring
+    i = np.arange(sub_d_y * (sub_d_x - 1))
+    i = i[i % sub_d_y < sub_d_y - 1]
+    faces = quad_faces(i + 1, i, i + sub_d_y, i + sub_d_y + 1, tri)
 
     return verts, faces
 
@@ -138,18 +132,19 @@ class AntLandscapeRefresh(bpy.types.Operator):
             # redraw verts
             mesh = obj.data
 
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", co)
+            co = co.reshape(-1, 3)
             if ob['vert_group'] != "" and ob['vert_group'] in obj.vertex_groups:
                 vertex_group = obj.vertex_groups[ob['vert_group']]
                 gi = vertex_group.index
-                for v in mesh.vertices:
-                    for g in v.groups:
-                        if g.group == gi:
-                            v.co[2] = 0.0
-                            v.co[2] = vertex_group.weight(v.index) * noise_gen(v.co, prop)
+                weights = {v.index: g.weight for v in mesh.vertices for g in v.groups if g.group == gi}
+                index = np.fromiter(weights.keys(), dtype=np.int64, count=len(weights))
+                weight = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+                co[index, 2] = weight * noise_gen_batch(co[index, 0], co[index, 1], 0.0, prop)
             else:
-                for v in mesh.vertices:
-                    v.co[2] = 0.0
-                    v.co[2] = noise_gen(v.co, prop)
+                co[:, 2] = noise_gen_batch(co[:, 0], co[:, 1], 0.0, prop)
+            mesh.vertices.foreach_set("co", co.ravel())
             mesh.update()
         else:
             pass
@@ -442,6 +437,8 @@ def draw_ant_noise(self, context, generate=True):
             box.prop_search(self, "texture_block", bpy.data, "textures")
         else:
             box.prop(self, "basis_type")
+        if generate:
+            box.prop(self, "fast_noise", toggle=True)
 
         col = box.column(align=True)
         col.prop(self, "random_seed")
@@ -727,6 +724,7 @@ def store_properties(operator, ob):
     ob.ant_landscape.fx_height = operator.fx_height
     ob.ant_landscape.fx_offset = operator.fx_offset
     ob.ant_landscape.fx_invert = operator.fx_invert
+    ob.ant_landscape.fast_noise = operator.fast_noise
     return ob
 
 
@@ -868,6 +866,13 @@ class Eroder(bpy.types.Operator):
         description="Use numexpr module (if available)",
         default=True
     )
+    threads: IntProperty(
+        name="Threads",
+        description="Number of threads eroding tiles of the grid in parallel",
+        default=1,
+        min=1,
+        soft_max=64
+    )
     Pd: FloatProperty(
         name="Diffusion Amount",
         description="Diffusion probability",
@@ -937,6 +942,7 @@ class Eroder(bpy.types.Operator):
             index_to_name[ob.vertex_groups[name].index] = name
 
         g = Grid.fromBlenderMesh(oldMesh, ob.vertex_groups['rainmap'], self.Ef)
+        g.settiling(None, self.threads)
 
         self.counts['diffuse'] = 0
         self.counts['avalanche'] = 0
@@ -974,6 +980,7 @@ class Eroder(bpy.types.Operator):
                 g.fluvial_erosion(self.Kr, self.Kv, self.userainmap, self.Kc, self.Ks,
                                   self.Kz * 50, self.Ka, 0, 0, 0, 0, self.numexpr)
                 self.counts['water'] += 1
+        g.close()
 
         newMesh = bpy.data.meshes.new(oldMesh.name)
         g.toBlenderMesh(newMesh)
@@ -1042,4 +1049,5 @@ class Eroder(bpy.types.Operator):
 
         col.prop(self, 'Ef')
 
+        layout.prop(self, 'threads')
         layout.prop(self, 'smooth')
@@ -0,0 +1,907 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Another Noise Tool - Batched Noise and Effects
+# Evaluates the landscape height field for whole arrays of coordinates at once,
+# the array counterpart of ant_noise.noise_gen
+
+import bpy
+import numpy as np
+from mathutils import noise as mathutils_noise
+from mathutils.noise import (
+    seed_set,
+    random_unit_vector,
+)
+from math import pi
+
+from . import ant_noise
+
+
+# ------------------------------------------------------------
+# Noise providers:
+# Both providers offer the mathutils.noise functions used by A.N.T.,
+# taking and returning arrays instead of single coordinates.
+
+
+class MathutilsNoise:
+    """
+    Calls mathutils.noise for each coordinate: the exact A.N.T. noise,
+    only the arithmetic around the noise calls is vectorized.
+    """
+
+    @staticmethod
+    def _map(func, x, y, z, *args, **kwargs):
+        coords = zip(x.tolist(), y.tolist(), z.tolist())
+        return np.fromiter((func(co, *args, **kwargs) for co in coords), dtype=np.float64, count=len(x))
+
+    @staticmethod
+    def _map_vector(func, x, y, z, *args, **kwargs):
+        coords = zip(x.tolist(), y.tolist(), z.tolist())
+        v = np.empty((len(x), 3))
+        for i, co in enumerate(coords):
+            v[i] = func(co, *args, **kwargs)
+        return v[:, 0], v[:, 1], v[:, 2]
+
+    def noise(self, x, y, z, basis='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.noise, x, y, z, noise_basis=basis)
+
+    def turbulence(self, x, y, z, octaves, hard, basis='PERLIN_ORIGINAL', amp=0.5, freq=2.0):
+        return self._map(mathutils_noise.turbulence, x, y, z, octaves, hard, noise_basis=basis,
+                         amplitude_scale=amp, frequency_scale=freq)
+
+    def turbulence_vector(self, x, y, z, octaves, hard, basis='PERLIN_ORIGINAL', amp=0.5, freq=2.0):
+        return self._map_vector(mathutils_noise.turbulence_vector, x, y, z, octaves, hard, noise_basis=basis,
+                                amplitude_scale=amp, frequency_scale=freq)
+
+    def fractal(self, x, y, z, H, lacunarity, octaves, basis='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.fractal, x, y, z, H, lacunarity, octaves, noise_basis=basis)
+
+    def multi_fractal(self, x, y, z, H, lacunarity, octaves, basis='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.multi_fractal, x, y, z, H, lacunarity, octaves, noise_basis=basis)
+
+    def hetero_terrain(self, x, y, z, H, lacunarity, octaves, offset, basis='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.hetero_terrain, x, y, z, H, lacunarity, octaves, offset,
+                         noise_basis=basis)
+
+    def hybrid_multi_fractal(self, x, y, z, H, lacunarity, octaves, offset, gain, basis='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.hybrid_multi_fractal, x, y, z, H, lacunarity, octaves, offset, gain,
+                         noise_basis=basis)
+
+    def ridged_multi_fractal(self, x, y, z, H, lacunarity, octaves, offset, gain, basis='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.ridged_multi_fractal, x, y, z, H, lacunarity, octaves, offset, gain,
+                         noise_basis=basis)
+
+    def variable_lacunarity(self, x, y, z, distortion, basis1='PERLIN_ORIGINAL', basis2='PERLIN_ORIGINAL'):
+        return self._map(mathutils_noise.variable_lacunarity, x, y, z, distortion,
+                         noise_type1=basis1, noise_type2=basis2)
+
+    def voronoi_f1_squared(self, x, y, z):
+        return self._map(lambda co: mathutils_noise.voronoi(co, distance_metric='DISTANCE_SQUARED')[0][0], x, y, z)
+
+
+# Offsets of the three noise evaluations of a noise vector, as in mathutils
+VECTOR_OFFSETS = (
+    (0.0, 0.0, 0.0),
+    (13.5, 13.5, 13.5),
+    (-13.5, -13.5, -13.5),
+)
+
+BASIS_SEEDS = {basis[0]: basis[3] for basis in ant_noise.noise_basis}
+
+
+def _hash(ix, iy, iz, seed):
+    # Integer hash of lattice cells (uint32 arithmetic, wrapping)
+    h = ix.astype(np.uint32) * np.uint32(0x8da6b343)
+    h ^= iy.astype(np.uint32) * np.uint32(0xd8163841)
+    h ^= iz.astype(np.uint32) * np.uint32(0xcb1ab31f)
+    h ^= np.uint32(seed * 0x9e3779b9 & 0xffffffff)
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x7feb352d)
+    h ^= h >> np.uint32(15)
+    h *= np.uint32(0x846ca68b)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+def _unit(h):
+    # Hash to [0, 1)
+    return (h >> np.uint32(8)).astype(np.float64) * (1.0 / (1 << 24))
+
+
+def _rehash(h):
+    h = h * np.uint32(0x2c1b3c6d)
+    h ^= h >> np.uint32(12)
+    h *= np.uint32(0x297a2d39)
+    h ^= h >> np.uint32(15)
+    return h
+
+
+def _lattice(x, y, z):
+    fx, fy, fz = np.floor(x), np.floor(y), np.floor(z)
+    return (fx.astype(np.int64), fy.astype(np.int64), fz.astype(np.int64)), (x - fx, y - fy, z - fz)
+
+
+def _gradient_noise(x, y, z, seed):
+    # Improved Perlin noise, signed
+    (ix, iy, iz), (tx, ty, tz) = _lattice(x, y, z)
+    u = tx * tx * tx * (tx * (tx * 6.0 - 15.0) + 10.0)
+    v = ty * ty * ty * (ty * (ty * 6.0 - 15.0) + 10.0)
+    w = tz * tz * tz * (tz * (tz * 6.0 - 15.0) + 10.0)
+    result = np.zeros_like(x)
+    for dx in (0, 1):
+        for dy in (0, 1):
+            for dz in (0, 1):
+                h = _hash(ix + dx, iy + dy, iz + dz, seed) & np.uint32(15)
+                gx, gy, gz = tx - dx, ty - dy, tz - dz
+                a = np.where(h < 8, gx, gy)
+                b = np.where(h < 4, gy, np.where((h == 12) | (h == 14), gx, gz))
+                grad = np.where(h & np.uint32(1), -a, a) + np.where(h & np.uint32(2), -b, b)
+                weight = (u if dx else 1.0 - u) * (v if dy else 1.0 - v) * (w if dz else 1.0 - w)
+                result += weight * grad
+    return result
+
+
+def _voronoi(x, y, z, seed, squared=False):
+    # Distances to the four nearest feature points, one jittered point per lattice cell
+    (ix, iy, iz), (tx, ty, tz) = _lattice(x, y, z)
+    da = np.full((4,) + x.shape, np.inf)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                h = _hash(ix + dx, iy + dy, iz + dz, seed)
+                px = dx + _unit(h) - tx
+                h = _rehash(h)
+                py = dy + _unit(h) - ty
+                h = _rehash(h)
+                pz = dz + _unit(h) - tz
+                d = px * px + py * py + pz * pz
+                if not squared:
+                    d = np.sqrt(d)
+                # keep the four smallest distances sorted
+                for k in range(4):
+                    smaller = np.minimum(da[k], d)
+                    d = np.maximum(da[k], d)
+                    da[k] = smaller
+    return da
+
+
+def _cell_noise(x, y, z, seed):
+    (ix, iy, iz), _ = _lattice(x, y, z)
+    return _unit(_hash(ix, iy, iz, seed))
+
+
+class NumpyNoise:
+    """
+    Noise bases evaluated with NumPy for all coordinates at once.
+    Same bases, fractals and ranges as mathutils.noise, but not the same patterns.
+    """
+
+    @staticmethod
+    def basis(x, y, z, basis):
+        """Unsigned noise basis, in [0, 1]."""
+        seed = BASIS_SEEDS.get(basis, 0)
+        if basis == 'CELLNOISE':
+            return _cell_noise(x, y, z, seed)
+        if basis.startswith('VORONOI'):
+            da = _voronoi(x, y, z, seed)
+            if basis == 'VORONOI_F2':
+                return da[1]
+            elif basis == 'VORONOI_F3':
+                return da[2]
+            elif basis == 'VORONOI_F4':
+                return da[3]
+            elif basis == 'VORONOI_F2F1':
+                return da[1] - da[0]
+            elif basis == 'VORONOI_CRACKLE':
+                return np.minimum(10.0 * (da[1] - da[0]), 1.0)
+            return da[0]
+        return 0.5 + 0.5 * _gradient_noise(x, y, z, seed)
+
+    def signed(self, x, y, z, basis):
+        return 2.0 * self.basis(x, y, z, basis) - 1.0
+
+    def noise(self, x, y, z, basis='PERLIN_ORIGINAL'):
+        return self.signed(x, y, z, basis)
+
+    def _noise_vector(self, x, y, z, basis):
+        return [self.signed(x + ox, y + oy, z + oz, basis) for ox, oy, oz in VECTOR_OFFSETS]
+
+    def turbulence(self, x, y, z, octaves, hard, basis='PERLIN_ORIGINAL', amp=0.5, freq=2.0):
+        out = self.signed(x, y, z, basis)
+        if hard:
+            out = np.abs(out)
+        a = 1.0
+        for i in range(1, octaves):
+            a *= amp
+            x, y, z = x * freq, y * freq, z * freq
+            t = self.signed(x, y, z, basis)
+            if hard:
+                t = np.abs(t)
+            out += a * t
+        return out
+
+    def turbulence_vector(self, x, y, z, octaves, hard, basis='PERLIN_ORIGINAL', amp=0.5, freq=2.0):
+        v = self._noise_vector(x, y, z, basis)
+        if hard:
+            v = [np.abs(c) for c in v]
+        a = 1.0
+        for i in range(1, octaves):
+            a *= amp
+            x, y, z = x * freq, y * freq, z * freq
+            t = self._noise_vector(x, y, z, basis)
+            for j in range(3):
+                v[j] = v[j] + a * (np.abs(t[j]) if hard else t[j])
+        return v[0], v[1], v[2]
+
+    def fractal(self, x, y, z, H, lacunarity, octaves, basis='PERLIN_ORIGINAL'):
+        pw_hl = lacunarity ** -H
+        pwr = 1.0
+        value = np.zeros_like(x)
+        for i in range(int(octaves)):
+            value += self.signed(x, y, z, basis) * pwr
+            pwr *= pw_hl
+            x, y, z = x * lacunarity, y * lacunarity, z * lacunarity
+        rmd = octaves - int(octaves)
+        if rmd != 0.0:
+            value += rmd * self.signed(x, y, z, basis) * pwr
+        return value
+
+    def multi_fractal(self, x, y, z, H, lacunarity, octaves, basis='PERLIN_ORIGINAL'):
+        pw_hl = lacunarity ** -H
+        pwr = 1.0
+        value = np.ones_like(x)
+        for i in range(int(octaves)):
+            value *= pwr * self.signed(x, y, z, basis) + 1.0
+            pwr *= pw_hl
+            x, y, z = x * lacunarity, y * lacunarity, z * lacunarity
+        rmd = octaves - int(octaves)
+        if rmd != 0.0:
+            value *= rmd * self.signed(x, y, z, basis) * pwr + 1.0
+        return value
+
+    def hetero_terrain(self, x, y, z, H, lacunarity, octaves, offset, basis='PERLIN_ORIGINAL'):
+        pw_hl = lacunarity ** -H
+        pwr = pw_hl
+        value = offset + self.signed(x, y, z, basis)
+        x, y, z = x * lacunarity, y * lacunarity, z * lacunarity
+        for i in range(1, int(octaves)):
+            value += (self.signed(x, y, z, basis) + offset) * pwr * value
+            pwr *= pw_hl
+            x, y, z = x * lacunarity, y * lacunarity, z * lacunarity
+        rmd = octaves - int(octaves)
+        if rmd != 0.0:
+            value += rmd * (self.signed(x, y, z, basis) + offset) * pwr * value
+        return value
+
+    def hybrid_multi_fractal(self, x, y, z, H, lacunarity, octaves, offset, gain, basis='PERLIN_ORIGINAL'):
+        pw_hl = lacunarity ** -H
+        pwr = np.full_like(x, pw_hl)
+        result = self.signed(x, y, z, basis) + offset
+        weight = gain * result
+        x, y, z = x * lacunarity, y * lacunarity, z * lacunarity
+        # points stop adding octaves once their weight vanishes
+        active = weight > 0.001
+        for i in range(1, int(octaves)):
+            if not active.any():
+                break
+            weight = np.minimum(weight, 1.0)
+            signal = (self.signed(x, y, z, basis) + offset) * pwr
+            result = np.where(active, result + weight * signal, result)
+            weight = np.where(active, weight * gain * signal, weight)
+            pwr = np.where(active, pwr * pw_hl, pwr)
+            x = np.where(active, x * lacunarity, x)
+            y = np.where(active, y * lacunarity, y)
+            z = np.where(active, z * lacunarity, z)
+            active &= weight > 0.001
+        rmd = octaves - int(octaves)
+        if rmd != 0.0:
+            result += rmd * (self.signed(x, y, z, basis) + offset) * pwr
+        return result
+
+    def ridged_multi_fractal(self, x, y, z, H, lacunarity, octaves, offset, gain, basis='PERLIN_ORIGINAL'):
+        pw_hl = lacunarity ** -H
+        pwr = pw_hl
+        signal = offset - np.abs(self.signed(x, y, z, basis))
+        signal *= signal
+        result = signal
+        for i in range(1, int(octaves)):
+            x, y, z = x * lacunarity, y * lacunarity, z * lacunarity
+            weight = np.clip(signal * gain, 0.0, 1.0)
+            signal = offset - np.abs(self.signed(x, y, z, basis))
+            signal = signal * signal * weight
+            result = result + signal * pwr
+            pwr *= pw_hl
+        return result
+
+    def variable_lacunarity(self, x, y, z, distortion, basis1='PERLIN_ORIGINAL', basis2='PERLIN_ORIGINAL'):
+        rx = self.signed(x + 13.5, y + 13.5, z + 13.5, basis1) * distortion
+        ry = self.signed(x, y, z, basis1) * distortion
+        rz = self.signed(x - 13.5, y - 13.5, z - 13.5, basis1) * distortion
+        return self.signed(x + rx, y + ry, z + rz, basis2)
+
+    def voronoi_f1_squared(self, x, y, z):
+        return _voronoi(x, y, z, 0, squared=True)[0]
+
+
+# ------------------------------------------------------------
+# Functions for marble_noise and effects:
+
+def sin_bias(a):
+    return 0.5 + 0.5 * np.sin(a)
+
+
+def cos_bias(a):
+    return 0.5 + 0.5 * np.cos(a)
+
+
+def tri_bias(a):
+    b = 2 * pi
+    return 1 - 2 * np.abs(np.floor((a * (1 / b)) + 0.5) - (a * (1 / b)))
+
+
+def saw_bias(a):
+    b = 2 * pi
+    a = a - np.trunc(a / b) * b
+    return np.where(a < 0, a + b, a) / b
+
+
+def no_bias(a):
+    return a
+
+
+def soft(a):
+    return a
+
+
+def sharp(a):
+    return np.sqrt(a)
+
+
+def sharper(a):
+    return sharp(sharp(a))
+
+
+Bias_Types = [sin_bias, cos_bias, tri_bias, saw_bias, no_bias]
+
+
+def shapes(x, y, z, shape=0):
+    p = pi
+    if shape == 1:
+        # ring
+        x = x * p
+        y = y * p
+        s = np.cos(x**2 + y**2) / (x**2 + y**2 + 0.5)
+    elif shape == 2:
+        # swirl
+        x = x * p
+        y = y * p
+        s = ((x * np.sin(x * x + y * y) + y * np.cos(x * x + y * y)) / (x**2 + y**2 + 0.5))
+    elif shape == 3:
+        # bumps
+        x = x * p
+        y = y * p
+        z = z * p
+        s = 1 - ((np.cos(x * p) + np.cos(y * p) + np.cos(z * p)) - 0.5)
+    elif shape == 4:
+        # wave
+        x = x * p * 2
+        y = y * p * 2
+        s = np.sin(x + np.sin(y))
+    elif shape == 5:
+        # z grad.
+        s = (z * p)
+    elif shape == 6:
+        # y grad.
+        s = (y * p)
+    elif shape == 7:
+        # x grad.
+        s = (x * p)
+    else:
+        # marble default
+        s = ((x + y + z) * 5)
+    return s
+
+
+# ------------------------------------------------------------
+# Noise types, see ant_noise for the single coordinate versions:
+
+def marble_noise(n, x, y, z, origin, size, shape, bias, sharpnes, turb, depth, hard, basis, amp, freq):
+    s = shapes(x, y, z, shape)
+    x = x + origin[0]
+    y = y + origin[1]
+    z = z + origin[2]
+    value = s + turb * n.turbulence_vector(x, y, z, depth, hard, basis)[1]
+
+    if bias == 1:
+        value = cos_bias(value)
+    elif bias == 2:
+        value = tri_bias(value)
+    elif bias == 3:
+        value = saw_bias(value)
+    else:
+        value = sin_bias(value)
+
+    if sharpnes == 1:
+        value = 1.0 - sharp(value)
+    elif sharpnes == 2:
+        value = 1.0 - sharper(value)
+    elif sharpnes == 3:
+        value = soft(value)
+    elif sharpnes == 4:
+        value = sharp(value)
+    elif sharpnes == 5:
+        value = sharper(value)
+    else:
+        value = 1.0 - soft(value)
+
+    return value
+
+
+def vlnTurbMode(n, x, y, z, distort, basis, vlbasis, hardnoise):
+    value = n.variable_lacunarity(x, y, z, distort, basis, vlbasis)
+    if hardnoise:
+        return np.abs(value)
+    return value
+
+
+def vl_noise_turbulence(n, x, y, z, distort, depth, basis, vlbasis, hardnoise, amp, freq):
+    value = vlnTurbMode(n, x, y, z, distort, basis, vlbasis, hardnoise)
+    for i in range(1, depth + 1):
+        value = value + vlnTurbMode(n, x * (freq * i), y * (freq * i), z * (freq * i),
+                                    distort, basis, vlbasis, hardnoise) * (amp * 0.5 / i)
+    return value
+
+
+def double_multiFractal(n, x, y, z, H, lacunarity, octaves, offset, gain, basis, vlbasis):
+    n1 = n.multi_fractal(x * 1.5 + 1, y * 1.5 + 1, z * 1.5 + 1, 1.0, 1.0, 1.0, basis) * (offset * 0.5)
+    n2 = n.multi_fractal(x - 1, y - 1, z - 1, H, lacunarity, octaves, vlbasis) * (gain * 0.5)
+    return (n1 * n1 + n2 * n2) * 0.5
+
+
+def distorted_heteroTerrain(n, x, y, z, H, lacunarity, octaves, offset, distort, basis, vlbasis):
+    h1 = n.hetero_terrain(x, y, z, 1.0, 2.0, 1.0, 1.0, basis) * 0.5
+    d = h1 * distort
+    h2 = n.hetero_terrain(x + d, y + d, z + d, H, lacunarity, octaves, offset, vlbasis) * 0.25
+    return (h1 * h1 + h2 * h2) * 0.5
+
+
+def slick_rock(n, x, y, z, H, lacunarity, octaves, offset, gain, distort, basis, vlbasis):
+    m = n.multi_fractal(x, y, z, 1.0, 2.0, 2.0, basis) * distort * 0.25
+    r = n.ridged_multi_fractal(x + m, y + m, z + m, H, lacunarity, octaves, offset + 0.1, gain * 2, vlbasis)
+    return (m + (m * r)) * 0.5
+
+
+def vl_hTerrain(n, x, y, z, H, lacunarity, octaves, offset, basis, vlbasis, distort):
+    ht = n.hetero_terrain(x, y, z, H, lacunarity, octaves, offset, basis) * 0.25
+    vl = ht * n.variable_lacunarity(x, y, z, distort, basis, vlbasis) * 0.5 + 0.5
+    return vl * ht
+
+
+def ant_turbulence(n, x, y, z, depth, hardnoise, nbasis, amp, freq, distortion):
+    t = n.turbulence_vector(x / 2, y / 2, z / 2, depth, 0, nbasis, amp, freq)
+    t = [c * 0.5 * distortion for c in t]
+    return n.turbulence(t[0], t[1], t[2], 2, hardnoise, 'VORONOI_F1') * 0.5 + 0.5
+
+
+def rocks_noise(n, x, y, z, depth, hardnoise, nbasis, distortion):
+    p = n.turbulence(x, y, z, 4, 0, 'BLENDER') * 0.125 * distortion
+    a = n.turbulence(x + p, y + p, z, 2, 0, 'VORONOI_F2F1')
+    pa = a * 0.1875 * distortion
+    b = n.turbulence(x, y, z + pa, depth, hardnoise, nbasis)
+    return ((a + 0.5 * (b - a)) * 0.5 + 0.5)
+
+
+def shattered_hterrain(n, x, y, z, H, lacunarity, octaves, offset, distort, basis):
+    d = (n.turbulence_vector(x, y, z, 6, 0)[0] * 0.5 + 0.5) * distort * 0.5
+    t1 = n.turbulence_vector(x + d, y + d, z + d, 0, 0, 'VORONOI_F2F1')[0] + 0.5
+    t2 = n.hetero_terrain(x * 2, y * 2, z * 2, H, lacunarity, octaves, offset, basis) * 0.5
+    return ((t1 * t2) + t2 * 0.5) * 0.5
+
+
+def strata_hterrain(n, x, y, z, H, lacunarity, octaves, offset, distort, basis):
+    value = n.hetero_terrain(x, y, z, H, lacunarity, octaves, offset, basis) * 0.5
+    steps = (np.sin(value * (distort * 5) * pi) * (0.1 / (distort * 5) * pi))
+    return (value * (1.0 - 0.5) + steps * 0.5)
+
+
+def planet_noise(n, x, y, z, oct=6, hard=0, noisebasis='PERLIN_ORIGINAL', nabla=0.001):
+    d = 0.001
+    offset = nabla * 1000
+    x = n.turbulence(x, y, z, oct, hard, noisebasis)
+    y = n.turbulence(x + offset, y, z, oct, hard, noisebasis)
+    z = n.turbulence(x, y + offset, z, oct, hard, noisebasis)
+    xdy = x - n.turbulence(x, y + d, z, oct, hard, noisebasis)
+    xdz = x - n.turbulence(x, y, z + d, oct, hard, noisebasis)
+    ydx = y - n.turbulence(x + d, y, z, oct, hard, noisebasis)
+    ydz = y - n.turbulence(x, y, z + d, oct, hard, noisebasis)
+    zdx = z - n.turbulence(x + d, y, z, oct, hard, noisebasis)
+    zdy = z - n.turbulence(x, y + d, z, oct, hard, noisebasis)
+    return (zdy - ydz), (zdx - xdz), (ydx - xdy)
+
+
+# ----------------------------------------------------------------------
+# Effect functions:
+
+def Height_Scale(input, iscale, offset, invert):
+    if invert != 0:
+        return (1.0 - input) * iscale + offset
+    else:
+        return input * iscale + offset
+
+
+def Mix_Modes(a, b, mixfactor, mode):
+    mode = int(mode)
+    a = a * (1.0 - mixfactor)
+    b = b * (1.0 + mixfactor)
+    # 1  mix
+    if mode == 0:
+        return (a * (1.0 - 0.5) + b * 0.5)
+    # 2  add
+    elif mode == 1:
+        return (a + b)
+    # 3  sub.
+    elif mode == 2:
+        return (a - b)
+    # 4  mult.
+    elif mode == 3:
+        return (a * b)
+    # 5  abs diff.
+    elif mode == 4:
+        return (np.abs(a - b))
+    # 6  screen
+    elif mode == 5:
+        return 1.0 - ((1.0 - a) * (1.0 - b) / 1.0)
+    # 7  addmodulo
+    elif mode == 6:
+        return np.mod(a + b, 1.0)
+    # 8  min.
+    elif mode == 7:
+        return np.minimum(a, b)
+    # 9  max.
+    elif mode == 8:
+        return np.maximum(a, b)
+    else:
+        return np.zeros_like(a)
+
+
+def Effect_Basis_Function(n, x, y, type, bias):
+    bias = int(bias)
+    type = int(type)
+    iscale = 1.0
+    offset = 0.0
+    z = np.zeros_like(x)
+    Bias = Bias_Types[bias]
+
+    # gradient:
+    if type == 1:
+        effect = offset + iscale * (Bias(x + y))
+    # waves / bumps:
+    elif type == 2:
+        effect = offset + iscale * 0.5 * (Bias(x * pi) + Bias(y * pi))
+    # zigzag:
+    elif type == 3:
+        effect = offset + iscale * Bias(offset + iscale * np.sin(x * pi + np.sin(y * pi)))
+    # wavy:
+    elif type == 4:
+        effect = offset + iscale * (Bias(np.cos(x) + np.sin(y) + np.cos(x * 2 + y * 2) - np.sin(-x * 4 + y * 4)))
+    # sine bump:
+    elif type == 5:
+        effect = offset + iscale * 1 - Bias((np.sin(x * pi) + np.sin(y * pi)))
+    # dots:
+    elif type == 6:
+        effect = offset + iscale * (Bias(x * pi * 2) * Bias(y * pi * 2)) - 0.5
+    # rings:
+    elif type == 7:
+        effect = offset + iscale * (Bias(1.0 - (x * x + y * y)))
+    # spiral:
+    elif type == 8:
+        effect = offset + iscale * \
+            Bias((x * np.sin(x * x + y * y) + y * np.cos(x * x + y * y)) / (x**2 + y**2 + 0.5)) * 2
+    # square / piramide:
+    elif type == 9:
+        effect = offset + iscale * Bias(1.0 - np.sqrt((x * x)**10 + (y * y)**10)**0.1)
+    # blocks:
+    elif type == 10:
+        effect = (0.5 - np.maximum(Bias(x * pi), Bias(y * pi)))
+        effect = np.where(effect > 0.0, 1.0, effect)
+        effect = offset + iscale * effect
+    # grid:
+    elif type == 11:
+        effect = (0.025 - np.minimum(Bias(x * pi), Bias(y * pi)))
+        effect = np.where(effect > 0.0, 1.0, effect)
+        effect = offset + iscale * effect
+    # tech:
+    elif type == 12:
+        a = np.maximum(Bias(x * pi), Bias(y * pi))
+        b = np.maximum(Bias(x * pi * 2 + 2), Bias(y * pi * 2 + 2))
+        effect = np.minimum(Bias(a), Bias(b)) * 3.0 - 2.0
+        effect = np.where(effect > 0.5, 1.0, effect)
+        effect = offset + iscale * effect
+    # crackle:
+    elif type == 13:
+        t = n.turbulence(x, y, z, 6, 0, 'BLENDER') * 0.25
+        effect = n.variable_lacunarity(x, y, t, 0.25, 'PERLIN_ORIGINAL', 'VORONOI_CRACKLE')
+        effect = np.minimum(effect, 0.5)
+        effect = offset + iscale * effect
+    # sparse cracks noise:
+    elif type == 14:
+        effect = 2.5 * np.abs(n.noise(x, y, z, 'PERLIN_ORIGINAL')) - 0.1
+        effect = np.minimum(effect, 0.25)
+        effect = offset + iscale * (effect * 2.5)
+    # shattered rock noise:
+    elif type == 15:
+        effect = 0.5 + n.noise(x, y, z, 'VORONOI_F2F1')
+        effect = np.minimum(effect, 0.75)
+        effect = offset + iscale * effect
+    # lunar noise:
+    elif type == 16:
+        effect = 0.25 + 1.5 * n.voronoi_f1_squared(x, y, z)
+        effect = np.minimum(effect, 0.5)
+        effect = offset + iscale * effect * 2
+    # cosine noise:
+    elif type == 17:
+        effect = np.cos(5 * n.noise(x, y, z, 'BLENDER'))
+        effect = offset + iscale * (effect * 0.5)
+    # spikey noise:
+    elif type == 18:
+        t = 0.5 + 0.5 * n.turbulence(x * 5, y * 5, z, 8, 0, 'BLENDER')
+        effect = ((t * t)**5)
+        effect = offset + iscale * effect
+    # stone noise:
+    elif type == 19:
+        effect = offset + iscale * (n.noise(x * 2, y * 2, z, 'BLENDER') * 1.5 - 0.75)
+    # Flat Turb:
+    elif type == 20:
+        t = n.turbulence(x, y, z, 6, 0, 'BLENDER')
+        effect = np.minimum(t * 2.0, 0.25)
+        effect = offset + iscale * effect
+    # Flat Voronoi:
+    elif type == 21:
+        t = 1 - n.voronoi_f1_squared(x, y, z)
+        effect = np.minimum(t * 2 - 1.5, 0.25)
+        effect = offset + iscale * effect
+    else:
+        effect = np.zeros_like(x)
+
+    return np.maximum(effect, 0.0)
+
+
+def Effect_Function(n, x, y, z, type, bias, turb, depth, frequency, amplitude):
+    # turbulence:
+    if turb > 0.0:
+        t = turb * (0.5 + 0.5 * n.turbulence(x, y, z, 6, 0, 'BLENDER'))
+        x = x + t
+        y = y + t
+
+    result = Effect_Basis_Function(n, x, y, type, bias) * amplitude
+    # fractalize:
+    for i in range(1, depth + 1):
+        x = x * frequency
+        y = y * frequency
+        result += Effect_Basis_Function(n, x, y, type, bias) * amplitude / i
+
+    return result
+
+
+# ------------------------------------------------------------
+# landscape_gen
+
+def noise_gen_batch(x, y, z, props, fast_noise=None):
+    """
+    Height of the landscape at coordinates x, y, z (arrays or scalars, broadcast together).
+    Same result as ant_noise.noise_gen for each coordinate, unless the NumPy noise bases are used:
+    fast_noise defaults to the "Fast Noise" property stored after the 65 A.N.T. properties.
+    """
+    x, y, z = np.broadcast_arrays(
+        np.asarray(x, dtype=np.float64),
+        np.asarray(y, dtype=np.float64),
+        np.asarray(z, dtype=np.float64),
+    )
+    shape = x.shape
+    x, y, z = x.ravel(), y.ravel(), z.ravel()
+
+    if fast_noise is None:
+        fast_noise = len(props) > 65 and props[65]
+    n = NumpyNoise() if fast_noise else MathutilsNoise()
+
+    texture_name = props[7]
+    sphere = props[4]
+    meshsize_x = props[10]
+    meshsize_y = props[11]
+    rseed = props[13]
+    x_offset = props[14]
+    y_offset = props[15]
+    z_offset = props[16]
+    size_x = props[17]
+    size_y = props[18]
+    size_z = props[19]
+    nsize = props[20]
+    ntype = props[21]
+    nbasis = props[22]
+    vlbasis = props[23]
+    distortion = props[24]
+    hardnoise = int(props[25])
+    depth = props[26]
+    amp = props[27]
+    freq = props[28]
+    dimension = props[29]
+    lacunarity = props[30]
+    offset = props[31]
+    gain = props[32]
+    marblebias = int(props[33])
+    marblesharpnes = int(props[34])
+    marbleshape = int(props[35])
+    height = props[36]
+    height_invert = props[37]
+    height_offset = props[38]
+    maximum = props[39]
+    minimum = props[40]
+    falloff = int(props[41])
+    edge_level = props[42]
+    falloffsize_x = props[43]
+    falloffsize_y = props[44]
+    stratatype = props[45]
+    strata = props[46]
+    fx_mixfactor = props[51]
+    fx_mix_mode = props[52]
+    fx_type = props[53]
+    fx_bias = props[54]
+    fx_turb = props[55]
+    fx_depth = props[56]
+    fx_frequency = props[57]
+    fx_amplitude = props[58]
+    fx_size = props[59]
+    fx_loc_x = props[60]
+    fx_loc_y = props[61]
+    fx_height = props[62]
+    fx_offset = props[63]
+    fx_invert = props[64]
+
+    # Origin
+    if rseed == 0:
+        origin = x_offset, y_offset, z_offset
+        origin_x = x_offset
+        origin_y = y_offset
+        origin_z = z_offset
+    else:
+        # Randomise origin
+        o_range = 100
+        seed_set(rseed)
+        origin = random_unit_vector()
+        ox = (origin[0] * o_range)
+        oy = (origin[1] * o_range)
+        oz = 0
+        origin_x = (ox - (ox * 0.5)) + x_offset
+        origin_y = (oy - (oy * 0.5)) + y_offset
+        origin_z = oz + z_offset
+
+    nx = x / (nsize * size_x) + origin_x
+    ny = y / (nsize * size_y) + origin_y
+    nz = z / (nsize * size_z) + origin_z
+
+    # Noise type's
+    if ntype in [0, 'multi_fractal']:
+        value = n.multi_fractal(nx, ny, nz, dimension, lacunarity, depth, nbasis) * 0.5
+
+    elif ntype in [1, 'ridged_multi_fractal']:
+        value = n.ridged_multi_fractal(nx, ny, nz, dimension, lacunarity, depth, offset, gain, nbasis) * 0.5
+
+    elif ntype in [2, 'hybrid_multi_fractal']:
+        value = n.hybrid_multi_fractal(nx, ny, nz, dimension, lacunarity, depth, offset, gain, nbasis) * 0.5
+
+    elif ntype in [3, 'hetero_terrain']:
+        value = n.hetero_terrain(nx, ny, nz, dimension, lacunarity, depth, offset, nbasis) * 0.25
+
+    elif ntype in [4, 'fractal']:
+        value = n.fractal(nx, ny, nz, dimension, lacunarity, depth, nbasis)
+
+    elif ntype in [5, 'turbulence_vector']:
+        value = n.turbulence_vector(nx, ny, nz, depth, hardnoise, nbasis, amp, freq)[0]
+
+    elif ntype in [6, 'variable_lacunarity']:
+        value = n.variable_lacunarity(nx, ny, nz, distortion, nbasis, vlbasis)
+
+    elif ntype in [7, 'marble_noise']:
+        value = marble_noise(
+            n,
+            (nx - origin_x + x_offset),
+            (ny - origin_y + y_offset),
+            (nz - origin_z + z_offset),
+            (origin[0] + x_offset, origin[1] + y_offset, origin[2] + z_offset), nsize,
+            marbleshape, marblebias, marblesharpnes,
+            distortion, depth, hardnoise, nbasis, amp, freq
+        )
+    elif ntype in [8, 'shattered_hterrain']:
+        value = shattered_hterrain(n, nx, ny, nz, dimension, lacunarity, depth, offset, distortion, nbasis)
+
+    elif ntype in [9, 'strata_hterrain']:
+        value = strata_hterrain(n, nx, ny, nz, dimension, lacunarity, depth, offset, distortion, nbasis)
+
+    elif ntype in [10, 'ant_turbulence']:
+        value = ant_turbulence(n, nx, ny, nz, depth, hardnoise, nbasis, amp, freq, distortion)
+
+    elif ntype in [11, 'vl_noise_turbulence']:
+        value = vl_noise_turbulence(n, nx, ny, nz, distortion, depth, nbasis, vlbasis, hardnoise, amp, freq)
+
+    elif ntype in [12, 'vl_hTerrain']:
+        value = vl_hTerrain(n, nx, ny, nz, dimension, lacunarity, depth, offset, nbasis, vlbasis, distortion)
+
+    elif ntype in [13, 'distorted_heteroTerrain']:
+        value = distorted_heteroTerrain(n, nx, ny, nz, dimension, lacunarity, depth, offset, distortion,
+                                        nbasis, vlbasis)
+
+    elif ntype in [14, 'double_multiFractal']:
+        value = double_multiFractal(n, nx, ny, nz, dimension, lacunarity, depth, offset, gain, nbasis, vlbasis)
+
+    elif ntype in [15, 'rocks_noise']:
+        value = rocks_noise(n, nx, ny, nz, depth, hardnoise, nbasis, distortion)
+
+    elif ntype in [16, 'slick_rock']:
+        value = slick_rock(n, nx, ny, nz, dimension, lacunarity, depth, offset, gain, distortion, nbasis, vlbasis)
+
+    elif ntype in [17, 'planet_noise']:
+        value = planet_noise(n, nx, ny, nz, depth, hardnoise, nbasis)[2] * 0.5 + 0.5
+
+    elif ntype in [18, 'blender_texture']:
+        if texture_name != "" and texture_name in bpy.data.textures:
+            texture = bpy.data.textures[texture_name]
+            value = MathutilsNoise._map(lambda co: texture.evaluate(co)[3], nx, ny, nz)
+        else:
+            value = np.zeros_like(x)
+    else:
+        value = np.full_like(x, 0.5)
+
+    # Effect mix
+    if fx_type not in [0, "0"]:
+        fx = x * 2.0 / fx_size + fx_loc_x
+        fy = y * 2.0 / fx_size + fx_loc_y
+        effect = Effect_Function(n, fx, fy, z, fx_type, fx_bias, fx_turb, fx_depth, fx_frequency, fx_amplitude)
+        effect = Height_Scale(effect, fx_height, fx_offset, fx_invert)
+        value = Mix_Modes(value, effect, fx_mixfactor, fx_mix_mode)
+
+    # Adjust height
+    value = Height_Scale(value, height, height_offset, height_invert)
+
+    # Edge falloff:
+    if not sphere and falloff:
+        ratio_x, ratio_y = np.abs(x) * 2 / meshsize_x, np.abs(y) * 2 / meshsize_y
+        if falloff == 1:
+            dist = np.sqrt(ratio_y**falloffsize_y)
+        elif falloff == 2:
+            dist = np.sqrt(ratio_x**falloffsize_x)
+        else:
+            dist = np.sqrt(ratio_x**falloffsize_x + ratio_y**falloffsize_y)
+        value = value - edge_level
+        smooth = (dist * dist * (3 - 2 * dist))
+        value = np.where(dist < 1.0, (value - value * smooth) + edge_level, edge_level)
+
+    # Strata / terrace / layers
+    if stratatype not in [0, "0"]:
+        if stratatype in [1, "1"]:
+            strata = strata / height
+            strata *= 2
+            steps = (np.sin(value * strata * pi) * (0.1 / strata * pi))
+            value = (value * 0.5 + steps * 0.5) * 2.0
+
+        elif stratatype in [2, "2"]:
+            strata = strata / height
+            steps = -np.abs(np.sin(value * strata * pi) * (0.1 / strata * pi))
+            value = (value * 0.5 + steps * 0.5) * 2.0
+
+        elif stratatype in [3, "3"]:
+            strata = strata / height
+            steps = np.abs(np.sin(value * strata * pi) * (0.1 / strata * pi))
+            value = (value * 0.5 + steps * 0.5) * 2.0
+
+        elif stratatype in [4, "4"]:
+            strata = strata / height
+            value = np.trunc(value * strata) * 1.0 / strata
+
+        elif stratatype in [5, "5"]:
+            strata = strata / height
+            steps = (np.trunc(value * strata) * 1.0 / strata)
+            value = (value * (1.0 - 0.5) + steps * 0.5)
+
+    # Clamp height min max
+    value = np.minimum(np.maximum(value, minimum), maximum)
+
+    return value.reshape(shape)
@@ -2,9 +2,14 @@
 
 from time import time
 import unittest
+import gc
 import sys
 import os
 from random import random as rand, shuffle
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import tempfile
+import weakref
 import numpy as np
 
 numexpr_available = False
@@ -18,10 +23,49 @@ def getptime():
     return time()
 
 
-class Grid:
+class Workspace(threading.local):
+    """Scratch arrays of a worker thread, reused between tiles and iterations."""
+
+    def __init__(self):
+        self.buffers = {}
+
+    def get(self, name, shape, dtype=np.single):
+        size = shape[0] * shape[1]
+        buf = self.buffers.get(name)
+        if buf is None or buf.size < size or buf.dtype != dtype:
+            buf = np.empty(size, dtype)
+            self.buffers[name] = buf
+        return buf[:size].reshape(shape)
+
+
+def _removefiles(filenames):
+    for filename in filenames:
+        try:
+            os.remove(filename)
+        except OSError:
+            # already removed, or still mapped by an array on Windows
+            pass
+    del filenames[:]
+
 
-    def __init__(self, size=10, dtype=np.single):
-        self.center = np.zeros([size, size], dtype)
+class Grid:
+    """
+    A heightfield and the erosion quantities on it.
+
+    The erosion steps are stencils on the 4 neighbors of each cell. They are computed
+    tile by tile (tiles read a halo of one cell around them) from the current arrays
+    into back buffers, which are swapped afterwards: tiles can be run concurrently,
+    on a pool of `workers` threads (NumPy releases the GIL).
+    With `memmapdir`, all arrays are memory mapped .npy files in that directory, so
+    grids bigger than memory can be eroded.
+    """
+
+    def __init__(self, size=10, dtype=np.single, tilesize=None, workers=1, memmapdir=None):
+        self.memmapdir = memmapdir
+        # the memory mapped files are removed by release(), or when the grid is garbage collected
+        self.memmapfiles = []
+        weakref.finalize(self, _removefiles, self.memmapfiles)
+        self.center = self._array('center', [size, size], dtype)
         self.water = None
         self.sediment = None
         self.scour = None
@@ -42,22 +86,117 @@ class Grid:
         self.scourmax = 1.0
         self.sedmax = 1.0
         self.scourmin = 1.0
+        self.rainmap = None
+        self.tilesize = tilesize
+        self.workers = workers
+        self.pool = None
+        self.workspace = Workspace()
+        self.backbuffers = {}
+
+    def _array(self, name, shape, dtype=np.single):
+        # a zeroed array, memory mapped if the grid is out-of-core
+        if self.memmapdir is None:
+            return np.zeros(shape, dtype)
+        fd, filename = tempfile.mkstemp(suffix='.npy', prefix=name + '_', dir=self.memmapdir)
+        os.close(fd)
+        self.memmapfiles.append(filename)
+        return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=tuple(shape))
+
+    def setmemmap(self, memmapdir):
+        """move all arrays to memory mapped files in memmapdir."""
+        self.memmapdir = memmapdir
+        self.backbuffers = {}
+        for name in ('center', 'water', 'sediment', 'scour', 'flowrate',
+                     'sedimentpct', 'capacity', 'avalanced', 'rainmap'):
+            a = getattr(self, name, None)
+            if a is not None and not isinstance(a, np.memmap):
+                m = self._array(name, a.shape, a.dtype)
+                m[...] = a
+                setattr(self, name, m)
+
+    def settiling(self, tilesize=None, workers=1):
+        """tilesize None splits the grid in one band of rows per worker."""
+        self.close()
+        self.tilesize = tilesize
+        self.workers = workers
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def release(self):
+        """drop all arrays and remove their memory mapped files."""
+        self.close()
+        for name in ('center', 'water', 'sediment', 'scour', 'flowrate',
+                     'sedimentpct', 'capacity', 'avalanced', 'rainmap'):
+            setattr(self, name, None)
+        self.backbuffers = {}
+        _removefiles(self.memmapfiles)
+
+    def _tiles(self):
+        # tiles cover the inner cells, the edges are kept at zero
+        nx, ny = self.center.shape
+        if self.tilesize is None:
+            tx = max(-(-(nx - 2) // max(self.workers, 1)), 1)
+            ty = max(ny - 2, 1)
+        else:
+            tx = ty = max(self.tilesize, 1)
+        return [(r, min(r + tx, nx - 1), c, min(c + ty, ny - 1))
+                for r in range(1, nx - 1, tx) for c in range(1, ny - 1, ty)]
+
+    def _bands(self):
+        # bands of rows covering the whole grid, for cell by cell operations
+        nx, ny = self.center.shape
+        n = max(-(-nx // max(self.workers, 1)), 1)
+        return [(r, min(r + n, nx)) for r in range(0, nx, n)]
+
+    def _run(self, func, tiles):
+        if self.workers <= 1 or len(tiles) <= 1:
+            for tile in tiles:
+                func(*tile)
+            return
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        # list() re-raises exceptions of the workers
+        list(self.pool.map(lambda tile: func(*tile), tiles))
+
+    def _buffer(self, name, like):
+        # a work buffer shaped like an array, allocated once
+        b = self.backbuffers.get(name)
+        if b is None or b.shape != like.shape or b.dtype != like.dtype:
+            b = self._array(name, like.shape, like.dtype)
+            self.backbuffers[name] = b
+        return b
+
+    def _backbuffer(self, name):
+        return self._buffer(name, getattr(self, name))
+
+    def _swap(self, name, b):
+        # tiles only write inner cells: keep the edges of the current array
+        a = getattr(self, name)
+        b[0, :] = a[0, :]
+        b[-1, :] = a[-1, :]
+        b[:, 0] = a[:, 0]
+        b[:, -1] = a[:, -1]
+        setattr(self, name, b)
+        self.backbuffers[name] = a
 
     def init_water_and_sediment(self):
         if self.water is None:
-            self.water = np.zeros(self.center.shape, dtype=np.single)
+            self.water = self._array('water', self.center.shape)
         if self.sediment is None:
-            self.sediment = np.zeros(self.center.shape, dtype=np.single)
+            self.sediment = self._array('sediment', self.center.shape)
         if self.scour is None:
-            self.scour = np.zeros(self.center.shape, dtype=np.single)
+            self.scour = self._array('scour', self.center.shape)
         if self.flowrate is None:
-            self.flowrate = np.zeros(self.center.shape, dtype=np.single)
+            self.flowrate = self._array('flowrate', self.center.shape)
         if self.sedimentpct is None:
-            self.sedimentpct = np.zeros(self.center.shape, dtype=np.single)
+            self.sedimentpct = self._array('sedimentpct', self.center.shape)
         if self.capacity is None:
-            self.capacity = np.zeros(self.center.shape, dtype=np.single)
+            self.capacity = self._array('capacity', self.center.shape)
         if self.avalanced is None:
-            self.avalanced = np.zeros(self.center.shape, dtype=np.single)
+            self.avalanced = self._array('avalanced', self.center.shape)
 
     def __str__(self):
         return ''.join(self.__str_iter__(fmt="%.3f"))
@@ -233,55 +372,66 @@ class Grid:
         c[:, -1] = 0
 
     def diffuse(self, Kd, IterDiffuse, numexpr):
+        # numexpr is accepted for compatibility, the tiled kernels use NumPy out= arguments
         self.zeroedge()
-        c = self.center[1:-1, 1:-1]
-        up = self.center[:-2, 1:-1]
-        down = self.center[2:, 1:-1]
-        left = self.center[1:-1, :-2]
-        right = self.center[1:-1, 2:]
-        if(numexpr and numexpr_available):
-            self.center[1:-1, 1:-1] = ne.evaluate('c + Kd * (up + down + left + right - 4.0 * c)')
-        else:
-            self.center[1:-1, 1:-1] = c + (Kd / IterDiffuse) * (up + down + left + right - 4.0 * c)
+        src = self.center
+        dst = self._backbuffer('center')
+        K = Kd / IterDiffuse
+
+        def tile(r0, r1, c0, c1):
+            c = src[r0:r1, c0:c1]
+            s = src[r0 - 1:r1 + 1, c0 - 1:c1 + 1]
+            lap = self.workspace.get('a', c.shape, src.dtype)
+            tmp = self.workspace.get('b', c.shape, src.dtype)
+            np.add(s[:-2, 1:-1], s[2:, 1:-1], out=lap)
+            lap += s[1:-1, :-2]
+            lap += s[1:-1, 2:]
+            np.multiply(c, 4.0, out=tmp)
+            lap -= tmp
+            lap *= K
+            np.add(c, lap, out=dst[r0:r1, c0:c1])
+
+        self._run(tile, self._tiles())
+        self._swap('center', dst)
         self.maxrss = max(getmemsize(), self.maxrss)
         return self.center
 
     def avalanche(self, delta, iterava, prob, numexpr):
         self.zeroedge()
-        c = self.center[1:-1, 1:-1]
-        up = self.center[:-2, 1:-1]
-        down = self.center[2:, 1:-1]
-        left = self.center[1:-1, :-2]
-        right = self.center[1:-1, 2:]
-        where = np.where
-
-        if(numexpr and numexpr_available):
-            self.center[1:-1, 1:-1] = ne.evaluate('c + where((up   -c) > delta ,(up   -c -delta)/2, 0) \
-                 + where((down -c) > delta ,(down -c -delta)/2, 0)  \
-                 + where((left -c) > delta ,(left -c -delta)/2, 0)  \
-                 + where((right-c) > delta ,(right-c -delta)/2, 0)  \
-                 + where((up   -c) < -delta,(up   -c +delta)/2, 0)  \
-                 + where((down -c) < -delta,(down -c +delta)/2, 0)  \
-                 + where((left -c) < -delta,(left -c +delta)/2, 0)  \
-                 + where((right-c) < -delta,(right-c +delta)/2, 0)')
-        else:
-            sa = (
-                # incoming
-                where((up - c) > delta, (up - c - delta) / 2, 0)
-                + where((down - c) > delta, (down - c - delta) / 2, 0)
-                + where((left - c) > delta, (left - c - delta) / 2, 0)
-                + where((right - c) > delta, (right - c - delta) / 2, 0)
-                # outgoing
-                + where((up - c) < -delta, (up - c + delta) / 2, 0)
-                + where((down - c) < -delta, (down - c + delta) / 2, 0)
-                + where((left - c) < -delta, (left - c + delta) / 2, 0)
-                + where((right - c) < -delta, (right - c + delta) / 2, 0)
-            )
+        if self.avalanced is None:
+            self.avalanced = self._array('avalanced', self.center.shape)
+        src = self.center
+        dst = self._backbuffer('center')
+
+        def tile(r0, r1, c0, c1):
+            c = src[r0:r1, c0:c1]
+            s = src[r0 - 1:r1 + 1, c0 - 1:c1 + 1]
+            sa = self.workspace.get('a', c.shape, src.dtype)
+            diff = self.workspace.get('b', c.shape, src.dtype)
+            term = self.workspace.get('c', c.shape, src.dtype)
+            mask = self.workspace.get('mask', c.shape, np.bool_)
+            sa[...] = 0
+            # incoming, then outgoing material
+            for sign in (1, -1):
+                for n in (s[:-2, 1:-1], s[2:, 1:-1], s[1:-1, :-2], s[1:-1, 2:]):
+                    np.subtract(n, c, out=diff)
+                    if sign > 0:
+                        np.greater(diff, delta, out=mask)
+                    else:
+                        np.less(diff, -delta, out=mask)
+                    np.subtract(diff, sign * delta, out=term)
+                    term /= 2
+                    term *= mask
+                    sa += term
             randarray = np.random.randint(0, 100, sa.shape) * 0.01
-            sa = where(randarray < prob, sa, 0)
-            self.avalanced[1:-1, 1:-1] = self.avalanced[1:-1, 1:-1] + sa / iterava
-            self.center[1:-1, 1:-1] = c + sa / iterava
-
+            np.less(randarray, prob, out=mask)
+            sa *= mask
+            sa /= iterava
+            self.avalanced[r0:r1, c0:c1] += sa
+            np.add(c, sa, out=dst[r0:r1, c0:c1])
+
+        self._run(tile, self._tiles())
+        self._swap('center', dst)
         self.maxrss = max(getmemsize(), self.maxrss)
         return self.center
 
@@ -299,105 +449,97 @@ class Grid:
         self.water[px - rx:px + rx + 1, py - ry:py + ry + 1] += amount
 
     def river(self, Kc, Ks, Kdep, Ka, Kev, numexpr):
-        zeros = np.zeros
-        where = np.where
-        min = np.minimum
-        max = np.maximum
-        abs = np.absolute
-        arctan = np.arctan
-        sin = np.sin
-
-        center = (slice(1, -1, None), slice(1, -1, None))
-        up = (slice(None, -2, None), slice(1, -1, None))
-        down = (slice(2, None, None), slice(1, -1, None))
-        left = (slice(1, -1, None), slice(None, -2, None))
-        right = (slice(1, -1, None), slice(2, None, None))
-
         water = self.water
         rock = self.center
         sediment = self.sediment
-        height = rock + water
+        height = self._buffer('height', rock)
+        sc = self._buffer('sc', water)
+        newwater = self._backbuffer('water')
+        newsediment = self._backbuffer('sediment')
 
         # !! this gives a runtime warning for division by zero
         verysmallnumber = 0.0000000001
-        water += verysmallnumber
-        sc = where(water > verysmallnumber, sediment / water, 0)
-
-        sdw = zeros(water[center].shape)
-        svdw = zeros(water[center].shape)
-        sds = zeros(water[center].shape)
-        angle = zeros(water[center].shape)
-        for d in (up, down, left, right):
-            if(numexpr and numexpr_available):
-                hdd = height[d]
-                hcc = height[center]
-                dw = ne.evaluate('hdd-hcc')
-                inflow = ne.evaluate('dw > 0')
-                wdd = water[d]
-                wcc = water[center]
-                # nested where() represent min() and max()
-                dw = ne.evaluate('where(inflow, where(wdd<dw, wdd, dw), where(-wcc>dw, -wcc, dw))/4.0')
-                sdw = ne.evaluate('sdw + dw')
-                scd = sc[d]
-                scc = sc[center]
-                rockd = rock[d]
-                rockc = rock[center]
-                sds = ne.evaluate('sds + dw * where(inflow, scd, scc)')
-                svdw = ne.evaluate('svdw + abs(dw)')
-                angle = ne.evaluate('angle + arctan(abs(rockd-rockc))')
-            else:
-                dw = (height[d] - height[center])
-                inflow = dw > 0
-                dw = where(inflow, min(water[d], dw), max(-water[center], dw)) / 4.0
-                sdw = sdw + dw
-                sds = sds + dw * where(inflow, sc[d], sc[center])
-                svdw = svdw + abs(dw)
-                angle = angle + np.arctan(abs(rock[d] - rock[center]))
-
-        if numexpr and numexpr_available:
-            wcc = water[center]
-            scc = sediment[center]
-            rcc = rock[center]
-            water[center] = ne.evaluate('wcc + sdw')
-            sediment[center] = ne.evaluate('scc + sds')
-            sc = ne.evaluate('where(wcc>0, scc/wcc, 2000*Kc)')
-            fKc = ne.evaluate('Kc*sin(Ka*angle)*svdw')
-            ds = ne.evaluate('where(sc > fKc, -Kd * scc, Ks * svdw)')
-            rock[center] = ne.evaluate('rcc - ds')
-            # there isn't really a bottom to the rock but negative values look ugly
-            rock[center] = ne.evaluate('where(rcc<0,0,rcc)')
-            sediment[center] = ne.evaluate('scc + ds')
-        else:
-            wcc = water[center]
-            scc = sediment[center]
-            rcc = rock[center]
-            water[center] = wcc * (1 - Kev) + sdw
-            sediment[center] = scc + sds
-            sc = where(wcc > 0, scc / wcc, 2 * Kc)
-            fKc = Kc * svdw
-            ds = where(fKc > sc, (fKc - sc) * Ks, (fKc - sc) * Kdep) * wcc
+
+        def band(r0, r1):
+            np.add(rock[r0:r1], water[r0:r1], out=height[r0:r1])
+            water[r0:r1] += verysmallnumber
+            sc[r0:r1] = 0
+            np.divide(sediment[r0:r1], water[r0:r1], out=sc[r0:r1], where=water[r0:r1] > verysmallnumber)
+
+        def tile(r0, r1, c0, c1):
+            center = (slice(r0, r1), slice(c0, c1))
+            shape = (r1 - r0, c1 - c0)
+            ws = self.workspace
+            sdw = ws.get('sdw', shape, np.float64)
+            svdw = ws.get('svdw', shape, np.float64)
+            sds = ws.get('sds', shape, np.float64)
+            dw = ws.get('dw', shape)
+            a = ws.get('a', shape)
+            b = ws.get('b', shape)
+            inflow = ws.get('inflow', shape, np.bool_)
+            sdw[...] = 0
+            svdw[...] = 0
+            sds[...] = 0
+            for d in ((slice(r0 - 1, r1 - 1), slice(c0, c1)), (slice(r0 + 1, r1 + 1), slice(c0, c1)),
+                      (slice(r0, r1), slice(c0 - 1, c1 - 1)), (slice(r0, r1), slice(c0 + 1, c1 + 1))):
+                np.subtract(height[d], height[center], out=dw)
+                np.greater(dw, 0, out=inflow)
+                # dw = where(inflow, min(water[d], dw), max(-water[center], dw)) / 4.0
+                np.minimum(water[d], dw, out=a)
+                np.negative(water[center], out=b)
+                np.maximum(b, dw, out=b)
+                np.copyto(b, a, where=inflow)
+                np.divide(b, 4.0, out=dw)
+                sdw += dw
+                np.copyto(a, sc[center])
+                np.copyto(a, sc[d], where=inflow)
+                a *= dw
+                sds += a
+                np.absolute(dw, out=a)
+                svdw += a
+
+            wcc = newwater[center]
+            scc = newsediment[center]
+            np.multiply(water[center], 1 - Kev, out=a)
+            np.add(a, sdw, out=wcc)
+            np.add(sediment[center], sds, out=scc)
+            # concentration and capacity of the updated cells
+            sct = self.sedimentpct[center]
+            sct[...] = 2 * Kc
+            np.divide(scc, wcc, out=sct, where=wcc > 0)
+            fKc = np.multiply(svdw, Kc, out=sdw)
+            self.capacity[center] = fKc
             self.flowrate[center] = svdw
+            # ds = where(fKc > sc, (fKc - sc) * Ks, (fKc - sc) * Kdep) * wcc
+            ds = np.subtract(fKc, sct, out=svdw)
+            np.greater(ds, 0, out=inflow)
+            ds *= np.where(inflow, Ks, Kdep)
+            ds *= wcc
             self.scour[center] = ds
-            self.sedimentpct[center] = sc
-            self.capacity[center] = fKc
-            sediment[center] = scc + ds + sds
+            ds += scc
+            ds += sds
+            scc[...] = ds
+
+        self._run(band, self._bands())
+        self._run(tile, self._tiles())
+        self._swap('water', newwater)
+        self._swap('sediment', newsediment)
 
     def flow(self, Kc, Ks, Kz, Ka, numexpr):
-        zeros = np.zeros
-        where = np.where
-        min = np.minimum
-        max = np.maximum
-        abs = np.absolute
-        arctan = np.arctan
-        sin = np.sin
-
-        center = (slice(1, -1, None), slice(1, -1, None))
         rock = self.center
-        ds = self.scour[center]
-        rcc = rock[center]
-        rock[center] = rcc - ds * Kz
-        # there isn't really a bottom to the rock but negative values look ugly
-        rock[center] = where(rcc < 0, 0, rcc)
+        scour = self.scour
+        nx, ny = rock.shape
+
+        def band(r0, r1):
+            r0, r1 = max(r0, 1), min(r1, nx - 1)
+            if r0 >= r1:
+                return
+            rcc = rock[r0:r1, 1:-1]
+            rcc -= scour[r0:r1, 1:-1] * Kz
+            # there isn't really a bottom to the rock but negative values look ugly
+            np.maximum(rcc, 0, out=rcc)
+
+        self._run(band, self._bands())
 
     def rivergeneration(
             self,
@@ -467,7 +609,7 @@ class TestGrid(unittest.TestCase):
         g = Grid(5)
         g.peak(1)
         self.assertEqual(g.center[2, 2], 1.0)
-        g.diffuse(0.1, numexpr=False)
+        g.diffuse(0.1, 1, numexpr=False)
         for n in [(2, 1), (2, 3), (1, 2), (3, 2)]:
             self.assertAlmostEqual(g.center[n], 0.1)
         self.assertAlmostEqual(g.center[2, 2], 0.6)
@@ -475,23 +617,73 @@ class TestGrid(unittest.TestCase):
     def test_diffuse_numexpr(self):
         g = Grid(5)
         g.peak(1)
-        g.diffuse(0.1, numexpr=False)
+        g.diffuse(0.1, 1, numexpr=False)
         h = Grid(5)
         h.peak(1)
-        h.diffuse(0.1, numexpr=True)
+        h.diffuse(0.1, 1, numexpr=True)
         self.assertEqual(list(g.center.flat), list(h.center.flat))
 
     def test_avalanche_numexpr(self):
         g = Grid(5)
         g.peak(1)
-        g.avalanche(0.1, numexpr=False)
+        g.avalanche(0.1, 1, 1.0, numexpr=False)
         h = Grid(5)
         h.peak(1)
-        h.avalanche(0.1, numexpr=True)
+        h.avalanche(0.1, 1, 1.0, numexpr=True)
         print(g)
         print(h)
         np.testing.assert_almost_equal(g.center, h.center)
 
+    @staticmethod
+    def erode(g, iterations=4):
+        # deterministic: avalanches always happen
+        g.center[...] = np.random.RandomState(0).random_sample(g.center.shape) * 5
+        g.init_water_and_sediment()
+        for i in range(iterations):
+            g.rivergeneration(0.2, 0.0, False, 1.0, 0.1, 0.1, 2.0, 0.05, 0, 0, 0, 0, False)
+            g.diffuse(0.02, 5, False)
+            g.avalanche(0.3, 5, 1.0, False)
+            g.fluvial_erosion(0.2, 0.0, False, 1.0, 0.1, 5.0, 2.0, 0, 0, 0, 0, False)
+        g.close()
+        return g
+
+    def assertSameErosion(self, g, h):
+        for name in ('center', 'water', 'sediment', 'scour', 'flowrate', 'sedimentpct', 'capacity', 'avalanced'):
+            np.testing.assert_array_equal(getattr(g, name), getattr(h, name), err_msg=name)
+
+    def test_tiled(self):
+        g = self.erode(Grid(23))
+        for tilesize, workers in ((None, 3), (5, 1), (7, 4)):
+            h = self.erode(Grid(23, tilesize=tilesize, workers=workers))
+            self.assertSameErosion(g, h)
+
+    def test_diffuse_tiled(self):
+        g = Grid(5, tilesize=2, workers=2)
+        g.peak(1)
+        g.diffuse(0.1, 1, numexpr=False)
+        for n in [(2, 1), (2, 3), (1, 2), (3, 2)]:
+            self.assertAlmostEqual(g.center[n], 0.1)
+        self.assertAlmostEqual(g.center[2, 2], 0.6)
+        g.close()
+
+    def test_memmap(self):
+        g = self.erode(Grid(23))
+        with tempfile.TemporaryDirectory() as memmapdir:
+            h = Grid(23, tilesize=8, workers=2, memmapdir=memmapdir)
+            self.assertIsInstance(h.center, np.memmap)
+            self.erode(h)
+            self.assertIsInstance(h.water, np.memmap)
+            self.assertSameErosion(g, h)
+            self.assertTrue(os.listdir(memmapdir))
+            h.release()
+            self.assertEqual(os.listdir(memmapdir), [])
+
+            h = self.erode(Grid(23, memmapdir=memmapdir))
+            self.assertTrue(os.listdir(memmapdir))
+            del h
+            gc.collect()
+            self.assertEqual(os.listdir(memmapdir), [])
+
 
 if __name__ == "__main__":
 
@@ -541,6 +733,10 @@ if __name__ == "__main__":
     parser.add_argument('-Gr', dest='gridrandom', type=float, default=0,
                         help='Add random values between 0 and given value')
     parser.add_argument('-m', dest='threads', type=int, default=1, help='number of threads to use')
+    parser.add_argument('-T', dest='tilesize', type=int, default=None,
+                        help='size of the tiles (default: one band of rows per thread)')
+    parser.add_argument('-M', dest='memmapdir', type=str, default=None,
+                        help='keep the grids in memory mapped files in this directory')
     parser.add_argument('-u', action='store_true', dest='unittest', default=False, help='perform unittests')
     parser.add_argument('-a', action='store_true', dest='analyze', default=False,
                         help='show some statistics of input and output meshes')
@@ -563,6 +759,9 @@ if __name__ == "__main__":
             grid = Grid.fromFile(args.infile)
     else:
         grid = Grid(args.gridsize)
+    grid.settiling(args.tilesize, args.threads)
+    if args.memmapdir is not None:
+        grid.setmemmap(args.memmapdir)
 
     if args.gridpeak > 0:
         grid.peak(args.gridpeak)
@@ -578,12 +777,29 @@ if __name__ == "__main__":
     t = getptime()
     for g in range(args.iterations):
         if args.Kd > 0:
-            grid.diffuse(args.Kd, args.usenumexpr)
+            grid.diffuse(args.Kd, 1, args.usenumexpr)
         if args.Kh > 0 and args.Kp > rand():
-            grid.avalanche(args.Kh, args.usenumexpr)
+            grid.avalanche(args.Kh, 1, args.Kp, args.usenumexpr)
         if args.Kr > 0 or args.Kspring > 0:
+            grid.rivergeneration(
+                args.Kr,
+                0,
+                False,
+                args.Kc,
+                args.Ks,
+                args.Kdep,
+                args.Ka,
+                0,
+                args.Kspring,
+                args.Kspringx,
+                args.Kspringy,
+                args.Kspringr,
+                args.usenumexpr,
+            )
             grid.fluvial_erosion(
                 args.Kr,
+                0,
+                False,
                 args.Kc,
                 args.Ks,
                 args.Kdep,
@@ -594,6 +810,7 @@ if __name__ == "__main__":
                 args.Kspringr,
                 args.usenumexpr,
             )
+    grid.close()
     t = getptime() - t
     print("\nElapsed time: %.1f seconds, max memory %.1f Mb.\n" % (t, grid.maxrss), file=sys.stderr)
     if args.analyze:
@@ -609,3 +826,5 @@ if __name__ == "__main__":
         print("sediment\n", np.array_str(grid.sediment, precision=3), file=sys.stderr)
         print("water\n", np.array_str(grid.water, precision=3), file=sys.stderr)
         print("sediment concentration\n", np.array_str(grid.sediment / grid.water, precision=3), file=sys.stderr)
+
+    grid.release()
@@ -241,6 +241,50 @@ class ExportGLTF2_Base:
         max=30
     )
 
+    export_mesh_quantization_enable: BoolProperty(
+        name='Mesh quantization',
+        description='Store vertex attributes as integers. '
+                    'Uses "KHR_mesh_quantization" glTF extension',
+        default=False
+    )
+
+    export_mesh_quantization_position: IntProperty(
+        name='Position quantization bits',
+        description='Quantization bits for position values',
+        default=14,
+        min=8,
+        max=16
+    )
+
+    export_mesh_quantization_normal: IntProperty(
+        name='Normal quantization bits',
+        description='Quantization bits for normal and tangent values',
+        default=8,
+        min=4,
+        max=16
+    )
+
+    export_mesh_quantization_texcoord: IntProperty(
+        name='Texcoord quantization bits',
+        description='Quantization bits for texture coordinate values',
+        default=12,
+        min=8,
+        max=16
+    )
+
+    export_optimize_vertex_cache: BoolProperty(
+        name='Optimize Vertex Order',
+        description='Reorder triangles and vertices for better GPU vertex cache use and compression',
+        default=False
+    )
+
+    export_meshopt_compression_enable: BoolProperty(
+        name='Meshopt compression',
+        description='Compress vertex and index data. '
+                    'Uses "EXT_meshopt_compression" glTF extension',
+        default=False
+    )
+
     export_tangents: BoolProperty(
         name='Tangents',
         description='Export vertex tangents with meshes',
@@ -455,6 +499,14 @@ class ExportGLTF2_Base:
         default=False
     )
 
+    export_profile: BoolProperty(
+        name='Profile',
+        description='Record time, call count and allocated memory of export stages, '
+                    'and write them as a Chrome trace (.trace.json) next to the exported file',
+        default=False,
+        options={'HIDDEN'}
+    )
+
     will_save_settings: BoolProperty(
         name='Remember Export Settings',
         description='Store glTF export settings in the Blender project',
@@ -561,6 +613,13 @@ class ExportGLTF2_Base:
         else:
             export_settings['gltf_draco_mesh_compression'] = False
 
+        export_settings['gltf_mesh_quantization'] = self.export_mesh_quantization_enable
+        export_settings['gltf_mesh_quantization_position'] = self.export_mesh_quantization_position
+        export_settings['gltf_mesh_quantization_normal'] = self.export_mesh_quantization_normal
+        export_settings['gltf_mesh_quantization_texcoord'] = self.export_mesh_quantization_texcoord
+        export_settings['gltf_optimize_vertex_cache'] = self.export_optimize_vertex_cache
+        export_settings['gltf_meshopt_compression'] = self.export_meshopt_compression_enable
+
         export_settings['gltf_materials'] = self.export_materials
         export_settings['gltf_colors'] = self.export_colors
         export_settings['gltf_cameras'] = self.export_cameras
@@ -614,6 +673,8 @@ class ExportGLTF2_Base:
 
         export_settings['gltf_lights'] = self.export_lights
 
+        export_settings['gltf_profile'] = self.export_profile
+
         export_settings['gltf_binary'] = bytearray()
         export_settings['gltf_binaryfilename'] = (
             os.path.splitext(os.path.basename(self.filepath))[0] + '.bin'
@@ -886,6 +947,44 @@ class GLTF_PT_export_geometry_compression(bpy.types.Panel):
         col.prop(operator, 'export_draco_generic_quantization', text="Generic")
 
 
+class GLTF_PT_export_geometry_quantization(bpy.types.Panel):
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_label = "Quantization"
+    bl_parent_id = "GLTF_PT_export_geometry"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        sfile = context.space_data
+        operator = sfile.active_operator
+        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+
+    def draw_header(self, context):
+        sfile = context.space_data
+        operator = sfile.active_operator
+        self.layout.prop(operator, "export_mesh_quantization_enable", text="")
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False  # No animation.
+
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        layout.active = not (operator.is_draco_available and operator.export_draco_mesh_compression_enable)
+
+        col = layout.column(align=True)
+        col.active = operator.export_mesh_quantization_enable
+        col.prop(operator, 'export_mesh_quantization_position', text="Quantize Position")
+        col.prop(operator, 'export_mesh_quantization_normal', text="Normal")
+        col.prop(operator, 'export_mesh_quantization_texcoord', text="Tex Coord")
+
+        layout.prop(operator, 'export_optimize_vertex_cache')
+        layout.prop(operator, 'export_meshopt_compression_enable')
+
+
 class GLTF_PT_export_animation(bpy.types.Panel):
     bl_space_type = 'FILE_BROWSER'
     bl_region_type = 'TOOL_PROPS'
@@ -1144,6 +1243,14 @@ class ImportGLTF2(Operator, ImportHelper):
         default=True,
     )
 
+    import_profile: BoolProperty(
+        name='Profile',
+        description='Record time, call count and allocated memory of import stages, '
+                    'and write them as a Chrome trace (.trace.json) next to the imported file',
+        default=False,
+        options={'HIDDEN'}
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -1206,12 +1313,18 @@ class ImportGLTF2(Operator, ImportHelper):
             return self.unit_import(self.filepath, import_settings)
 
     def unit_import(self, filename, import_settings):
+        import os
         import time
         from .io.imp.gltf2_io_gltf import glTFImporter, ImportError
+        from .io.imp.gltf2_io_user_extensions import import_user_extensions
+        from .io.com import gltf2_io_profile
         from .blender.imp.gltf2_blender_gltf import BlenderGlTF
 
         try:
             gltf_importer = glTFImporter(filename, import_settings)
+            if self.import_profile:
+                gltf2_io_profile.start_profiling(
+                    on_event=lambda event: import_user_extensions('gather_import_profile_event_hook', gltf_importer, event))
             gltf_importer.read()
             gltf_importer.checks()
 
@@ -1230,6 +1343,15 @@ class ImportGLTF2(Operator, ImportHelper):
             self.report({'ERROR'}, e.args[0])
             return {'CANCELLED'}
 
+        finally:
+            if self.import_profile:
+                profiler = gltf2_io_profile.stop_profiling()
+                if profiler is not None:
+                    trace_filepath = os.path.splitext(filename)[0] + '.trace.json'
+                    profiler.write_chrome_trace(trace_filepath)
+                    import_user_extensions('gather_import_profile_hook', gltf_importer, profiler)
+                    print("Profile written to " + trace_filepath)
+
     def set_debug_log(self):
         import logging
         if bpy.app.debug_value == 0:
@@ -1287,6 +1409,7 @@ classes = (
     GLTF_PT_export_geometry_material,
     GLTF_PT_export_geometry_original_pbr,
     GLTF_PT_export_geometry_compression,
+    GLTF_PT_export_geometry_quantization,
     GLTF_PT_export_animation,
     GLTF_PT_export_animation_export,
     GLTF_PT_export_animation_shapekeys,
@@ -0,0 +1,419 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2018-2022 The glTF-Blender-IO authors.
+
+#
+# Export / import benchmark.
+#
+# Generates synthetic scenes, exports them, imports them back, and stores
+# per stage timings and peak memory as JSON. Run headless with:
+#
+#   blender -b --factory-startup -P gltf2_blender_benchmark.py -- --output results.json
+#
+# Compare two result files with:
+#
+#   blender -b --factory-startup -P gltf2_blender_benchmark.py -- --compare base.json results.json
+#
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bpy
+import numpy as np
+
+
+# Synthetic scene parameters, from cheap to expensive.
+BENCHMARK_CASES = {
+    'small': {
+        'vertex_count': 10000, 'mesh_count': 2, 'instance_count': 2, 'material_count': 2,
+        'bone_count': 0, 'influences': 0, 'morph_target_count': 0, 'frame_count': 0,
+    },
+    'skinned': {
+        'vertex_count': 50000, 'mesh_count': 1, 'instance_count': 1, 'material_count': 1,
+        'bone_count': 64, 'influences': 4, 'morph_target_count': 0, 'frame_count': 50,
+    },
+    'morphed': {
+        'vertex_count': 50000, 'mesh_count': 1, 'instance_count': 1, 'material_count': 1,
+        'bone_count': 0, 'influences': 0, 'morph_target_count': 8, 'frame_count': 50,
+    },
+    'instanced': {
+        'vertex_count': 2000, 'mesh_count': 10, 'instance_count': 200, 'material_count': 10,
+        'bone_count': 0, 'influences': 0, 'morph_target_count': 0, 'frame_count': 20,
+    },
+    'large': {
+        'vertex_count': 1000000, 'mesh_count': 1, 'instance_count': 1, 'material_count': 4,
+        'bone_count': 0, 'influences': 0, 'morph_target_count': 0, 'frame_count': 0,
+    },
+}
+
+
+# Stages timed during export and import.
+# Each stage is a function or method looked up at call time by the pipeline.
+def __export_stages():
+    from io_scene_gltf2.blender.exp import gltf2_blender_gather
+    from io_scene_gltf2.blender.exp import gltf2_blender_extract
+    from io_scene_gltf2.blender.exp.gltf2_blender_gltf2_exporter import GlTF2Exporter
+    from io_scene_gltf2.io.com import gltf2_io
+    from io_scene_gltf2.io.exp import gltf2_io_export
+    from io_scene_gltf2.io.exp import gltf2_io_draco_compression_extension
+    from io_scene_gltf2.io.exp import gltf2_io_mesh_optimizer
+    from io_scene_gltf2.io.exp import gltf2_io_mesh_quantization_extension
+    from io_scene_gltf2.io.exp import gltf2_io_meshopt_compression_extension
+
+    return [
+        ('gather', gltf2_blender_gather, 'gather_gltf2', False),
+        ('extract', gltf2_blender_extract, 'extract_primitives', False),
+        ('buffer', GlTF2Exporter, 'add_scene', False),
+        ('buffer', GlTF2Exporter, 'add_animation', False),
+        ('buffer', GlTF2Exporter, 'finalize_buffer', False),
+        ('encode', gltf2_io_draco_compression_extension, 'encode_scene_primitives', False),
+        ('encode', gltf2_io_mesh_optimizer, 'optimize_scene_primitives', False),
+        ('encode', gltf2_io_mesh_quantization_extension, 'encode_scene_primitives', False),
+        ('encode', gltf2_io_meshopt_compression_extension, 'encode_scene_primitives', False),
+        ('encode', gltf2_io.Gltf, 'to_dict', False),
+        ('write', gltf2_io_export, 'save_gltf', False),
+    ]
+
+
+def __import_stages():
+    from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
+    from io_scene_gltf2.blender.imp import gltf2_blender_scene
+    from io_scene_gltf2.blender.imp.gltf2_blender_scene import BlenderScene
+    from io_scene_gltf2.blender.imp.gltf2_blender_mesh import BlenderMesh
+
+    return [
+        ('parse', glTFImporter, 'read', False),
+        ('vnode', gltf2_blender_scene, 'compute_vnodes', False),
+        ('mesh', BlenderMesh, 'create', True),
+        ('animation', BlenderScene, 'create_animations', True),
+    ]
+
+
+class StageTimer:
+    """Temporarily wraps pipeline functions to accumulate wall time and call counts per stage."""
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.timings = {}
+        self.__originals = []
+
+    def __enter__(self):
+        for stage, owner, attr, is_static in self.stages:
+            original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+            self.__originals.append((owner, attr, original))
+            func = original.__func__ if is_static else original
+            wrapped = self.__wrap(stage, func)
+            setattr(owner, attr, staticmethod(wrapped) if is_static else wrapped)
+        return self
+
+    def __exit__(self, *exc):
+        for owner, attr, original in reversed(self.__originals):
+            setattr(owner, attr, original)
+        self.__originals.clear()
+
+    def __wrap(self, stage, func):
+        timings = self.timings
+
+        def wrapped(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timing = timings.setdefault(stage, {'time': 0.0, 'calls': 0})
+                timing['time'] += time.perf_counter() - start
+                timing['calls'] += 1
+        return wrapped
+
+
+def clear_blend_data():
+    for collection in [bpy.data.objects, bpy.data.meshes, bpy.data.armatures, bpy.data.materials,
+                       bpy.data.actions, bpy.data.images, bpy.data.textures]:
+        bpy.data.batch_remove(list(collection))
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+
+
+def generate_scene(params):
+    """Build a synthetic scene in the current Blender scene."""
+    scene = bpy.context.scene
+    rng = np.random.default_rng(0)
+
+    materials = [bpy.data.materials.new("Material.%d" % i) for i in range(params['material_count'])]
+    for i, mat in enumerate(materials):
+        mat.use_nodes = True
+        mat.node_tree.nodes['Principled BSDF'].inputs['Base Color'].default_value = (i % 3 / 2, 0.5, 0.5, 1.0)
+
+    armature_object = None
+    if params['bone_count'] > 0:
+        armature_object = __generate_armature(scene, params)
+
+    frame_count = params['frame_count']
+    if frame_count > 0:
+        scene.frame_start = 1
+        scene.frame_end = frame_count
+
+    for mesh_index in range(params['mesh_count']):
+        mesh = __generate_grid_mesh("Mesh.%d" % mesh_index, params['vertex_count'], materials)
+
+        for instance_index in range(params['instance_count']):
+            obj = bpy.data.objects.new("Object.%d.%d" % (mesh_index, instance_index), mesh)
+            obj.location = (instance_index * 3.0, mesh_index * 3.0, 0.0)
+            scene.collection.objects.link(obj)
+
+            if instance_index == 0 and params['morph_target_count'] > 0:
+                __generate_morph_targets(obj, params['morph_target_count'], rng)
+
+            if armature_object is not None:
+                if instance_index == 0:
+                    __generate_skin_weights(obj, params)
+                obj.parent = armature_object
+                modifier = obj.modifiers.new("Armature", 'ARMATURE')
+                modifier.object = armature_object
+
+            if frame_count > 0:
+                __animate_object(obj, frame_count)
+
+
+def __generate_grid_mesh(name, vertex_count, materials):
+    side = max(2, int(vertex_count ** 0.5))
+    xs, ys = np.meshgrid(np.linspace(-1, 1, side), np.linspace(-1, 1, side))
+    co = np.empty((side * side, 3), dtype=np.float32)
+    co[:, 0] = xs.ravel()
+    co[:, 1] = ys.ravel()
+    co[:, 2] = 0.1 * np.sin(xs.ravel() * 8) * np.cos(ys.ravel() * 8)
+
+    base = (np.arange(side - 1)[np.newaxis, :] + side * np.arange(side - 1)[:, np.newaxis]).ravel()
+    quads = np.stack((base, base + 1, base + side + 1, base + side), axis=1).astype(np.int32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set('co', co.ravel())
+    mesh.loops.add(quads.size)
+    mesh.loops.foreach_set('vertex_index', quads.ravel())
+    mesh.polygons.add(len(quads))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, quads.size, 4, dtype=np.int32))
+    mesh.polygons.foreach_set('loop_total', np.full(len(quads), 4, dtype=np.int32))
+
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set('uv', (co[quads.ravel(), :2] * 0.5 + 0.5).ravel())
+
+    for mat in materials:
+        mesh.materials.append(mat)
+    if len(materials) > 1:
+        material_index = np.arange(len(quads), dtype=np.int32) % len(materials)
+        mesh.polygons.foreach_set('material_index', material_index)
+
+    mesh.update()
+    mesh.validate()
+    return mesh
+
+
+def __generate_armature(scene, params):
+    armature = bpy.data.armatures.new("Armature")
+    armature_object = bpy.data.objects.new("Armature", armature)
+    scene.collection.objects.link(armature_object)
+
+    bpy.context.view_layer.objects.active = armature_object
+    bpy.ops.object.mode_set(mode='EDIT')
+    parent = None
+    bone_count = params['bone_count']
+    for i in range(bone_count):
+        bone = armature.edit_bones.new("Bone.%d" % i)
+        bone.head = (-1 + 2 * i / bone_count, 0.0, 0.0)
+        bone.tail = (-1 + 2 * (i + 1) / bone_count, 0.0, 0.0)
+        bone.parent = parent
+        bone.use_connect = parent is not None
+        parent = bone
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    frame_count = params['frame_count']
+    if frame_count > 0:
+        armature_object.animation_data_create()
+        action = bpy.data.actions.new("ArmatureAction")
+        armature_object.animation_data.action = action
+        frames = np.arange(1, frame_count + 1, dtype=np.float32)
+        for pose_bone in armature_object.pose.bones:
+            data_path = pose_bone.path_from_id('rotation_quaternion')
+            values = [np.cos(frames * 0.1) * 0.5 + 0.5, np.sin(frames * 0.1) * 0.5,
+                      np.zeros(frame_count), np.zeros(frame_count)]
+            for index, channel in enumerate(values):
+                __set_keyframes(action, data_path, index, frames, channel, pose_bone.name)
+
+    return armature_object
+
+
+def __generate_skin_weights(obj, params):
+    bone_count = params['bone_count']
+    influences = params['influences']
+    groups = [obj.vertex_groups.new(name="Bone.%d" % i) for i in range(bone_count)]
+
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get('co', co)
+    first_bone = np.clip(((co[0::3] + 1) / 2 * bone_count).astype(np.int64), 0, bone_count - 1)
+
+    weight = 1.0 / influences
+    for influence in range(influences):
+        bones = (first_bone + influence) % bone_count
+        for bone in range(bone_count):
+            vertices = np.nonzero(bones == bone)[0].tolist()
+            if vertices:
+                groups[bone].add(vertices, weight, 'REPLACE')
+
+
+def __generate_morph_targets(obj, morph_target_count, rng):
+    obj.shape_key_add(name="Basis")
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get('co', co)
+    for i in range(morph_target_count):
+        key_block = obj.shape_key_add(name="Key.%d" % i, from_mix=False)
+        key_block.data.foreach_set('co', co + rng.normal(0, 0.01, co.shape).astype(np.float32))
+
+
+def __animate_object(obj, frame_count):
+    obj.animation_data_create()
+    action = bpy.data.actions.new(obj.name + "Action")
+    obj.animation_data.action = action
+    frames = np.arange(1, frame_count + 1, dtype=np.float32)
+    __set_keyframes(action, 'location', 2, frames, np.sin(frames * 0.2))
+    __set_keyframes(action, 'rotation_euler', 2, frames, frames * 0.05)
+
+    shape_keys = obj.data.shape_keys
+    if shape_keys is not None and shape_keys.animation_data is None:
+        shape_keys.animation_data_create()
+        shape_key_action = bpy.data.actions.new(obj.name + "ShapeKeyAction")
+        shape_keys.animation_data.action = shape_key_action
+        for i, key_block in enumerate(shape_keys.key_blocks[1:]):
+            values = np.sin(frames * 0.1 + i) * 0.5 + 0.5
+            __set_keyframes(shape_key_action, key_block.path_from_id('value'), 0, frames, values)
+
+
+def __set_keyframes(action, data_path, index, frames, values, group=None):
+    fcurve = action.fcurves.new(data_path, index=index, action_group=group or "")
+    fcurve.keyframe_points.add(len(frames))
+    co = np.empty(2 * len(frames), dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    fcurve.keyframe_points.foreach_set('co', co)
+    fcurve.update()
+
+
+def run_case(name, params, directory, trace_memory=True):
+    """Generate, export and import back one benchmark case. Return its results."""
+    clear_blend_data()
+    start = time.perf_counter()
+    generate_scene(params)
+    generate_time = time.perf_counter() - start
+
+    filepath = os.path.join(directory, name + '.glb')
+    result = {'params': params, 'generate_time': generate_time}
+
+    export_stages = __export_stages()
+    result['export'] = __run_timed(
+        export_stages,
+        lambda: bpy.ops.export_scene.gltf(filepath=filepath, export_format='GLB'),
+        trace_memory)
+    result['file_size'] = os.path.getsize(filepath)
+
+    clear_blend_data()
+    import_stages = __import_stages()
+    result['import'] = __run_timed(
+        import_stages,
+        lambda: bpy.ops.import_scene.gltf(filepath=filepath),
+        trace_memory)
+
+    clear_blend_data()
+    return result
+
+
+def __run_timed(stages, f, trace_memory):
+    if trace_memory:
+        tracemalloc.start()
+    with StageTimer(stages) as timer:
+        start = time.perf_counter()
+        f()
+        total = time.perf_counter() - start
+    peak_memory = None
+    if trace_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {'time': total, 'stages': timer.timings, 'peak_memory': peak_memory}
+
+
+def run(case_names, output, trace_memory=True):
+    from io_scene_gltf2 import bl_info
+
+    results = {
+        'version': list(bl_info['version']),
+        'blender': bpy.app.version_string,
+        'revision': bpy.app.build_hash.decode('ascii', 'replace') if isinstance(bpy.app.build_hash, bytes)
+        else str(bpy.app.build_hash),
+        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'cases': {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name in case_names:
+            print("glTF benchmark: running case %s" % name)
+            results['cases'][name] = run_case(name, BENCHMARK_CASES[name], directory, trace_memory)
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare two result dicts, return the list of (case, phase, stage, baseline, current)
+    whose time or peak memory grew by more than threshold.
+    """
+    regressions = []
+    for name, case in current['cases'].items():
+        base_case = baseline['cases'].get(name)
+        if base_case is None:
+            continue
+        for phase in ['export', 'import']:
+            measures = [('total', base_case[phase]['time'], case[phase]['time'])]
+            for stage, timing in case[phase]['stages'].items():
+                if stage in base_case[phase]['stages']:
+                    measures.append((stage, base_case[phase]['stages'][stage]['time'], timing['time']))
+            if case[phase]['peak_memory'] is not None and base_case[phase]['peak_memory'] is not None:
+                measures.append(('peak_memory', base_case[phase]['peak_memory'], case[phase]['peak_memory']))
+
+            for stage, base_value, value in measures:
+                if base_value > 0 and (value - base_value) / base_value > threshold:
+                    regressions.append((name, phase, stage, base_value, value))
+    return regressions
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="glTF export/import benchmark")
+    parser.add_argument('--output', default='gltf_benchmark.json', help="JSON file to write results to")
+    parser.add_argument('--cases', default=','.join(BENCHMARK_CASES.keys()),
+                        help="Comma separated list of cases among: " + ', '.join(BENCHMARK_CASES.keys()))
+    parser.add_argument('--no-memory', action='store_true', help="Do not trace peak memory (faster)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="Compare two result files instead of running the benchmark")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Relative growth reported as regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        for name, phase, stage, base_value, value in regressions:
+            print("REGRESSION %s %s %s: %.4g -> %.4g" % (name, phase, stage, base_value, value))
+        return 1 if regressions else 0
+
+    run(args.cases.split(','), args.output, not args.no_memory)
+    return 0
+
+
+if __name__ == '__main__':
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    sys.exit(main(argv))
@@ -3,6 +3,7 @@
 import time
 
 import bpy
+import os
 import sys
 import traceback
 
@@ -11,8 +12,13 @@ from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.blender.exp import gltf2_blender_gather
 from io_scene_gltf2.blender.exp.gltf2_blender_gltf2_exporter import GlTF2Exporter
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline
+from io_scene_gltf2.io.com import gltf2_io_profile
+from io_scene_gltf2.io.com.gltf2_io_profile import profile_stage
 from io_scene_gltf2.io.exp import gltf2_io_export
 from io_scene_gltf2.io.exp import gltf2_io_draco_compression_extension
+from io_scene_gltf2.io.exp import gltf2_io_mesh_optimizer
+from io_scene_gltf2.io.exp import gltf2_io_mesh_quantization_extension
+from io_scene_gltf2.io.exp import gltf2_io_meshopt_compression_extension
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
 
@@ -28,16 +34,22 @@ def save(context, export_settings):
 
     __notify_start(context)
     start_time = time.time()
-    pre_export_callbacks = export_settings["pre_export_callbacks"]
-    for callback in pre_export_callbacks:
-        callback(export_settings)
+    if export_settings['gltf_profile']:
+        __start_profiling(export_settings)
+    try:
+        pre_export_callbacks = export_settings["pre_export_callbacks"]
+        for callback in pre_export_callbacks:
+            callback(export_settings)
 
-    json, buffer = __export(export_settings)
+        json, buffer = __export(export_settings)
 
-    post_export_callbacks = export_settings["post_export_callbacks"]
-    for callback in post_export_callbacks:
-        callback(export_settings)
-    __write_file(json, buffer, export_settings)
+        post_export_callbacks = export_settings["post_export_callbacks"]
+        for callback in post_export_callbacks:
+            callback(export_settings)
+        __write_file(json, buffer, export_settings)
+    finally:
+        if export_settings['gltf_profile']:
+            __stop_profiling(export_settings)
 
     end_time = time.time()
     __notify_end(context, end_time - start_time)
@@ -62,6 +74,7 @@ def __export(export_settings):
     return json, buffer
 
 
+@profile_stage('gather_gltf', datablock=lambda exporter, export_settings: export_settings['gltf_filepath'])
 def __gather_gltf(exporter, export_settings):
     active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
 
@@ -70,6 +83,15 @@ def __gather_gltf(exporter, export_settings):
     if export_settings['gltf_draco_mesh_compression']:
         gltf2_io_draco_compression_extension.encode_scene_primitives(scenes, export_settings)
         exporter.add_draco_extension()
+    else:
+        if export_settings['gltf_optimize_vertex_cache']:
+            gltf2_io_mesh_optimizer.optimize_scene_primitives(scenes, export_settings)
+        if export_settings['gltf_mesh_quantization']:
+            gltf2_io_mesh_quantization_extension.encode_scene_primitives(scenes, export_settings)
+            exporter.add_mesh_quantization_extension()
+        if export_settings['gltf_meshopt_compression']:
+            gltf2_io_meshopt_compression_extension.encode_scene_primitives(scenes, export_settings)
+            exporter.add_meshopt_extension()
 
     export_user_extensions('gather_gltf_hook', export_settings, active_scene_idx, scenes, animations)
 
@@ -149,6 +171,19 @@ def __write_file(json, buffer, export_settings):
         raise e
 
 
+def __start_profiling(export_settings):
+    gltf2_io_profile.start_profiling(
+        on_event=lambda event: export_user_extensions('gather_profile_event_hook', export_settings, event))
+
+
+def __stop_profiling(export_settings):
+    profiler = gltf2_io_profile.stop_profiling()
+    trace_filepath = os.path.splitext(export_settings['gltf_filepath'])[0] + '.trace.json'
+    profiler.write_chrome_trace(trace_filepath)
+    export_user_extensions('gather_profile_hook', export_settings, profiler)
+    print_console('INFO', 'Profile written to {}'.format(trace_filepath))
+
+
 def __notify_start(context):
     print_console('INFO', 'Starting glTF 2.0 export')
     context.window_manager.progress_begin(0, 100)
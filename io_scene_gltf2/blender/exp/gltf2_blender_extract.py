@@ -6,9 +6,11 @@ from mathutils import Vector
 
 from . import gltf2_blender_export_keys
 from ...io.com.gltf2_io_debug import print_console
+from ...io.com.gltf2_io_profile import profile_stage
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_skins
 
 
+@profile_stage('extract_primitives', datablock=lambda blender_mesh, *args: blender_mesh.name)
 def extract_primitives(blender_mesh, uuid_for_skined_data, blender_vertex_groups, modifiers, export_settings):
     """Extract primitives from a mesh."""
     print_console('INFO', 'Extracting primitive: ' + blender_mesh.name)
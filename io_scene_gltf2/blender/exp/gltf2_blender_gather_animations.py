@@ -7,6 +7,7 @@ import typing
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_animation_channels
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+from io_scene_gltf2.io.com.gltf2_io_profile import profile_stage
 from ..com.gltf2_blender_extras import generate_extras
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 from io_scene_gltf2.blender.exp.gltf2_blender_gather_tree import VExportNode
@@ -42,6 +43,8 @@ def __gather_channels_baked(obj_uuid, export_settings):
 
     return channels if len(channels) > 0 else None
 
+@profile_stage('gather_animations',
+               datablock=lambda obj_uuid, tracks, offset, export_settings: export_settings['vtree'].nodes[obj_uuid].blender_object.name)
 def gather_animations(  obj_uuid: int,
                         tracks: typing.Dict[str, typing.List[int]],
                         offset: int,
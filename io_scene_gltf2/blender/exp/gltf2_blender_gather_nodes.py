@@ -19,9 +19,11 @@ from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.com import gltf2_io_extensions
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+from io_scene_gltf2.io.com.gltf2_io_profile import profile_stage
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_tree
 
 
+@profile_stage('gather_node', datablock=lambda vnode, export_settings: vnode.blender_object.name)
 def gather_node(vnode, export_settings):
     blender_object = vnode.blender_object
 
@@ -11,6 +11,7 @@ from io_scene_gltf2.io.com import gltf2_io_extensions
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 from io_scene_gltf2.io.exp import gltf2_io_buffer
 from io_scene_gltf2.io.exp import gltf2_io_image_data
+from io_scene_gltf2.io.exp import gltf2_io_meshopt_compression_extension
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
@@ -60,6 +61,8 @@ class GlTF2Exporter:
         )
 
         self.__buffer = gltf2_io_buffer.Buffer()
+        self.__meshopt_fallback_byte_length = 0
+        self.__meshopt_fallback_buffer_views = []
         self.__images = {}
 
         # mapping of all glTFChildOfRootProperty types to their corresponding root level arrays
@@ -128,6 +131,13 @@ class GlTF2Exporter:
             )
             self.__gltf.buffers.append(buffer)
 
+        if self.__meshopt_fallback_byte_length > 0:
+            fallback_buffer = gltf2_io_meshopt_compression_extension.gather_fallback_buffer(
+                self.__meshopt_fallback_byte_length)
+            fallback_buffer_index = self.__to_reference(fallback_buffer)
+            for fallback_buffer_view in self.__meshopt_fallback_buffer_views:
+                fallback_buffer_view.buffer = fallback_buffer_index
+
         self.__finalized = True
 
         if is_glb:
@@ -142,6 +152,25 @@ class GlTF2Exporter:
         self.__gltf.extensions_required.append('KHR_draco_mesh_compression')
         self.__gltf.extensions_used.append('KHR_draco_mesh_compression')
 
+    def add_mesh_quantization_extension(self):
+        """
+        Register mesh quantization extension as *used* and *required*.
+
+        :return:
+        """
+        self.__gltf.extensions_required.append('KHR_mesh_quantization')
+        self.__gltf.extensions_used.append('KHR_mesh_quantization')
+
+    def add_meshopt_extension(self):
+        """
+        Register meshopt extension as *used* and *required*.
+        The fallback buffer holds no data, so loaders without meshopt support can't read the file.
+
+        :return:
+        """
+        self.__gltf.extensions_required.append('EXT_meshopt_compression')
+        self.__gltf.extensions_used.append('EXT_meshopt_compression')
+
     def finalize_images(self):
         """
         Write all images.
@@ -297,6 +326,16 @@ class GlTF2Exporter:
         if type(node) in self.__propertyTypeLookup:
             return __traverse_property(node)
 
+        # compressed binary data is moved to the buffer, and referenced by a view of the fallback buffer
+        if isinstance(node, gltf2_io_meshopt_compression_extension.MeshoptBinaryData):
+            buffer_view = self.__buffer.add_and_get_view(node)
+            fallback_buffer_view = gltf2_io_meshopt_compression_extension.gather_fallback_buffer_view(
+                buffer_view, node, self.__meshopt_fallback_byte_length)
+            # offsets should be a multiple of 4
+            self.__meshopt_fallback_byte_length += (node.decoded_byte_length + 3) // 4 * 4
+            self.__meshopt_fallback_buffer_views.append(fallback_buffer_view)
+            return self.__to_reference(fallback_buffer_view)
+
         # binary data needs to be moved to a buffer and referenced with a buffer view
         if isinstance(node, gltf2_io_binary_data.BinaryData):
             buffer_view = self.__buffer.add_and_get_view(node)
@@ -6,6 +6,7 @@ from mathutils import Matrix
 import numpy as np
 
 from ...io.imp.gltf2_io_binary import BinaryData
+from ...io.com.gltf2_io_profile import profile_stage
 from ..com.gltf2_blender_extras import set_extras
 from .gltf2_blender_material import BlenderMaterial
 from ...io.com.gltf2_io_debug import print_console
@@ -20,6 +21,7 @@ class BlenderMesh():
         raise RuntimeError("%s should not be instantiated" % cls)
 
     @staticmethod
+    @profile_stage('BlenderMesh.create', datablock=lambda gltf, mesh_idx, skin_idx: gltf.data.meshes[mesh_idx].name)
     def create(gltf, mesh_idx, skin_idx):
         """Mesh creation."""
         return create_mesh(gltf, mesh_idx, skin_idx)
@@ -8,6 +8,7 @@ from .gltf2_blender_animation import BlenderAnimation
 from .gltf2_blender_vnode import VNode, compute_vnodes
 from ..com.gltf2_blender_extras import set_extras
 from io_scene_gltf2.io.imp.gltf2_io_user_extensions import import_user_extensions
+from io_scene_gltf2.io.com.gltf2_io_profile import profile_stage
 
 
 class BlenderScene():
@@ -16,6 +17,7 @@ class BlenderScene():
         raise RuntimeError("%s should not be instantiated" % cls)
 
     @staticmethod
+    @profile_stage('BlenderScene.create')
     def create(gltf):
         """Scene creation."""
         scene = bpy.context.scene
@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2018-2022 The glTF-Blender-IO authors.
+
+#
+# Imports
+#
+
+import functools
+import json
+import os
+import time
+import tracemalloc
+
+#
+# Globals
+#
+
+g_profiler = None
+
+#
+# Functions
+#
+
+
+class Profiler:
+    """
+    Records wall time, call count and allocated bytes of pipeline stages.
+    Stages can be nested; each finished stage is kept as an event, and can be written as a Chrome trace
+    (load it in chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, on_event=None, trace_memory=True):
+        self.on_event = on_event
+        self.trace_memory = trace_memory
+        self.events = []
+        self.stages = {}
+        self.datablocks = {}
+        self.__stack = []
+        self.__start = time.perf_counter()
+        self.__started_tracemalloc = False
+
+    def begin(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracemalloc = True
+
+    def end(self):
+        if self.__started_tracemalloc:
+            tracemalloc.stop()
+            self.__started_tracemalloc = False
+
+    def __allocated(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def push(self, stage, datablock=None):
+        self.__stack.append((stage, datablock, time.perf_counter(), self.__allocated()))
+
+    def pop(self):
+        stage, datablock, start, allocated_start = self.__stack.pop()
+        end = time.perf_counter()
+        event = {
+            'stage': stage,
+            'datablock': datablock,
+            'start': start - self.__start,
+            'duration': end - start,
+            'allocated': self.__allocated() - allocated_start,
+            'depth': len(self.__stack),
+        }
+        self.events.append(event)
+
+        for stats in [self.stages.setdefault(stage, self.__new_stats()),
+                      self.datablocks.setdefault((stage, datablock), self.__new_stats())]:
+            stats['time'] += event['duration']
+            stats['calls'] += 1
+            stats['allocated'] += event['allocated']
+
+        if self.on_event is not None:
+            self.on_event(event)
+
+    @staticmethod
+    def __new_stats():
+        return {'time': 0.0, 'calls': 0, 'allocated': 0}
+
+    def to_chrome_trace(self):
+        trace_events = []
+        for event in self.events:
+            name = event['stage'] if event['datablock'] is None else "{} ({})".format(event['stage'], event['datablock'])
+            trace_events.append({
+                'name': name,
+                'cat': event['stage'],
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['duration'] * 1e6,
+                'pid': os.getpid(),
+                'tid': 0,
+                'args': {'datablock': event['datablock'], 'allocated': event['allocated']},
+            })
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'stages': self.stages,
+                'datablocks': [
+                    dict(stage=stage, datablock=datablock, **stats)
+                    for (stage, datablock), stats in self.datablocks.items()
+                ],
+            },
+        }
+
+    def write_chrome_trace(self, filepath):
+        with open(filepath, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def start_profiling(on_event=None, trace_memory=True):
+    """Install a profiler, recording all stages until stop_profiling()."""
+    global g_profiler
+    g_profiler = Profiler(on_event, trace_memory)
+    g_profiler.begin()
+    return g_profiler
+
+
+def stop_profiling():
+    global g_profiler
+    profiler = g_profiler
+    g_profiler = None
+    if profiler is not None:
+        profiler.end()
+    return profiler
+
+
+def profile_stage(stage, datablock=None):
+    """
+    Decorates a pipeline stage. Does nothing more than calling the function, unless profiling has started.
+    :param datablock: optional function, passed all the arguments of the stage, returning the name of the
+    datablock processed by this call.
+    """
+    def inner(func):
+        @functools.wraps(func)
+        def wrapper_profiled(*args, **kwargs):
+            profiler = g_profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            name = None
+            if datablock is not None:
+                try:
+                    name = datablock(*args, **kwargs)
+                except Exception:
+                    pass
+
+            profiler.push(stage, name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.pop()
+
+        return wrapper_profiled
+
+    return inner
@@ -9,11 +9,12 @@ from io_scene_gltf2.io.com import gltf2_io_constants
 class BinaryData:
     """Store for gltf binary data that can later be stored in a buffer."""
 
-    def __init__(self, data: bytes, bufferViewTarget=None):
+    def __init__(self, data: bytes, bufferViewTarget=None, byteStride=None):
         if not isinstance(data, bytes):
             raise TypeError("Data is not a bytes array")
         self.data = data
         self.bufferViewTarget = bufferViewTarget
+        self.byteStride = byteStride
 
     def __eq__(self, other):
         return self.data == other.data
@@ -8,6 +8,7 @@
 import json
 import struct
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
+from io_scene_gltf2.io.com.gltf2_io_profile import profile_stage
 
 #
 # Globals
@@ -19,6 +20,7 @@ from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extension
 from collections import OrderedDict
 
 
+@profile_stage('save_gltf', datablock=lambda gltf, export_settings, *args: export_settings['gltf_filepath'])
 def save_gltf(gltf, export_settings, encoder, glb_buffer):
     # Use a class here, to be able to pass data by reference to hook (to be able to change them inside hook)
     class GlTF_format:
@@ -0,0 +1,311 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2018-2022 The glTF-Blender-IO authors.
+
+import numpy as np
+
+from io_scene_gltf2.io.com import gltf2_io
+from io_scene_gltf2.io.com import gltf2_io_constants
+from io_scene_gltf2.io.exp.gltf2_io_binary_data import BinaryData
+
+
+# Pure NumPy ports of the meshoptimizer index optimizers and codecs,
+# so that no native library is needed at export time.
+
+VERTEX_CACHE_SIZE = 16
+
+VERTEX_HEADER = 0xa0  # Vertex codec, version 0
+SEQUENCE_HEADER = 0xd1  # Index sequence codec, version 1
+VERTEX_TAIL_MIN_SIZE = 32
+INDEX_TAIL_SIZE = 4
+
+
+def optimize_scene_primitives(scenes, export_settings):
+    """
+    Reorder triangles for the post-transform vertex cache, then reorder vertices in first use order.
+    Every attribute and morph target of a primitive is remapped along with its indices.
+    """
+    optimized_primitives_cache = set()
+
+    for scene in scenes:
+        for node in scene.nodes:
+            __traverse_node(node, lambda node: __optimize_node(node, optimized_primitives_cache))
+
+
+def __traverse_node(node, f):
+    f(node)
+    if node.children is not None:
+        for child in node.children:
+            __traverse_node(child, f)
+
+
+def __optimize_node(node, optimized_primitives_cache):
+    if node.mesh is None:
+        return
+    for primitive in node.mesh.primitives:
+        if primitive in optimized_primitives_cache:
+            continue
+        optimized_primitives_cache.add(primitive)
+        __optimize_primitive(primitive)
+
+
+def __optimize_primitive(primitive):
+    # Only do TRIANGLES primitives
+    if primitive.mode not in [None, 4] or primitive.indices is None:
+        return
+
+    if 'POSITION' not in primitive.attributes or primitive.attributes['POSITION'].buffer_view is None:
+        return
+
+    vertex_count = primitive.attributes['POSITION'].count
+    indices = accessor_to_array(primitive.indices).reshape(-1)
+    if len(indices) < 3:
+        return
+
+    indices = optimize_vertex_cache(indices, vertex_count)
+    remap, unique_count = optimize_vertex_fetch_remap(indices, vertex_count)
+    order = np.argsort(remap, kind='stable')[:unique_count]
+    indices = remap[indices]
+
+    component_type = primitive.indices.component_type
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
+    primitive.indices = __clone_accessor(
+        primitive.indices,
+        BinaryData(indices.astype(dtype).tobytes(), gltf2_io_constants.BufferViewTarget.ELEMENT_ARRAY_BUFFER),
+        len(indices),
+    )
+
+    for attr_name in primitive.attributes:
+        primitive.attributes[attr_name] = __remap_accessor(primitive.attributes[attr_name], order)
+    for target in primitive.targets or []:
+        for attr_name in target:
+            target[attr_name] = __remap_accessor(target[attr_name], order)
+
+
+def __remap_accessor(accessor, order):
+    array = accessor_to_array(accessor)[order]
+    remapped = __clone_accessor(
+        accessor,
+        BinaryData(array.tobytes(), gltf2_io_constants.BufferViewTarget.ARRAY_BUFFER),
+        len(array),
+    )
+    # Unused vertices are dropped, so bounds may shrink
+    if accessor.max is not None and len(array) > 0:
+        remapped.max = np.amax(array, axis=0).tolist()
+        remapped.min = np.amin(array, axis=0).tolist()
+    return remapped
+
+
+def __clone_accessor(accessor, buffer_view, count):
+    return gltf2_io.Accessor(
+        buffer_view=buffer_view,
+        byte_offset=None,
+        component_type=accessor.component_type,
+        count=count,
+        extensions=accessor.extensions,
+        extras=accessor.extras,
+        max=accessor.max,
+        min=accessor.min,
+        name=accessor.name,
+        normalized=accessor.normalized,
+        sparse=None,
+        type=accessor.type,
+    )
+
+
+def accessor_to_array(accessor):
+    """Read back the tightly packed data of an accessor as a (count, num_elems) array."""
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(accessor.component_type)
+    num_elems = gltf2_io_constants.DataType.num_elements(accessor.type)
+    array = np.frombuffer(accessor.buffer_view.data, dtype=dtype)
+    return array.reshape(accessor.count, num_elems)
+
+
+def optimize_vertex_cache(indices, vertex_count, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Reorder triangles to reduce vertex shader invocations (Tipsify, Sander et al. 2007).
+
+    :param indices: triangle list indices
+    :return: reordered triangle list indices
+    """
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    triangle_count = len(triangles)
+    corners = triangles.reshape(-1)
+
+    # Vertex -> triangle adjacency, as compressed rows
+    live = np.bincount(corners, minlength=vertex_count)
+    offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(live, out=offsets[1:])
+    adjacency = (np.argsort(corners, kind='stable') // 3).tolist()
+    offsets = offsets.tolist()
+    live = live.tolist()
+    triangles = triangles.tolist()
+
+    cache_timestamps = [0] * vertex_count
+    emitted = bytearray(triangle_count)
+    dead_end = []
+    result = []
+
+    timestamp = cache_size + 1
+    cursor = 0
+    current = 0
+    while current >= 0:
+        candidates = []
+
+        for triangle in adjacency[offsets[current]:offsets[current + 1]]:
+            if emitted[triangle]:
+                continue
+            for v in triangles[triangle]:
+                result.append(v)
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if timestamp - cache_timestamps[v] > cache_size:
+                    cache_timestamps[v] = timestamp
+                    timestamp += 1
+            emitted[triangle] = 1
+
+        # Pick the candidate that will still be in cache for all its remaining triangles
+        current = -1
+        best_priority = -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if timestamp - cache_timestamps[v] + 2 * live[v] <= cache_size:
+                    priority = timestamp - cache_timestamps[v]
+                if priority > best_priority:
+                    best_priority = priority
+                    current = v
+
+        if current < 0:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    current = v
+                    break
+
+        if current < 0:
+            while cursor < vertex_count:
+                if live[cursor] > 0:
+                    current = cursor
+                    break
+                cursor += 1
+
+    return np.array(result, dtype=np.uint32)
+
+
+def optimize_vertex_fetch_remap(indices, vertex_count):
+    """
+    Compute a remap table that renumbers vertices in the order of first use by the index buffer.
+    Unused vertices are mapped to 0xffffffff.
+
+    :return: remap table and the number of used vertices
+    """
+    used, first_use = np.unique(indices, return_index=True)
+    used = used[np.argsort(first_use, kind='stable')]
+
+    remap = np.full(vertex_count, 0xffffffff, dtype=np.uint32)
+    remap[used] = np.arange(len(used), dtype=np.uint32)
+    return remap, len(used)
+
+
+def vertex_block_size(byte_stride):
+    return min((8192 // byte_stride) & ~15, 256)
+
+
+def encode_vertex_buffer(data, count, byte_stride):
+    """
+    Encode vertex data with the meshoptimizer vertex codec (EXT_meshopt_compression ATTRIBUTES mode).
+
+    :param data: bytes holding count * byte_stride bytes
+    :return: encoded bytes
+    """
+    assert byte_stride > 0 and byte_stride <= 256 and byte_stride % 4 == 0
+    vertices = np.frombuffer(data, dtype=np.uint8).reshape(count, byte_stride)
+    first_vertex = vertices[0].tobytes() if count > 0 else bytes(byte_stride)
+
+    # Byte-wise deltas against the previous vertex, zigzag encoded
+    previous = np.concatenate((vertices[:1], vertices[:-1]))
+    deltas = vertices - previous
+    deltas = ((deltas.view(np.int8) >> 7).view(np.uint8) ^ (deltas << 1)).astype(np.uint8)
+
+    block_size = vertex_block_size(byte_stride)
+    block_count = (count + block_size - 1) // block_size
+    group_count = block_size // 16
+
+    # Zero padded blocks, laid out as (block, byte, group, value)
+    blocks = np.zeros((block_count * block_size, byte_stride), dtype=np.uint8)
+    blocks[:count] = deltas
+    groups = blocks.reshape(block_count, group_count, 16, byte_stride).transpose(0, 3, 1, 2)
+
+    # Groups past the end of the last block are not encoded
+    block_groups = np.full(block_count, group_count)
+    if block_count > 0:
+        block_groups[-1] = (count - (block_count - 1) * block_size + 15) // 16
+    valid = np.arange(group_count)[np.newaxis, :] < block_groups[:, np.newaxis]
+    valid = np.broadcast_to(valid[:, np.newaxis, :], groups.shape[:3])
+
+    # Pick the smallest encoding per group: zeros, 2 bits, 4 bits or raw bytes
+    size_2 = 4 + np.count_nonzero(groups >= 3, axis=3)
+    size_4 = 8 + np.count_nonzero(groups >= 15, axis=3)
+    modes = np.full(groups.shape[:3], 3, dtype=np.uint8)
+    best = np.full(groups.shape[:3], 16)
+    modes[size_2 < best] = 1
+    best = np.minimum(best, size_2)
+    modes[size_4 < best] = 2
+    modes[np.all(groups == 0, axis=3)] = 0
+    modes[~valid] = 0
+
+    packed_2 = np.minimum(groups, 3).reshape(groups.shape[:3] + (4, 4))
+    packed_2 = (packed_2[..., 0] << 6) | (packed_2[..., 1] << 4) | (packed_2[..., 2] << 2) | packed_2[..., 3]
+    packed_4 = np.minimum(groups, 15).reshape(groups.shape[:3] + (8, 2))
+    packed_4 = (packed_4[..., 0] << 4) | packed_4[..., 1]
+
+    payload = np.zeros(groups.shape[:3] + (24,), dtype=np.uint8)
+    payload[..., 8:] = groups
+    payload_mask = np.zeros(payload.shape, dtype=bool)
+    payload[modes == 1, :4] = packed_2[modes == 1]
+    payload_mask[modes == 1, :4] = True
+    payload_mask[modes == 1, 8:] = groups[modes == 1] >= 3
+    payload[modes == 2, :8] = packed_4[modes == 2]
+    payload_mask[modes == 2, :8] = True
+    payload_mask[modes == 2, 8:] = groups[modes == 2] >= 15
+    payload_mask[modes == 3, 8:] = True
+
+    # Two bits of header per group, four groups per header byte
+    header_count = (group_count + 3) // 4
+    header_modes = np.zeros(groups.shape[:2] + (header_count * 4,), dtype=np.uint8)
+    header_modes[..., :group_count] = modes
+    header_modes = header_modes.reshape(groups.shape[:2] + (header_count, 4))
+    header = header_modes[..., 0] | (header_modes[..., 1] << 2) | (header_modes[..., 2] << 4) | (header_modes[..., 3] << 6)
+    header_mask = np.arange(header_count)[np.newaxis, :] < ((block_groups + 3) // 4)[:, np.newaxis]
+    header_mask = np.broadcast_to(header_mask[:, np.newaxis, :], header.shape)
+
+    stream = np.concatenate((header, payload.reshape(groups.shape[:2] + (-1,))), axis=2)
+    stream_mask = np.concatenate((header_mask, payload_mask.reshape(groups.shape[:2] + (-1,))), axis=2)
+
+    tail_size = max(byte_stride, VERTEX_TAIL_MIN_SIZE)
+    return bytes([VERTEX_HEADER]) + stream[stream_mask].tobytes() + bytes(tail_size - byte_stride) + first_vertex
+
+
+def encode_index_sequence(indices):
+    """
+    Encode index data with the meshoptimizer index sequence codec (EXT_meshopt_compression INDICES mode).
+    Deltas are always taken against the previous index, i.e. only the first baseline is used.
+
+    :return: encoded bytes
+    """
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    previous = np.concatenate(([0], indices[:-1]))
+    deltas = (indices - previous) & 0xffffffff
+    zigzag = ((deltas << 1) & 0xffffffff) ^ np.where(deltas & 0x80000000, 0xffffffff, 0)
+    values = (zigzag << 1) & 0xffffffff
+
+    # Little endian base 128 varints
+    shifts = np.arange(5, dtype=np.int64) * 7
+    lengths = 1 + np.count_nonzero(values[:, np.newaxis] >> shifts[1:] != 0, axis=1)
+    chunks = (values[:, np.newaxis] >> shifts) & 127
+    continued = np.arange(5)[np.newaxis, :] < (lengths[:, np.newaxis] - 1)
+    chunks |= np.where(continued, 128, 0)
+    used = np.arange(5)[np.newaxis, :] < lengths[:, np.newaxis]
+
+    return bytes([SEQUENCE_HEADER]) + chunks.astype(np.uint8)[used].tobytes() + bytes(INDEX_TAIL_SIZE)
@@ -0,0 +1,257 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2018-2022 The glTF-Blender-IO authors.
+
+import numpy as np
+
+from io_scene_gltf2.io.com import gltf2_io
+from io_scene_gltf2.io.com import gltf2_io_constants
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+from io_scene_gltf2.io.exp.gltf2_io_binary_data import BinaryData
+from io_scene_gltf2.io.exp.gltf2_io_mesh_optimizer import accessor_to_array
+
+
+def encode_scene_primitives(scenes, export_settings):
+    """
+    Handles KHR_mesh_quantization.
+    Stores vertex attributes as (normalized) integers. Positions are quantized on a grid
+    spanning the bounds of the mesh; the dequantization is stored as the transform of a new
+    child node holding the mesh.
+    """
+    mesh_nodes = {}
+    for scene in scenes:
+        for node in scene.nodes:
+            __traverse_node(node, lambda node: __collect_mesh_node(node, mesh_nodes))
+
+    # Accessors are shared between meshes created from the same Blender mesh data.
+    quantized_accessors_cache = {}
+
+    for mesh, nodes in mesh_nodes.values():
+        # Skinned meshes ignore their node transform, and morph target
+        # deltas would need the same grid: keep float positions for those.
+        quantize_position = all(node.skin is None for node in nodes) \
+            and all(not primitive.targets for primitive in mesh.primitives)
+
+        dequantization = None
+        if quantize_position:
+            dequantization = __mesh_dequantization(mesh, export_settings)
+
+        for primitive in mesh.primitives:
+            __encode_primitive(primitive, dequantization, quantized_accessors_cache, export_settings)
+
+        if dequantization is None:
+            continue
+
+        print_console('INFO', 'Mesh quantization: Quantized positions of mesh {}.'.format(mesh.name))
+        translation, scale = dequantization
+        for node in nodes:
+            __move_mesh_to_dequantization_node(node, translation, scale)
+
+
+def __traverse_node(node, f):
+    f(node)
+    if node.children is not None:
+        for child in node.children:
+            __traverse_node(child, f)
+
+
+def __collect_mesh_node(node, mesh_nodes):
+    if node.mesh is None:
+        return
+    mesh_nodes.setdefault(id(node.mesh), (node.mesh, []))[1].append(node)
+
+
+def __mesh_dequantization(mesh, export_settings):
+    positions = [
+        primitive.attributes['POSITION'] for primitive in mesh.primitives
+        if 'POSITION' in primitive.attributes
+        and primitive.attributes['POSITION'].buffer_view is not None
+        and primitive.attributes['POSITION'].component_type == gltf2_io_constants.ComponentType.Float
+    ]
+    if len(positions) != len(mesh.primitives):
+        return None
+
+    bounds_max = np.amax([position.max for position in positions], axis=0)
+    bounds_min = np.amin([position.min for position in positions], axis=0)
+
+    # Uniform scale, so that normals are not distorted by the node transform
+    extent = float(np.amax(bounds_max - bounds_min)) / 2
+    if extent == 0:
+        extent = 1.0
+    steps = (1 << (export_settings['gltf_mesh_quantization_position'] - 1)) - 1
+
+    translation = ((bounds_max + bounds_min) / 2).tolist()
+    scale = extent / steps
+    return translation, scale
+
+
+def __move_mesh_to_dequantization_node(node, translation, scale):
+    dequantization_node = gltf2_io.Node(
+        camera=None,
+        children=[],
+        extensions=None,
+        extras=None,
+        matrix=None,
+        mesh=node.mesh,
+        name=node.name,
+        rotation=None,
+        scale=[scale] * 3,
+        skin=None,
+        translation=translation,
+        weights=node.weights,
+    )
+    node.mesh = None
+    node.weights = None
+    if node.children is None:
+        node.children = []
+    node.children.append(dequantization_node)
+
+
+def __is_float_accessor(accessor):
+    return accessor.buffer_view is not None and accessor.component_type == gltf2_io_constants.ComponentType.Float
+
+
+def __encode_primitive(primitive, dequantization, quantized_accessors_cache, export_settings):
+    # Weights of all the WEIGHTS_n sets of a vertex must sum up to one together
+    weights_names = sorted(
+        (attr_name for attr_name in primitive.attributes if attr_name.startswith('WEIGHTS_')),
+        key=lambda attr_name: int(attr_name[len('WEIGHTS_'):])
+    )
+    weights_accessors = [primitive.attributes[attr_name] for attr_name in weights_names]
+    if weights_accessors and all(__is_float_accessor(accessor) for accessor in weights_accessors):
+        key = (tuple(id(accessor) for accessor in weights_accessors), 'WEIGHTS')
+        if key not in quantized_accessors_cache:
+            quantized_accessors_cache[key] = __quantize_weights_accessors(weights_accessors)
+        for attr_name, quantized in zip(weights_names, quantized_accessors_cache[key]):
+            primitive.attributes[attr_name] = quantized
+
+    for attr_name in primitive.attributes:
+        if attr_name.startswith('WEIGHTS_'):
+            continue
+        accessor = primitive.attributes[attr_name]
+        if not __is_float_accessor(accessor):
+            continue
+
+        key = (id(accessor), attr_name, dequantization is not None and attr_name == 'POSITION')
+        if key not in quantized_accessors_cache:
+            quantized_accessors_cache[key] = __quantize_accessor(accessor, attr_name, dequantization, export_settings)
+        primitive.attributes[attr_name] = quantized_accessors_cache[key]
+
+
+def __quantize_accessor(accessor, attr_name, dequantization, export_settings):
+    values = accessor_to_array(accessor)
+
+    if attr_name == 'POSITION':
+        if dequantization is None:
+            return accessor
+        translation, scale = dequantization
+        quantized = np.round((values - np.array(translation, dtype=np.float32)) / scale)
+        return __to_accessor(accessor, quantized, gltf2_io_constants.ComponentType.Short, False, True)
+
+    if attr_name in ['NORMAL', 'TANGENT']:
+        bits = export_settings['gltf_mesh_quantization_normal']
+        component_type = gltf2_io_constants.ComponentType.Byte if bits <= 8 \
+            else gltf2_io_constants.ComponentType.Short
+        quantized = quantize_normalized(values, bits, component_type)
+        return __to_accessor(accessor, quantized, component_type, True, False)
+
+    if attr_name.startswith('TEXCOORD_'):
+        # Texture coordinates outside of the unit square are kept as floats
+        if np.amin(values) < 0.0 or np.amax(values) > 1.0:
+            return accessor
+        bits = export_settings['gltf_mesh_quantization_texcoord']
+        component_type = gltf2_io_constants.ComponentType.UnsignedShort
+        quantized = quantize_normalized(values, bits, component_type)
+        return __to_accessor(accessor, quantized, component_type, True, False)
+
+    if attr_name.startswith('COLOR_'):
+        if np.amin(values) < 0.0 or np.amax(values) > 1.0:
+            return accessor
+        component_type = gltf2_io_constants.ComponentType.UnsignedShort
+        quantized = quantize_normalized(values, 16, component_type)
+        return __to_accessor(accessor, quantized, component_type, True, False)
+
+    return accessor
+
+
+def __quantize_weights_accessors(accessors):
+    component_type = gltf2_io_constants.ComponentType.UnsignedShort
+    quantized = quantize_weights([accessor_to_array(accessor) for accessor in accessors])
+    return [
+        __to_accessor(accessor, weights, component_type, True, False)
+        for accessor, weights in zip(accessors, quantized)
+    ]
+
+
+def quantize_weights(weights_sets):
+    """
+    Quantize the WEIGHTS_n sets of a primitive, given as a list of (N, 4) arrays, to normalized USHORT.
+    The weights of a vertex are normalized over all the sets together, and the rounding error is put on
+    the biggest weight so that they still sum up to 65535. Vertices without any weight keep zero weights.
+    """
+    weights = np.clip(np.concatenate(weights_sets, axis=1), 0.0, None)
+    total = weights.sum(axis=1)
+    weighted = total > 0
+    weights[weighted] /= total[weighted, None]
+
+    quantized = np.round(weights * 65535).astype(np.int64)
+    rows = np.nonzero(weighted)[0]
+    biggest = np.argmax(quantized[rows], axis=1)
+    quantized[rows, biggest] += 65535 - quantized[rows].sum(axis=1)
+
+    return np.split(quantized, np.cumsum([w.shape[1] for w in weights_sets])[:-1], axis=1)
+
+
+def quantize_normalized(values, bits, component_type):
+    """
+    Quantize values in [-1, 1] (signed types) or [0, 1] (unsigned types) to a normalized integer type.
+    When fewer bits than the size of the type are requested, the low bits are left to zero.
+    """
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
+    type_bits = gltf2_io_constants.ComponentType.get_size(component_type) * 8
+    bits = min(bits, type_bits)
+    shift = type_bits - bits
+    type_max = np.iinfo(dtype).max
+    steps = type_max >> shift
+
+    if np.iinfo(dtype).min < 0:
+        values = np.clip(values, -1.0, 1.0)
+    else:
+        values = np.clip(values, 0.0, 1.0)
+    return np.round(values * steps).astype(np.int64) << shift
+
+
+def __to_accessor(accessor, quantized, component_type, normalized, include_max_and_min):
+    dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
+    quantized = quantized.astype(dtype)
+
+    # Vertex attribute elements must be aligned to 4 bytes
+    row_size = quantized.shape[1] * quantized.itemsize
+    byte_stride = None
+    if row_size % 4 != 0:
+        byte_stride = (row_size + 3) // 4 * 4
+        padded = np.zeros((len(quantized), byte_stride // quantized.itemsize), dtype=dtype)
+        padded[:, :quantized.shape[1]] = quantized
+        data = padded.tobytes()
+    else:
+        data = quantized.tobytes()
+
+    amax = None
+    amin = None
+    if include_max_and_min:
+        amax = np.amax(quantized, axis=0).tolist()
+        amin = np.amin(quantized, axis=0).tolist()
+
+    return gltf2_io.Accessor(
+        buffer_view=BinaryData(data, gltf2_io_constants.BufferViewTarget.ARRAY_BUFFER, byte_stride),
+        byte_offset=None,
+        component_type=component_type,
+        count=accessor.count,
+        extensions=None,
+        extras=None,
+        max=amax,
+        min=amin,
+        name=accessor.name,
+        normalized=normalized or None,
+        sparse=None,
+        type=accessor.type,
+    )
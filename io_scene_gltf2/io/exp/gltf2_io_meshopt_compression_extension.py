@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2018-2022 The glTF-Blender-IO authors.
+
+from io_scene_gltf2.io.com import gltf2_io
+from io_scene_gltf2.io.com import gltf2_io_constants
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+from io_scene_gltf2.io.exp.gltf2_io_binary_data import BinaryData
+from io_scene_gltf2.io.exp import gltf2_io_mesh_optimizer
+
+
+class MeshoptBinaryData(BinaryData):
+    """Compressed binary data, stored in a buffer view of the EXT_meshopt_compression fallback buffer."""
+
+    def __init__(self, data: bytes, count, byte_stride, mode, bufferViewTarget=None):
+        super().__init__(data, bufferViewTarget, byte_stride)
+        self.count = count
+        self.mode = mode
+
+    @property
+    def decoded_byte_length(self):
+        return self.count * self.byteStride
+
+
+def encode_scene_primitives(scenes, export_settings):
+    """
+    Handles EXT_meshopt_compression.
+    Replaces index and vertex attribute data with data encoded by the meshoptimizer codecs.
+    """
+    encoded_accessors_cache = set()
+
+    for scene in scenes:
+        for node in scene.nodes:
+            __traverse_node(node, lambda node: __encode_node(node, encoded_accessors_cache))
+
+
+def __traverse_node(node, f):
+    f(node)
+    if node.children is not None:
+        for child in node.children:
+            __traverse_node(child, f)
+
+
+def __encode_node(node, encoded_accessors_cache):
+    if node.mesh is None:
+        return
+
+    print_console('INFO', 'Meshopt encoder: Encoding mesh {}.'.format(node.name))
+    for primitive in node.mesh.primitives:
+        if primitive.indices is not None:
+            __encode_accessor(primitive.indices, 'INDICES', encoded_accessors_cache)
+        for attr_name in primitive.attributes:
+            __encode_accessor(primitive.attributes[attr_name], 'ATTRIBUTES', encoded_accessors_cache)
+        for target in primitive.targets or []:
+            for attr_name in target:
+                __encode_accessor(target[attr_name], 'ATTRIBUTES', encoded_accessors_cache)
+
+
+def __encode_accessor(accessor, mode, encoded_accessors_cache):
+    binary_data = accessor.buffer_view
+    if accessor in encoded_accessors_cache or not isinstance(binary_data, BinaryData):
+        return
+    encoded_accessors_cache.add(accessor)
+
+    byte_stride = binary_data.byteStride
+    if byte_stride is None:
+        byte_stride = gltf2_io_constants.ComponentType.get_size(accessor.component_type) \
+            * gltf2_io_constants.DataType.num_elements(accessor.type)
+
+    if mode == 'INDICES':
+        if byte_stride not in [2, 4]:
+            return
+        indices = gltf2_io_mesh_optimizer.accessor_to_array(accessor)
+        encoded_data = gltf2_io_mesh_optimizer.encode_index_sequence(indices)
+    else:
+        # Attributes need 4 byte aligned elements, no bigger than 256 bytes.
+        if byte_stride % 4 != 0 or byte_stride > 256:
+            return
+        encoded_data = gltf2_io_mesh_optimizer.encode_vertex_buffer(binary_data.data, accessor.count, byte_stride)
+
+    accessor.buffer_view = MeshoptBinaryData(encoded_data, accessor.count, byte_stride, mode,
+                                             binary_data.bufferViewTarget)
+
+
+def gather_fallback_buffer_view(buffer_view: gltf2_io.BufferView, binary_data: MeshoptBinaryData, fallback_byte_offset):
+    """
+    Create the buffer view referenced by the accessors, pointing at the (uncompressed) fallback buffer.
+    The view of the compressed data in the main buffer is moved into the extension.
+    The fallback buffer index is set once the fallback buffer is added to the glTF buffers.
+    """
+    extension = {
+        'buffer': buffer_view.buffer,
+        'byteOffset': buffer_view.byte_offset,
+        'byteLength': buffer_view.byte_length,
+        'byteStride': binary_data.byteStride,
+        'count': binary_data.count,
+        'mode': binary_data.mode,
+    }
+
+    return gltf2_io.BufferView(
+        buffer=None,
+        byte_length=binary_data.decoded_byte_length,
+        byte_offset=fallback_byte_offset,
+        byte_stride=binary_data.byteStride if binary_data.mode == 'ATTRIBUTES' else None,
+        extensions={'EXT_meshopt_compression': extension},
+        extras=None,
+        name=None,
+        target=binary_data.bufferViewTarget
+    )
+
+
+def gather_fallback_buffer(byte_length):
+    return gltf2_io.Buffer(
+        byte_length=byte_length,
+        extensions={'EXT_meshopt_compression': {'fallback': True}},
+        extras=None,
+        name=None,
+        uri=None
+    )
@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2018-2022 The glTF-Blender-IO authors.
+
+#
+# KHR_mesh_quantization export tests. Run headless with:
+#
+#   blender -b --factory-startup -P test_mesh_quantization.py
+#
+
+import sys
+import unittest
+
+import numpy as np
+
+from io_scene_gltf2.io.com import gltf2_io
+from io_scene_gltf2.io.com import gltf2_io_constants
+from io_scene_gltf2.io.exp.gltf2_io_binary_data import BinaryData
+from io_scene_gltf2.io.exp.gltf2_io_mesh_optimizer import accessor_to_array
+from io_scene_gltf2.io.exp.gltf2_io_mesh_quantization_extension import encode_scene_primitives, quantize_weights
+
+
+EXPORT_SETTINGS = {
+    'gltf_mesh_quantization_position': 16,
+    'gltf_mesh_quantization_normal': 8,
+    'gltf_mesh_quantization_texcoord': 16,
+}
+
+# 8 influences per vertex, split over WEIGHTS_0 and WEIGHTS_1
+WEIGHTS = np.array((
+    (0.5, 0.3, 0.1, 0.05, 0.03, 0.02, 0.0, 0.0),
+    (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    (0.125, 0.125, 0.125, 0.125, 0.125, 0.125, 0.125, 0.125),
+    (0.1, 0.0, 0.0, 0.0, 0.6, 0.3, 0.0, 0.0),
+), dtype=np.float32)
+
+
+def float_accessor(values):
+    return gltf2_io.Accessor(
+        buffer_view=BinaryData(values.astype(np.float32).tobytes(), gltf2_io_constants.BufferViewTarget.ARRAY_BUFFER),
+        byte_offset=None,
+        component_type=gltf2_io_constants.ComponentType.Float,
+        count=len(values),
+        extensions=None,
+        extras=None,
+        max=None,
+        min=None,
+        name=None,
+        normalized=None,
+        sparse=None,
+        type=gltf2_io_constants.DataType.Vec4,
+    )
+
+
+def skinned_scene(weights_sets):
+    primitive = gltf2_io.MeshPrimitive(
+        attributes={
+            'WEIGHTS_{}'.format(i): float_accessor(weights) for i, weights in enumerate(weights_sets)
+        },
+        extensions=None,
+        extras=None,
+        indices=None,
+        material=None,
+        mode=None,
+        targets=None,
+    )
+    mesh = gltf2_io.Mesh(extensions=None, extras=None, name='Mesh', primitives=[primitive], weights=None)
+    node = gltf2_io.Node(
+        camera=None, children=None, extensions=None, extras=None, matrix=None, mesh=mesh, name='Node',
+        rotation=None, scale=None, skin=0, translation=None, weights=None,
+    )
+    scene = gltf2_io.Scene(extensions=None, extras=None, name='Scene', nodes=[node])
+    return scene, primitive
+
+
+class TestWeightsQuantization(unittest.TestCase):
+
+    def test_sets_are_normalized_together(self):
+        quantized = quantize_weights([WEIGHTS[:, :4], WEIGHTS[:, 4:]])
+        self.assertEqual([q.shape for q in quantized], [(4, 4), (4, 4)])
+
+        total = quantized[0].sum(axis=1) + quantized[1].sum(axis=1)
+        np.testing.assert_array_equal(total, [65535, 0, 65535, 65535])
+        np.testing.assert_allclose(np.concatenate(quantized, axis=1) / 65535, WEIGHTS, atol=1e-4)
+
+    def test_small_secondary_weights_are_not_inflated(self):
+        quantized = quantize_weights([WEIGHTS[:, :4], WEIGHTS[:, 4:]])
+        np.testing.assert_array_equal(quantized[1][0], [1966, 1311, 0, 0])
+
+    def test_rounding_error_goes_to_the_biggest_weight(self):
+        quantized = quantize_weights([WEIGHTS[:, :4], WEIGHTS[:, 4:]])
+        # The biggest weight of the last vertex is in WEIGHTS_1, WEIGHTS_0 is left untouched
+        self.assertEqual(quantized[0][3].tolist(), [6554, 0, 0, 0])
+        self.assertEqual(quantized[1][3].tolist(), [39321, 19660, 0, 0])
+
+    def test_all_zero_rows_stay_zero(self):
+        quantized = quantize_weights([WEIGHTS[:, :4], WEIGHTS[:, 4:]])
+        self.assertFalse(quantized[0][1].any())
+        self.assertFalse(quantized[1][1].any())
+
+    def test_encode_primitive_with_more_than_four_influences(self):
+        scene, primitive = skinned_scene([WEIGHTS[:, :4], WEIGHTS[:, 4:]])
+        encode_scene_primitives([scene], EXPORT_SETTINGS)
+
+        weights = []
+        for attr_name in ('WEIGHTS_0', 'WEIGHTS_1'):
+            accessor = primitive.attributes[attr_name]
+            self.assertEqual(accessor.component_type, gltf2_io_constants.ComponentType.UnsignedShort)
+            self.assertTrue(accessor.normalized)
+            weights.append(accessor_to_array(accessor).astype(np.int64))
+
+        total = weights[0].sum(axis=1) + weights[1].sum(axis=1)
+        np.testing.assert_array_equal(total, [65535, 0, 65535, 65535])
+        self.assertFalse(weights[1][1].any())
+
+
+if __name__ == '__main__':
+    unittest.main(argv=[sys.argv[0]])
@@ -68,6 +68,7 @@ classes = (
     tessellate_numpy.tissue_tessellate,
     tessellate_numpy.tissue_update_tessellate,
     tessellate_numpy.tissue_update_tessellate_deps,
+    tessellate_numpy.tissue_clear_tessellate_cache,
     tessellate_numpy.TISSUE_PT_tessellate,
     tessellate_numpy.tissue_rotate_face_left,
     tessellate_numpy.tissue_rotate_face_right,
@@ -25,12 +25,39 @@ class tissuePreferences(bpy.types.AddonPreferences):
         default=True
         )
 
+    tess_cache_size : IntProperty(
+        name="Tessellate Cache (MB)",
+        description="Memory used for storing the Tessellate stages that don't need to be computed again on updates",
+        default=256,
+        min=0,
+        soft_max=4096
+        )
+
+    tess_chunk_size : IntProperty(
+        name="Tessellate Chunk (MB)",
+        description="Memory used by each process for deforming the patches of the Tessellation",
+        default=256,
+        min=16,
+        soft_max=4096
+        )
+
+    tess_processes : IntProperty(
+        name="Tessellate Processes",
+        description="Number of processes deforming the patches of the Tessellation (0 uses all the CPU cores)",
+        default=0,
+        min=0,
+        soft_max=64
+        )
+
     def draw(self, context):
 
         from .utils_pip import Pip
         Pip._ensure_user_site_package()
         layout = self.layout
         layout.prop(self, "print_stats")
+        layout.prop(self, "tess_cache_size")
+        layout.prop(self, "tess_chunk_size")
+        layout.prop(self, "tess_processes")
         import importlib
         numba_spec = importlib.util.find_spec('numba')
         found = numba_spec is not None
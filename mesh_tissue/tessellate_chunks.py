@@ -0,0 +1,248 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# ---------------------------- PATCH DEFORMATION ----------------------------- #
+#                                                                              #
+# Deformation of the tessellated patches in chunks of generator faces.        #
+# This module doesn't depend on bpy, in order to run inside worker processes. #
+#                                                                              #
+
+import sys
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+
+# float64 arrays (n_verts1, 3) alive at the same time while deforming a patch
+patch_arrays = 12
+
+def lerp2(v00, v10, v01, v11, vx, vy):
+    co0 = v00 + (v10 - v00) * vx
+    co1 = v01 + (v11 - v01) * vx
+    return co0 + (co1 - co0) * vy
+
+def interp_patches(values, patches, u, v, u1, v1, vx, vy):
+    '''
+    Bilinear interpolation of the per-vertex values (n_verts0, k) of the
+    generator, on the grid of each patch (n_patches, sides+1, sides+1).
+    Returns an array (n_patches, n_verts1, k)
+    '''
+    n_patches = len(patches)
+    k = values.shape[-1]
+    patch_values = values[patches]
+    v00 = patch_values[:, u, v].reshape((n_patches,-1,k))
+    v10 = patch_values[:, u1, v].reshape((n_patches,-1,k))
+    v01 = patch_values[:, u, v1].reshape((n_patches,-1,k))
+    v11 = patch_values[:, u1, v1].reshape((n_patches,-1,k))
+    return lerp2(v00, v10, v01, v11, vx, vy)
+
+def patch_grid(arrays, params):
+    '''
+    Corners of the patch grid and relative coordinates of the component
+    vertices, as read by the interpolations of each chunk.
+    '''
+    n_verts1 = params['n_verts1']
+    grid = {}
+    for key in ('u', 'v', 'u1', 'v1'):
+        grid[key] = arrays[key] if key in arrays else params[key]
+    # corners used by the normals, that can have different coordinates
+    grid['nor_u'] = arrays['nor_u'] if 'nor_u' in arrays else grid['u']
+    grid['nor_u1'] = arrays['nor_u1'] if 'nor_u1' in arrays else grid['u1']
+    uv = arrays['uv']
+    grid['vx'] = uv[:,0].reshape((1,n_verts1,1))
+    grid['vy'] = uv[:,1].reshape((1,n_verts1,1))
+    grid['vz'] = uv[:,2].reshape((1,n_verts1,1))
+    if 'vx_nor' in arrays:
+        grid['vx_nor'] = arrays['vx_nor'].reshape((1,n_verts1,1))
+    else:
+        grid['vx_nor'] = grid['vx']
+    return grid
+
+def thickness_weight(arrays, params, i0, i1, grid=None):
+    '''
+    Thickness weight of the component vertices on the patches [i0, i1),
+    None if the thickness doesn't depend on a vertex group.
+    '''
+    if grid is None: grid = patch_grid(arrays, params)
+    u, v, u1, v1 = grid['u'], grid['v'], grid['u1'], grid['v1']
+    patches = arrays['patches'][i0:i1]
+    if 'weight' in arrays:
+        if params['vg_thickness'] is None: return None
+        weight = arrays['weight'][params['vg_thickness']][:,None]
+        return interp_patches(weight, patches, u, v, u1, v1, grid['vx'], grid['vy'])
+    if 'weight_thickness' in arrays:
+        weight = arrays['weight_thickness'][:,None]
+        weight = interp_patches(weight, patches, u, v, u1, v1, grid['vx'], grid['vy'])
+        if params['invert_thickness']:
+            weight = 1-weight
+        fact = params['thickness_factor']
+        if fact > 0:
+            weight = weight*(1-fact) + fact
+        return weight
+    return None
+
+def deform_chunk(arrays, params, i0, i1):
+    '''
+    Deform the component on the patches [i0, i1), writing the coordinates
+    (and the vertex groups) of the new vertices in the output arrays.
+    Only plain NumPy is used, that works with and without Numba.
+    '''
+    n_verts1 = params['n_verts1']
+    grid = patch_grid(arrays, params)
+    u, v, u1, v1 = grid['u'], grid['v'], grid['u1'], grid['v1']
+    nor_u, nor_u1 = grid['nor_u'], grid['nor_u1']
+    vx, vy, vz, vx_nor = grid['vx'], grid['vy'], grid['vz'], grid['vx_nor']
+    patches = arrays['patches'][i0:i1]
+
+    co2 = interp_patches(arrays['verts'], patches, u, v, u1, v1, vx, vy)
+
+    # weight
+    if 'weight' in arrays:
+        weight = interp_patches(arrays['weight'].T, patches, u, v, u1, v1, vx, vy)
+        arrays['out_weight'][:, i0*n_verts1:i1*n_verts1] = weight.reshape((-1,weight.shape[-1])).T
+        weight = None
+    weight_thickness = thickness_weight(arrays, params, i0, i1, grid)
+
+    # normals
+    if 'face_normals' in arrays:
+        n2 = arrays['face_normals'][i0:i1][:,None,:]
+    elif 'normals_neg' in arrays:
+        n2 = interp_patches(arrays['normals'], patches, nor_u, v, nor_u1, v1, vx_nor, vy)
+        n2_neg = interp_patches(arrays['normals_neg'], patches, nor_u, v, nor_u1, v1, vx_nor, vy)
+        nor_mask = (vz<0).reshape((-1))
+        n2[:,nor_mask] = n2_neg[:,nor_mask]
+        n2_neg = None
+    else:
+        n2 = interp_patches(arrays['normals'], patches, nor_u, v, nor_u1, v1, vx_nor, vy)
+
+    # thickness variation
+    a2 = None
+    if 'face_areas' in arrays:
+        a2 = arrays['face_areas'][i0:i1][:,None,None]
+    elif 'verts_area' in arrays:
+        verts_area = arrays['verts_area']
+        if params['mean_area']:
+            a2 = verts_area[patches].mean(axis=(1,2)).reshape((-1,1,1))
+        else:
+            a2 = interp_patches(verts_area[:,None], patches, nor_u, v, nor_u1, v1, vx, vy)
+
+    if a2 is None and weight_thickness is None:
+        co3 = co2 + n2 * vz
+    elif a2 is None:
+        co3 = co2 + n2 * vz * weight_thickness
+    elif weight_thickness is None:
+        co3 = co2 + n2 * vz * a2
+    else:
+        co3 = co2 + n2 * vz * a2 * weight_thickness
+    arrays['out_co'][i0*n_verts1:i1*n_verts1] = co3.reshape((-1,3))
+
+def deform_chunk_shared(specs, params, i0, i1):
+    '''
+    Worker process entry: attach the shared arrays and deform the chunk.
+    '''
+    blocks = []
+    arrays = {}
+    try:
+        for name, (shm_name, shape, dtype) in specs.items():
+            if shm_name is None:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            shm = shared_memory.SharedMemory(name=shm_name)
+            blocks.append(shm)
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        deform_chunk(arrays, params, i0, i1)
+    finally:
+        arrays = None
+        for shm in blocks: shm.close()
+
+def patch_chunks(n_patches, n_verts1, chunk_size, processes, n_vg=0):
+    '''
+    Ranges of patches that can be deformed in chunk_size MB on each process.
+    '''
+    n_verts1 = max(n_verts1, 1)
+    # the coordinates arrays, plus the interpolated weight of each vertex group
+    patch_bytes = n_verts1*3*8*patch_arrays + n_vg*n_verts1*8
+    chunk_patches = max(int(chunk_size*1024*1024/processes/patch_bytes), 1)
+    if processes > 1:
+        # at least one chunk for each process
+        chunk_patches = min(chunk_patches, -(-n_patches//processes))
+    return [(i, min(i+chunk_patches, n_patches)) for i in range(0, n_patches, chunk_patches)]
+
+def use_fork():
+    # Worker processes can't import Blender modules, they need to inherit this one.
+    return sys.platform.startswith('linux') and 'fork' in multiprocessing.get_all_start_methods()
+
+class PatchDeformer:
+    '''
+    Deform the patches in chunks of bounded memory, on a pool of processes
+    sharing the input arrays read-only through shared memory. Where forking
+    the processes isn't possible, the chunks are deformed on a pool of threads.
+    The output arrays are valid until the deformer is closed:
+
+        with PatchDeformer(arrays, params, n_patches, n_verts1) as deformer:
+            co, weight = deformer.run()
+    '''
+    def __init__(self, arrays, params, n_patches, n_verts1, n_vg=0,
+            chunk_size=256, processes=0):
+        if processes <= 0: processes = multiprocessing.cpu_count()
+        self.params = dict(params, n_verts1=n_verts1)
+        self.chunks = patch_chunks(n_patches, n_verts1, chunk_size, processes, n_vg)
+        self.processes = min(processes, len(self.chunks))
+        self.shared = self.processes > 1 and use_fork()
+        self.blocks = []
+        self.specs = {}
+        self.arrays = {}
+        for name, array in arrays.items():
+            if self.shared:
+                self.empty(name, array.shape, array.dtype)[...] = array
+            else:
+                self.arrays[name] = array
+        self.empty('out_co', (n_patches*n_verts1, 3), np.float32)
+        if n_vg:
+            self.empty('out_weight', (n_vg, n_patches*n_verts1), np.float32)
+
+    def empty(self, name, shape, dtype):
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))*dtype.itemsize
+        if self.shared and size > 0:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self.blocks.append(shm)
+            array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            self.specs[name] = (shm.name, shape, dtype.str)
+        else:
+            array = np.empty(shape, dtype=dtype)
+            self.specs[name] = (None, shape, dtype.str)
+        self.arrays[name] = array
+        return array
+
+    def run(self):
+        if self.processes < 2:
+            for i0, i1 in self.chunks:
+                deform_chunk(self.arrays, self.params, i0, i1)
+        elif self.shared:
+            context = multiprocessing.get_context('fork')
+            i0, i1 = zip(*self.chunks)
+            with ProcessPoolExecutor(self.processes, mp_context=context) as executor:
+                list(executor.map(deform_chunk_shared, repeat(self.specs),
+                    repeat(self.params), i0, i1))
+        else:
+            i0, i1 = zip(*self.chunks)
+            with ThreadPoolExecutor(self.processes) as executor:
+                list(executor.map(deform_chunk, repeat(self.arrays),
+                    repeat(self.params), i0, i1))
+        return self.arrays['out_co'], self.arrays.get('out_weight')
+
+    def close(self):
+        self.arrays = {}
+        for shm in self.blocks:
+            shm.unlink()
+            # still mapped while the returned arrays are in use
+            try: shm.close()
+            except BufferError: pass
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -36,6 +36,7 @@ import bmesh
 from .utils import *
 from .weight_tools import *
 from .numba_functions import *
+from .tessellate_chunks import PatchDeformer, thickness_weight
 from .tissue_properties import *
 import os, mathutils
 from pathlib import Path
@@ -70,6 +71,61 @@ def tessellated(ob):
                     return True
     return False
 
+def tessellate_component_grid(ob1, fill_mode, mode, sides, bool_shapekeys):
+    '''
+    Coordinates of the prepared component vertices (and Shape Keys) in the
+    grid of the patches.
+    '''
+    step = 1/sides
+    me1 = ob1.data
+    verts1 = get_vertices_numpy(me1)
+    grid = {'uv': verts1, 'uv_quads': None, 'sk_uv': None, 'sk_uv_quads': None}
+    if fill_mode == 'PATCH':
+        grid['uv_quads'], grid['uv'] = grid_coordinates(verts1, step, sides, mode)
+    if bool_shapekeys:
+        sk_uv_quads = []
+        sk_uv = []
+        for sk_co in get_shape_keys_numpy(ob1)[1:]:
+            _sk_uv_quads, _sk_uv = grid_coordinates(sk_co, step, sides, mode)
+            sk_uv_quads.append(_sk_uv_quads)
+            sk_uv.append(_sk_uv)
+        grid['sk_uv_quads'] = np.array(sk_uv_quads).reshape((-1,len(verts1),4))
+        grid['sk_uv'] = np.array(sk_uv).reshape((-1,len(verts1),3))
+    return grid
+
+def grid_coordinates(co, step, sides, mode):
+    '''
+    Grid cell (u, v, u1, v1) and factor coordinates of each vertex.
+    '''
+    u = (co[:,0]//step).astype('int')
+    v = (co[:,1]//step).astype('int')
+    u1 = np.minimum(u+1, sides)
+    v1 = np.minimum(v+1, sides)
+    if mode != 'BOUNDS':
+        for i, i1 in ((u, u1), (v, v1)):
+            over = i > sides-1
+            i[over] = sides-1
+            i1[over] = sides
+            under = i < 0
+            i[under] = 0
+            i1[under] = 1
+    uv = np.empty(co.shape)
+    uv[:,0] = (co[:,0]-u*step)/step
+    uv[:,1] = (co[:,1]-v*step)/step
+    uv[:,2] = co[:,2]
+    return np.stack((u, v, u1, v1), axis=1), uv
+
+def tessellate_component_thickness(z, props, bb_z):
+    '''
+    Offset and thickness of the component, as in tessellate_prepare_component().
+    '''
+    if props['mode'] == 'BOUNDS' and not props['use_origin_offset']:
+        if props['scale_mode'] == 'CONSTANT' or props['normals_mode'] in ('OBJECT', 'SHAPEKEYS'):
+            z = z + props['offset'] * 0.5
+        else:
+            z = z + props['offset'] * 0.5 * bb_z
+    return z * props['zscale']
+
 def tessellate_patch(props):
     tt = time.time()
 
@@ -343,10 +399,21 @@ def tessellate_patch(props):
     sides0 = sides-2
     patch_faces0 = int((sides-2)**2)
 
-    if fill_mode == 'PATCH':
-        all_verts, mask, materials = get_patches(before_subsurf, me0, 4, levels, bool_selection)
-    else:
-        all_verts, mask, materials = get_quads(me0, bool_selection)
+    # Indexing depends only on the topology of the base
+    patches_key = tessellate_cache_key(fill_mode, levels, bool_selection, me0,
+        before_subsurf if fill_mode == 'PATCH' else None)
+    patches = tessellate_cache.get('patches', patches_key)
+    if patches is None:
+        if fill_mode == 'PATCH':
+            all_verts, mask, materials = get_patches(before_subsurf, me0, 4, levels, bool_selection)
+        else:
+            all_verts, mask, materials = get_quads(me0, bool_selection)
+        patches = {'all_verts': all_verts, 'mask': mask, 'materials': materials}
+        tessellate_cache.set('patches', patches_key, patches)
+    # patches can be rotated in place
+    all_verts = patches['all_verts'].copy()
+    mask = patches['mask']
+    materials = patches['materials']
     n_patches = len(all_verts)
 
     tt = tissue_time(tt, "Indexing", levels=2)
@@ -619,7 +686,31 @@ def tessellate_patch(props):
                 m.show_viewport = False
             com_modifiers = True
         ob1 = convert_object_to_mesh(_ob1, com_modifiers, False)
-        ob1, com_area = tessellate_prepare_component(ob1, props)
+
+        # The prepared component is cached without thickness, applied later.
+        # Clipping and Cyclic bounds change the topology of the component,
+        # that needs to be prepared every time.
+        com_props = props.copy()
+        com_props['zscale'] = 1
+        com_props['offset'] = 0
+        com_co = get_vertices_numpy(ob1.data)
+        com_key = None
+        if mode == 'BOUNDS' or (bounds_x == 'EXTEND' and bounds_y == 'EXTEND'):
+            com_key = tessellate_cache_key(ob1.data, com_co,
+                get_shape_keys_numpy(ob1) if bool_shapekeys else None,
+                np.array(_ob1.matrix_world) if mode == 'GLOBAL' else None,
+                mode, props['scale_mode'], props['normals_mode'],
+                use_origin_offset, props['bool_shapekeys'], bool_shapekeys,
+                fill_mode, sides)
+        com_grid = tessellate_cache.get('component', com_key)
+        if com_grid is None:
+            bb_z = np.ptp(com_co[:,2]) if len(com_co) > 0 else 0
+            ob1, com_area = tessellate_prepare_component(ob1, com_props)
+            com_grid = tessellate_component_grid(ob1, fill_mode, mode, sides, bool_shapekeys)
+            com_grid['com_area'] = com_area
+            com_grid['bb_z'] = bb_z
+            tessellate_cache.set('component', com_key, com_grid)
+        com_area = com_grid['com_area']
         ob1.name = "_tissue_tmp_ob1"
 
         # restore original modifiers visibility for component object
@@ -629,90 +720,23 @@ def tessellate_patch(props):
         except: pass
 
         me1 = ob1.data
-        verts1 = [v.co for v in me1.vertices]
-        n_verts1 = len(verts1)
+        np_verts1_uv = com_grid['uv'].copy()
+        n_verts1 = len(np_verts1_uv)
         if n_verts1 == 0:
             bpy.data.objects.remove(ob1)
             continue
 
         ### COMPONENT GRID COORDINATES ###
 
-        # find relative UV component's vertices
-        if fill_mode == 'PATCH':
-            verts1_uv_quads = [0]*n_verts1
-            verts1_uv = [0]*n_verts1
-            for i, vert in enumerate(verts1):
-                # grid coordinates
-                u = int(vert[0]//step)
-                v = int(vert[1]//step)
-                u1 = min(u+1, sides)
-                v1 = min(v+1, sides)
-                if mode != 'BOUNDS':
-                    if u > sides-1:
-                        u = sides-1
-                        u1 = sides
-                    if u < 0:
-                        u = 0
-                        u1 = 1
-                    if v > sides-1:
-                        v = sides-1
-                        v1 = sides
-                    if v < 0:
-                        v = 0
-                        v1 = 1
-                verts1_uv_quads[i] = (u,v,u1,v1)
-                # factor coordinates
-                fu = (vert[0]-u*step)/step
-                fv = (vert[1]-v*step)/step
-                fw = vert.z
-                # interpolate Z scaling factor
-                verts1_uv[i] = Vector((fu,fv,fw))
-        else:
-            verts1_uv = verts1
-
+        np_verts1_uv[:,2] = tessellate_component_thickness(np_verts1_uv[:,2], props, com_grid['bb_z'])
         if bool_shapekeys:
-            sk_uv_quads = []
-            sk_uv = []
-            for sk in ob1.data.shape_keys.key_blocks[1:]:
-                source = sk.data
-                _sk_uv_quads = [0]*n_verts1
-                _sk_uv = [0]*n_verts1
-                for i, sk_v in enumerate(source):
-                    sk_vert = sk_v.co
-
-                    # grid coordinates
-                    u = int(sk_vert[0]//step)
-                    v = int(sk_vert[1]//step)
-                    u1 = min(u+1, sides)
-                    v1 = min(v+1, sides)
-                    if mode != 'BOUNDS':
-                        if u > sides-1:
-                            u = sides-1
-                            u1 = sides
-                        if u < 0:
-                            u = 0
-                            u1 = 1
-                        if v > sides-1:
-                            v = sides-1
-                            v1 = sides
-                        if v < 0:
-                            v = 0
-                            v1 = 1
-                    _sk_uv_quads[i] = (u,v,u1,v1)
-                    # factor coordinates
-                    fu = (sk_vert[0]-u*step)/step
-                    fv = (sk_vert[1]-v*step)/step
-                    fw = sk_vert.z
-                    _sk_uv[i] = Vector((fu,fv,fw))
-                sk_uv_quads.append(_sk_uv_quads)
-                sk_uv.append(_sk_uv)
+            sk_uv_quads = com_grid['sk_uv_quads']
+            sk_uv = com_grid['sk_uv'].copy()
+            sk_uv[:,:,2] = tessellate_component_thickness(sk_uv[:,:,2], props, com_grid['bb_z'])
             store_sk_coordinates = [[] for t in ob1.data.shape_keys.key_blocks[1:]]
-            sk_uv_quads = np.array(sk_uv_quads)
-            sk_uv = np.array(sk_uv)
 
-        np_verts1_uv = np.array(verts1_uv)
         if fill_mode == 'PATCH':
-            verts1_uv_quads = np.array(verts1_uv_quads)
+            verts1_uv_quads = com_grid['uv_quads']
             np_u = verts1_uv_quads[:,0]
             np_v = verts1_uv_quads[:,1]
             np_u1 = verts1_uv_quads[:,2]
@@ -727,77 +751,32 @@ def tessellate_patch(props):
 
         ### DEFORM PATCHES ###
 
-        verts_xyz = verts0_co[masked_verts]
-        v00 = verts_xyz[:, np_u, np_v].reshape((n_patches,-1,3))
-        v10 = verts_xyz[:, np_u1, np_v].reshape((n_patches,-1,3))
-        v01 = verts_xyz[:, np_u, np_v1].reshape((n_patches,-1,3))
-        v11 = verts_xyz[:, np_u1, np_v1].reshape((n_patches,-1,3))
-        vx = np_verts1_uv[:,0].reshape((1,n_verts1,1))
-        vy = np_verts1_uv[:,1].reshape((1,n_verts1,1))
-        vz = np_verts1_uv[:,2].reshape((1,n_verts1,1))
-        co2 = np_lerp2(v00, v10, v01, v11, vx, vy, 'verts')
+        # Generator and component arrays, deformed in chunks of patches
+        deform = {'patches': masked_verts, 'verts': verts0_co, 'uv': np_verts1_uv}
+        deform_params = {}
+        for key, val in zip(('u','v','u1','v1'), (np_u, np_v, np_u1, np_v1)):
+            if type(val) == np.ndarray: deform[key] = val
+            else: deform_params[key] = val
 
         ### PATCHES WEIGHT ###
-        weight_thickness = None
+        n_vg = 0
         if bool_vertex_group:
             n_vg = len(weight)
-            patches_weight = weight[:, masked_verts]
-            w00 = patches_weight[:, :, np_u, np_v].reshape((n_vg, n_patches,-1,1))
-            w10 = patches_weight[:, :, np_u1, np_v].reshape((n_vg, n_patches,-1,1))
-            w01 = patches_weight[:, :, np_u, np_v1].reshape((n_vg, n_patches,-1,1))
-            w11 = patches_weight[:, :, np_u1, np_v1].reshape((n_vg, n_patches,-1,1))
-            store_weight = np_lerp2(w00,w10,w01,w11,vx[None,:,:,:],vy[None,:,:,:],'weight')
-
+            deform['weight'] = weight
+            deform_params['vg_thickness'] = None
             if vertex_group_thickness in ob0.vertex_groups.keys():
                 vg_id = ob0.vertex_groups[vertex_group_thickness].index
-                weight_thickness = store_weight[vg_id,:,:]
-            if vertex_group_smooth_normals in ob0.vertex_groups.keys():
-                vg_id = ob0.vertex_groups[vertex_group_smooth_normals].index
-                weight_smooth_normals = store_weight[vg_id,:,:]
-        else:
+                deform_params['vg_thickness'] = vg_id
+        elif vertex_group_thickness in ob0.vertex_groups.keys():
             # Read vertex group Thickness
-            if vertex_group_thickness in ob0.vertex_groups.keys():
-                vg = ob0.vertex_groups[vertex_group_thickness]
-                weight_thickness = get_weight_numpy(vg, n_verts0)
-                wt = weight_thickness[masked_verts]
-                wt = wt[:,:,:,np.newaxis]
-                w00 = wt[:, np_u, np_v].reshape((n_patches, -1, 1))
-                w10 = wt[:, np_u1, np_v].reshape((n_patches, -1, 1))
-                w01 = wt[:, np_u, np_v1].reshape((n_patches, -1, 1))
-                w11 = wt[:, np_u1, np_v1].reshape((n_patches, -1, 1))
-                weight_thickness = np_lerp2(w00,w10,w01,w11,vx,vy,'verts')
-                try:
-                    weight_thickness.shape
-                    if invert_vertex_group_thickness:
-                        weight_thickness = 1-weight_thickness
-                    fact = vertex_group_thickness_factor
-                    if fact > 0:
-                        weight_thickness = weight_thickness*(1-fact) + fact
-                except: pass
-
-            # Read vertex group smooth normals
-            if vertex_group_smooth_normals in ob0.vertex_groups.keys():
-                vg = ob0.vertex_groups[vertex_group_smooth_normals]
-                weight_smooth_normals = get_weight_numpy(vg, n_verts0)
-                wt = weight_smooth_normals[masked_verts]
-                wt = wt[:,:,:,None]
-                w00 = wt[:, np_u, np_v].reshape((n_patches, -1, 1))
-                w10 = wt[:, np_u1, np_v].reshape((n_patches, -1, 1))
-                w01 = wt[:, np_u, np_v1].reshape((n_patches, -1, 1))
-                w11 = wt[:, np_u1, np_v1].reshape((n_patches, -1, 1))
-                weight_smooth_normals = np_lerp2(w00,w10,w01,w11,vx,vy,'verts')
-                try:
-                    weight_smooth_normals.shape
-                    if invert_vertex_group_smooth_normals:
-                        weight_smooth_normals = 1-weight_smooth_normals
-                    #fact = vertex_group_thickness_factor
-                    #if fact > 0:
-                    #    weight_thickness = weight_thickness*(1-fact) + fact
-                except: pass
+            vg = ob0.vertex_groups[vertex_group_thickness]
+            deform['weight_thickness'] = get_weight_numpy(vg, n_verts0)
+            deform_params['invert_thickness'] = invert_vertex_group_thickness
+            deform_params['thickness_factor'] = vertex_group_thickness_factor
 
         if normals_mode == 'FACES':
             n2 = get_attribute_numpy(before_subsurf.polygons,'normal',3)
-            n2 = n2[masked_faces][:,None,:]
+            deform['face_normals'] = n2[masked_faces]
         else:
             if normals_mode == 'CUSTOM':
                 me0.calc_normals_split()
@@ -816,175 +795,143 @@ def tessellate_patch(props):
                 bm1 = bmesh.new()
                 bm1.from_mesh(me1)
                 uv_co = np.array(uv_from_bmesh(bm1, 'Eval_Normals'))
-                vx_nor = uv_co[:,0]#.reshape((1,n_verts1,1))
-                #vy_nor = uv_co[:,1]#.reshape((1,n_verts1,1))
+                vx_nor = uv_co[:,0]
 
                 # grid coordinates
-                np_u = np.clip(vx_nor//step, 0, sides).astype('int')
-                #np_v = np.maximum(vy_nor//step, 0).astype('int')
-                np_u1 = np.clip(np_u+1, 0, sides).astype('int')
-                #np_v1 = np.minimum(np_v+1, sides).astype('int')
-
-                vx_nor = (vx_nor - np_u * step)/step
-                #vy_nor = (vy_nor - np_v * step)/step
-                vx_nor = vx_nor.reshape((1,n_verts1,1))
-                #vy_nor = vy_nor.reshape((1,n_verts1,1))
-                vy_nor = vy
+                nor_u = np.clip(vx_nor//step, 0, sides).astype('int')
+                nor_u1 = np.clip(nor_u+1, 0, sides).astype('int')
+                deform['nor_u'] = nor_u
+                deform['nor_u1'] = nor_u1
+                deform['vx_nor'] = (vx_nor - nor_u * step)/step
                 bm1.free()
-            else:
-                vx_nor = vx
-                vy_nor = vy
 
             if normals_mode in ('SHAPEKEYS','OBJECT') and scale_mode == 'CONSTANT' and even_thickness:
-                verts_norm_pos = verts0_normal_pos[masked_verts]
-                verts_norm_neg = verts0_normal_neg[masked_verts]
-                nor_mask = (vz<0).reshape((-1))
-                n00 = verts_norm_pos[:, np_u, np_v].reshape((n_patches,-1,3))
-                n10 = verts_norm_pos[:, np_u1, np_v].reshape((n_patches,-1,3))
-                n01 = verts_norm_pos[:, np_u, np_v1].reshape((n_patches,-1,3))
-                n11 = verts_norm_pos[:, np_u1, np_v1].reshape((n_patches,-1,3))
-                n00_neg = verts_norm_neg[:, np_u, np_v].reshape((n_patches,-1,3))
-                n10_neg = verts_norm_neg[:, np_u1, np_v].reshape((n_patches,-1,3))
-                n01_neg = verts_norm_neg[:, np_u, np_v1].reshape((n_patches,-1,3))
-                n11_neg = verts_norm_neg[:, np_u1, np_v1].reshape((n_patches,-1,3))
-                n00[:,nor_mask] = n00_neg[:,nor_mask]
-                n10[:,nor_mask] = n10_neg[:,nor_mask]
-                n01[:,nor_mask] = n01_neg[:,nor_mask]
-                n11[:,nor_mask] = n11_neg[:,nor_mask]
+                deform['normals'] = verts0_normal_pos
+                deform['normals_neg'] = verts0_normal_neg
             else:
-                verts_norm = verts0_normal[masked_verts]
-                n00 = verts_norm[:, np_u, np_v].reshape((n_patches,-1,3))
-                n10 = verts_norm[:, np_u1, np_v].reshape((n_patches,-1,3))
-                n01 = verts_norm[:, np_u, np_v1].reshape((n_patches,-1,3))
-                n11 = verts_norm[:, np_u1, np_v1].reshape((n_patches,-1,3))
-            n2 = np_lerp2(n00, n10, n01, n11, vx_nor, vy_nor, 'verts')
+                deform['normals'] = verts0_normal
 
         # thickness variation
         mean_area = []
-        a2 = None
         if scale_mode == 'ADAPTIVE' and normals_mode not in ('SHAPEKEYS','OBJECT'):
             #com_area = bb[0]*bb[1]
             if mode != 'BOUNDS' or com_area == 0: com_area = 1
-            if normals_mode == 'FACES':
-                if levels == 0 and True:
-                    areas = [0]*len(mask)
-                    before_subsurf.polygons.foreach_get('area',areas)
-                    areas = np.sqrt(np.array(areas)/com_area)[masked_faces]
-                    a2 = areas[:,None,None]
-                else:
-                    areas = calc_verts_area_bmesh(me0)
-                    verts_area = np.sqrt(areas*patch_faces/com_area)
-                    verts_area = verts_area[masked_verts]
-                    verts_area = verts_area.mean(axis=(1,2)).reshape((n_patches,1,1))
-                    a2 = verts_area
+            if normals_mode == 'FACES' and levels == 0:
+                areas = [0]*len(mask)
+                before_subsurf.polygons.foreach_get('area',areas)
+                deform['face_areas'] = np.sqrt(np.array(areas)/com_area)[masked_faces]
             else:
                 areas = calc_verts_area_bmesh(me0)
-                verts_area = np.sqrt(areas*patch_faces/com_area)
-                verts_area = verts_area[masked_verts]
-                a00 = verts_area[:, np_u, np_v].reshape((n_patches,-1,1))
-                a10 = verts_area[:, np_u1, np_v].reshape((n_patches,-1,1))
-                a01 = verts_area[:, np_u, np_v1].reshape((n_patches,-1,1))
-                a11 = verts_area[:, np_u1, np_v1].reshape((n_patches,-1,1))
-                # remapped z scale
-                a2 = np_lerp2(a00,a10,a01,a11,vx,vy,'verts')
-
-        store_coordinates = calc_thickness(co2,n2,vz,a2,weight_thickness)
-        co2 = n2 = vz = a2 = None
-
-        if bool_shapekeys:
-            tt_sk = time.time()
-            n_sk = len(sk_uv_quads)
-            # ids of face corners for each vertex (n_sk, n_verts1, 4)
-            np_u = np.clip(sk_uv_quads[:,:,0], 0, sides).astype('int')[:,None,:]
-            np_v = np.clip(sk_uv_quads[:,:,1], 0, sides).astype('int')[:,None,:]
-            np_u1 = np.clip(sk_uv_quads[:,:,2], 0, sides).astype('int')[:,None,:]
-            np_v1 = np.clip(sk_uv_quads[:,:,3], 0, sides).astype('int')[:,None,:]
-            print(np_v1)
-            # face corners for each vertex  (n_patches, n_sk, n_verts1, 4)
-            v00 = verts_xyz[:,np_u,np_v].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
-            v10 = verts_xyz[:,np_u1,np_v].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
-            v01 = verts_xyz[:,np_u,np_v1].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
-            v11 = verts_xyz[:,np_u1,np_v1].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
-            vx = sk_uv[:,:,0].reshape((1,n_sk,n_verts1,1))
-            vy = sk_uv[:,:,1].reshape((1,n_sk,n_verts1,1))
-            vz = sk_uv[:,:,2].reshape((1,n_sk,n_verts1,1))
-            co2 = np_lerp2(v00,v10,v01,v11,vx,vy,mode='shapekeys')
-
-            if normals_mode == 'FACES':
-                n2 = n2[None,:,:,:]
-            else:
-
-                if normals_mode in ('SHAPEKEYS','OBJECT') and scale_mode == 'CONSTANT' and even_thickness:
-                    verts_norm_pos = verts0_normal_pos[masked_verts]
-                    verts_norm_neg = verts0_normal_neg[masked_verts]
-                    nor_mask = (vz<0).reshape((-1))
-                    n00 = verts_norm_pos[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,3))
-                    n10 = verts_norm_pos[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,3))
-                    n01 = verts_norm_pos[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,3))
-                    n11 = verts_norm_pos[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,3))
-                    n00_neg = verts_norm_neg[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,3))
-                    n10_neg = verts_norm_neg[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,3))
-                    n01_neg = verts_norm_neg[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,3))
-                    n11_neg = verts_norm_neg[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,3))
-                    n00[:,:,nor_mask] = n00_neg[:,:,nor_mask]
-                    n10[:,:,nor_mask] = n10_neg[:,:,nor_mask]
-                    n01[:,:,nor_mask] = n01_neg[:,:,nor_mask]
-                    n11[:,:,nor_mask] = n11_neg[:,:,nor_mask]
-                else:
-                    n00 = verts_norm[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,3))
-                    n10 = verts_norm[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,3))
-                    n01 = verts_norm[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,3))
-                    n11 = verts_norm[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,3))
-                n2 = np_lerp2(n00,n10,n01,n11,vx,vy,'shapekeys')
-
-            # NOTE: weight thickness is based on the base position of the
-            #       vertices, not on the coordinates of the shape keys
+                deform['verts_area'] = np.sqrt(areas*patch_faces/com_area)
+                deform_params['mean_area'] = normals_mode == 'FACES'
+
+        with PatchDeformer(deform, deform_params, n_patches, n_verts1, n_vg,
+                tess_chunk_size(), tess_processes()) as deformer:
+            store_coordinates, store_weight = deformer.run()
+
+            if bool_shapekeys:
+                tt_sk = time.time()
+                # Shape Keys are computed on all the patches at once
+                verts_xyz = verts0_co[masked_verts]
+                weight_thickness = thickness_weight(deformer.arrays, deformer.params, 0, n_patches)
+                if normals_mode == 'FACES':
+                    n2 = deform['face_normals'][:,None,:]
+                elif 'normals_neg' not in deform:
+                    verts_norm = deform['normals'][masked_verts]
+                if 'verts_area' in deform:
+                    verts_area = deform['verts_area'][masked_verts]
+                n_sk = len(sk_uv_quads)
+                # ids of face corners for each vertex (n_sk, n_verts1, 4)
+                np_u = np.clip(sk_uv_quads[:,:,0], 0, sides).astype('int')[:,None,:]
+                np_v = np.clip(sk_uv_quads[:,:,1], 0, sides).astype('int')[:,None,:]
+                np_u1 = np.clip(sk_uv_quads[:,:,2], 0, sides).astype('int')[:,None,:]
+                np_v1 = np.clip(sk_uv_quads[:,:,3], 0, sides).astype('int')[:,None,:]
+                print(np_v1)
+                # face corners for each vertex  (n_patches, n_sk, n_verts1, 4)
+                v00 = verts_xyz[:,np_u,np_v].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
+                v10 = verts_xyz[:,np_u1,np_v].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
+                v01 = verts_xyz[:,np_u,np_v1].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
+                v11 = verts_xyz[:,np_u1,np_v1].reshape((n_patches,n_sk,n_verts1,3))#.swapaxes(0,1)
+                vx = sk_uv[:,:,0].reshape((1,n_sk,n_verts1,1))
+                vy = sk_uv[:,:,1].reshape((1,n_sk,n_verts1,1))
+                vz = sk_uv[:,:,2].reshape((1,n_sk,n_verts1,1))
+                co2 = np_lerp2(v00,v10,v01,v11,vx,vy,mode='shapekeys')
 
-            if scale_mode == 'ADAPTIVE':# and normals_mode not in ('OBJECT', 'SHAPEKEYS'): ### not sure
                 if normals_mode == 'FACES':
-                    a2 = mean_area
+                    n2 = n2[None,:,:,:]
                 else:
-                    a00 = verts_area[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,1))
-                    a10 = verts_area[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,1))
-                    a01 = verts_area[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,1))
-                    a11 = verts_area[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,1))
-                    # remapped z scale
-                    a2 = np_lerp2(a00,a10,a01,a11,vx,vy,'shapekeys')
 
-            store_sk_coordinates = calc_thickness(co2,n2,vz,a2,weight_thickness)
-            co2 = n2 = vz = a2 = weight_thickness = None
-            tissue_time(tt_sk, "Compute ShapeKeys", levels=3)
+                    if normals_mode in ('SHAPEKEYS','OBJECT') and scale_mode == 'CONSTANT' and even_thickness:
+                        verts_norm_pos = verts0_normal_pos[masked_verts]
+                        verts_norm_neg = verts0_normal_neg[masked_verts]
+                        nor_mask = (vz<0).reshape((-1))
+                        n00 = verts_norm_pos[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,3))
+                        n10 = verts_norm_pos[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,3))
+                        n01 = verts_norm_pos[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,3))
+                        n11 = verts_norm_pos[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,3))
+                        n00_neg = verts_norm_neg[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,3))
+                        n10_neg = verts_norm_neg[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,3))
+                        n01_neg = verts_norm_neg[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,3))
+                        n11_neg = verts_norm_neg[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,3))
+                        n00[:,:,nor_mask] = n00_neg[:,:,nor_mask]
+                        n10[:,:,nor_mask] = n10_neg[:,:,nor_mask]
+                        n01[:,:,nor_mask] = n01_neg[:,:,nor_mask]
+                        n11[:,:,nor_mask] = n11_neg[:,:,nor_mask]
+                    else:
+                        n00 = verts_norm[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,3))
+                        n10 = verts_norm[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,3))
+                        n01 = verts_norm[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,3))
+                        n11 = verts_norm[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,3))
+                    n2 = np_lerp2(n00,n10,n01,n11,vx,vy,'shapekeys')
+
+                # NOTE: weight thickness is based on the base position of the
+                #       vertices, not on the coordinates of the shape keys
+
+                if scale_mode == 'ADAPTIVE':# and normals_mode not in ('OBJECT', 'SHAPEKEYS'): ### not sure
+                    if normals_mode == 'FACES':
+                        a2 = mean_area
+                    else:
+                        a00 = verts_area[:, np_u, np_v].reshape((n_patches,n_sk,n_verts1,1))
+                        a10 = verts_area[:, np_u1, np_v].reshape((n_patches,n_sk,n_verts1,1))
+                        a01 = verts_area[:, np_u, np_v1].reshape((n_patches,n_sk,n_verts1,1))
+                        a11 = verts_area[:, np_u1, np_v1].reshape((n_patches,n_sk,n_verts1,1))
+                        # remapped z scale
+                        a2 = np_lerp2(a00,a10,a01,a11,vx,vy,'shapekeys')
 
-        tt = tissue_time(tt, "Compute Coordinates", levels=2)
+                store_sk_coordinates = calc_thickness(co2,n2,vz,a2,weight_thickness)
+                co2 = n2 = vz = a2 = weight_thickness = None
+                tissue_time(tt_sk, "Compute ShapeKeys", levels=3)
 
-        new_me = array_mesh(ob1, len(masked_verts))
-        tt = tissue_time(tt, "Repeat component", levels=2)
+            tt = tissue_time(tt, "Compute Coordinates", levels=2)
 
-        new_patch = bpy.data.objects.new("_tissue_tmp_patch", new_me)
-        bpy.context.collection.objects.link(new_patch)
+            new_me = array_mesh(ob1, len(masked_verts))
+            tt = tissue_time(tt, "Repeat component", levels=2)
 
-        store_coordinates = np.concatenate(store_coordinates, axis=0).reshape((-1)).tolist()
-        new_me.vertices.foreach_set('co',store_coordinates)
+            new_patch = bpy.data.objects.new("_tissue_tmp_patch", new_me)
+            bpy.context.collection.objects.link(new_patch)
 
-        for area in bpy.context.screen.areas:
-            for space in area.spaces:
-                try: new_patch.local_view_set(space, True)
-                except: pass
-        tt = tissue_time(tt, "Inject coordinates", levels=2)
-
-        # Vertex Group
-        for vg in ob1.vertex_groups:
-            vg_name = vg.name
-            if vg_name in ob0.vertex_groups.keys():
-                vg_name = '_{}_'.format(vg_name)
-            new_patch.vertex_groups.new(name=vg_name)
-        if bool_vertex_group:
-            new_groups = []
-            for vg in ob0.vertex_groups:
-                new_groups.append(new_patch.vertex_groups.new(name=vg.name))
-            for vg, w in zip(new_groups, store_weight):
-                set_weight_numpy(vg, w.reshape(-1))
-            tt = tissue_time(tt, "Write Vertex Groups", levels=2)
+            new_me.vertices.foreach_set('co',store_coordinates.reshape((-1)))
+
+            for area in bpy.context.screen.areas:
+                for space in area.spaces:
+                    try: new_patch.local_view_set(space, True)
+                    except: pass
+            tt = tissue_time(tt, "Inject coordinates", levels=2)
+
+            # Vertex Group
+            for vg in ob1.vertex_groups:
+                vg_name = vg.name
+                if vg_name in ob0.vertex_groups.keys():
+                    vg_name = '_{}_'.format(vg_name)
+                new_patch.vertex_groups.new(name=vg_name)
+            if bool_vertex_group:
+                new_groups = []
+                for vg in ob0.vertex_groups:
+                    new_groups.append(new_patch.vertex_groups.new(name=vg.name))
+                for vg, w in zip(new_groups, store_weight):
+                    set_weight_numpy(vg, w.reshape(-1))
+                tt = tissue_time(tt, "Write Vertex Groups", levels=2)
+            store_coordinates = store_weight = None
 
         if bool_shapekeys:
             for sk, val in zip(_ob1.data.shape_keys.key_blocks, original_key_values):
@@ -2290,6 +2237,23 @@ class tissue_update_tessellate(Operator):
     def check(self, context):
         return True
 
+class tissue_clear_tessellate_cache(Operator):
+    bl_idname = "object.tissue_clear_tessellate_cache"
+    bl_label = "Clear Tessellate Cache"
+    bl_description = ("Free the memory used for storing the Tessellate stages")
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        tessellate_cache.clear()
+        return {'FINISHED'}
+
+def draw_tessellate_cache(layout):
+    row = layout.row(align=True)
+    row.label(text="Cache: {} hits, {} misses, {:.1f} MB".format(
+        tessellate_cache.hits(), tessellate_cache.misses(),
+        tessellate_cache.size / 1024**2))
+    row.operator("object.tissue_clear_tessellate_cache", text='', icon='TRASH')
+
 class TISSUE_PT_tessellate(Panel):
     bl_label = "Tissue Tools"
     bl_category = "Tissue"
@@ -2354,6 +2318,7 @@ class TISSUE_PT_tessellate(Panel):
         col.separator()
         col.label(text="Utils:")
         col.operator("render.tissue_render_animation", icon='RENDER_ANIMATION')
+        draw_tessellate_cache(col)
 
 class TISSUE_PT_tessellate_object(Panel):
     bl_space_type = 'PROPERTIES'
@@ -2427,6 +2392,7 @@ class TISSUE_PT_tessellate_object(Panel):
             #layout.use_property_split = True
             col = layout.column(align=True)
             col.prop(props, "bool_smooth")
+            draw_tessellate_cache(col)
 
 
 class TISSUE_PT_tessellate_frame(Panel):
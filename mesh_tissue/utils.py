@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import bpy, bmesh
+import hashlib
 import threading
 import numpy as np
 import multiprocessing
@@ -19,6 +20,20 @@ def use_numba_tess():
     else:
         return True
 
+def tess_chunk_size():
+    tissue_addon = bpy.context.preferences.addons[__package__]
+    if 'tess_chunk_size' in tissue_addon.preferences.keys():
+        return tissue_addon.preferences['tess_chunk_size']
+    else:
+        return 256
+
+def tess_processes():
+    tissue_addon = bpy.context.preferences.addons[__package__]
+    if 'tess_processes' in tissue_addon.preferences.keys():
+        return tissue_addon.preferences['tess_processes']
+    else:
+        return 0
+
 def tissue_time(start_time, name, levels=0):
     tissue_addon = bpy.context.preferences.addons[__package__]
     end_time = time.time()
@@ -391,6 +406,91 @@ def get_mesh_before_subs(ob):
     for m, vis in zip(hide_mods,mods_visibility): m.show_viewport = vis
     return me, subs
 
+# ------------------------------------------------------------------
+# CACHE
+# ------------------------------------------------------------------
+
+def tess_cache_size():
+    tissue_addon = bpy.context.preferences.addons[__package__]
+    if 'tess_cache_size' in tissue_addon.preferences.keys():
+        return tissue_addon.preferences['tess_cache_size']
+    else:
+        return 256
+
+def tessellate_cache_key(*items):
+    '''
+    Hash of the given items. Meshes are hashed by topology, selection and
+    materials, numpy arrays by content, anything else by representation.
+    '''
+    h = hashlib.blake2b(digest_size=16)
+    for item in items:
+        if isinstance(item, bpy.types.Mesh):
+            arrays = [
+                get_attribute_numpy(item.loops, 'vertex_index'),
+                get_attribute_numpy(item.polygons, 'loop_total'),
+                get_attribute_numpy(item.polygons, 'select'),
+                get_attribute_numpy(item.polygons, 'material_index'),
+                get_attribute_numpy(item.edges, 'vertices', mult=2),
+                np.array(len(item.vertices))
+                ]
+            for a in arrays: h.update(np.ascontiguousarray(a).tobytes())
+        elif isinstance(item, np.ndarray):
+            h.update(np.ascontiguousarray(item).tobytes())
+        else:
+            h.update(repr(item).encode())
+        h.update(b'|')
+    return h.hexdigest()
+
+class TessellateCache:
+    '''
+    Results of the Tessellate stages that don't depend on thickness, rotation
+    or merge settings, as numpy arrays (Blender data can't be stored between
+    updates). The least recently used results are discarded when the total
+    size exceeds the limit set in the preferences.
+    '''
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.entries = {}
+        self.size = 0
+        self.stats = {}
+
+    def get(self, stage, key):
+        '''
+        Cached result of the stage, or None. A None key is never cached.
+        '''
+        stats = self.stats.setdefault(stage, {'hits': 0, 'misses': 0})
+        entry = self.entries.pop((stage, key), None) if key else None
+        if entry is None:
+            stats['misses'] += 1
+            return None
+        # most recently used at the end
+        self.entries[(stage, key)] = entry
+        stats['hits'] += 1
+        return entry[0]
+
+    def set(self, stage, key, value):
+        if not key: return
+        old = self.entries.pop((stage, key), None)
+        if old: self.size -= old[1]
+        size = sum(v.nbytes for v in value.values() if isinstance(v, np.ndarray))
+        max_size = tess_cache_size() * 1024**2
+        if size > max_size: return
+        self.entries[(stage, key)] = (value, size)
+        self.size += size
+        while self.size > max_size:
+            old_key = next(iter(self.entries))
+            self.size -= self.entries.pop(old_key)[1]
+
+    def hits(self):
+        return sum(s['hits'] for s in self.stats.values())
+
+    def misses(self):
+        return sum(s['misses'] for s in self.stats.values())
+
+tessellate_cache = TessellateCache()
+
 # ------------------------------------------------------------------
 # MESH FUNCTIONS
 # ------------------------------------------------------------------
@@ -868,6 +968,20 @@ def get_vertices_numpy(mesh):
     verts = np.array(verts).reshape((n_verts,3))
     return verts
 
+def get_shape_keys_numpy(ob):
+    '''
+    Create a numpy array with the coordinates of each Shape Key of a given
+    object, with shape (n_keys, n_verts, 3)
+    '''
+    if ob.data.shape_keys is None:
+        return np.zeros((0, len(ob.data.vertices), 3))
+    coordinates = []
+    for sk in ob.data.shape_keys.key_blocks:
+        co = [0]*len(sk.data)*3
+        sk.data.foreach_get('co', co)
+        coordinates.append(co)
+    return np.array(coordinates).reshape((len(coordinates),-1,3))
+
 def get_vertices_and_normals_numpy(mesh):
     '''
     Create two numpy arrays with the vertices and the normals of a given mesh
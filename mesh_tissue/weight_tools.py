@@ -18,6 +18,7 @@
 ################################################################################
 
 import bpy, bmesh, os
+import hashlib
 import numpy as np
 import math, timeit, time
 from math import pi
@@ -3125,6 +3126,7 @@ class start_reaction_diffusion(Operator):
         for v in ob.data.vertices:
             ob.vertex_groups['A'].add([v.index], 1, 'REPLACE')
             ob.vertex_groups['B'].add([v.index], 0, 'REPLACE')
+        rd_state_cache.pop(ob.name, None)
 
         ob.vertex_groups.update()
         ob.data.update()
@@ -3162,6 +3164,7 @@ class reset_reaction_diffusion_weight(Operator):
         for v in ob.data.vertices:
             ob.vertex_groups['A'].add([v.index], 1, 'REPLACE')
             ob.vertex_groups['B'].add([v.index], 0, 'REPLACE')
+        rd_state_cache.pop(ob.name, None)
 
         ob.vertex_groups.update()
         ob.data.update()
@@ -3191,6 +3194,8 @@ class bake_reaction_diffusion(Operator):
             context.scene.frame_current = props.cache_frame_end
             props.run = bool_run
         else:
+            if props.cache_dir != '':
+                rd_remove_frame_stacks(props.cache_dir)
             for i in range(props.cache_frame_start, props.cache_frame_end):
                 context.scene.frame_current = i
                 reaction_diffusion_def(ob, bake=True)
@@ -3221,10 +3226,275 @@ class reaction_diffusion_free_data(Operator):
             data_a = folder / "b_{:04d}".format(i)
             if os.path.exists(data_a):
                 os.remove(data_a)
+        if props.cache_dir != '':
+            rd_remove_frame_stacks(folder)
         return {'FINISHED'}
 
 from bpy.app.handlers import persistent
 
+# Edge Laplacians of the simulated meshes, by topology hash
+rd_laplacian_cache = {}
+rd_laplacian_cache_size = 4
+# Last simulated frame of each object, reused by the following frame
+rd_state_cache = {}
+
+# Settings used for reading the parameters maps from the Vertex Groups
+rd_map_props = (
+    'diff_a', 'diff_b', 'f', 'k', 'diff_mult', 'brush_mult',
+    'vertex_group_diff_a', 'vertex_group_diff_b', 'vertex_group_scale',
+    'vertex_group_f', 'vertex_group_k', 'vertex_group_brush',
+    'invert_vertex_group_diff_a', 'invert_vertex_group_diff_b',
+    'invert_vertex_group_scale', 'invert_vertex_group_f',
+    'invert_vertex_group_k', 'min_diff_a', 'max_diff_a', 'min_diff_b',
+    'max_diff_b', 'min_scale', 'max_scale', 'min_f', 'max_f', 'min_k', 'max_k'
+    )
+
+class EdgeLaplacian:
+    '''
+    Laplacian of the mesh edges, stored as a CSR adjacency: the neighbours of
+    the vertex i are indices[indptr[i]:indptr[i+1]].
+    For the product, the vertices are sorted by decreasing valence (order) and
+    the j-th neighbours of all the vertices are gathered at once: slots[j]
+    holds them for the vertices having at least j+1 neighbours, which are
+    always the first ones.
+    '''
+    def __init__(self, n_verts, edge_verts):
+        edge_verts = np.asarray(edge_verts).reshape((-1,2))
+        rows = np.concatenate((edge_verts[:,0], edge_verts[:,1]))
+        cols = np.concatenate((edge_verts[:,1], edge_verts[:,0]))
+        sort = np.argsort(rows, kind='stable')
+        counts = np.bincount(rows, minlength=n_verts)
+
+        self.n_verts = n_verts
+        self.indices = cols[sort].astype(np.int32 if n_verts < 2**31 else np.int64)
+        self.indptr = np.zeros(n_verts+1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+        self.order = np.argsort(-counts, kind='stable')
+        inverse = np.empty_like(self.order)
+        inverse[self.order] = np.arange(n_verts)
+        valence = counts[self.order]
+        self.degree = valence.astype(np.float64)
+        self.slots = []
+        for j in range(valence[0] if n_verts else 0):
+            n_rows = np.searchsorted(-valence, -j)   # valence > j
+            first = self.indptr[self.order[:n_rows]]
+            self.slots.append(inverse[self.indices[first + j]])
+        self.buffer = np.empty(n_verts)
+
+    def sorted(self, x):
+        '''
+        Values sorted as the vertices of the product.
+        '''
+        if type(x) is np.ndarray: return x[self.order]
+        return x
+
+    def unsorted(self, x, out):
+        out[self.order] = x
+        return out
+
+    def dot(self, x, out=None):
+        '''
+        Sum of (x[j] - x[i]) over the edges of each vertex i, with x and the
+        result sorted as the vertices of the product.
+        '''
+        if out is None: out = np.empty(self.n_verts)
+        np.multiply(self.degree, x, out=out)
+        np.negative(out, out=out)
+        for cols in self.slots:
+            n_rows = len(cols)
+            buffer = self.buffer[:n_rows]
+            np.take(x, cols, out=buffer)
+            out[:n_rows] += buffer
+        return out
+
+def mesh_topology_hash(n_verts, edge_verts):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(n_verts).tobytes())
+    h.update(np.ascontiguousarray(edge_verts).tobytes())
+    return h.hexdigest()
+
+def get_edge_laplacian(me):
+    '''
+    Laplacian of the mesh edges, computed once for each topology.
+    Returns the topology hash and the Laplacian.
+    '''
+    n_verts = len(me.vertices)
+    edge_verts = np.empty(len(me.edges)*2, dtype=np.int32)
+    me.edges.foreach_get("vertices", edge_verts)
+    key = mesh_topology_hash(n_verts, edge_verts)
+    # most recently used at the end
+    laplacian = rd_laplacian_cache.pop(key, None)
+    if laplacian is None:
+        laplacian = EdgeLaplacian(n_verts, edge_verts)
+    rd_laplacian_cache[key] = laplacian
+    while len(rd_laplacian_cache) > rd_laplacian_cache_size:
+        del rd_laplacian_cache[next(iter(rd_laplacian_cache))]
+    return key, laplacian
+
+def reaction_diffusion_numpy(laplacian, a, b, brush, diff_a, diff_b, f, k, dt, time_steps):
+    '''
+    Gray-Scott steps, computed in place on a and b. The parameters can be
+    floats or arrays with a value for each vertex.
+    '''
+    _a, _b = a, b
+    a = laplacian.sorted(a)
+    b = laplacian.sorted(b)
+    brush, diff_a, diff_b, f, k = [laplacian.sorted(v) for v in (brush, diff_a, diff_b, f, k)]
+    lap_a = np.empty_like(a)
+    lap_b = np.empty_like(b)
+    ab2 = np.empty_like(a)
+    tmp = np.empty_like(a)
+    kf = k + f
+    for i in range(time_steps):
+        laplacian.dot(a, lap_a)
+        laplacian.dot(b, lap_b)
+        np.multiply(b, b, out=ab2)
+        ab2 *= a
+        # a += (diff_a*lap_a - ab2 + f*(1-a))*dt
+        lap_a *= diff_a
+        lap_a -= ab2
+        np.subtract(1, a, out=tmp)
+        tmp *= f
+        lap_a += tmp
+        lap_a *= dt
+        # b += (diff_b*lap_b + ab2 - (k+f)*b)*dt
+        lap_b *= diff_b
+        lap_b += ab2
+        np.multiply(kf, b, out=tmp)
+        lap_b -= tmp
+        lap_b *= dt
+        a += lap_a
+        b += lap_b
+        b += brush
+        np.clip(a, 0, 1, out=a)
+        np.clip(b, 0, 1, out=b)
+    return laplacian.unsorted(a, _a), laplacian.unsorted(b, _b)
+
+def rd_read_weights(ob, me, props):
+    '''
+    Read A, B and the parameters maps from the Vertex Groups.
+    '''
+    bm = bmesh.new()   # create an empty BMesh
+    bm.from_mesh(me)   # fill it in from a Mesh
+    dvert_lay = bm.verts.layers.deform.active
+
+    f = props.f
+    k = props.k
+    diff_a = props.diff_a
+    diff_b = props.diff_b
+    scale = props.diff_mult
+    brush = 0
+
+    group_index_a = ob.vertex_groups["A"].index
+    group_index_b = ob.vertex_groups["B"].index
+    a = bmesh_get_weight_numpy(group_index_a, dvert_lay, bm.verts)
+    b = bmesh_get_weight_numpy(group_index_b, dvert_lay, bm.verts)
+
+    if props.vertex_group_diff_a != '':
+        group_index = ob.vertex_groups[props.vertex_group_diff_a].index
+        diff_a = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
+        if props.invert_vertex_group_diff_a:
+            vg_bounds = (props.min_diff_a, props.max_diff_a)
+        else:
+            vg_bounds = (props.max_diff_a, props.min_diff_a)
+        diff_a = np.interp(diff_a, (0,1), vg_bounds)
+
+    if props.vertex_group_diff_b != '':
+        group_index = ob.vertex_groups[props.vertex_group_diff_b].index
+        diff_b = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
+        if props.invert_vertex_group_diff_b:
+            vg_bounds = (props.max_diff_b, props.min_diff_b)
+        else:
+            vg_bounds = (props.min_diff_b, props.max_diff_b)
+        diff_b = np.interp(diff_b, (0,1), vg_bounds)
+
+    if props.vertex_group_scale != '':
+        group_index = ob.vertex_groups[props.vertex_group_scale].index
+        scale = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
+        if props.invert_vertex_group_scale:
+            vg_bounds = (props.max_scale, props.min_scale)
+        else:
+            vg_bounds = (props.min_scale, props.max_scale)
+        scale = np.interp(scale, (0,1), vg_bounds)
+
+    if props.vertex_group_f != '':
+        group_index = ob.vertex_groups[props.vertex_group_f].index
+        f = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
+        if props.invert_vertex_group_f:
+            vg_bounds = (props.max_f, props.min_f)
+        else:
+            vg_bounds = (props.min_f, props.max_f)
+        f = np.interp(f, (0,1), vg_bounds, )
+
+    if props.vertex_group_k != '':
+        group_index = ob.vertex_groups[props.vertex_group_k].index
+        k = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
+        if props.invert_vertex_group_k:
+            vg_bounds = (props.max_k, props.min_k)
+        else:
+            vg_bounds = (props.min_k, props.max_k)
+        k = np.interp(k, (0,1), vg_bounds)
+
+    if props.vertex_group_brush != '':
+        group_index = ob.vertex_groups[props.vertex_group_brush].index
+        brush = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
+        brush *= props.brush_mult
+
+    bm.free()
+
+    maps = {
+        'diff_a' : diff_a * scale,
+        'diff_b' : diff_b * scale,
+        'f' : f,
+        'k' : k,
+        'brush' : brush
+        }
+    return a, b, maps
+
+def rd_write_weights(ob, a, b, vg_a, vg_b):
+    if ob.mode == 'WEIGHT_PAINT':
+        # slower, but prevent crashes
+        for i in range(len(a)):
+            if vg_a: vg_a.add([i], a[i], 'REPLACE')
+            if vg_b: vg_b.add([i], b[i], 'REPLACE')
+    else:
+        # faster, but can cause crashes while painting weight
+        bm = bmesh.new()        # create an empty BMesh
+        bm.from_mesh(ob.data)   # fill it in from a Mesh
+        dvert_lay = bm.verts.layers.deform.verify()
+        if vg_a: index_a = vg_a.index
+        if vg_b: index_b = vg_b.index
+        for i, v in enumerate(bm.verts):
+            dvert = v[dvert_lay]
+            if vg_a: dvert[index_a] = a[i]
+            if vg_b: dvert[index_b] = b[i]
+        bm.to_mesh(ob.data)
+        bm.free()
+
+def rd_frame_stack_path(folder, frame_start):
+    return Path(folder) / "rd_frames_{:04d}.npy".format(frame_start)
+
+def rd_remove_frame_stacks(folder):
+    for file_name in Path(folder).glob("rd_frames_*.npy"):
+        os.remove(file_name)
+
+def rd_read_cache(folder, frame):
+    '''
+    Read A and B of a baked frame, from the frames stack written by the Fast
+    Bake or from the files of the single frames.
+    '''
+    for file_name in Path(folder).glob("rd_frames_*.npy"):
+        frame_start = int(file_name.stem.split('_')[-1])
+        stack = np.load(file_name, mmap_mode='r')
+        if 0 <= frame - frame_start < len(stack):
+            a = stack[frame - frame_start, 0].astype(np.float64)
+            b = stack[frame - frame_start, 1].astype(np.float64)
+            return a, b
+    a = np.fromfile(folder / "a_{:04d}".format(frame))
+    b = np.fromfile(folder / "b_{:04d}".format(frame))
+    return a, b
+
 def reaction_diffusion_scene(scene, bake=False):
     for ob in scene.objects:
         if ob.reaction_diffusion_settings.run:
@@ -3253,7 +3523,6 @@ def reaction_diffusion_def(ob, bake=False):
             folder = Path(props.cache_dir)
 
     me = ob.data
-    n_edges = len(me.edges)
     n_verts = len(me.vertices)
     a = np.zeros(n_verts)
     b = np.zeros(n_verts)
@@ -3279,160 +3548,36 @@ def reaction_diffusion_def(ob, bake=False):
                 m.show_viewport = v
             ob.modifiers.update()
 
-        bm = bmesh.new()   # create an empty BMesh
-        bm.from_mesh(me)   # fill it in from a Mesh
-        dvert_lay = bm.verts.layers.deform.active
-
-        dt = props.dt
-        time_steps = props.time_steps
-        f = props.f
-        k = props.k
-        diff_a = props.diff_a
-        diff_b = props.diff_b
-        scale = props.diff_mult
-
-        brush_mult = props.brush_mult
-
-        # store weight values
-        if 'dB' in ob.vertex_groups: db = np.zeros(n_verts)
-        if 'grad' in ob.vertex_groups: grad = np.zeros(n_verts)
-
-        if props.vertex_group_diff_a != '': diff_a = np.zeros(n_verts)
-        if props.vertex_group_diff_b != '': diff_b = np.zeros(n_verts)
-        if props.vertex_group_scale != '': scale = np.zeros(n_verts)
-        if props.vertex_group_f != '': f = np.zeros(n_verts)
-        if props.vertex_group_k != '': k = np.zeros(n_verts)
-        if props.vertex_group_brush != '': brush = np.zeros(n_verts)
-        else: brush = 0
-
-        group_index_a = ob.vertex_groups["A"].index
-        group_index_b = ob.vertex_groups["B"].index
-        a = bmesh_get_weight_numpy(group_index_a, dvert_lay, bm.verts)
-        b = bmesh_get_weight_numpy(group_index_b, dvert_lay, bm.verts)
-
-        if props.vertex_group_diff_a != '':
-            group_index = ob.vertex_groups[props.vertex_group_diff_a].index
-            diff_a = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-            if props.invert_vertex_group_diff_a:
-                vg_bounds = (props.min_diff_a, props.max_diff_a)
-            else:
-                vg_bounds = (props.max_diff_a, props.min_diff_a)
-            diff_a = np.interp(diff_a, (0,1), vg_bounds)
-
-        if props.vertex_group_diff_b != '':
-            group_index = ob.vertex_groups[props.vertex_group_diff_b].index
-            diff_b = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-            if props.invert_vertex_group_diff_b:
-                vg_bounds = (props.max_diff_b, props.min_diff_b)
-            else:
-                vg_bounds = (props.min_diff_b, props.max_diff_b)
-            diff_b = np.interp(diff_b, (0,1), vg_bounds)
-
-        if props.vertex_group_scale != '':
-            group_index = ob.vertex_groups[props.vertex_group_scale].index
-            scale = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-            if props.invert_vertex_group_scale:
-                vg_bounds = (props.max_scale, props.min_scale)
-            else:
-                vg_bounds = (props.min_scale, props.max_scale)
-            scale = np.interp(scale, (0,1), vg_bounds)
-
-        if props.vertex_group_f != '':
-            group_index = ob.vertex_groups[props.vertex_group_f].index
-            f = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-            if props.invert_vertex_group_f:
-                vg_bounds = (props.max_f, props.min_f)
-            else:
-                vg_bounds = (props.min_f, props.max_f)
-            f = np.interp(f, (0,1), vg_bounds, )
-
-        if props.vertex_group_k != '':
-            group_index = ob.vertex_groups[props.vertex_group_k].index
-            k = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-            if props.invert_vertex_group_k:
-                vg_bounds = (props.max_k, props.min_k)
-            else:
-                vg_bounds = (props.min_k, props.max_k)
-            k = np.interp(k, (0,1), vg_bounds)
-
-        if props.vertex_group_brush != '':
-            group_index = ob.vertex_groups[props.vertex_group_brush].index
-            brush = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-            brush *= brush_mult
-
-
-        #timeElapsed = time.time() - start
-        #print('RD - Read Vertex Groups:',timeElapsed)
-        #start = time.time()
-
-        diff_a *= scale
-        diff_b *= scale
-
-        edge_verts = [0]*n_edges*2
-        me.edges.foreach_get("vertices", edge_verts)
-        edge_verts = np.array(edge_verts)
-
-        if 'gradient' in ob.vertex_groups.keys() and False:
-            group_index = ob.vertex_groups['gradient'].index
-            gradient = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-
-            arr = (np.arange(n_edges)*2).astype(int)
-            id0 = edge_verts[arr]
-            id1 = edge_verts[arr+1]
-
-            #gradient = np.abs(gradient[id0] - gradient[id1])
-            gradient = gradient[id1] - gradient[id0]
-            gradient /= np.max(gradient)
-            sign = np.sign(gradient)
-            sign[sign==0] = 1
-            gradient = (0.05*abs(gradient) + 0.95)*sign
-            #gradient *= (1-abs(gradient)
-            #gradient = 0.2*(1-gradient) + 0.95
-
-        #gradient = get_uv_edge_vectors(me)
-        #uv_dir = Vector((0.5,0.5,0)).normalized()
-        #gradient = np.array([abs(g.dot(uv_dir.normalized())) for g in gradient])
-        #gradient = (gradient + 0.5)/2
-        #gradient = np.array([max(0,g.dot(uv_dir.normalized())) for g in gradient])
+        topology, laplacian = get_edge_laplacian(me)
+        settings = tuple(getattr(props, name) for name in rd_map_props)
+
+        # Continue from the previous frame, without reading the weights again.
+        # Weights can change while painting or from the modifiers.
+        state = rd_state_cache.get(ob.name)
+        if (state and state['topology'] == topology and
+                state['settings'] == settings and
+                state['frame'] == scene.frame_current - 1 and
+                props.update_weight_a and props.update_weight_b and
+                not props.bool_mod and ob.mode != 'WEIGHT_PAINT'):
+            a, b, maps = state['a'], state['b'], state['maps']
+        else:
+            a, b, maps = rd_read_weights(ob, me, props)
 
         timeElapsed = time.time() - start
         print('       Preparation Time:',timeElapsed)
         start = time.time()
 
-        try:
-            _f = f if type(f) is np.ndarray else np.array((f,))
-            _k = k if type(k) is np.ndarray else np.array((k,))
-            _diff_a = diff_a if type(diff_a) is np.ndarray else np.array((diff_a,))
-            _diff_b = diff_b if type(diff_b) is np.ndarray else np.array((diff_b,))
-            _brush = brush if type(brush) is np.ndarray else np.array((brush,))
-
-            #a, b = numba_reaction_diffusion_anisotropic(n_verts, n_edges, edge_verts, a, b, _brush, _diff_a, _diff_b, _f, _k, dt, time_steps, gradient)
-            a, b = numba_reaction_diffusion(n_verts, n_edges, edge_verts, a, b, _brush, _diff_a, _diff_b, _f, _k, dt, time_steps)
-        except:
-            print('Not using Numba! The simulation could be slow.')
-            arr = np.arange(n_edges)*2
-            id0 = edge_verts[arr]     # first vertex indices for each edge
-            id1 = edge_verts[arr+1]   # second vertex indices for each edge
-            for i in range(time_steps):
-                b += brush
-                lap_a = np.zeros(n_verts)
-                lap_b = np.zeros(n_verts)
-                lap_a0 =  a[id1] -  a[id0]   # laplacian increment for first vertex of each edge
-                lap_b0 =  b[id1] -  b[id0]   # laplacian increment for first vertex of each edge
-
-                np.add.at(lap_a, id0, lap_a0)
-                np.add.at(lap_b, id0, lap_b0)
-                np.add.at(lap_a, id1, -lap_a0)
-                np.add.at(lap_b, id1, -lap_b0)
+        reaction_diffusion_numpy(laplacian, a, b, maps['brush'], maps['diff_a'],
+            maps['diff_b'], maps['f'], maps['k'], props.dt, props.time_steps)
 
-                ab2 = a*b**2
-                a += eval("(diff_a*lap_a - ab2 + f*(1-a))*dt")
-                b += eval("(diff_b*lap_b + ab2 - (k+f)*b)*dt")
-                #a += (diff_a*lap_a - ab2 + f*(1-a))*dt
-                #b += (diff_b*lap_b + ab2 - (k+f)*b)*dt
-
-                a = nan_to_num(a)
-                b = nan_to_num(b)
+        rd_state_cache[ob.name] = {
+            'topology' : topology,
+            'settings' : settings,
+            'frame' : scene.frame_current,
+            'a' : a,
+            'b' : b,
+            'maps' : maps
+            }
 
         timeElapsed = time.time() - start
         print('       Simulation Time:',timeElapsed)
@@ -3446,10 +3591,7 @@ def reaction_diffusion_def(ob, bake=False):
         b.tofile(file_name)
     elif props.bool_cache:
         try:
-            file_name = folder / "a_{:04d}".format(scene.frame_current)
-            a = np.fromfile(file_name)
-            file_name = folder / "b_{:04d}".format(scene.frame_current)
-            b = np.fromfile(file_name)
+            a, b = rd_read_cache(folder, scene.frame_current)
         except:
             print('       Cannot read cache.')
             return
@@ -3473,26 +3615,7 @@ def reaction_diffusion_def(ob, bake=False):
         if vg_a == vg_b == None:
             pass
         else:
-            if ob.mode == 'WEIGHT_PAINT':# or props.bool_cache:
-                # slower, but prevent crashes
-                for i in range(n_verts):
-                    if vg_a: vg_a.add([i], a[i], 'REPLACE')
-                    if vg_b: vg_b.add([i], b[i], 'REPLACE')
-            else:
-                if props.bool_mod or props.bool_cache:
-                    #bm.free()               # release old bmesh
-                    bm = bmesh.new()        # create an empty BMesh
-                    bm.from_mesh(ob.data)   # fill it in from a Mesh
-                    dvert_lay = bm.verts.layers.deform.active
-                # faster, but can cause crashes while painting weight
-                if vg_a: index_a = vg_a.index
-                if vg_b: index_b = vg_b.index
-                for i, v in enumerate(bm.verts):
-                    dvert = v[dvert_lay]
-                    if vg_a: dvert[index_a] = a[i]
-                    if vg_b: dvert[index_b] = b[i]
-                bm.to_mesh(ob.data)
-                bm.free()
+            rd_write_weights(ob, a, b, vg_a, vg_b)
         print('       Writing Vertex Groups Time:',time.time() - start)
     if props.normalize:
         min_a = np.min(a)
@@ -3611,186 +3734,37 @@ def fast_bake_def(ob, frame_start=1, frame_end=250):
     else:
         me = ob.data
 
-    bm = bmesh.new()   # create an empty BMesh
-    bm.from_mesh(me)   # fill it in from a Mesh
-    dvert_lay = bm.verts.layers.deform.active
-    n_edges = len(me.edges)
     n_verts = len(me.vertices)
-    a = np.zeros(n_verts)
-    b = np.zeros(n_verts)
-    group_index_a = ob.vertex_groups["A"].index
-    group_index_b = ob.vertex_groups["B"].index
-
-    dt = props.dt
-    time_steps = props.time_steps
-    f = props.f
-    k = props.k
-    diff_a = props.diff_a
-    diff_b = props.diff_b
-    scale = props.diff_mult
-
-    brush_mult = props.brush_mult
-
-    # store weight values
-    if 'dB' in ob.vertex_groups: db = np.zeros(n_verts)
-    if 'grad' in ob.vertex_groups: grad = np.zeros(n_verts)
-
-    if props.vertex_group_diff_a != '': diff_a = np.zeros(n_verts)
-    if props.vertex_group_diff_b != '': diff_b = np.zeros(n_verts)
-    if props.vertex_group_scale != '': scale = np.zeros(n_verts)
-    if props.vertex_group_f != '': f = np.zeros(n_verts)
-    if props.vertex_group_k != '': k = np.zeros(n_verts)
-    if props.vertex_group_brush != '': brush = np.zeros(n_verts)
-    else: brush = 0
-
-    a = bmesh_get_weight_numpy(group_index_a, dvert_lay, bm.verts)
-    b = bmesh_get_weight_numpy(group_index_b, dvert_lay, bm.verts)
-
-    if props.vertex_group_diff_a != '':
-        group_index = ob.vertex_groups[props.vertex_group_diff_a].index
-        diff_a = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-        if props.invert_vertex_group_diff_a:
-            vg_bounds = (props.min_diff_a, props.max_diff_a)
-        else:
-            vg_bounds = (props.max_diff_a, props.min_diff_a)
-        diff_a = np.interp(diff_a, (0,1), vg_bounds)
-
-    if props.vertex_group_diff_b != '':
-        group_index = ob.vertex_groups[props.vertex_group_diff_b].index
-        diff_b = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-        if props.invert_vertex_group_diff_b:
-            vg_bounds = (props.max_diff_b, props.min_diff_b)
-        else:
-            vg_bounds = (props.min_diff_b, props.max_diff_b)
-        diff_b = np.interp(diff_b, (0,1), vg_bounds)
-
-    if props.vertex_group_scale != '':
-        group_index = ob.vertex_groups[props.vertex_group_scale].index
-        scale = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-        if props.invert_vertex_group_scale:
-            vg_bounds = (props.max_scale, props.min_scale)
-        else:
-            vg_bounds = (props.min_scale, props.max_scale)
-        scale = np.interp(scale, (0,1), vg_bounds)
-
-    if props.vertex_group_f != '':
-        group_index = ob.vertex_groups[props.vertex_group_f].index
-        f = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-        if props.invert_vertex_group_f:
-            vg_bounds = (props.max_f, props.min_f)
-        else:
-            vg_bounds = (props.min_f, props.max_f)
-        f = np.interp(f, (0,1), vg_bounds, )
-
-    if props.vertex_group_k != '':
-        group_index = ob.vertex_groups[props.vertex_group_k].index
-        k = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-        if props.invert_vertex_group_k:
-            vg_bounds = (props.max_k, props.min_k)
-        else:
-            vg_bounds = (props.min_k, props.max_k)
-        k = np.interp(k, (0,1), vg_bounds)
-
-    if props.vertex_group_brush != '':
-        group_index = ob.vertex_groups[props.vertex_group_brush].index
-        brush = bmesh_get_weight_numpy(group_index, dvert_lay, bm.verts)
-        brush *= brush_mult
-
-    diff_a *= scale
-    diff_b *= scale
-
-    edge_verts = [0]*n_edges*2
-    me.edges.foreach_get("vertices", edge_verts)
-
-    gradient = get_uv_edge_vectors(me)
-    uv_dir = Vector((0.5,0.5,0))
-    #gradient = [abs(g.dot(uv_dir)) for g in gradient]
-    gradient = [max(0,g.dot(uv_dir)) for g in gradient]
+    a, b, maps = rd_read_weights(ob, me, props)
+    topology, laplacian = get_edge_laplacian(me)
 
     timeElapsed = time.time() - start
     print('       Preparation Time:',timeElapsed)
     start = time.time()
 
-    try:
-        edge_verts = np.array(edge_verts)
-        _f = f if type(f) is np.ndarray else np.array((f,))
-        _k = k if type(k) is np.ndarray else np.array((k,))
-        _diff_a = diff_a if type(diff_a) is np.ndarray else np.array((diff_a,))
-        _diff_b = diff_b if type(diff_b) is np.ndarray else np.array((diff_b,))
-        _brush = brush if type(brush) is np.ndarray else np.array((brush,))
-
-        run_rd = False
-        for j in range(props.cache_frame_start, props.cache_frame_end+1):
-            start2 = time.time()
-            print("{:6d} Reaction-Diffusion: {}".format(j, ob.name))
-            if run_rd:
-                b += _brush
-                a, b = numba_reaction_diffusion(n_verts, n_edges, edge_verts, a, b, _brush, _diff_a, _diff_b, _f, _k, dt, time_steps)
-            else:
-                run_rd = True
-
-            if not(os.path.exists(folder)):
-                os.mkdir(folder)
-            file_name = folder / "a_{:04d}".format(j)
-            a.tofile(file_name)
-            file_name = folder / "b_{:04d}".format(j)
-            b.tofile(file_name)
-
-            timeElapsed = time.time() - start2
-            print('       Simulation Time:',timeElapsed)
-
-    except:
-        print('Not using Numba! The simulation could be slow.')
-        edge_verts = np.array(edge_verts)
-        arr = np.arange(n_edges)*2
-        id0 = edge_verts[arr]     # first vertex indices for each edge
-        id1 = edge_verts[arr+1]   # second vertex indices for each edge
-        for j in range(props.cache_frame_start, props.cache_frame_end):
-            for i in range(time_steps):
-                b += brush
-                lap_a = np.zeros(n_verts)
-                lap_b = np.zeros(n_verts)
-                lap_a0 =  a[id1] -  a[id0]   # laplacian increment for first vertex of each edge
-                lap_b0 =  b[id1] -  b[id0]   # laplacian increment for first vertex of each edge
-
-                np.add.at(lap_a, id0, lap_a0)
-                np.add.at(lap_b, id0, lap_b0)
-                np.add.at(lap_a, id1, -lap_a0)
-                np.add.at(lap_b, id1, -lap_b0)
-
-                ab2 = a*b**2
-                a += eval("(diff_a*lap_a - ab2 + f*(1-a))*dt")
-                b += eval("(diff_b*lap_b + ab2 - (k+f)*b)*dt")
-
-                a = nan_to_num(a)
-                b = nan_to_num(b)
-
-            if not(os.path.exists(folder)):
-                os.mkdir(folder)
-            file_name = folder / "a_{:04d}".format(j)
-            a.tofile(file_name)
-            file_name = folder / "b_{:04d}".format(j)
-            b.tofile(file_name)
+    # All the frames are stored in a single memory-mapped array
+    if not(os.path.exists(folder)):
+        os.mkdir(folder)
+    rd_remove_frame_stacks(folder)
+    n_frames = max(frame_end - frame_start + 1, 1)
+    frames = np.lib.format.open_memmap(rd_frame_stack_path(folder, frame_start),
+        mode='w+', dtype=np.float32, shape=(n_frames, 2, n_verts))
+    for j in range(n_frames):
+        start2 = time.time()
+        print("{:6d} Reaction-Diffusion: {}".format(frame_start + j, ob.name))
+        if j > 0:
+            reaction_diffusion_numpy(laplacian, a, b, maps['brush'], maps['diff_a'],
+                maps['diff_b'], maps['f'], maps['k'], props.dt, props.time_steps)
+        frames[j,0] = a
+        frames[j,1] = b
+
+        timeElapsed = time.time() - start2
+        print('       Simulation Time:',timeElapsed)
+    frames.flush()
+    del frames
+    rd_state_cache.pop(ob.name, None)
 
-    if ob.mode == 'WEIGHT_PAINT':
-        # slower, but prevent crashes
-        vg_a = ob.vertex_groups['A']
-        vg_b = ob.vertex_groups['B']
-        for i in range(n_verts):
-            vg_a.add([i], a[i], 'REPLACE')
-            vg_b.add([i], b[i], 'REPLACE')
-    else:
-        if props.bool_mod:
-            bm.free()               # release old bmesh
-            bm = bmesh.new()        # create an empty BMesh
-            bm.from_mesh(ob.data)   # fill it in from a Mesh
-            dvert_lay = bm.verts.layers.deform.active
-        # faster, but can cause crashes while painting weight
-        for i, v in enumerate(bm.verts):
-            dvert = v[dvert_lay]
-            dvert[group_index_a] = a[i]
-            dvert[group_index_b] = b[i]
-        bm.to_mesh(ob.data)
+    rd_write_weights(ob, a, b, ob.vertex_groups['A'], ob.vertex_groups['B'])
 
     # Update Vertex Colors
     if 'A' in ob.data.vertex_colors or 'B' in ob.data.vertex_colors:
@@ -3814,7 +3788,6 @@ def fast_bake_def(ob, frame_start=1, frame_end=250):
             ps.invert_vertex_group_density = not ps.invert_vertex_group_density
 
     if props.bool_mod: bpy.data.meshes.remove(me)
-    bm.free()
     timeElapsed = time.time() - start
     print('       Closing Time:',timeElapsed)
 
@@ -103,6 +103,8 @@ classes = (
 
 @persistent
 def depsgraph_update_post_handler(dummy):
+    internals.tag_state_changed()
+
     if internals.move_triggered:
         internals.move_triggered = False
         return
@@ -112,12 +114,14 @@ def depsgraph_update_post_handler(dummy):
 
 @persistent
 def undo_redo_post_handler(dummy):
+    internals.tag_state_changed()
     internals.move_selection.clear()
     internals.move_active = None
 
 
 @persistent
 def global_load_pre_handler(dummy):
+    internals.tag_state_changed()
     internals.move_triggered = False
     internals.move_selection.clear()
     internals.move_active = None
@@ -18,6 +18,7 @@ from bpy.props import (
 
 move_triggered = False
 move_selection = []
+move_selection_objects = {}
 move_active = None
 
 layer_collections = {}
@@ -28,6 +29,11 @@ expanded = set()
 row_index = 0
 max_lvl = 0
 
+# bumped whenever the collections or the qcd slots may have changed,
+# lets the header and popup skip rebuilding and comparing their state
+state_version = 0
+collection_tree_key = None
+
 rto_history = {
     "exclude": {},
     "exclude_all": {},
@@ -90,14 +96,22 @@ swap_buffer = {
     }
 
 
+def tag_state_changed():
+    global state_version
+
+    state_version += 1
+
+
 class QCDSlots():
     _slots = {}
+    _names = {}
     overrides = set()
     allow_update = True
 
     def __init__(self):
         self._slots = persistent_data.slots
         self.overrides = persistent_data.overrides
+        self._names = {name: idx for idx, name in self._slots.items()}
 
     def __iter__(self):
         return self._slots.items().__iter__()
@@ -110,7 +124,7 @@ class QCDSlots():
             return idx in self._slots.keys()
 
         if name:
-            return name in self._slots.values()
+            return name in self._names
 
         raise
 
@@ -130,23 +144,23 @@ class QCDSlots():
         blend_overrides = eval(decoupled_data[1])
 
         self._slots.clear()
+        self._names.clear()
         self.overrides.clear()
 
         for key, value in blend_slots.items():
             self._slots[key] = value
+            self._names[value] = key
 
         for key in blend_overrides:
             self.overrides.add(key)
 
+        tag_state_changed()
+
     def length(self):
         return len(self._slots)
 
     def get_idx(self, name, r_value=None):
-        for idx, slot_name in self._slots.items():
-            if slot_name == name:
-                return idx
-
-        return r_value
+        return self._names.get(name, r_value)
 
     def get_name(self, idx, r_value=None):
         if idx in self._slots:
@@ -155,25 +169,36 @@ class QCDSlots():
         return r_value
 
     def add_slot(self, idx, name):
+        old_name = self._slots.get(idx)
+        if old_name is not None and self._names.get(old_name) == idx:
+            del self._names[old_name]
+
         self._slots[idx] = name
+        self._names[name] = idx
 
         if name in self.overrides:
             self.overrides.remove(name)
 
+        tag_state_changed()
+
     def update_slot(self, idx, name):
         self.add_slot(idx, name)
 
     def del_slot(self, *, idx=None, name=None):
         if idx and not name:
+            name = self._slots.pop(idx)
+
+        elif name and not idx:
+            idx = self._names[name]
             del self._slots[idx]
-            return
 
-        if name and not idx:
-            slot_idx = self.get_idx(name)
-            del self._slots[slot_idx]
-            return
+        else:
+            raise
 
-        raise
+        if self._names.get(name) == idx:
+            del self._names[name]
+
+        tag_state_changed()
 
     def add_override(self, name):
         qcd_slots.del_slot(name=name)
@@ -181,6 +206,9 @@ class QCDSlots():
 
     def clear_slots(self):
         self._slots.clear()
+        self._names.clear()
+
+        tag_state_changed()
 
     def update_qcd(self):
         for idx, name in list(self._slots.items()):
@@ -199,13 +227,13 @@ class QCDSlots():
                 if layer_collection.name in qcd_slots.overrides:
                     continue
 
-                for x in range(20):
-                    if (not self.contains(idx=str(x+1)) and
-                        not self.contains(name=layer_collection.name)):
+                if not self.contains(name=layer_collection.name):
+                    for x in range(20):
+                        if not self.contains(idx=str(x+1)):
                             self.add_slot(str(x+1), layer_collection.name)
+                            break
 
-
-                if self.length() > 20:
+                if self.length() >= 20:
                     break
 
     def renumerate(self, *, beginning=False, depth_first=False, constrain=False):
@@ -455,12 +483,17 @@ class CMListCollection(PropertyGroup):
     qcd_slot_idx: StringProperty(name="QCD Slot", update=update_qcd_slot)
 
 
-def update_collection_tree(context):
+def update_collection_tree(context, *, if_changed=False):
     global max_lvl
     global row_index
     global collection_tree
     global layer_collections
     global qcd_slots
+    global collection_tree_key
+
+    # nothing was updated since the tree was last built for this view layer
+    if if_changed and collection_tree_key == (state_version, context.view_layer.as_pointer()):
+        return
 
     collection_tree.clear()
     layer_collections.clear()
@@ -491,6 +524,8 @@ def update_collection_tree(context):
 
     qcd_slots.auto_numerate()
 
+    collection_tree_key = (state_version, context.view_layer.as_pointer())
+
 
 def get_all_collections(context, collections, parent, tree, level=0, visible=False):
     global row_index
@@ -535,25 +570,42 @@ def update_property_group(context):
     qcd_slots.allow_update = False
 
     update_collection_tree(context)
-    context.scene.collection_manager.cm_list_collection.clear()
-    create_property_group(context, collection_tree)
+    update_property_group_rows(context.scene.collection_manager.cm_list_collection)
 
     qcd_slots.allow_update = True
 
 
-def create_property_group(context, tree):
-    global in_filter
-    global qcd_slots
+def update_property_group_rows(cm_list_collection):
+    # the list rows follow the collection tree order, only the rows between
+    # the unchanged leading and trailing rows are recreated
+    names = list(layer_collections)
+    row_names = [item.name for item in cm_list_collection]
+
+    start = 0
+    max_start = min(len(names), len(row_names))
+    while start < max_start and names[start] == row_names[start]:
+        start += 1
+
+    end = 0
+    max_end = max_start - start
+    while end < max_end and names[-1 - end] == row_names[-1 - end]:
+        end += 1
+
+    for x in range(len(row_names) - end - start):
+        cm_list_collection.remove(start)
+
+    for x, name in enumerate(names[start:len(names) - end], start):
+        new_cm_listitem = cm_list_collection.add()
+        new_cm_listitem.name = name
 
-    cm = context.scene.collection_manager
+        if x != len(cm_list_collection) - 1:
+            cm_list_collection.move(len(cm_list_collection) - 1, x)
 
-    for laycol in tree:
-        new_cm_listitem = cm.cm_list_collection.add()
-        new_cm_listitem.name = laycol["name"]
-        new_cm_listitem.qcd_slot_idx = qcd_slots.get_idx(laycol["name"], "")
+    for item in cm_list_collection:
+        qcd_slot_idx = qcd_slots.get_idx(item.name, "")
 
-        if laycol["has_children"]:
-            create_property_group(context, laycol["children"])
+        if item.qcd_slot_idx != qcd_slot_idx:
+            item.qcd_slot_idx = qcd_slot_idx
 
 
 def get_modifiers(event):
@@ -579,19 +631,25 @@ def generate_state(*, qcd=False):
     global qcd_slots
 
     state = {
-        "name": [],
-        "exclude": [],
-        "select": [],
-        "hide": [],
-        "disable": [],
-        "render": [],
-        "holdout": [],
-        "indirect": [],
+        "version": state_version,
+        "name": list(layer_collections),
+        "exclude": [laycol["ptr"].exclude for laycol in layer_collections.values()],
         }
 
-    for name, laycol in layer_collections.items():
-        state["name"].append(name)
-        state["exclude"].append(laycol["ptr"].exclude)
+    # the qcd state is only compared on names, exclusion and slots
+    if qcd:
+        state["qcd"] = dict(qcd_slots)
+
+        return state
+
+    state["select"] = []
+    state["hide"] = []
+    state["disable"] = []
+    state["render"] = []
+    state["holdout"] = []
+    state["indirect"] = []
+
+    for laycol in layer_collections.values():
         state["select"].append(laycol["ptr"].collection.hide_select)
         state["hide"].append(laycol["ptr"].hide_viewport)
         state["disable"].append(laycol["ptr"].collection.hide_viewport)
@@ -599,9 +657,6 @@ def generate_state(*, qcd=False):
         state["holdout"].append(laycol["ptr"].holdout)
         state["indirect"].append(laycol["ptr"].indirect_only)
 
-    if qcd:
-        state["qcd"] = dict(qcd_slots)
-
     return state
 
 
@@ -609,7 +664,7 @@ def check_state(context, *, cm_popup=False, phantom_mode=False, qcd=False):
     view_layer = context.view_layer
 
     # check if expanded & history/buffer state still correct
-    if cm_popup and collection_state:
+    if cm_popup and collection_state and collection_state["version"] != state_version:
         new_state = generate_state()
 
         if new_state["name"] != collection_state["name"]:
@@ -666,7 +721,7 @@ def check_state(context, *, cm_popup=False, phantom_mode=False, qcd=False):
                             phantom_history["view_layer"] = ""
 
 
-    if qcd and qcd_collection_state:
+    if qcd and qcd_collection_state and qcd_collection_state["version"] != state_version:
         from .qcd_operators import QCDAllBase
         new_state = generate_state(qcd=True)
 
@@ -678,22 +733,43 @@ def check_state(context, *, cm_popup=False, phantom_mode=False, qcd=False):
                 qcd_collection_state.clear()
                 QCDAllBase.clear()
 
+        # compared already, skip it until the next change
+        if qcd_collection_state:
+            qcd_collection_state["version"] = state_version
+
 
 def get_move_selection(*, names_only=False):
     global move_selection
+    global move_selection_objects
 
     if not move_selection:
-        move_selection = {obj.name for obj in bpy.context.selected_objects}
+        move_selection_objects = {obj.name: obj for obj in bpy.context.selected_objects}
+        move_selection = set(move_selection_objects)
 
     if names_only:
         return move_selection
 
     else:
-        if len(move_selection) <= 5:
-            return {bpy.data.objects[name] for name in move_selection}
+        # the objects are looked up once per selection, with a single pass over
+        # bpy.data.objects for larger selections
+        if move_selection_objects.keys() != move_selection:
+            if len(move_selection) <= 5:
+                move_selection_objects = {name: bpy.data.objects[name] for name in move_selection}
 
-        else:
-            return {obj for obj in bpy.data.objects if obj.name in move_selection}
+            else:
+                move_selection_objects = {obj.name: obj for obj in bpy.data.objects
+                                          if obj.name in move_selection}
+
+        return set(move_selection_objects.values())
+
+
+def get_move_selection_collections(objects=None):
+    # collections directly holding any of the objects, gathered once so the
+    # collections can be checked without going through all their objects
+    if objects is None:
+        objects = get_move_selection()
+
+    return {collection for obj in objects for collection in obj.users_collection}
 
 
 def get_move_active(*, always=False):
@@ -10,6 +10,7 @@ from . import internals
 from .internals import (
     update_property_group,
     get_move_selection,
+    get_move_selection_collections,
     get_move_active,
 )
 
@@ -118,6 +119,24 @@ def set_rto(layer_collection, rto, value):
         setattr(collection, rto_path[rto].split(".")[1], value)
 
 
+def set_rtos(rto, states):
+    # states holds a value for every layer collection, in tree order, so parents
+    # are set before their children and any exclusion propagated to the children
+    # gets overwritten, collections already in the wanted state are skipped
+    for laycol, state in zip(internals.layer_collections.values(), states):
+        if get_rto(laycol["ptr"], rto) != state:
+            set_rto(laycol["ptr"], rto, state)
+
+
+def activate_parents(states, laycol, rto):
+    on = set_off_on[rto]["on"]
+
+    laycol = laycol["parent"]
+    while laycol["id"] != 0:
+        states[laycol["id"] - 1] = on
+        laycol = laycol["parent"]
+
+
 def apply_to_children(parent, apply_function, *args, **kwargs):
     # works for both Collections & LayerCollections
     child_lists = [parent.children]
@@ -143,15 +162,18 @@ def isolate_rto(cls, self, view_layer, rto, *, children=False):
     target = internals.rto_history[rto][view_layer]["target"]
     history = internals.rto_history[rto][view_layer]["history"]
 
+    # get current states
+    states = [get_rto(x["ptr"], rto) for x in internals.layer_collections.values()]
+
     # get active collections
-    active_layer_collections = [x["ptr"] for x in internals.layer_collections.values()
-                                if get_rto(x["ptr"], rto) == on]
+    active_layer_collections = [x["ptr"] for x, state in
+                                zip(internals.layer_collections.values(), states)
+                                if state == on]
 
     # check if previous state should be restored
     if cls.isolated and self.name == target:
         # restore previous state
-        for x, item in enumerate(internals.layer_collections.values()):
-            set_rto(item["ptr"], rto, history[x])
+        set_rtos(rto, history)
 
         # reset target and history
         del internals.rto_history[rto][view_layer]
@@ -162,8 +184,7 @@ def isolate_rto(cls, self, view_layer, rto, *, children=False):
     elif (len(active_layer_collections) == 1 and
           active_layer_collections[0].name == self.name):
         # activate all collections
-        for item in internals.layer_collections.values():
-            set_rto(item["ptr"], rto, on)
+        set_rtos(rto, [on] * len(states))
 
         # reset target and history
         del internals.rto_history[rto][view_layer]
@@ -179,52 +200,28 @@ def isolate_rto(cls, self, view_layer, rto, *, children=False):
         history.clear()
 
         # save state
-        for item in internals.layer_collections.values():
-            history.append(get_rto(item["ptr"], rto))
-
-        child_states = {}
-        if children:
-            # get child states
-            def get_child_states(layer_collection):
-                child_states[layer_collection.name] = get_rto(layer_collection, rto)
-
-            apply_to_children(laycol_ptr, get_child_states)
+        history.extend(states)
 
         # isolate collection
-        for item in internals.layer_collections.values():
-            if item["name"] != laycol_ptr.name:
-                set_rto(item["ptr"], rto, off)
-
-        set_rto(laycol_ptr, rto, on)
+        laycol = internals.layer_collections[self.name]
+        new_states = [off] * len(states)
+        new_states[laycol["id"] - 1] = on
 
         if rto not in ["exclude", "holdout", "indirect"]:
             # activate all parents
-            laycol = internals.layer_collections[self.name]
-            while laycol["id"] != 0:
-                set_rto(laycol["ptr"], rto, on)
-                laycol = laycol["parent"]
-
-            if children:
-                # restore child states
-                def restore_child_states(layer_collection):
-                    set_rto(layer_collection, rto, child_states[layer_collection.name])
-
-                apply_to_children(laycol_ptr, restore_child_states)
+            activate_parents(new_states, laycol, rto)
 
-        else:
-            if children:
-                # restore child states
-                def restore_child_states(layer_collection):
-                    set_rto(layer_collection, rto, child_states[layer_collection.name])
-
-                apply_to_children(laycol_ptr, restore_child_states)
+        if children:
+            # keep child states
+            def keep_child_states(layer_collection):
+                x = internals.layer_collections[layer_collection.name]["id"] - 1
+                new_states[x] = states[x]
 
-            elif rto == "exclude":
-                # deactivate all children
-                def deactivate_all_children(layer_collection):
-                    set_rto(layer_collection, rto, True)
+            apply_to_children(laycol_ptr, keep_child_states)
 
-                apply_to_children(laycol_ptr, deactivate_all_children)
+        # without children all of them are deactivated, including the
+        # excluded children of the isolated collection
+        set_rtos(rto, new_states)
 
         cls.isolated = True
 
@@ -251,31 +248,28 @@ def isolate_sel_objs_collections(view_layer, rto, caller, *, use_active=False):
     # if not isolated, isolate collections of selected objects
     if len(history) == 0:
         keep_history = False
+        selected_collections = get_move_selection_collections(selected_objects)
+        states = []
 
-        # save history and isolate RTOs
+        # save history and get the isolated RTOs
         for item in internals.layer_collections.values():
             history.append(get_rto(item["ptr"], rto))
             rto_state = off
 
             # check if any of the selected objects are in the collection
-            if not set(selected_objects).isdisjoint(item["ptr"].collection.objects):
+            if item["ptr"].collection in selected_collections:
                 rto_state = on
 
             if history[-1] != rto_state:
                 keep_history = True
 
-            if rto == "exclude":
-                set_exclude_state(item["ptr"], rto_state)
+            states.append(rto_state)
 
-            else:
-                set_rto(item["ptr"], rto, rto_state)
-
-                # activate all parents if needed
-                if rto_state == on and rto not in ["holdout", "indirect"]:
-                    laycol = item["parent"]
-                    while laycol["id"] != 0:
-                        set_rto(laycol["ptr"], rto, on)
-                        laycol = laycol["parent"]
+        if rto not in ["exclude", "holdout", "indirect"]:
+            # activate all parents if needed
+            for item, rto_state in zip(internals.layer_collections.values(), list(states)):
+                if rto_state == on:
+                    activate_parents(states, item, rto)
 
 
         if not keep_history:
@@ -283,10 +277,11 @@ def isolate_sel_objs_collections(view_layer, rto, caller, *, use_active=False):
 
             return "Collection already isolated"
 
+        set_rtos(rto, states)
+
 
     else:
-        for x, item in enumerate(internals.layer_collections.values()):
-            set_rto(item["ptr"], rto, history[x])
+        set_rtos(rto, history)
 
         # clear history
         if caller == "CM":
@@ -320,22 +315,25 @@ def disable_sel_objs_collections(view_layer, rto, caller):
 
     # if not disabled, disable collections of selected objects
     if len(history) == 0:
+        selected_collections = get_move_selection_collections(selected_objects)
+        states = []
+
         # save history and disable RTOs
         for item in internals.layer_collections.values():
             history.append(get_rto(item["ptr"], rto))
 
             # check if any of the selected objects are in the collection
-            if not set(selected_objects).isdisjoint(item["ptr"].collection.objects):
-                if rto == "exclude":
-                    set_exclude_state(item["ptr"], off)
+            if item["ptr"].collection in selected_collections:
+                states.append(off)
+
+            else:
+                states.append(history[-1])
 
-                else:
-                    set_rto(item["ptr"], rto, off)
+        set_rtos(rto, states)
 
 
     else:
-        for x, item in enumerate(internals.layer_collections.values()):
-            set_rto(item["ptr"], rto, history[x])
+        set_rtos(rto, history)
 
         # clear history
         if caller == "CM":
@@ -369,42 +367,26 @@ def activate_all_rtos(view_layer, rto):
 
     # if not activated, activate all
     if len(history) == 0:
-        keep_history = False
-
-        for item in reversed(list(internals.layer_collections.values())):
-            if get_rto(item["ptr"], rto) == off:
-                keep_history = True
-
-            history.append(get_rto(item["ptr"], rto))
+        history.extend(get_rto(item["ptr"], rto)
+                       for item in internals.layer_collections.values())
 
-            set_rto(item["ptr"], rto, on)
+        if off in history:
+            set_rtos(rto, [on] * len(history))
 
-        if not keep_history:
+        else:
             history.clear()
 
-        history.reverse()
-
     else:
-        for x, item in enumerate(internals.layer_collections.values()):
-            set_rto(item["ptr"], rto, history[x])
+        set_rtos(rto, history)
 
         # clear rto history
         del internals.rto_history[rto+"_all"][view_layer]
 
 
 def invert_rtos(view_layer, rto):
-    if rto == "exclude":
-        orig_values = []
+    orig_values = [get_rto(item["ptr"], rto) for item in internals.layer_collections.values()]
 
-        for item in internals.layer_collections.values():
-            orig_values.append(get_rto(item["ptr"], rto))
-
-        for x, item in enumerate(internals.layer_collections.values()):
-            set_rto(item["ptr"], rto, not orig_values[x])
-
-    else:
-        for item in internals.layer_collections.values():
-            set_rto(item["ptr"], rto, not get_rto(item["ptr"], rto))
+    set_rtos(rto, [not value for value in orig_values])
 
     # clear rto history
     internals.rto_history[rto].pop(view_layer, None)
@@ -424,13 +406,7 @@ def copy_rtos(view_layer, rto):
 
     else:
         # paste
-        for x, laycol in enumerate(internals.layer_collections.values()):
-            set_rto(laycol["ptr"],
-                    rto,
-                    set_off_on[rto][
-                        internals.copy_buffer["values"][x]
-                        ]
-                    )
+        set_rtos(rto, [set_off_on[rto][value] for value in internals.copy_buffer["values"]])
 
         # clear rto history
         internals.rto_history[rto].pop(view_layer, None)
@@ -465,28 +441,16 @@ def swap_rtos(view_layer, rto):
                                             )
 
         # swap A with B
-        for x, laycol in enumerate(internals.layer_collections.values()):
-            set_rto(laycol["ptr"], internals.swap_buffer["A"]["RTO"],
-                    set_off_on[
-                        internals.swap_buffer["A"]["RTO"]
-                        ][
-                        internals.swap_buffer["B"]["values"][x]
-                        ]
-                    )
-
-            set_rto(laycol["ptr"], internals.swap_buffer["B"]["RTO"],
-                    set_off_on[
-                        internals.swap_buffer["B"]["RTO"]
-                        ][
-                        internals.swap_buffer["A"]["values"][x]
-                        ]
-                    )
-
-
-        # clear rto history
         swap_a = internals.swap_buffer["A"]["RTO"]
         swap_b = internals.swap_buffer["B"]["RTO"]
 
+        set_rtos(swap_a, [set_off_on[swap_a][value]
+                          for value in internals.swap_buffer["B"]["values"]])
+        set_rtos(swap_b, [set_off_on[swap_b][value]
+                          for value in internals.swap_buffer["A"]["values"]])
+
+
+        # clear rto history
         internals.rto_history[swap_a].pop(view_layer, None)
         internals.rto_history[swap_a+"_all"].pop(view_layer, None)
         internals.rto_history[swap_b].pop(view_layer, None)
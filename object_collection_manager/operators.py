@@ -309,11 +309,14 @@ class CMSendObjectsToCollectionOperator(Operator):
             if not active_object:
                 active_object = tuple(selected_objects)[0]
 
+            # objects already in the collection, looked up once for the whole selection
+            target_objects = set(target_collection.objects)
+
             # check if in collection
-            if not active_object.name in target_collection.objects:
+            if not active_object in target_objects:
                 # add to collection
                 for obj in selected_objects:
-                    if obj.name not in target_collection.objects:
+                    if obj not in target_objects:
                         target_collection.objects.link(obj)
 
             else:
@@ -322,7 +325,7 @@ class CMSendObjectsToCollectionOperator(Operator):
 
                 # remove from collections
                 for obj in selected_objects:
-                    if obj.name in target_collection.objects:
+                    if obj in target_objects:
 
                         # disallow removing if only one
                         if len(obj.users_collection) == 1:
@@ -358,8 +361,10 @@ class CMSendObjectsToCollectionOperator(Operator):
 
         else:
             # move objects to collection
+            target_objects = set(target_collection.objects)
+
             for obj in selected_objects:
-                if obj.name not in target_collection.objects:
+                if obj not in target_objects:
                     target_collection.objects.link(obj)
 
                 # remove from all other collections
@@ -1529,6 +1534,7 @@ class CMUndoWrapper(Operator):
         internals.collection_state.clear()
         internals.collection_state.update(generate_state())
         bpy.ops.ed.undo()
+        internals.tag_state_changed()
         update_property_group(context)
 
         check_state(context, cm_popup=True)
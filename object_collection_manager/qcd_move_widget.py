@@ -16,6 +16,7 @@ from . import internals
 
 from .qcd_operators import (
     get_move_selection,
+    get_move_selection_collections,
     get_move_active,
     )
 
@@ -640,6 +641,7 @@ def allocate_main_ui(self, context):
 
 
     selected_objects = get_move_selection()
+    selected_collections = get_move_selection_collections(selected_objects)
     active_object = get_move_active()
 
 
@@ -681,7 +683,7 @@ def allocate_main_ui(self, context):
 
                     self.areas[f"Button {slot_num} Active Object Indicator"] = active_object_indicator
 
-                elif not set(selected_objects).isdisjoint(collection_objects):
+                elif qcd_laycol.collection in selected_collections:
                     x = cur_width_pos + round(button_size / 4) + floor(1 * scale_factor())
                     y = cur_height_pos - round(button_size / 4) - floor(1 * scale_factor())
                     selected_object_indicator = {
@@ -771,14 +773,16 @@ def draw_callback_px(self, context):
     in_tooltip_area = False
     tooltip_slot_idx = None
 
+    selected_objects = get_move_selection()
+    selected_collections = get_move_selection_collections(selected_objects)
+    active_object = get_move_active()
+
     for num in range(20):
         slot_num = num + 1
         qcd_slot_name = internals.qcd_slots.get_name(f"{slot_num}")
         if qcd_slot_name:
             qcd_laycol = internals.layer_collections[qcd_slot_name]["ptr"]
             collection_objects = qcd_laycol.collection.objects
-            selected_objects = get_move_selection()
-            active_object = get_move_active()
             button_area = self.areas[f"Button {slot_num}"]
 
             # colors
@@ -851,7 +855,7 @@ def draw_callback_px(self, context):
                 bgl.glDisable(bgl.GL_BLEND)
 
             # SELECTED OBJECTS
-            elif not set(selected_objects).isdisjoint(collection_objects):
+            elif qcd_laycol.collection in selected_collections:
                 selected_object_indicator = self.areas[f"Button {slot_num} Selected Object Indicator"]
 
                 alpha = addon_prefs.qcd_ogl_selected_icon_alpha
@@ -23,15 +23,16 @@ from .internals import (
     generate_state,
     get_modifiers,
     get_move_selection,
+    get_move_selection_collections,
     get_move_active,
     update_qcd_header,
 )
 
 from .operator_utils import (
     mode_converter,
-    apply_to_children,
     select_collection_objects,
     set_exclude_state,
+    set_rtos,
     isolate_sel_objs_collections,
     disable_sel_objs_collections,
 )
@@ -88,8 +89,7 @@ class QCDAllBase():
 
     @classmethod
     def apply_history(cls):
-        for x, item in enumerate(internals.layer_collections.values()):
-            item["ptr"].exclude = cls.history[x]
+        set_rtos("exclude", cls.history)
 
         # clear rto history
         del internals.qcd_history[cls.view_layer]
@@ -158,6 +158,9 @@ class EnableAllQCDSlotsMeta(Operator):
                 qab.apply_history()
                 qab.finalize()
 
+                # the whole restore is a single undo step
+                bpy.ops.ed.undo_push(message=self.bl_label)
+
 
         if qab.meta_report:
             self.report({"INFO"}, qab.meta_report)
@@ -191,15 +194,17 @@ class EnableAllQCDSlots(Operator):
 
         if not qab.history:
             keep_history = False
+            states = []
 
             for laycol in internals.layer_collections.values():
                 is_qcd_slot = internals.qcd_slots.contains(name=laycol["name"])
 
                 qab.history.append(laycol["ptr"].exclude)
+                states.append(qab.history[-1])
 
                 if is_qcd_slot and laycol["ptr"].exclude:
                     keep_history = True
-                    set_exclude_state(laycol["ptr"], False)
+                    states[-1] = False
 
 
             if not keep_history:
@@ -215,6 +220,8 @@ class EnableAllQCDSlots(Operator):
 
                 return {'CANCELLED'}
 
+            set_rtos("exclude", states)
+
             internals.qcd_collection_state.clear()
             internals.qcd_collection_state.update(internals.generate_state(qcd=True))
 
@@ -255,18 +262,16 @@ class EnableAllQCDSlotsIsolated(Operator):
         if not qab.history:
             keep_history = False
 
+            states = []
+
             for laycol in internals.layer_collections.values():
                 is_qcd_slot = internals.qcd_slots.contains(name=laycol["name"])
 
                 qab.history.append(laycol["ptr"].exclude)
+                states.append(not is_qcd_slot)
 
-                if is_qcd_slot and laycol["ptr"].exclude:
-                    keep_history = True
-                    set_exclude_state(laycol["ptr"], False)
-
-                if not is_qcd_slot and not laycol["ptr"].exclude:
+                if states[-1] != qab.history[-1]:
                     keep_history = True
-                    set_exclude_state(laycol["ptr"], True)
 
 
             if not keep_history:
@@ -277,6 +282,8 @@ class EnableAllQCDSlotsIsolated(Operator):
                 self.report({"INFO"}, "All QCD slots are already enabled and isolated.")
                 return {'CANCELLED'}
 
+            set_rtos("exclude", states)
+
             internals.qcd_collection_state.clear()
             internals.qcd_collection_state.update(internals.generate_state(qcd=True))
 
@@ -377,14 +384,17 @@ class DisableAllNonQCDSlots(Operator):
         if not qab.history:
             keep_history = False
 
+            states = []
+
             for laycol in internals.layer_collections.values():
                 is_qcd_slot = internals.qcd_slots.contains(name=laycol["name"])
 
                 qab.history.append(laycol["ptr"].exclude)
+                states.append(qab.history[-1])
 
                 if not is_qcd_slot and not laycol["ptr"].exclude:
                     keep_history = True
-                    set_exclude_state(laycol["ptr"], True)
+                    states[-1] = True
 
             if not keep_history:
                 # clear rto history
@@ -394,6 +404,8 @@ class DisableAllNonQCDSlots(Operator):
                 self.report({"INFO"}, "All non QCD slots are already disabled.")
                 return {'CANCELLED'}
 
+            set_rtos("exclude", states)
+
             internals.qcd_collection_state.clear()
             internals.qcd_collection_state.update(internals.generate_state(qcd=True))
 
@@ -439,8 +451,7 @@ class DisableAllCollections(Operator):
                 self.report({"INFO"}, "All collections are already disabled.")
                 return {'CANCELLED'}
 
-            for laycol in internals.layer_collections.values():
-                laycol["ptr"].exclude = True
+            set_rtos("exclude", [True] * len(qab.history))
 
             internals.qcd_collection_state.clear()
             internals.qcd_collection_state.update(internals.generate_state(qcd=True))
@@ -551,19 +562,22 @@ class MoveToQCDSlot(Operator):
         if not selected_objects:
             return {'CANCELLED'}
 
+        # objects already in the slot, looked up once for the whole selection
+        slot_objects = set(qcd_laycol.collection.objects)
+
         # adds object to slot
         if self.toggle:
             if not active_object:
                 active_object = tuple(selected_objects)[0]
 
-            if not active_object.name in qcd_laycol.collection.objects:
+            if not active_object in slot_objects:
                 for obj in selected_objects:
-                    if obj.name not in qcd_laycol.collection.objects:
+                    if obj not in slot_objects:
                         qcd_laycol.collection.objects.link(obj)
 
             else:
                 for obj in selected_objects:
-                    if obj.name in qcd_laycol.collection.objects:
+                    if obj in slot_objects:
 
                         if len(obj.users_collection) == 1:
                             continue
@@ -574,7 +588,7 @@ class MoveToQCDSlot(Operator):
         # moves object to slot
         else:
             for obj in selected_objects:
-                if obj.name not in qcd_laycol.collection.objects:
+                if obj not in slot_objects:
                     qcd_laycol.collection.objects.link(obj)
 
                 for collection in obj.users_collection:
@@ -682,39 +696,28 @@ class ViewQCDSlot(Operator):
 
         orig_active_object = context.view_layer.objects.active
         locked = get_locked_objs(context)
+        locked_collections = get_move_selection_collections(locked.objs)
 
 
         if self.toggle:
             # check if slot can be toggled off.
             if not qcd_laycol.exclude:
-                if not set(locked.objs).isdisjoint(qcd_laycol.collection.objects):
+                if qcd_laycol.collection in locked_collections:
                     return {'CANCELLED'}
 
             # toggle exclusion of qcd_laycol
             set_exclude_state(qcd_laycol, not qcd_laycol.exclude)
 
         else:
-            # exclude all collections
-            for laycol in internals.layer_collections.values():
-                if laycol["name"] != qcd_laycol.name:
-                    # prevent exclusion if locked objects in this collection
-                    if set(locked.objs).isdisjoint(laycol["ptr"].collection.objects):
-                        laycol["ptr"].exclude = True
-                    else:
-                        laycol["ptr"].exclude = False
+            # exclude all collections, including the children of the target
+            # collection, and prevent exclusion if locked objects are in them
+            states = [laycol["ptr"].collection not in locked_collections
+                      for laycol in internals.layer_collections.values()]
 
             # un-exclude target collection
-            qcd_laycol.exclude = False
-
-            # exclude all children
-            def exclude_all_children(layer_collection):
-                # prevent exclusion if locked objects in this collection
-                if set(locked.objs).isdisjoint(layer_collection.collection.objects):
-                    layer_collection.exclude = True
-                else:
-                    layer_collection.exclude = False
+            states[internals.layer_collections[slot_name]["id"] - 1] = False
 
-            apply_to_children(qcd_laycol, exclude_all_children)
+            set_rtos("exclude", states)
 
         if orig_active_object:
             if orig_active_object.name in context.view_layer.objects:
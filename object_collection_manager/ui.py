@@ -26,6 +26,7 @@ from .internals import (
     generate_state,
     check_state,
     get_move_selection,
+    get_move_selection_collections,
     get_move_active,
     update_qcd_header,
     add_vertical_separator_line,
@@ -227,8 +228,10 @@ class CollectionManager(Operator):
         row_setcol.operator_context = 'INVOKE_DEFAULT'
 
         selected_objects = get_move_selection()
+        selected_collections = get_move_selection_collections(selected_objects)
         active_object = get_move_active()
         CM_UL_items.selected_objects = selected_objects
+        CM_UL_items.selected_collections = selected_collections
         CM_UL_items.active_object = active_object
 
         collection = context.view_layer.layer_collection.collection
@@ -242,7 +245,7 @@ class CollectionManager(Operator):
             if active_object and active_object.name in collection.objects:
                 icon = 'SNAP_VOLUME'
 
-            elif not selected_objects.isdisjoint(collection.objects):
+            elif collection in selected_collections:
                 icon = 'STICKY_UVS_LOC'
 
         else:
@@ -502,6 +505,7 @@ class CM_UL_items(UIList):
     last_filter_value = ""
 
     selected_objects = set()
+    selected_collections = set()
     active_object = None
 
     visible_items = []
@@ -545,6 +549,7 @@ class CM_UL_items(UIList):
         laycol = internals.layer_collections[item.name]
         collection = laycol["ptr"].collection
         selected_objects = CM_UL_items.selected_objects
+        selected_collections = CM_UL_items.selected_collections
         active_object = CM_UL_items.active_object
 
         column = layout.column(align=True)
@@ -702,7 +707,7 @@ class CM_UL_items(UIList):
             if active_object and active_object.name in collection.objects:
                 icon = 'SNAP_VOLUME'
 
-            elif not selected_objects.isdisjoint(collection.objects):
+            elif collection in selected_collections:
                 icon = 'STICKY_UVS_LOC'
 
         else:
@@ -874,12 +879,13 @@ class CM_UL_items(UIList):
         if self.filter_by_selected:
             CM_UL_items.filtering = True
             new_flt_flags = [0] * len(list_items)
+            selected_collections = get_move_selection_collections(context.selected_objects)
 
             for idx, item in enumerate(list_items):
                 collection = internals.layer_collections[item.name]["ptr"].collection
 
                 # check if any of the selected objects are in the collection
-                if not set(context.selected_objects).isdisjoint(collection.objects):
+                if collection in selected_collections:
                     new_flt_flags[idx] = self.bitflag_filter_item
 
                 # add in any recently created collections
@@ -1028,7 +1034,7 @@ class EnableAllQCDSlotsMenu(Menu):
 
 
 def view3d_header_qcd_slots(self, context):
-    update_collection_tree(context)
+    update_collection_tree(context, if_changed=True)
 
     view_layer = context.view_layer
     layout = self.layout
@@ -1053,6 +1059,7 @@ def view3d_header_qcd_slots(self, context):
     row.scale_y = 0.5
 
     selected_objects = get_move_selection()
+    selected_collections = get_move_selection_collections(selected_objects)
     active_object = get_move_active()
 
     for x in range(20):
@@ -1070,7 +1077,7 @@ def view3d_header_qcd_slots(self, context):
                 icon = 'LAYER_ACTIVE'
 
             # if there are selected objects use LAYER_ACTIVE
-            elif not selected_objects.isdisjoint(collection_objects):
+            elif qcd_laycol.collection in selected_collections:
                 icon = 'LAYER_USED'
 
             # If there are objects use LAYER_USED
@@ -47,6 +47,12 @@ def main_object(context, collection, obj, level, **kw):
     use_interior_vgroup = kw_copy.pop("use_interior_vgroup")
     use_sharp_edges = kw_copy.pop("use_sharp_edges")
     use_sharp_edges_apply = kw_copy.pop("use_sharp_edges_apply")
+    output_mode = kw_copy.pop("output_mode")
+    use_debug_redraw = kw_copy["use_debug_redraw"]
+
+    if kw_copy["use_batch"]:
+        # the view layer is only updated once all the shards are created
+        kw_copy["use_debug_redraw"] = False
 
     scene = context.scene
 
@@ -58,22 +64,35 @@ def main_object(context, collection, obj, level, **kw):
     # not essential but selection is visual distraction.
     obj.select_set(False)
 
-    if kw_copy["use_debug_redraw"]:
+    if use_debug_redraw:
         obj_display_type_prev = obj.display_type
         obj.display_type = 'WIRE'
 
-    objects = fracture_cell_setup.cell_fracture_objects(context, collection, obj, **kw_copy)
-    objects = fracture_cell_setup.cell_fracture_boolean(
-        context, collection, obj, objects,
-        use_island_split=use_island_split,
-        use_interior_hide=(use_interior_vgroup or use_sharp_edges),
-        use_debug_bool=use_debug_bool,
-        use_debug_redraw=kw_copy["use_debug_redraw"],
-        level=level,
-    )
+    if output_mode == 'MESH':
+        # all the shards in one object, recursion doesn't apply
+        del kw_copy["use_batch"], kw_copy["use_debug_redraw"]
+        recursion = 0
+        objects = fracture_cell_setup.cell_fracture_mesh(
+            context, collection, obj,
+            use_island_split=use_island_split,
+            use_interior_hide=(use_interior_vgroup or use_sharp_edges),
+            use_debug_bool=use_debug_bool,
+            use_recenter=use_recenter,
+            **kw_copy,
+        )
+    else:
+        objects = fracture_cell_setup.cell_fracture_objects(context, collection, obj, **kw_copy)
+        objects = fracture_cell_setup.cell_fracture_boolean(
+            context, collection, obj, objects,
+            use_island_split=use_island_split,
+            use_interior_hide=(use_interior_vgroup or use_sharp_edges),
+            use_debug_bool=use_debug_bool,
+            use_debug_redraw=kw_copy["use_debug_redraw"],
+            level=level,
+        )
 
     # must apply after boolean.
-    if use_recenter:
+    if use_recenter and output_mode != 'MESH':
         bpy.ops.object.origin_set(
             {"selected_editable_objects": objects},
             type='ORIGIN_GEOMETRY',
@@ -136,7 +155,7 @@ def main_object(context, collection, obj, level, **kw):
                 use_sharp_edges_apply=use_sharp_edges_apply,
             )
 
-    if kw_copy["use_debug_redraw"]:
+    if use_debug_redraw:
         obj.display_type = obj_display_type_prev
 
     # testing only!
@@ -251,7 +270,8 @@ class FractureCell(Operator):
     source_limit: IntProperty(
         name="Source Limit",
         description="Limit the number of input points, 0 for unlimited",
-        min=0, max=5000,
+        min=0, max=100000,
+        soft_max=5000,
         default=100,
     )
 
@@ -270,6 +290,13 @@ class FractureCell(Operator):
         default=(1.0, 1.0, 1.0),
     )
 
+    processes: IntProperty(
+        name="Processes",
+        description="Number of processes computing the cells, 0 for all the CPU cores",
+        min=0, max=256,
+        default=0,
+    )
+
     # -------------------------------------------------------------------------
     # Recursion
 
@@ -402,6 +429,28 @@ class FractureCell(Operator):
         default=True,
     )
 
+    output_mode: EnumProperty(
+        name="Output",
+        items=(
+            ('OBJECTS', "Objects", "Create an object for each shard"),
+            ('MESH', "Single Mesh", (
+                "Create one mesh with all the shards, storing the shard index and pivot "
+                "in the \"shard\" and \"pivot\" vertex attributes. "
+                "Use a margin to keep the shards apart, recursion is not supported"
+            )),
+        ),
+        default='OBJECTS',
+    )
+
+    use_batch: BoolProperty(
+        name="Batch Objects",
+        description=(
+            "Link the shard objects once they are all created, "
+            "updating the view layer only at the end (no realtime progress)"
+        ),
+        default=True,
+    )
+
     # -------------------------------------------------------------------------
     # Scene Options
     #
@@ -460,6 +509,8 @@ class FractureCell(Operator):
         rowsub.prop(self, "source_noise")
         rowsub = col.row()
         rowsub.prop(self, "cell_scale")
+        rowsub = col.row()
+        rowsub.prop(self, "processes")
 
         box = layout.box()
         col = box.column()
@@ -502,6 +553,9 @@ class FractureCell(Operator):
         col.label(text="Object")
         rowsub = col.row(align=True)
         rowsub.prop(self, "use_recenter")
+        rowsub = col.row()
+        rowsub.prop(self, "output_mode", expand=True)
+        rowsub.prop(self, "use_batch")
 
         box = layout.box()
         col = box.column()
@@ -2,6 +2,143 @@
 
 # Script copyright (C) Blender Foundation 2012
 
+import numpy as np
+
+# Same tolerances as `mathutils.geometry.points_in_planes`.
+EPS_COPLANAR = 1e-4
+EPS_ISECT = 1e-6
+
+# Nearest points considered first for each cell, more are only read when the cell isn't closed by them.
+NEIGHBORS_INIT = 24
+# Planes added at once to a cell, the planes not cutting the cell are removed before adding more.
+PLANES_BATCH = 16
+
+_plane_triples_cache = {}
+
+
+def _plane_triples(planes_len):
+    triples = _plane_triples_cache.get(planes_len)
+    if triples is None:
+        from itertools import combinations
+        triples = np.array(list(combinations(range(planes_len), 3)), dtype=np.int32).reshape(-1, 3)
+        _plane_triples_cache[planes_len] = triples
+    return triples
+
+
+def points_in_planes(planes):
+    """
+    Vectorized `mathutils.geometry.points_in_planes`,
+    return the corners of the convex volume inside all (N, 4) planes and the indices of the planes used.
+    """
+    triples = _plane_triples(len(planes))
+    normals = planes[:, :3]
+    # cross products and their squared length, for each pair of planes
+    cross = np.cross(normals[:, None, :], normals[None, :, :])
+    cross_sq = np.einsum('ijk,ijk->ij', cross, cross) > EPS_COPLANAR
+    i, j, k = triples.T
+    triples = triples[cross_sq[i, j] & cross_sq[j, k] & cross_sq[k, i]]
+    i, j, k = triples.T
+    n1n2 = cross[i, j]
+    n2n3 = cross[j, k]
+    n3n1 = cross[k, i]
+    quotient = -np.einsum('ij,ij->i', normals[i], n2n3)
+    valid = np.abs(quotient) > EPS_COPLANAR
+    triples = triples[valid]
+    i, j, k = triples.T
+    co = (
+        n2n3[valid] * planes[i, 3:] +
+        n3n1[valid] * planes[j, 3:] +
+        n1n2[valid] * planes[k, 3:]
+    ) / quotient[valid, None]
+
+    # for low epsilon values the point could intersect its own plane
+    outside = (co @ planes[:, :3].T + planes[:, 3]) > EPS_ISECT
+    outside[np.arange(len(triples))[:, None], triples] = False
+    inside = ~outside.any(axis=1)
+    return co[inside], np.unique(triples[inside])
+
+
+def _points_neighbors(points, neighbors_len):
+    """Indices of the nearest points of each point (itself excluded), sorted by distance."""
+    import mathutils
+
+    kd = mathutils.kdtree.KDTree(len(points))
+    for i, co in enumerate(points):
+        kd.insert(co, i)
+    kd.balance()
+
+    neighbors = np.empty((len(points), neighbors_len), dtype=np.int32)
+    for i, co in enumerate(points):
+        found = [index for _co, index, _dist in kd.find_n(co, neighbors_len + 1) if index != i]
+        neighbors[i] = found[:neighbors_len]
+    return neighbors
+
+
+def _cell_vertices(index, points, neighbors, planes_bounds, points_scale, margin_cell):
+    point = points[index]
+    planes = planes_bounds.copy()
+    planes[:, 3] += planes[:, :3] @ point
+    distance_max = 10000000000.0  # a big value!
+    vertices = np.empty((0, 3))
+
+    order = neighbors[index]
+    order_all = len(order) == len(points) - 1
+    start = 0
+    while True:
+        if start == len(order):
+            if order_all:
+                break
+            # the nearest points don't close the cell, sort them all
+            order = np.argsort(((points - point) ** 2).sum(axis=1), kind='stable')
+            order = order[order != index]
+            order_all = True
+            continue
+
+        normal = points[order[start:]] - point
+        nlength = np.sqrt((normal ** 2).sum(axis=1))
+
+        if points_scale is not None:
+            normal_alt = normal * points_scale
+            # rotate plane to new distance
+            # should always be positive!! - but abs incase
+            scalar = (_normalized(normal_alt) * _normalized(normal)).sum(axis=1)
+            nlength = nlength * scalar
+            normal = normal_alt
+
+        # the planes closer than the farthest corner of the cell are added in batches
+        too_far = nlength > distance_max
+        stop = int(np.argmax(too_far)) if too_far.any() else len(nlength)
+        if stop == 0:
+            break
+        stop = min(stop, PLANES_BATCH)
+
+        planes_new = np.empty((stop, 4))
+        planes_new[:, :3] = _normalized(normal[:stop])
+        planes_new[:, 3] = (-nlength[:stop] / 2.0) + margin_cell
+        planes = np.concatenate((planes, planes_new))
+
+        vertices, plane_indices = points_in_planes(planes)
+        if len(vertices) == 0:
+            break
+        planes = planes[plane_indices]
+
+        distance_max = np.sqrt((vertices ** 2).sum(axis=1).max()) * 2.0
+        start += stop
+
+    return vertices
+
+
+def _normalized(vectors):
+    length = np.sqrt((vectors ** 2).sum(axis=1))[:, None]
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0.0)
+
+
+def _cells_chunk(indices, points, neighbors, planes_bounds, points_scale, margin_cell):
+    return [
+        _cell_vertices(i, points, neighbors, planes_bounds, points_scale, margin_cell)
+        for i in indices
+    ]
+
 
 def points_as_bmesh_cells(
         verts,
@@ -9,96 +146,69 @@ def points_as_bmesh_cells(
         points_scale=None,
         margin_bounds=0.05,
         margin_cell=0.0,
+        processes=0,
 ):
-    from math import sqrt
-    import mathutils
-    from mathutils import Vector
+    """
+    Voronoi cells of the points, clipped by the bounding box of verts.
+    Return a list of (center, vertices) arrays, cell vertices are relative to the center.
 
-    cells = []
+    Each cell is only cut by the nearest points, the cells are computed in parallel by
+    ``processes`` worker processes (all the CPU cores when zero).
+    """
+    import multiprocessing
+    import sys
 
-    points_sorted_current = [p for p in points]
-    plane_indices = []
-    vertices = []
+    points = np.array(points, dtype=np.float64).reshape(-1, 3)
+    verts = np.array(verts, dtype=np.float64).reshape(-1, 3)
 
     if points_scale is not None:
         points_scale = tuple(points_scale)
     if points_scale == (1.0, 1.0, 1.0):
         points_scale = None
+    if points_scale is not None:
+        points_scale = np.array(points_scale)
+
+    if len(points) == 0:
+        return []
 
     # there are many ways we could get planes - convex hull for eg
     # but it ends up fastest if we just use bounding box
-    if 1:
-        xa = [v[0] for v in verts]
-        ya = [v[1] for v in verts]
-        za = [v[2] for v in verts]
-
-        xmin, xmax = min(xa) - margin_bounds, max(xa) + margin_bounds
-        ymin, ymax = min(ya) - margin_bounds, max(ya) + margin_bounds
-        zmin, zmax = min(za) - margin_bounds, max(za) + margin_bounds
-        convexPlanes = [
-            Vector((+1.0, 0.0, 0.0, -xmax)),
-            Vector((-1.0, 0.0, 0.0, +xmin)),
-            Vector((0.0, +1.0, 0.0, -ymax)),
-            Vector((0.0, -1.0, 0.0, +ymin)),
-            Vector((0.0, 0.0, +1.0, -zmax)),
-            Vector((0.0, 0.0, -1.0, +zmin)),
-        ]
-
-    for i, point_cell_current in enumerate(points):
-        planes = [None] * len(convexPlanes)
-        for j in range(len(convexPlanes)):
-            planes[j] = convexPlanes[j].copy()
-            planes[j][3] += planes[j].xyz.dot(point_cell_current)
-        distance_max = 10000000000.0  # a big value!
-
-        points_sorted_current.sort(key=lambda p: (p - point_cell_current).length_squared)
-
-        for j in range(1, len(points)):
-            normal = points_sorted_current[j] - point_cell_current
-            nlength = normal.length
-
-            if points_scale is not None:
-                normal_alt = normal.copy()
-                normal_alt.x *= points_scale[0]
-                normal_alt.y *= points_scale[1]
-                normal_alt.z *= points_scale[2]
-
-                # rotate plane to new distance
-                # should always be positive!! - but abs incase
-                scalar = normal_alt.normalized().dot(normal.normalized())
-                # assert(scalar >= 0.0)
-                nlength *= scalar
-                normal = normal_alt
-
-            if nlength > distance_max:
-                break
-
-            plane = normal.normalized()
-            plane.resize_4d()
-            plane[3] = (-nlength / 2.0) + margin_cell
-            planes.append(plane)
-
-            vertices[:], plane_indices[:] = mathutils.geometry.points_in_planes(planes)
-            if len(vertices) == 0:
-                break
-
-            if len(plane_indices) != len(planes):
-                planes[:] = [planes[k] for k in plane_indices]
-
-            # for comparisons use length_squared and delay
-            # converting to a real length until the end.
-            distance_max = 10000000000.0  # a big value!
-            for v in vertices:
-                distance = v.length_squared
-                if distance_max < distance:
-                    distance_max = distance
-            distance_max = sqrt(distance_max)  # make real length
-            distance_max *= 2.0
-
-        if len(vertices) == 0:
-            continue
-
-        cells.append((point_cell_current, vertices[:]))
-        del vertices[:]
-
-    return cells
+    xmin, ymin, zmin = verts.min(axis=0) - margin_bounds
+    xmax, ymax, zmax = verts.max(axis=0) + margin_bounds
+    planes_bounds = np.array((
+        (+1.0, 0.0, 0.0, -xmax),
+        (-1.0, 0.0, 0.0, +xmin),
+        (0.0, +1.0, 0.0, -ymax),
+        (0.0, -1.0, 0.0, +ymin),
+        (0.0, 0.0, +1.0, -zmax),
+        (0.0, 0.0, -1.0, +zmin),
+    ))
+
+    neighbors = _points_neighbors(points, min(NEIGHBORS_INIT, len(points) - 1))
+    args = (points, neighbors, planes_bounds, points_scale, margin_cell)
+
+    if processes <= 0:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(points) // 64)
+
+    # Worker processes can't import Blender modules, they need to inherit this one.
+    if processes > 1 and sys.platform.startswith('linux'):
+        from concurrent.futures import ProcessPoolExecutor
+        from itertools import repeat
+
+        chunks = np.array_split(np.arange(len(points)), processes * 4)
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(processes, mp_context=context) as executor:
+            cells_vertices = [
+                vertices
+                for chunk in executor.map(_cells_chunk, chunks, *(repeat(arg) for arg in args))
+                for vertices in chunk
+            ]
+    else:
+        cells_vertices = _cells_chunk(range(len(points)), *args)
+
+    return [
+        (point, vertices)
+        for point, vertices in zip(points, cells_vertices)
+        if len(vertices) != 0
+    ]
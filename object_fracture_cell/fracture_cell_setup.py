@@ -106,25 +106,20 @@ def _points_from_object(depsgraph, scene, obj, source):
     return points
 
 
-def cell_fracture_objects(
+def _cells_from_object(
         context, collection, obj,
         source={'PARTICLE_OWN'},
         source_limit=0,
         source_noise=0.0,
-        clean=True,
-        # operator options
-        use_smooth_faces=False,
-        use_data_match=False,
         use_debug_points=False,
         margin=0.0,
-        material_index=0,
-        use_debug_redraw=False,
         cell_scale=(1.0, 1.0, 1.0),
+        processes=0,
 ):
+    import numpy as np
     from . import fracture_cell_calc
     depsgraph = context.evaluated_depsgraph_get()
     scene = context.scene
-    view_layer = context.view_layer
 
     # -------------------------------------------------------------------------
     # GET POINTS
@@ -179,70 +174,129 @@ def cell_fracture_objects(
         del obj_tmp, mesh_tmp
 
     mesh = obj.data
-    matrix = obj.matrix_world.copy()
-    verts = [matrix @ v.co for v in mesh.vertices]
+    matrix = np.array(obj.matrix_world)
+    verts = np.empty(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", verts)
+    verts = verts.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
 
-    cells = fracture_cell_calc.points_as_bmesh_cells(
+    return fracture_cell_calc.points_as_bmesh_cells(
         verts,
         points,
         cell_scale,
         margin_cell=margin,
+        processes=processes,
     )
 
-    # some hacks here :S
-    cell_name = obj.name + "_cell"
 
-    objects = []
+def _cell_hull(bm, cell_points, clean, use_smooth_faces, material_index):
+    """Add the convex hull of the cell points to the bmesh."""
+    import numpy as np
 
-    for center_point, cell_points in cells:
+    # WORKAROUND FOR CONVEX HULL BUG/LIMIT
+    # XXX small noise
+    cell_points = cell_points + (np.random.random(cell_points.shape) - 0.5) * 0.001
+    # XXX small noise
 
-        # ---------------------------------------------------------------------
-        # BMESH
+    bm_verts = [bm.verts.new(co) for co in cell_points.tolist()]
 
-        # create the convex hulls
-        bm = bmesh.new()
+    bmesh.ops.remove_doubles(bm, verts=bm_verts, dist=0.005)
+    bm_verts = [bm_vert for bm_vert in bm_verts if bm_vert.is_valid]
+    try:
+        bmesh.ops.convex_hull(bm, input=bm_verts)
+    except RuntimeError:
+        import traceback
+        traceback.print_exc()
 
-        # WORKAROUND FOR CONVEX HULL BUG/LIMIT
-        # XXX small noise
-        import random
+    if clean:
+        bm.normal_update()
+        try:
+            bmesh.ops.dissolve_limit(bm, verts=bm_verts, angle_limit=0.001)
+        except RuntimeError:
+            import traceback
+            traceback.print_exc()
 
-        def R():
-            return (random.random() - 0.5) * 0.001
-        # XXX small noise
+    bm_faces = {bm_face for bm_vert in bm_verts if bm_vert.is_valid for bm_face in bm_vert.link_faces}
+    # Smooth faces will remain only inner faces, after applying boolean modifier.
+    if use_smooth_faces:
+        for bm_face in bm_faces:
+            bm_face.smooth = True
 
-        for i, co in enumerate(cell_points):
+    if material_index != 0:
+        for bm_face in bm_faces:
+            bm_face.material_index = material_index
 
-            # XXX small noise
-            co.x += R()
-            co.y += R()
-            co.z += R()
-            # XXX small noise
 
-            bm_vert = bm.verts.new(co)
+def _cell_data_match(obj, mesh_dst):
+    # match materials and data layers so boolean displays them
+    # currently only materials + data layers, could do others...
+    mesh_src = obj.data
+    for mat in mesh_src.materials:
+        mesh_dst.materials.append(mat)
+    for lay_attr in ("vertex_colors", "uv_layers"):
+        lay_src = getattr(mesh_src, lay_attr)
+        lay_dst = getattr(mesh_dst, lay_attr)
+        for key in lay_src.keys():
+            lay_dst.new(name=key)
 
-        import mathutils
-        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.005)
-        try:
-            bmesh.ops.convex_hull(bm, input=bm.verts)
-        except RuntimeError:
-            import traceback
-            traceback.print_exc()
 
-        if clean:
-            bm.normal_update()
-            try:
-                bmesh.ops.dissolve_limit(bm, verts=bm.verts, angle_limit=0.001)
-            except RuntimeError:
-                import traceback
-                traceback.print_exc()
-        # Smooth faces will remain only inner faces, after applying boolean modifier.
-        if use_smooth_faces:
-            for bm_face in bm.faces:
-                bm_face.smooth = True
+def _cell_data_match_slots(obj, obj_cell):
+    # support for object materials
+    for i in range(len(obj_cell.data.materials)):
+        slot_src = obj.material_slots[i]
+        slot_dst = obj_cell.material_slots[i]
 
-        if material_index != 0:
-            for bm_face in bm.faces:
-                bm_face.material_index = material_index
+        slot_dst.link = slot_src.link
+        slot_dst.material = slot_src.material
+
+
+def cell_fracture_objects(
+        context, collection, obj,
+        source={'PARTICLE_OWN'},
+        source_limit=0,
+        source_noise=0.0,
+        clean=True,
+        # operator options
+        use_smooth_faces=False,
+        use_data_match=False,
+        use_debug_points=False,
+        margin=0.0,
+        material_index=0,
+        use_debug_redraw=False,
+        cell_scale=(1.0, 1.0, 1.0),
+        processes=0,
+        use_batch=False,
+):
+    """
+    Create an object for each cell.
+    With ``use_batch`` the objects are linked to the collection once they are all created,
+    updating the view layer only at the end.
+    """
+    view_layer = context.view_layer
+
+    cells = _cells_from_object(
+        context, collection, obj,
+        source=source,
+        source_limit=source_limit,
+        source_noise=source_noise,
+        use_debug_points=use_debug_points,
+        margin=margin,
+        cell_scale=cell_scale,
+        processes=processes,
+    )
+
+    # some hacks here :S
+    cell_name = obj.name + "_cell"
+
+    objects = []
+
+    for center_point, cell_points in cells:
+
+        # ---------------------------------------------------------------------
+        # BMESH
+
+        # create the convex hulls
+        bm = bmesh.new()
+        _cell_hull(bm, cell_points, clean, use_smooth_faces, material_index)
 
         # ---------------------------------------------------------------------
         # MESH
@@ -253,40 +307,35 @@ def cell_fracture_objects(
         del bm
 
         if use_data_match:
-            # match materials and data layers so boolean displays them
-            # currently only materials + data layers, could do others...
-            mesh_src = obj.data
-            for mat in mesh_src.materials:
-                mesh_dst.materials.append(mat)
-            for lay_attr in ("vertex_colors", "uv_layers"):
-                lay_src = getattr(mesh_src, lay_attr)
-                lay_dst = getattr(mesh_dst, lay_attr)
-                for key in lay_src.keys():
-                    lay_dst.new(name=key)
+            _cell_data_match(obj, mesh_dst)
 
         # ---------------------------------------------------------------------
         # OBJECT
 
         obj_cell = bpy.data.objects.new(name=cell_name, object_data=mesh_dst)
-        collection.objects.link(obj_cell)
         # scene.objects.active = obj_cell
         obj_cell.location = center_point
 
         objects.append(obj_cell)
 
-        # support for object materials
-        if use_data_match:
-            for i in range(len(mesh_dst.materials)):
-                slot_src = obj.material_slots[i]
-                slot_dst = obj_cell.material_slots[i]
+        if use_batch:
+            continue
 
-                slot_dst.link = slot_src.link
-                slot_dst.material = slot_src.material
+        collection.objects.link(obj_cell)
+
+        if use_data_match:
+            _cell_data_match_slots(obj, obj_cell)
 
         if use_debug_redraw:
             view_layer.update()
             _redraw_yasiamevil()
 
+    if use_batch:
+        for obj_cell in objects:
+            collection.objects.link(obj_cell)
+            if use_data_match:
+                _cell_data_match_slots(obj, obj_cell)
+
     view_layer.update()
 
     return objects
@@ -396,6 +445,194 @@ def cell_fracture_boolean(
     return objects_boolean
 
 
+def _mesh_islands(mesh):
+    """Island index of each vertex, islands are the parts of the mesh connected by edges."""
+    import numpy as np
+
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int64)
+    mesh.edges.foreach_get("vertices", edges)
+    edges = edges.reshape(-1, 2)
+
+    roots = np.arange(len(mesh.vertices))
+    while True:
+        roots_edges = roots[edges]
+        roots_low = roots_edges.min(axis=1)
+        np.minimum.at(roots, roots_edges[:, 0], roots_low)
+        np.minimum.at(roots, roots_edges[:, 1], roots_low)
+        while True:
+            roots_next = roots[roots]
+            if np.array_equal(roots_next, roots):
+                break
+            roots = roots_next
+        if np.array_equal(roots[edges[:, 0]], roots[edges[:, 1]]):
+            break
+    return np.unique(roots, return_inverse=True)[1]
+
+
+def cell_fracture_mesh(
+        context, collection, obj,
+        source={'PARTICLE_OWN'},
+        source_limit=0,
+        source_noise=0.0,
+        clean=True,
+        # operator options
+        use_smooth_faces=False,
+        use_data_match=False,
+        use_debug_points=False,
+        margin=0.0,
+        material_index=0,
+        cell_scale=(1.0, 1.0, 1.0),
+        processes=0,
+        use_debug_bool=False,
+        use_island_split=False,
+        use_interior_hide=False,
+        use_recenter=False,
+        remove_doubles=True,
+):
+    """
+    Create a single object with all the cells, intersected with obj by one boolean.
+    Each vertex stores the index of its shard in the "shard" attribute and the shard pivot in "pivot",
+    for use with geometry nodes or rigid-body workflows.
+    The pivot is the seed point of the cell, or the shard median with ``use_recenter``.
+    Shards touching each other (no margin) are merged by the boolean.
+    """
+    import numpy as np
+    import mathutils
+
+    cells = _cells_from_object(
+        context, collection, obj,
+        source=source,
+        source_limit=source_limit,
+        source_noise=source_noise,
+        use_debug_points=use_debug_points,
+        margin=margin,
+        cell_scale=cell_scale,
+        processes=processes,
+    )
+    if not cells:
+        return []
+
+    cell_name = obj.name + "_cell"
+
+    # ---------------------------------------------------------------------
+    # BMESH
+
+    bm = bmesh.new()
+    for center_point, cell_points in cells:
+        _cell_hull(bm, cell_points + center_point, clean, use_smooth_faces, material_index)
+    # points left inside the hulls
+    bmesh.ops.delete(bm, geom=[bm_vert for bm_vert in bm.verts if not bm_vert.link_faces], context='VERTS')
+
+    # ---------------------------------------------------------------------
+    # MESH / OBJECT
+
+    mesh_dst = bpy.data.meshes.new(name=cell_name)
+    bm.to_mesh(mesh_dst)
+    bm.free()
+
+    if use_data_match:
+        _cell_data_match(obj, mesh_dst)
+
+    obj_cell = bpy.data.objects.new(name=cell_name, object_data=mesh_dst)
+    collection.objects.link(obj_cell)
+
+    if use_data_match:
+        _cell_data_match_slots(obj, obj_cell)
+
+    # ---------------------------------------------------------------------
+    # BOOLEAN
+
+    if use_interior_hide:
+        obj.data.polygons.foreach_set("hide", [False] * len(obj.data.polygons))
+
+    mod = obj_cell.modifiers.new(name="Boolean", type='BOOLEAN')
+    mod.object = obj
+    mod.operation = 'INTERSECT'
+
+    if use_debug_bool:
+        context.view_layer.update()
+        return [obj_cell]
+
+    if use_interior_hide:
+        mesh_dst.polygons.foreach_set("hide", [True] * len(mesh_dst.polygons))
+
+    depsgraph = context.evaluated_depsgraph_get()
+    mesh_new = bpy.data.meshes.new_from_object(obj_cell.evaluated_get(depsgraph))
+    obj_cell.data = mesh_new
+    obj_cell.modifiers.remove(mod)
+    bpy.data.meshes.remove(mesh_dst)
+
+    if clean or remove_doubles:
+        bm = bmesh.new()
+        bm.from_mesh(mesh_new)
+
+        if clean:
+            bm.normal_update()
+            try:
+                bmesh.ops.dissolve_limit(bm, verts=bm.verts, edges=bm.edges, angle_limit=0.001)
+            except RuntimeError:
+                import traceback
+                traceback.print_exc()
+            bm.to_mesh(mesh_new)
+
+        # doubles are only merged inside each shard
+        if remove_doubles:
+            islands = _mesh_islands(mesh_new)
+            bm.verts.ensure_lookup_table()
+            islands_verts = [[] for i in range(islands.max() + 1)]
+            for i, island in enumerate(islands.tolist()):
+                islands_verts[island].append(bm.verts[i])
+            for island_verts in islands_verts:
+                bmesh.ops.remove_doubles(bm, verts=island_verts, dist=0.005)
+            bm.to_mesh(mesh_new)
+        bm.free()
+
+    # ---------------------------------------------------------------------
+    # SHARDS
+
+    if mesh_new.vertices:
+        co = np.empty(len(mesh_new.vertices) * 3)
+        mesh_new.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3)
+
+        islands = _mesh_islands(mesh_new)
+        islands_count = np.bincount(islands)
+        islands_center = np.stack([np.bincount(islands, weights=co[:, i]) for i in range(3)], axis=1)
+        islands_center /= islands_count[:, None]
+
+        # cells are the Voronoi regions of the points, scaled by cell_scale
+        points = np.array([center_point for center_point, cell_points in cells])
+        points_scale = np.sqrt(np.array(cell_scale, dtype=np.float64))
+        kd = mathutils.kdtree.KDTree(len(points))
+        for i, co_point in enumerate(points * points_scale):
+            kd.insert(co_point, i)
+        kd.balance()
+        islands_cell = np.array([kd.find(co_center)[1] for co_center in islands_center * points_scale])
+
+        if use_island_split:
+            shard_cells = islands_cell
+            islands_shard = np.arange(len(islands_cell))
+        else:
+            shard_cells, islands_shard = np.unique(islands_cell, return_inverse=True)
+        shards = islands_shard[islands]
+
+        if use_recenter:
+            shards_count = np.bincount(shards)
+            pivots = np.stack([np.bincount(shards, weights=co[:, i]) for i in range(3)], axis=1)
+            pivots /= shards_count[:, None]
+        else:
+            pivots = points[shard_cells]
+
+        attribute = mesh_new.attributes.new("shard", 'INT', 'POINT')
+        attribute.data.foreach_set("value", shards.astype(np.int32))
+        attribute = mesh_new.attributes.new("pivot", 'FLOAT_VECTOR', 'POINT')
+        attribute.data.foreach_set("vector", pivots[shards].astype(np.float32).ravel())
+
+    context.view_layer.update()
+
+    return [obj_cell]
+
+
 def cell_fracture_interior_handle(
         objects,
         use_interior_vgroup=False,
@@ -4,6 +4,7 @@
 
 
 import bmesh
+import numpy as np
 
 
 def bmesh_copy_from_object(obj, transform=True, triangulate=True, apply_modifiers=False):
@@ -76,17 +77,22 @@ def bmesh_calc_area(bm):
 
 
 def bmesh_check_self_intersect_object(obj):
-    """Check if any faces self intersect returns an array of edge index values."""
+    """Check if any faces self intersect returns an array of face index values."""
     import array
-    import mathutils
 
     if not obj.data.polygons:
         return array.array('i', ())
 
-    bm = bmesh_copy_from_object(obj, transform=False, triangulate=False)
-    tree = mathutils.bvhtree.BVHTree.FromBMesh(bm, epsilon=0.00001)
+    return arrays_check_self_intersect(MeshArrays(obj))
+
+
+def arrays_check_self_intersect(arrays):
+    import array
+
+    tree = bvhtree_from_arrays(arrays)
     overlap = tree.overlap(tree)
-    faces_error = {i for i_pair in overlap for i in i_pair}
+    tris_poly = arrays.tris_poly.tolist()
+    faces_error = {tris_poly[i] for i_pair in overlap for i in i_pair}
 
     return array.array('i', faces_error)
 
@@ -116,67 +122,68 @@ def bmesh_face_points_random(f, num_points=1, margin=0.05):
         yield vecs[0] + u1 * side1 + u2 * side2
 
 
-def bmesh_check_thick_object(obj, thickness):
-    import array
-    import bpy
+def face_points_random(tris_co, num_points=1, margin=0.05, seed=0):
+    """Random points on each (N, 3, 3) triangle, returns an (N, num_points, 3) array."""
 
-    # Triangulate
-    bm = bmesh_copy_from_object(obj, transform=True, triangulate=False)
+    # for predictable results
+    rng = np.random.default_rng(seed)
 
-    # map original faces to their index.
-    face_index_map_org = {f: i for i, f in enumerate(bm.faces)}
-    ret = bmesh.ops.triangulate(bm, faces=bm.faces)
-    face_map = ret["face_map"]
-    del ret
-    # old edge -> new mapping
+    u = rng.uniform(0.0 + margin, 1.0 - margin, (len(tris_co), num_points, 2))
+    flip = u.sum(axis=2) > 1.0
+    u[flip] = 1.0 - u[flip]
 
-    # Convert new/old map to index dict.
+    side1 = tris_co[:, 1] - tris_co[:, 0]
+    side2 = tris_co[:, 2] - tris_co[:, 0]
 
-    # Create a real mesh (lame!)
-    context = bpy.context
-    layer = context.view_layer
-    scene_collection = context.layer_collection.collection
+    return (
+        tris_co[:, None, 0] +
+        u[:, :, 0, None] * side1[:, None] +
+        u[:, :, 1, None] * side2[:, None]
+    )
 
-    me_tmp = bpy.data.meshes.new(name="~temp~")
-    bm.to_mesh(me_tmp)
-    obj_tmp = bpy.data.objects.new(name=me_tmp.name, object_data=me_tmp)
-    scene_collection.objects.link(obj_tmp)
 
-    layer.update()
-    ray_cast = obj_tmp.ray_cast
+def arrays_check_thick_iter(arrays, thickness, faces_error, batch_size=4096):
+    """
+    Add the index of the faces thinner than thickness to the faces_error set,
+    rays are cast in batches of batch_size triangles, yielding the progress (0..1) after each one.
+    """
 
     EPS_BIAS = 0.0001
-
-    faces_error = set()
-    bm_faces_new = bm.faces[:]
-
-    for f in bm_faces_new:
-        no = f.normal
-        no_sta = no * EPS_BIAS
-        no_end = no * thickness
-        for p in bmesh_face_points_random(f, num_points=6):
-            # Cast the ray backwards
-            p_a = p - no_sta
-            p_b = p - no_end
-            p_dir = p_b - p_a
-
-            ok, _co, no, index = ray_cast(p_a, p_dir, distance=p_dir.length)
-
-            if ok:
+    num_points = 6
+
+    tris_len = len(arrays.tris)
+    if tris_len == 0:
+        return
+    tree = bvhtree_from_arrays(arrays)
+    ray_cast = tree.ray_cast
+    tris_poly = arrays.tris_poly.tolist()
+
+    # Cast the rays backwards
+    distance = thickness - EPS_BIAS
+    for tri_sta in range(0, tris_len, batch_size):
+        tri_end = min(tri_sta + batch_size, tris_len)
+        no = arrays.tris_normal[tri_sta:tri_end]
+        points = face_points_random(arrays.tris_co[tri_sta:tri_end], num_points=num_points, seed=tri_sta)
+        p_a = (points - no[:, None] * EPS_BIAS).reshape(-1, 3).tolist()
+        p_dir = np.repeat(-no, num_points, axis=0).tolist()
+
+        for i, (co, direction) in enumerate(zip(p_a, p_dir)):
+            _co, _no, index, _dist = ray_cast(co, direction, distance)
+
+            if index is not None:
                 # Add the face we hit
-                for f_iter in (f, bm_faces_new[index]):
-                    # if the face wasn't triangulated, just use existing
-                    f_org = face_map.get(f_iter, f_iter)
-                    f_org_index = face_index_map_org[f_org]
-                    faces_error.add(f_org_index)
+                faces_error.add(tris_poly[tri_sta + i // num_points])
+                faces_error.add(tris_poly[index])
+
+        yield tri_end / tris_len
 
-    bm.free()
 
-    scene_collection.objects.unlink(obj_tmp)
-    bpy.data.objects.remove(obj_tmp)
-    bpy.data.meshes.remove(me_tmp)
+def bmesh_check_thick_object(obj, thickness):
+    import array
 
-    layer.update()
+    faces_error = set()
+    for _progress in arrays_check_thick_iter(MeshArrays(obj), thickness, faces_error):
+        pass
 
     return array.array('i', faces_error)
 
@@ -195,3 +202,245 @@ def face_is_distorted(ele, angle_distort):
             return True
 
     return False
+
+
+# ------------
+# Mesh Arrays
+
+class MeshArrays:
+    """
+    Snapshot of the object mesh (modifiers are not applied) as NumPy arrays,
+    shared by the checks, the indices match the mesh elements.
+    """
+
+    def __init__(self, obj):
+        import hashlib
+        assert obj.type == 'MESH'
+
+        if obj.mode == 'EDIT':
+            obj.update_from_editmode()
+
+        me = obj.data
+        me.calc_loop_triangles()
+
+        co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        edges = np.empty(len(me.edges) * 2, dtype=np.int32)
+        me.edges.foreach_get("vertices", edges)
+        loops_vert = np.empty(len(me.loops), dtype=np.int32)
+        me.loops.foreach_get("vertex_index", loops_vert)
+        loops_edge = np.empty(len(me.loops), dtype=np.int32)
+        me.loops.foreach_get("edge_index", loops_edge)
+        poly_loop_start = np.empty(len(me.polygons), dtype=np.int32)
+        me.polygons.foreach_get("loop_start", poly_loop_start)
+        poly_loop_total = np.empty(len(me.polygons), dtype=np.int32)
+        me.polygons.foreach_get("loop_total", poly_loop_total)
+        tris = np.empty(len(me.loop_triangles) * 3, dtype=np.int32)
+        me.loop_triangles.foreach_get("vertices", tris)
+        tris_poly = np.empty(len(me.loop_triangles), dtype=np.int32)
+        me.loop_triangles.foreach_get("polygon_index", tris_poly)
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+
+        key = hashlib.blake2b(digest_size=16)
+        for data in (co, edges, loops_vert, loops_edge, poly_loop_start, poly_loop_total, tris, matrix):
+            key.update(data.tobytes())
+        self.key = key.hexdigest()
+
+        self.co_local = co.reshape(-1, 3).astype(np.float64)
+        self.co = self.co_local @ matrix[:3, :3].T + matrix[:3, 3]
+        self.edges = edges.reshape(-1, 2)
+        self.loops_vert = loops_vert
+        self.loops_edge = loops_edge
+        self.poly_loop_start = poly_loop_start
+        self.poly_loop_total = poly_loop_total
+        self.tris = tris.reshape(-1, 3)
+        self.tris_poly = tris_poly
+
+        self._cache = {}
+
+    def _cached(self, name, fn):
+        value = self._cache.get(name)
+        if value is None:
+            value = self._cache[name] = fn()
+        return value
+
+    @property
+    def tris_co(self):
+        """(N, 3, 3) triangle corners."""
+        return self._cached("tris_co", lambda: self.co[self.tris])
+
+    @property
+    def tris_normal(self):
+        """(N, 3) unit triangle normals."""
+        def calc():
+            tris_co = self.tris_co
+            return _normalized(np.cross(tris_co[:, 1] - tris_co[:, 0], tris_co[:, 2] - tris_co[:, 0]))
+
+        return self._cached("tris_normal", calc)
+
+    @property
+    def loops_poly(self):
+        """Polygon of each loop."""
+        return self._cached(
+            "loops_poly",
+            lambda: np.repeat(np.arange(len(self.poly_loop_start), dtype=np.int32), self.poly_loop_total),
+        )
+
+    @property
+    def loops_next(self):
+        """Next loop in the polygon of each loop."""
+        def calc():
+            loops_next = np.arange(1, len(self.loops_vert) + 1, dtype=np.int32)
+            loops_next[self.poly_loop_start + self.poly_loop_total - 1] = self.poly_loop_start
+            return loops_next
+
+        return self._cached("loops_next", calc)
+
+    @property
+    def loops_prev(self):
+        """Previous loop in the polygon of each loop."""
+        def calc():
+            loops_prev = np.empty_like(self.loops_next)
+            loops_prev[self.loops_next] = np.arange(len(self.loops_next), dtype=np.int32)
+            return loops_prev
+
+        return self._cached("loops_prev", calc)
+
+    def poly_normal_raw(self, co):
+        """(P, 3) polygon normals scaled by twice their area (Newell's method)."""
+
+        loops_co = co[self.loops_vert]
+        cross = np.cross(loops_co, loops_co[self.loops_next])
+        return np.stack([
+            np.bincount(self.loops_poly, weights=cross[:, axis], minlength=len(self.poly_loop_start))
+            for axis in range(3)
+        ], axis=1)
+
+    @property
+    def poly_normal(self):
+        """(P, 3) unit polygon normals, in world space."""
+        return self._cached("poly_normal", lambda: _normalized(self.poly_normal_raw(self.co)))
+
+    @property
+    def edges_loops(self):
+        """
+        The first two loops of each edge, by radial order, and the number of loops
+        (edges with two loops are manifold).
+        """
+        def calc():
+            loops_edge = self.loops_edge
+            edges_len = len(self.edges)
+            order = np.argsort(loops_edge, kind='stable')
+            count = np.bincount(loops_edge, minlength=edges_len)
+            offset = np.cumsum(count) - count
+            # The loop of the last polygon using an edge comes first (as created by BMesh).
+            pair = np.full((edges_len, 2), -1, dtype=np.int32)
+            has_2 = count >= 2
+            pair[has_2, 0] = order[offset[has_2] + count[has_2] - 1]
+            pair[has_2, 1] = order[offset[has_2] + count[has_2] - 2]
+            return pair, count
+
+        return self._cached("edges_loops", calc)
+
+
+def _normalized(vectors):
+
+    length = np.sqrt((vectors ** 2).sum(axis=1))[:, None]
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0.0)
+
+
+def _indices(mask):
+    import array
+    return array.array('i', np.flatnonzero(mask).tolist())
+
+
+def arrays_check_solid(arrays):
+    """Non-manifold edges and manifold edges with flipped neighbor faces."""
+    pair, count = arrays.edges_loops
+    manifold = count == 2
+    loops_vert = arrays.loops_vert
+    contiguous = loops_vert[pair[:, 0]] != loops_vert[pair[:, 1]]
+    return _indices(~manifold), _indices(manifold & ~contiguous)
+
+
+def arrays_check_degenerate(arrays, threshold):
+    """Faces and edges with an area or length (in object space) below threshold."""
+
+    co = arrays.co_local
+    area = np.sqrt((arrays.poly_normal_raw(co) ** 2).sum(axis=1)) * 0.5
+    edges_vec = co[arrays.edges[:, 1]] - co[arrays.edges[:, 0]]
+    length = np.sqrt((edges_vec ** 2).sum(axis=1))
+    return _indices(area <= threshold), _indices(length <= threshold)
+
+
+def arrays_check_distorted(arrays, angle_distort):
+    """Faces with a corner normal deviating from the face normal more than angle_distort."""
+
+    co = arrays.co
+    loops_vert = arrays.loops_vert
+    loops_co = co[loops_vert]
+    loops_no = _normalized(np.cross(
+        co[loops_vert[arrays.loops_prev]] - loops_co,
+        co[loops_vert[arrays.loops_next]] - loops_co,
+    ))
+    poly_no = arrays.poly_normal
+    loops_poly_no = poly_no[arrays.loops_poly]
+    # Degenerate corners use the face normal.
+    loops_zero = ~loops_no.any(axis=1)
+    loops_no[loops_zero] = loops_poly_no[loops_zero]
+
+    dot = np.abs((loops_no * loops_poly_no).sum(axis=1))
+    angle = np.arccos(np.clip(dot, -1.0, 1.0))
+    distort = np.bincount(arrays.loops_poly, weights=angle > angle_distort, minlength=len(poly_no)) > 0
+    # Faces without a normal are always distorted.
+    distort |= ~poly_no.any(axis=1) & (arrays.poly_loop_total > 0)
+    return _indices(distort)
+
+
+def arrays_check_sharp(arrays, angle_sharp):
+    """Manifold edges with a signed face angle above angle_sharp (concave edges are negative)."""
+
+    pair, count = arrays.edges_loops
+    manifold = np.flatnonzero(count == 2)
+    l1, l2 = pair[manifold].T
+    loops_poly = arrays.loops_poly
+    no1 = arrays.poly_normal[loops_poly[l1]]
+    no2 = arrays.poly_normal[loops_poly[l2]]
+
+    angle = np.arccos(np.clip((no1 * no2).sum(axis=1), -1.0, 1.0))
+    co = arrays.co
+    loops_vert = arrays.loops_vert
+    l_dir = co[loops_vert[arrays.loops_next[l1]]] - co[loops_vert[l1]]
+    concave = ((np.cross(no1, no2) * l_dir).sum(axis=1) <= 0.0) & (no1 != no2).any(axis=1)
+    angle[concave] *= -1.0
+
+    sharp = np.zeros(len(count), dtype=bool)
+    sharp[manifold] = angle > angle_sharp
+    return _indices(sharp)
+
+
+def arrays_check_overhang(arrays, angle_overhang):
+    """Faces with a normal closer to down than angle_overhang."""
+
+    poly_no = arrays.poly_normal
+    angle = np.arccos(np.clip(-poly_no[:, 2], -1.0, 1.0))
+    # ignore zero area faces
+    return _indices((angle < angle_overhang) & poly_no.any(axis=1))
+
+
+# BVH trees of the last meshes, by MeshArrays key.
+_bvhtree_cache = {}
+_bvhtree_cache_size = 4
+
+
+def bvhtree_from_arrays(arrays):
+    """BVH tree of the triangles, reused while the mesh and its transform don't change."""
+    from mathutils.bvhtree import BVHTree
+
+    tree = _bvhtree_cache.pop(arrays.key, None)
+    if tree is None:
+        tree = BVHTree.FromPolygons(arrays.co.tolist(), arrays.tris.tolist(), all_triangles=True, epsilon=0.00001)
+        while len(_bvhtree_cache) >= _bvhtree_cache_size:
+            del _bvhtree_cache[next(iter(_bvhtree_cache))]
+    _bvhtree_cache[arrays.key] = tree
+    return tree
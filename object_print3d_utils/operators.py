@@ -4,6 +4,7 @@
 
 
 import math
+import time
 
 import bpy
 from bpy.types import Operator
@@ -128,11 +129,17 @@ class MESH_OT_print3d_info_area(Operator):
 # ---------------
 # Geometry Checks
 
+# Check results of the last mesh checked, by check and parameters.
+_check_cache = {}
+_check_cache_key = None
+
+
 def execute_check(self, context):
     obj = context.active_object
 
     info = []
-    self.main_check(obj, info)
+    for _progress in check_steps((self.__class__,), obj, info):
+        pass
     report.update(*info)
 
     multiple_obj_warning(self, context)
@@ -140,6 +147,89 @@ def execute_check(self, context):
     return {'FINISHED'}
 
 
+def check_steps(check_cls, obj, info):
+    """
+    Run the checks on one snapshot of the mesh, yielding the progress (0..1) between the steps of the slow ones.
+    Results are reused while the mesh and the parameters of the check don't change.
+    """
+    global _check_cache_key
+    from . import mesh_helpers
+
+    print_3d = bpy.context.scene.print_3d
+    arrays = mesh_helpers.MeshArrays(obj)
+    if arrays.key != _check_cache_key:
+        _check_cache.clear()
+        _check_cache_key = arrays.key
+
+    steps = len(check_cls)
+    for i, cls in enumerate(check_cls):
+        check_params = getattr(cls, "check_params", None)
+        params = () if check_params is None else check_params(print_3d)
+        key = (cls.bl_idname, params)
+
+        info_check = _check_cache.get(key)
+        if info_check is None:
+            info_check = []
+            main_check_iter = getattr(cls, "main_check_iter", None)
+            if main_check_iter is None:
+                cls.main_check(arrays, info_check, *params)
+            else:
+                for progress in main_check_iter(arrays, info_check, *params):
+                    yield (i + progress) / steps
+            _check_cache[key] = info_check
+
+        info.extend(info_check)
+        yield (i + 1) / steps
+
+
+def invoke_check(self, context, check_cls):
+    # Run the checks from a timer, so the progress is shown and they can be cancelled.
+    wm = context.window_manager
+
+    self._info = []
+    self._steps = check_steps(check_cls, context.active_object, self._info)
+    self._timer = wm.event_timer_add(0.01, window=context.window)
+    wm.progress_begin(0.0, 1.0)
+    wm.modal_handler_add(self)
+
+    return {'RUNNING_MODAL'}
+
+
+def modal_check(self, context, event):
+    if event.type == 'ESC':
+        finish_check(self, context)
+        self.report({'WARNING'}, "Check cancelled")
+        return {'CANCELLED'}
+
+    if event.type != 'TIMER' or event.is_repeat:
+        return {'PASS_THROUGH'}
+
+    # Work for a short time on each tick to keep the interface responsive.
+    time_end = time.perf_counter() + 0.1
+    for progress in self._steps:
+        if time.perf_counter() > time_end:
+            context.window_manager.progress_update(progress)
+            context.workspace.status_text_set(
+                tip_("3D-Print Check: {:d}%, Esc to cancel").format(int(progress * 100.0))
+            )
+            return {'RUNNING_MODAL'}
+
+    finish_check(self, context)
+    report.update(*self._info)
+
+    multiple_obj_warning(self, context)
+
+    return {'FINISHED'}
+
+
+def finish_check(self, context):
+    wm = context.window_manager
+    wm.event_timer_remove(self._timer)
+    wm.progress_end()
+    context.workspace.status_text_set(None)
+    self._steps.close()
+
+
 def multiple_obj_warning(self, context):
     if len(context.selected_objects) > 1:
         self.report({"INFO"}, "Multiple selected objects. Only the active one will be evaluated")
@@ -151,17 +241,10 @@ class MESH_OT_print3d_check_solid(Operator):
     bl_description = "Check for geometry is solid (has valid inside/outside) and correct normals"
 
     @staticmethod
-    def main_check(obj, info):
-        import array
+    def main_check(arrays, info):
         from . import mesh_helpers
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=False, triangulate=False)
-
-        edges_non_manifold = array.array('i', (i for i, ele in enumerate(bm.edges) if not ele.is_manifold))
-        edges_non_contig = array.array(
-            'i',
-            (i for i, ele in enumerate(bm.edges) if ele.is_manifold and (not ele.is_contiguous)),
-        )
+        edges_non_manifold, edges_non_contig = mesh_helpers.arrays_check_solid(arrays)
 
         info.append(
             (tip_("Non Manifold Edge: {}").format(
@@ -170,8 +253,6 @@ class MESH_OT_print3d_check_solid(Operator):
                  edges_non_manifold)))
         info.append((tip_("Bad Contig. Edges: {}").format(len(edges_non_contig)), (bmesh.types.BMEdge, edges_non_contig)))
 
-        bm.free()
-
     def execute(self, context):
         return execute_check(self, context)
 
@@ -182,10 +263,10 @@ class MESH_OT_print3d_check_intersections(Operator):
     bl_description = "Check geometry for self intersections"
 
     @staticmethod
-    def main_check(obj, info):
+    def main_check(arrays, info):
         from . import mesh_helpers
 
-        faces_intersect = mesh_helpers.bmesh_check_self_intersect_object(obj)
+        faces_intersect = mesh_helpers.arrays_check_self_intersect(arrays)
         info.append((tip_("Intersect Face: {}").format(len(faces_intersect)), (bmesh.types.BMFace, faces_intersect)))
 
     def execute(self, context):
@@ -201,24 +282,18 @@ class MESH_OT_print3d_check_degenerate(Operator):
     )
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-        from . import mesh_helpers
+    def check_params(print_3d):
+        return (print_3d.threshold_zero,)
 
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        threshold = print_3d.threshold_zero
-
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=False, triangulate=False)
+    @staticmethod
+    def main_check(arrays, info, threshold):
+        from . import mesh_helpers
 
-        faces_zero = array.array('i', (i for i, ele in enumerate(bm.faces) if ele.calc_area() <= threshold))
-        edges_zero = array.array('i', (i for i, ele in enumerate(bm.edges) if ele.calc_length() <= threshold))
+        faces_zero, edges_zero = mesh_helpers.arrays_check_degenerate(arrays, threshold)
 
         info.append((tip_("Zero Faces: {}").format(len(faces_zero)), (bmesh.types.BMFace, faces_zero)))
         info.append((tip_("Zero Edges: {}").format(len(edges_zero)), (bmesh.types.BMEdge, edges_zero)))
 
-        bm.free()
-
     def execute(self, context):
         return execute_check(self, context)
 
@@ -229,26 +304,17 @@ class MESH_OT_print3d_check_distorted(Operator):
     bl_description = "Check for non-flat faces"
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-        from . import mesh_helpers
+    def check_params(print_3d):
+        return (print_3d.angle_distort,)
 
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        angle_distort = print_3d.angle_distort
-
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
-        bm.normal_update()
+    @staticmethod
+    def main_check(arrays, info, angle_distort):
+        from . import mesh_helpers
 
-        faces_distort = array.array(
-            'i',
-            (i for i, ele in enumerate(bm.faces) if mesh_helpers.face_is_distorted(ele, angle_distort))
-        )
+        faces_distort = mesh_helpers.arrays_check_distorted(arrays, angle_distort)
 
         info.append((tip_("Non-Flat Faces: {}").format(len(faces_distort)), (bmesh.types.BMFace, faces_distort)))
 
-        bm.free()
-
     def execute(self, context):
         return execute_check(self, context)
 
@@ -262,18 +328,34 @@ class MESH_OT_print3d_check_thick(Operator):
     )
 
     @staticmethod
-    def main_check(obj, info):
+    def check_params(print_3d):
+        return (print_3d.thickness_min,)
+
+    @staticmethod
+    def main_check_iter(arrays, info, thickness_min):
+        import array
         from . import mesh_helpers
 
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
+        faces_error = set()
+        yield from mesh_helpers.arrays_check_thick_iter(arrays, thickness_min, faces_error)
+        faces_error = array.array('i', faces_error)
 
-        faces_error = mesh_helpers.bmesh_check_thick_object(obj, print_3d.thickness_min)
         info.append((tip_("Thin Faces: {}").format(len(faces_error)), (bmesh.types.BMFace, faces_error)))
 
+    @classmethod
+    def main_check(cls, arrays, info, thickness_min):
+        for _progress in cls.main_check_iter(arrays, info, thickness_min):
+            pass
+
     def execute(self, context):
         return execute_check(self, context)
 
+    def invoke(self, context, event):
+        return invoke_check(self, context, (self.__class__,))
+
+    def modal(self, context, event):
+        return modal_check(self, context, event)
+
 
 class MESH_OT_print3d_check_sharp(Operator):
     bl_idname = "mesh.print3d_check_sharp"
@@ -281,23 +363,16 @@ class MESH_OT_print3d_check_sharp(Operator):
     bl_description = "Check edges are below the sharpness preference"
 
     @staticmethod
-    def main_check(obj, info):
-        from . import mesh_helpers
-
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        angle_sharp = print_3d.angle_sharp
+    def check_params(print_3d):
+        return (print_3d.angle_sharp,)
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
-        bm.normal_update()
+    @staticmethod
+    def main_check(arrays, info, angle_sharp):
+        from . import mesh_helpers
 
-        edges_sharp = [
-            ele.index for ele in bm.edges
-            if ele.is_manifold and ele.calc_face_angle_signed() > angle_sharp
-        ]
+        edges_sharp = mesh_helpers.arrays_check_sharp(arrays, angle_sharp)
 
         info.append((tip_("Sharp Edge: {}").format(len(edges_sharp)), (bmesh.types.BMEdge, edges_sharp)))
-        bm.free()
 
     def execute(self, context):
         return execute_check(self, context)
@@ -309,32 +384,22 @@ class MESH_OT_print3d_check_overhang(Operator):
     bl_description = "Check faces don't overhang past a certain angle"
 
     @staticmethod
-    def main_check(obj, info):
-        from mathutils import Vector
+    def check_params(print_3d):
+        return (print_3d.angle_overhang,)
+
+    @staticmethod
+    def main_check(arrays, info, angle_overhang):
         from . import mesh_helpers
 
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        angle_overhang = (math.pi / 2.0) - print_3d.angle_overhang
+        angle_overhang = (math.pi / 2.0) - angle_overhang
 
         if angle_overhang == math.pi:
             info.append(("Skipping Overhang", ()))
             return
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
-        bm.normal_update()
-
-        z_down = Vector((0, 0, -1.0))
-        z_down_angle = z_down.angle
-
-        # 4.0 ignores zero area faces
-        faces_overhang = [
-            ele.index for ele in bm.faces
-            if z_down_angle(ele.normal, 4.0) < angle_overhang
-        ]
+        faces_overhang = mesh_helpers.arrays_check_overhang(arrays, angle_overhang)
 
         info.append((tip_("Overhang Face: {}").format(len(faces_overhang)), (bmesh.types.BMFace, faces_overhang)))
-        bm.free()
 
     def execute(self, context):
         return execute_check(self, context)
@@ -359,8 +424,8 @@ class MESH_OT_print3d_check_all(Operator):
         obj = context.active_object
 
         info = []
-        for cls in self.check_cls:
-            cls.main_check(obj, info)
+        for _progress in check_steps(self.check_cls, obj, info):
+            pass
 
         report.update(*info)
 
@@ -368,6 +433,12 @@ class MESH_OT_print3d_check_all(Operator):
 
         return {'FINISHED'}
 
+    def invoke(self, context, event):
+        return invoke_check(self, context, self.check_cls)
+
+    def modal(self, context, event):
+        return modal_check(self, context, event)
+
 
 class MESH_OT_print3d_clean_distorted(Operator):
     bl_idname = "mesh.print3d_clean_distorted"
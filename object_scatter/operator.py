@@ -5,7 +5,7 @@ import gpu
 import blf
 import math
 import enum
-import random
+import numpy as np
 
 from itertools import islice
 from mathutils.bvhtree import BVHTree
@@ -81,7 +81,6 @@ class ScatterObjects(bpy.types.Operator):
             if build_state == BuildState.FINISHED:
                 self.targets.append(self.active_target)
                 self.active_target = None
-            self.remove_target_from_cache(self.active_target)
             return True
 
         return False
@@ -101,7 +100,7 @@ class ScatterObjects(bpy.types.Operator):
         draw_matrices_batches(list(self.iter_matrix_batches()))
 
     def draw_px(self):
-        draw_text((20, 20, 0), "Instances: " + str(len(self.get_all_matrices())))
+        draw_text((20, 20, 0), "Instances: " + str(self.get_instance_amount()))
 
     def finish(self, return_value):
         self.disable_draw_callback()
@@ -121,17 +120,26 @@ class ScatterObjects(bpy.types.Operator):
     def get_all_matrices(self):
         settings = self.get_current_settings()
 
-        matrices = []
+        matrices = [np.empty((0, 4, 4), dtype=np.float32)]
         for target in self.iter_targets():
             self.ensure_target_is_in_cache(target)
-            matrices.extend(self.target_cache[target].get_matrices(settings))
-        return matrices
+            matrices.append(self.target_cache[target].get_matrices(settings))
+        return np.concatenate(matrices)
+
+    def get_instance_amount(self):
+        settings = self.get_current_settings()
+
+        amount = 0
+        for target in self.iter_targets():
+            self.ensure_target_is_in_cache(target)
+            amount += len(self.target_cache[target].get_matrices(settings))
+        return amount
 
     def iter_matrix_batches(self):
         settings = self.get_current_settings()
         for target in self.iter_targets():
             self.ensure_target_is_in_cache(target)
-            yield self.target_cache[target].get_batch(settings)
+            yield from self.target_cache[target].get_batches(settings)
 
     def iter_targets(self):
         yield from self.targets
@@ -143,13 +151,17 @@ class ScatterObjects(bpy.types.Operator):
             entry = TargetCacheEntry(target, self.base_scale)
             self.target_cache[target] = entry
 
-    def remove_target_from_cache(self, target):
-        self.target_cache.pop(self.active_target, None)
-
     def get_current_settings(self):
         return bpy.context.scene.scatter_properties.to_settings()
 
 class TargetCacheEntry:
+    '''
+    Matrices and GPU batches of a target. While the target is built, only the
+    instances of its new parts are computed. The batches of full chunks are kept,
+    only the batch of the last chunk is rebuilt when instances are added.
+    '''
+    batch_chunk_size = 4096
+
     def __init__(self, target, base_scale):
         self.target = target
         self.last_used_settings = None
@@ -158,15 +170,37 @@ class TargetCacheEntry:
 
     def get_matrices(self, settings):
         self._handle_new_settings(settings)
-        if self.matrices is None:
-            self.matrices = self.target.get_matrices(settings)
-        return self.matrices
-
-    def get_batch(self, settings):
-        self._handle_new_settings(settings)
-        if self.gpu_batch is None:
-            self.gpu_batch = create_batch_for_matrices(self.get_matrices(settings), self.base_scale)
-        return self.gpu_batch
+        progress = self.target.get_progress()
+        if progress != self.progress:
+            new_matrices = self.target.get_matrices(settings, self.progress, progress)
+            self._append_matrices(new_matrices)
+            self.progress = progress
+            self.tail_batch = None
+        return self.matrix_buffer[:self.amount]
+
+    def _append_matrices(self, matrices):
+        end = self.amount + len(matrices)
+        if end > len(self.matrix_buffer):
+            # Double the capacity, so adding instances while drawing a stroke stays cheap
+            buffer = np.empty((max(end, 2 * len(self.matrix_buffer)), 4, 4), dtype=np.float32)
+            buffer[:self.amount] = self.matrix_buffer[:self.amount]
+            self.matrix_buffer = buffer
+        self.matrix_buffer[self.amount:end] = matrices
+        self.amount = end
+
+    def get_batches(self, settings):
+        matrices = self.get_matrices(settings)
+        chunk_size = self.batch_chunk_size
+        while len(matrices) - self.batches_end >= chunk_size:
+            chunk = matrices[self.batches_end:self.batches_end + chunk_size]
+            self.batches.append(create_batch_for_matrices(chunk, self.base_scale))
+            self.batches_end += chunk_size
+            self.tail_batch = None
+        if self.tail_batch is None and self.batches_end < len(matrices):
+            self.tail_batch = create_batch_for_matrices(matrices[self.batches_end:], self.base_scale)
+        if self.tail_batch is None:
+            return self.batches
+        return self.batches + [self.tail_batch]
 
     def _handle_new_settings(self, settings):
         if settings != self.last_used_settings:
@@ -174,8 +208,12 @@ class TargetCacheEntry:
         self.last_used_settings = settings
 
     def settings_changed(self):
-        self.matrices = None
-        self.gpu_batch = None
+        self.matrix_buffer = np.empty((256, 4, 4), dtype=np.float32)
+        self.amount = 0
+        self.progress = 0
+        self.batches = []
+        self.batches_end = 0
+        self.tail_batch = None
 
 
 # Duplicator Creation
@@ -205,9 +243,17 @@ def triangle_object_from_matrices(name, matrices, triangle_scale):
 
 def triangle_mesh_from_matrices(name, matrices, triangle_scale):
     mesh = bpy.data.meshes.new(name)
-    vertices, polygons = mesh_data_from_matrices(matrices, triangle_scale)
-    mesh.from_pydata(vertices, [], polygons)
-    mesh.update()
+    vertices = mesh_data_from_matrices(matrices, triangle_scale)
+    amount = len(matrices)
+
+    mesh.vertices.add(amount * 3)
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.loops.add(amount * 3)
+    mesh.loops.foreach_set("vertex_index", np.arange(amount * 3, dtype=np.int32))
+    mesh.polygons.add(amount)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, amount * 3, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(amount, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
     mesh.validate()
     return mesh
 
@@ -217,15 +263,15 @@ unit_triangle_vertices = (
     Vector((0, 2/3**0.75, 0)))
 
 def mesh_data_from_matrices(matrices, triangle_scale):
-    vertices = []
-    polygons = []
-    triangle_vertices = [triangle_scale * v for v in unit_triangle_vertices]
-
-    for i, matrix in enumerate(matrices):
-        vertices.extend((matrix @ v for v in triangle_vertices))
-        polygons.append((i * 3 + 0, i * 3 + 1, i * 3 + 2))
+    '''Return the (N, 3, 3) triangle vertices placed by the (N, 4, 4) matrices.'''
+    return transform_points(matrices, np.array(unit_triangle_vertices) * triangle_scale)
 
-    return vertices, polygons
+def transform_points(matrices, points):
+    '''Return the (N, P, 3) points transformed by each of the (N, 4, 4) matrices.'''
+    matrices = np.asarray(matrices, dtype=np.float32).reshape(-1, 4, 4)
+    points = np.asarray(points, dtype=np.float32)
+    return (np.einsum('nij,pj->npi', matrices[:, :3, :3], points) +
+            matrices[:, None, :3, 3])
 
 
 # Target Provider
@@ -242,8 +288,11 @@ class TargetProvider:
     def continue_build(self, event):
         return BuildState.FINISHED
 
-    def get_matrices(self, scatter_settings):
-        return []
+    def get_progress(self):
+        return 0
+
+    def get_matrices(self, scatter_settings, start=0, end=None):
+        return np.empty((0, 4, 4), dtype=np.float32)
 
     def draw(self):
         pass
@@ -270,18 +319,26 @@ class StrokeTarget(TargetProvider):
             self.batch = create_line_strip_batch(self.points)
         draw_line_strip_batch(self.batch, color=(1.0, 0.4, 0.1, 1.0), thickness=5)
 
-    def get_matrices(self, scatter_settings):
-        return scatter_around_stroke(self.points, self.bvhtree, scatter_settings)
-
-def scatter_around_stroke(stroke_points, bvhtree, settings):
-    scattered_matrices = []
-    for point, local_seed in iter_points_on_stroke_with_seed(stroke_points, settings.density, settings.seed):
-        matrix = scatter_from_source_point(bvhtree, point, local_seed, settings)
-        scattered_matrices.append(matrix)
-    return scattered_matrices
-
-def iter_points_on_stroke_with_seed(stroke_points, density, seed):
-    for i, (start, end) in enumerate(iter_pairwise(stroke_points)):
+    def get_progress(self):
+        # Amount of stroke segments, the instances of a segment don't change when points are added.
+        return max(len(self.points) - 1, 0)
+
+    def get_matrices(self, scatter_settings, start=0, end=None):
+        return scatter_around_stroke(self.points, self.bvhtree, scatter_settings, start, end)
+
+def scatter_around_stroke(stroke_points, bvhtree, settings, start_segment=0, end_segment=None):
+    if end_segment is None:
+        end_segment = len(stroke_points) - 1
+    stroke_points = stroke_points[start_segment:end_segment + 1]
+    scattered_matrices = [
+        scatter_from_source_point(bvhtree, point, local_seed, settings)
+        for point, local_seed in iter_points_on_stroke_with_seed(
+            stroke_points, settings.density, settings.seed, start_segment)
+    ]
+    return np.array(scattered_matrices, dtype=np.float32).reshape(-1, 4, 4)
+
+def iter_points_on_stroke_with_seed(stroke_points, density, seed, start_segment=0):
+    for i, (start, end) in enumerate(iter_pairwise(stroke_points), start_segment):
         segment_seed = sub_seed(seed, i)
         segment_vector = end - start
 
@@ -349,18 +406,12 @@ def draw_matrices_batches(batches):
     gpu.state.depth_mask_set(True)
 
 def create_batch_for_matrices(matrices, base_scale):
-    coords = []
-    indices = []
-
-    scaled_box_vertices = [base_scale * vertex for vertex in box_vertices]
-
-    for matrix in matrices:
-        offset = len(coords)
-        coords.extend((matrix @ vertex for vertex in scaled_box_vertices))
-        indices.extend(tuple(index + offset for index in element) for element in box_indices)
+    coords = transform_points(matrices, np.array(box_vertices) * base_scale)
+    offsets = np.arange(len(matrices), dtype=np.int32) * len(box_vertices)
+    indices = np.array(box_indices, dtype=np.int32)[None] + offsets[:, None, None]
 
     batch = batch_for_shader(get_uniform_color_shader(),
-        'TRIS', {"pos" : coords}, indices = indices)
+        'TRIS', {"pos" : coords.reshape(-1, 3)}, indices = indices.reshape(-1, 3))
     return batch
 
 
@@ -431,8 +482,7 @@ def get_selected_non_active_objects(context):
     return set(context.selected_objects) - {context.active_object}
 
 def make_random_chunks(sequence, chunk_amount):
-    sequence = list(sequence)
-    random.shuffle(sequence)
+    sequence = sequence[np.random.permutation(len(sequence))]
     return make_chunks(sequence, chunk_amount)
 
 def make_chunks(sequence, chunk_amount):
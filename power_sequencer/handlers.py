@@ -3,6 +3,8 @@
 import bpy
 from bpy.app.handlers import persistent
 
+from .operators.utils.strip_index import clear_strip_index
+
 
 @persistent
 def power_sequencer_playback_speed_post(scene):
@@ -31,6 +33,22 @@ def power_sequencer_playback_speed_post(scene):
         bpy.ops.screen.frame_offset(delta=target_frame - scene.frame_current)
 
 
+@persistent
+def power_sequencer_strip_index_clear(*args):
+    """
+    Drops the cached strip index when the strips may have changed
+    """
+    clear_strip_index()
+
+
+STRIP_INDEX_HANDLERS = (
+    bpy.app.handlers.depsgraph_update_post,
+    bpy.app.handlers.load_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+)
+
+
 def draw_playback_speed(self, context):
     layout = self.layout
     scene = context.scene
@@ -49,6 +67,8 @@ def register_handlers():
 
     # Handlers
     bpy.app.handlers.frame_change_post.append(power_sequencer_playback_speed_post)
+    for handlers in STRIP_INDEX_HANDLERS:
+        handlers.append(power_sequencer_strip_index_clear)
 
 
 def unregister_handlers():
@@ -58,3 +78,6 @@ def unregister_handlers():
 
     # Handlers
     bpy.app.handlers.frame_change_post.remove(power_sequencer_playback_speed_post)
+    for handlers in STRIP_INDEX_HANDLERS:
+        handlers.remove(power_sequencer_strip_index_clear)
+    clear_strip_index()
@@ -3,6 +3,7 @@
 import bpy
 
 from .utils.functions import slice_selection
+from .utils.strip_index import clear_strip_index, get_strip_index
 from .utils.doc import doc_name, doc_idname, doc_brief, doc_description
 
 
@@ -50,6 +51,10 @@ class POWER_SEQUENCER_OT_expand_to_surrounding_cuts(bpy.types.Operator):
 
     def invoke(self, context, event):
         sequence_blocks = slice_selection(context, context.selected_sequences)
+        strip_index = get_strip_index(context)
+        # The blocks don't touch, so the only cut the index misses is the end of the
+        # previous block after it got extended.
+        extended_end = None
         for sequences in sequence_blocks:
             sequences_frame_start = min(
                 sequences, key=lambda s: s.frame_final_start
@@ -57,8 +62,11 @@ class POWER_SEQUENCER_OT_expand_to_surrounding_cuts(bpy.types.Operator):
             sequences_frame_end = max(sequences, key=lambda s: s.frame_final_end).frame_final_end
 
             frame_left, frame_right = find_closest_cuts(
-                context, sequences_frame_start, sequences_frame_end
+                strip_index, sequences_frame_start, sequences_frame_end
             )
+            if extended_end is not None:
+                frame_left = max(frame_left, extended_end)
+            extended_end = max(frame_right, sequences_frame_end)
             if sequences_frame_start == frame_left and sequences_frame_end == frame_right:
                 continue
 
@@ -73,16 +81,11 @@ class POWER_SEQUENCER_OT_expand_to_surrounding_cuts(bpy.types.Operator):
                 s.frame_final_end = (
                     frame_right if frame_right > sequences_frame_end else sequences_frame_end
                 )
+        clear_strip_index()
         return {"FINISHED"}
 
 
-def find_closest_cuts(context, frame_min, frame_max):
-    frame_left = max(
-        context.sequences,
-        key=lambda s: s.frame_final_end if s.frame_final_end <= frame_min else -1,
-    ).frame_final_end
-    frame_right = min(
-        context.sequences,
-        key=lambda s: s.frame_final_start if s.frame_final_start >= frame_max else 1000000,
-    ).frame_final_start
+def find_closest_cuts(strip_index, frame_min, frame_max):
+    frame_left = strip_index.last_end(frame_min, frame_min)
+    frame_right = strip_index.first_start(frame_max, frame_max)
     return frame_left, frame_right
@@ -5,6 +5,7 @@ from operator import attrgetter
 
 from .utils.doc import doc_name, doc_idname, doc_brief, doc_description
 from .utils.functions import slice_selection
+from .utils.strip_index import clear_strip_index, get_strip_index
 
 
 class POWER_SEQUENCER_OT_gap_remove(bpy.types.Operator):
@@ -51,14 +52,9 @@ class POWER_SEQUENCER_OT_gap_remove(bpy.types.Operator):
 
     def execute(self, context):
         frame = self.frame if self.frame >= 0 else context.scene.frame_current
-        sequences = (
-            [s for s in context.sequences if not s.lock]
-            if self.ignore_locked
-            else context.sequences
-        )
-        sequences = [
-            s for s in sequences if s.frame_final_start >= frame or s.frame_final_end > frame
-        ]
+        sequences = get_strip_index(context).ending_after(frame)
+        if self.ignore_locked:
+            sequences = [s for s in sequences if not s.lock]
         sequence_blocks = slice_selection(context, sequences)
         if not sequence_blocks:
             return {"FINISHED"}
@@ -89,12 +85,7 @@ class POWER_SEQUENCER_OT_gap_remove(bpy.types.Operator):
 
         gap_frame = -1
         if strips_start > frame:
-            strips_before_frame_start = [s for s in context.sequences if s.frame_final_end <= frame]
-            frame_target = 0
-            if strips_before_frame_start:
-                frame_target = max(
-                    strips_before_frame_start, key=attrgetter("frame_final_end")
-                ).frame_final_end
+            frame_target = get_strip_index(context).last_end(frame, 0)
             gap_frame = frame_target if frame_target < strips_start else frame
         else:
             gap_frame = strips_end
@@ -121,6 +112,7 @@ class POWER_SEQUENCER_OT_gap_remove(bpy.types.Operator):
             if not self.all:
                 break
             gap_frame = block[-1].frame_final_end
+        clear_strip_index()
 
     def move_markers(self, context, gap_frame, gap_size):
         markers = (m for m in context.scene.timeline_markers if m.frame > gap_frame)
@@ -3,11 +3,14 @@
 import json
 import os
 import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import bpy
 
 from .utils.functions import convert_duration_to_frames
 from .utils.doc import doc_brief, doc_description, doc_idname, doc_name
+from .utils.info_progress_bar import InfoProgressBar
 from ..addon_preferences import get_preferences
 from .utils.global_settings import (
     Extensions,
@@ -17,6 +20,64 @@ from .utils.global_settings import (
     EXTENSIONS_VIDEO,
 )
 
+PROBE_HEADER_SIZE = 64
+
+MediaInfo = namedtuple("MediaInfo", ["filepath", "size", "is_valid"])
+
+
+def probe_media_file(filepath):
+    """
+    Local stand-in for a media probe: reads the start of the file to check that it exists and
+    holds data, without loading it in Blender
+    Returns a MediaInfo
+    """
+    try:
+        size = os.path.getsize(filepath)
+        with open(filepath, "rb") as media_file:
+            header = media_file.read(PROBE_HEADER_SIZE)
+    except OSError:
+        return MediaInfo(filepath, 0, False)
+    return MediaInfo(filepath, size, len(header) > 0)
+
+
+def probe_media_files(filepaths, probe=probe_media_file, progress=None, max_workers=None):
+    """
+    Runs `probe` on all the filepaths in a pool of worker threads
+    Returns the list of MediaInfo in the order of filepaths
+    """
+    infos = [None] * len(filepaths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(probe, path): index for index, path in enumerate(filepaths)}
+        for future in as_completed(futures):
+            infos[futures[future]] = future.result()
+            if progress:
+                progress.step()
+    return infos
+
+
+def group_by_directory(filepaths):
+    """
+    Returns a list of (directory, [filenames]) for consecutive filepaths sharing a directory
+    """
+    groups = []
+    for path in filepaths:
+        head, tail = os.path.split(path)
+        if groups and groups[-1][0] == head:
+            groups[-1][1].append(tail)
+        else:
+            groups.append((head, [tail]))
+    return groups
+
+
+def files_properties(directory, filenames):
+    """
+    Returns the file properties for the strip add operators: the multiple files
+    import uses `directory` and `files`, the single file one `filepath`
+    """
+    if len(filenames) == 1:
+        return {"filepath": os.path.join(directory, filenames[0])}
+    return {"directory": directory, "files": [{"name": name} for name in filenames]}
+
 
 class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
     """*brief* Imports video, images, and audio from the project folder
@@ -24,7 +85,11 @@ class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
     Finds and imports all valid video, audio files, and pictures in the blend file's folder and
     sub-folders, ignoring folders named BL_proxy.
 
-    If you set it in the add-on preferences, it also sets imported sequences to use proxies. See
+    Files are checked in parallel before the import, the ones that can't be read are skipped and
+    will be imported the next time. The files of each folder are added in one batch.
+
+    If you set it in the add-on preferences, it also sets imported sequences to use proxies and
+    builds the proxies and timecode indices in a background job. See
     `Preferences -> Add-ons -> Blender Power Sequencer -> Proxy`
     """
 
@@ -63,9 +128,18 @@ class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
         default=1.0,
         min=0.0,
     )
+    build_proxies: bpy.props.BoolProperty(
+        name="Build Proxies",
+        description=(
+            "Build the proxies and timecode indices of the imported strips in a background job"
+        ),
+        default=True,
+    )
 
     sequencer_area = None
     directory = ""
+    # Swap it to probe the media files differently, see probe_media_file
+    media_probe = staticmethod(probe_media_file)
 
     @classmethod
     def poll(cls, context):
@@ -85,17 +159,31 @@ class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
 
         bpy.ops.screen.animation_cancel(restore_frame=True)
 
-        audio = self.import_audios(
-            context, [f for f in files_to_import if f.lower().endswith(EXTENSIONS_AUDIO)]
-        )
-        video = self.import_videos(
-            context, [f for f in files_to_import if f.lower().endswith(EXTENSIONS_VIDEO)]
-        )
-        img = self.import_imgs(
-            context, [f for f in files_to_import if f.lower().endswith(EXTENSIONS_IMG)]
-        )
+        with InfoProgressBar(0, len(files_to_import) * 2) as progress:
+            infos = probe_media_files(files_to_import, self.media_probe, progress)
+            invalid = [info.filepath for info in infos if not info.is_valid]
+            files_to_import = [info.filepath for info in infos if info.is_valid]
+            progress.step(len(invalid))
+
+            audio = self.import_audios(
+                context,
+                [f for f in files_to_import if f.lower().endswith(EXTENSIONS_AUDIO)],
+                progress,
+            )
+            video = self.import_videos(
+                context,
+                [f for f in files_to_import if f.lower().endswith(EXTENSIONS_VIDEO)],
+                progress,
+            )
+            img = self.import_imgs(
+                context, [f for f in files_to_import if f.lower().endswith(EXTENSIONS_IMG)], progress
+            )
 
-        bpy.data.texts["POWER_SEQUENCER_IMPORTS"].from_string(json.dumps(filepaths))
+        # Files that couldn't be read are left out so the next import tries them again
+        invalid = {os.path.relpath(f, self.directory) for f in invalid}
+        bpy.data.texts["POWER_SEQUENCER_IMPORTS"].from_string(
+            json.dumps([f for f in filepaths if f not in invalid])
+        )
 
         for s in audio:
             s.show_waveform = True
@@ -104,7 +192,18 @@ class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
         for s in imported:
             s.select = True
         self.set_selected_strips_proxies(context)
-        self.report({"INFO"}, "Imported {!s} strips from newly found files.".format(len(imported)))
+
+        if invalid:
+            self.report(
+                {"WARNING"},
+                "Imported {!s} strips from newly found files, skipped {!s} unreadable files.".format(
+                    len(imported), len(invalid)
+                ),
+            )
+        else:
+            self.report(
+                {"INFO"}, "Imported {!s} strips from newly found files.".format(len(imported))
+            )
         return {"FINISHED"}
 
     def get_sequencer_area(self, context):
@@ -175,45 +274,47 @@ class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
         files_to_import = [p for p in filepaths if p not in imported_files]
         return files_to_import
 
-    def import_videos(self, context, videos_filepaths):
+    def import_videos(self, context, videos_filepaths, progress):
         """
-        Imports a list of files using movie_strip_add
+        Imports a list of files using movie_strip_add, one call per folder
         Returns the list of imported sequences
         """
         frame = context.scene.frame_current
 
-        context.window_manager.progress_begin(0, len(videos_filepaths))
         imported = []
-        for index, f in enumerate(videos_filepaths):
+        for index, (directory, filenames) in enumerate(group_by_directory(videos_filepaths)):
             is_first_import = index == 0
             bpy.ops.sequencer.movie_strip_add(
                 self.sequencer_area,
-                filepath=f,
+                **files_properties(directory, filenames),
                 frame_start=frame,
                 sound=self.keep_audio,
                 use_framerate=is_first_import,
             )
             imported.extend(context.selected_sequences)
-            frame = context.selected_sequences[0].frame_final_end
-            context.window_manager.progress_update(index)
+            frame = max(s.frame_final_end for s in context.selected_sequences)
+            progress.step(len(filenames))
 
-        context.window_manager.progress_end()
         return imported
 
-    def import_audios(self, context, audio_filepaths):
+    def import_audios(self, context, audio_filepaths, progress):
         """
-        Imports audio files as sound strips from a list of absolute file paths
+        Imports audio files as sound strips from a list of absolute file paths, one call per
+        folder
         Returns the list of newly imported audio files
         """
         frame = context.scene.frame_current
         imported = []
-        for f in audio_filepaths:
-            bpy.ops.sequencer.sound_strip_add(self.sequencer_area, filepath=f, frame_start=frame)
+        for directory, filenames in group_by_directory(audio_filepaths):
+            bpy.ops.sequencer.sound_strip_add(
+                self.sequencer_area, **files_properties(directory, filenames), frame_start=frame
+            )
             imported.extend(context.selected_sequences)
-            frame = context.selected_sequences[0].frame_final_end
+            frame = max(s.frame_final_end for s in context.selected_sequences)
+            progress.step(len(filenames))
         return imported
 
-    def import_imgs(self, context, img_filepaths):
+    def import_imgs(self, context, img_filepaths, progress):
         frame = context.scene.frame_current
         strip_length = convert_duration_to_frames(context, self.img_length)
         strip_padding = convert_duration_to_frames(context, self.img_padding)
@@ -230,25 +331,31 @@ class POWER_SEQUENCER_OT_import_local_footage(bpy.types.Operator):
             )
             frame += strip_length + strip_padding
             new_sequences.extend(context.selected_sequences)
+            progress.step()
 
         return new_sequences
 
     def set_selected_strips_proxies(self, context):
+        """
+        Sets the selected strips to use the proxy sizes from the add-on preferences and starts
+        building their proxies and timecode indices in a background job
+        """
         proxy_sizes = ["25", "50", "75", "100"]
 
-        use_proxy = False
         prefs = get_preferences(context)
-        for size in proxy_sizes:
-            if hasattr(prefs, "proxy_" + size):
-                use_proxy = True
-                break
-
+        use_proxy = any(getattr(prefs, "proxy_" + size) for size in proxy_sizes)
         if not use_proxy:
             return
 
-        for s in [s for s in context.selected_sequences if s.type in ["MOVIE", "IMAGE"]]:
+        strips = [s for s in context.selected_sequences if s.type in ["MOVIE", "IMAGE"]]
+        for s in strips:
             s.use_proxy = True
             s.proxy.build_25 = prefs.proxy_25
             s.proxy.build_50 = prefs.proxy_50
             s.proxy.build_75 = prefs.proxy_75
             s.proxy.build_100 = prefs.proxy_100
+            if s.type == "MOVIE":
+                s.proxy.build_record_run = True
+
+        if strips and self.build_proxies:
+            bpy.ops.sequencer.rebuild_proxy(self.sequencer_area)
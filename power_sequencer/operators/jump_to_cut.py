@@ -1,9 +1,12 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright (C) 2016-2020 by Nathan Lovato, Daniel Oakey, Razvan Radulescu, and contributors
 import bpy
-from operator import attrgetter
+import re
 
 from .utils.doc import doc_name, doc_idname, doc_brief, doc_description
+from .utils.strip_index import get_strip_index
+
+STRIP_DATA_PATH = re.compile(r'sequence_editor\.sequences_all\["(.+?)"\]')
 
 
 class POWER_SEQUENCER_OT_jump_to_cut(bpy.types.Operator):
@@ -53,6 +56,7 @@ class POWER_SEQUENCER_OT_jump_to_cut(bpy.types.Operator):
 
     def execute(self, context):
         frame_current = context.scene.frame_current
+        strip_index = get_strip_index(context)
 
         fcurves = []
         animation_data = context.scene.animation_data
@@ -61,52 +65,44 @@ class POWER_SEQUENCER_OT_jump_to_cut(bpy.types.Operator):
 
         frame_target = -1
 
-        # First find the closest cut, then if that sequence has an associated
-        # fcurve, loop through the curve's keyframes.
+        # First find the closest cut, then if the sequences past the time cursor
+        # have associated fcurves, loop through the curves' keyframes.
         if self.direction == "RIGHT":
-            frame_target = 100_000_000
-            for s in context.sequences:
+            frame_target = strip_index.next_cut(frame_current, 100_000_000)
+            for f, s in strip_fcurves(strip_index, fcurves):
                 if s.frame_final_end <= frame_current:
                     continue
-
-                candidates = [frame_target, s.frame_final_end]
-                if s.frame_final_start > frame_current:
-                    candidates.append(s.frame_final_start)
-
-                frame_target = min(candidates)
-
-                for f in fcurves:
-                    if s.name not in f.data_path:
+                for k in f.keyframe_points:
+                    frame = k.co[0]
+                    if frame <= frame_current:
                         continue
-
-                    for k in f.keyframe_points:
-                        frame = k.co[0]
-                        if frame <= frame_current:
-                            continue
-                        frame_target = min(frame_target, frame)
+                    frame_target = min(frame_target, frame)
 
         elif self.direction == "LEFT":
-            for s in context.sequences:
+            frame_target = strip_index.previous_cut(frame_current, -1)
+            for f, s in strip_fcurves(strip_index, fcurves):
                 if s.frame_final_start >= frame_current:
                     continue
-
-                candidates = [frame_target, s.frame_final_start]
-                if s.frame_final_end < frame_current:
-                    candidates.append(s.frame_final_end)
-
-                frame_target = max(candidates)
-
-                for f in fcurves:
-                    if s.name not in f.data_path:
+                for k in f.keyframe_points:
+                    frame = k.co[0]
+                    if frame >= frame_current:
                         continue
-
-                    for k in f.keyframe_points:
-                        frame = k.co[0]
-                        if frame >= frame_current:
-                            continue
-                        frame_target = max(frame_target, frame)
+                    frame_target = max(frame_target, frame)
 
         if frame_target > 0 and frame_target != 100_000_000:
             context.scene.frame_current = int(frame_target)
 
         return {"FINISHED"}
+
+
+def strip_fcurves(strip_index, fcurves):
+    """
+    Yields (fcurve, sequence) pairs for the fcurves that animate a sequence in the index
+    """
+    for f in fcurves:
+        match = STRIP_DATA_PATH.match(f.data_path)
+        if not match:
+            continue
+        s = strip_index.strips_by_name.get(match.group(1))
+        if s:
+            yield f, s
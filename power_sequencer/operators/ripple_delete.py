@@ -4,11 +4,13 @@ import bpy
 
 from .utils.doc import doc_brief, doc_description, doc_idname, doc_name
 from .utils.functions import (
+    delete_strips,
     get_frame_range,
     get_mouse_frame_and_channel,
+    move_selection,
     slice_selection,
-    ripple_move,
 )
+from .utils.strip_index import clear_strip_index, get_strip_index
 
 
 class POWER_SEQUENCER_OT_ripple_delete(bpy.types.Operator):
@@ -55,11 +57,24 @@ class POWER_SEQUENCER_OT_ripple_delete(bpy.types.Operator):
 
         is_single_channel = len(channels) == 1
         if is_single_channel:
-            for block in selection_blocks:
+            # Find the strips to ripple for every block before deleting anything, then work
+            # from the last block so the strips moved by one block don't affect the next.
+            strip_index = get_strip_index(context)
+            selection_set = set(selection)
+            to_ripple_blocks = [
+                [
+                    s
+                    for s in strip_index.starting_from(block[0].frame_final_start, channels)
+                    if s not in selection_set
+                ]
+                for block in selection_blocks
+            ]
+            for block, to_ripple in reversed(list(zip(selection_blocks, to_ripple_blocks))):
                 delete_start = block[0].frame_final_start
                 delete_end = block[-1].frame_final_end
                 ripple_duration = abs(delete_end - delete_start)
-                ripple_move(context, block, -ripple_duration, delete=True)
+                delete_strips(block)
+                move_selection(context, to_ripple, -ripple_duration, 0)
 
         else:
             cursor_frame = scene.frame_current
@@ -69,6 +84,7 @@ class POWER_SEQUENCER_OT_ripple_delete(bpy.types.Operator):
                     s.select = True
                 selection_start = get_frame_range(block)[0]
                 sequencer.delete()
+                clear_strip_index()
 
                 scene.frame_current = selection_start
                 bpy.ops.power_sequencer.gap_remove()
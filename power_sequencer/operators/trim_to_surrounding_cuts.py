@@ -9,6 +9,7 @@ import bpy
 from .utils.functions import convert_duration_to_frames, trim_strips
 from .utils.doc import doc_name, doc_idname, doc_brief, doc_description
 from .utils.functions import find_closest_surrounding_cuts_frames, find_strips_in_range
+from .utils.strip_index import get_strip_index
 
 
 class POWER_SEQUENCER_OT_trim_to_surrounding_cuts(bpy.types.Operator):
@@ -74,7 +75,11 @@ class POWER_SEQUENCER_OT_trim_to_surrounding_cuts(bpy.types.Operator):
             return {"CANCELLED"}
 
         to_delete, to_trim = find_strips_in_range(
-            left_cut_frame, right_cut_frame, context.sequences
+            left_cut_frame,
+            right_cut_frame,
+            get_strip_index(context).overlapping(
+                min(left_cut_frame, right_cut_frame), max(left_cut_frame, right_cut_frame)
+            ),
         )
         trim_start, trim_end = (left_cut_frame + margin_frame, right_cut_frame - margin_frame)
 
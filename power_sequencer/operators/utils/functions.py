@@ -6,6 +6,7 @@ from operator import attrgetter
 import bpy
 
 from .global_settings import SequenceTypes
+from .strip_index import clear_strip_index, get_strip_index
 
 max_channel = 32
 min_channel = 1
@@ -277,6 +278,7 @@ def trim_strips(context, frame_start, frame_end, to_trim, to_delete=[]):
             s.frame_final_end = trim_start
 
     delete_strips(to_delete)
+    clear_strip_index()
     for s in initial_selection:
         s.select = True
     return {"FINISHED"}
@@ -287,23 +289,7 @@ def find_closest_surrounding_cuts(context, frame):
     Returns a tuple of (strip_before, strip_after), the two closest sequences around a gap.
     If the frame is in the middle of a strip, both strips may be the same.
     """
-    strip_before = max(
-        context.sequences,
-        key=lambda s: s.frame_final_end
-        if s.frame_final_end <= frame
-        else s.frame_final_start
-        if s.frame_final_start <= frame
-        else 0,
-    )
-    strip_after = min(
-        context.sequences,
-        key=lambda s: s.frame_final_start
-        if s.frame_final_start >= frame
-        else s.frame_final_end
-        if s.frame_final_end >= frame
-        else 1000000,
-    )
-    return strip_before, strip_after
+    return get_strip_index(context).surrounding_cuts(frame)
 
 
 def find_closest_surrounding_cuts_frames(context, frame):
@@ -317,11 +303,7 @@ def find_closest_surrounding_cuts_frames(context, frame):
 
 def get_sequences_under_cursor(context):
     frame = context.scene.frame_current
-    under_cursor = [
-        s
-        for s in context.sequences
-        if s.frame_final_start <= frame and s.frame_final_end >= frame and not s.lock
-    ]
+    under_cursor = [s for s in get_strip_index(context).under_frame(frame) if not s.lock]
     return under_cursor
 
 
@@ -333,11 +315,7 @@ def ripple_move(context, sequences, duration_frames, delete=False):
     """
     channels = {s.channel for s in sequences}
     first_strip = min(sequences, key=lambda s: s.frame_final_start)
-    to_ripple = [
-        s
-        for s in context.sequences
-        if s.channel in channels and s.frame_final_start >= first_strip.frame_final_start
-    ]
+    to_ripple = get_strip_index(context).starting_from(first_strip.frame_final_start, channels)
 
     if delete:
         delete_strips(sequences)
@@ -392,6 +370,7 @@ def delete_strips(to_delete):
     sequences = bpy.context.scene.sequence_editor.sequences
     for s in to_delete:
         sequences.remove(s)
+    clear_strip_index()
 
 
 def move_selection(context, sequences, frame_offset, channel_offset=0):
@@ -406,6 +385,7 @@ def move_selection(context, sequences, frame_offset, channel_offset=0):
     for s in sequences:
         s.select = True
     bpy.ops.transform.seq_slide(value=(frame_offset, channel_offset))
+    clear_strip_index()
     bpy.ops.sequencer.select_all(action="DESELECT")
     for s in initial_selection:
         s.select = True
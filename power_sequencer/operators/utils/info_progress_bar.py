@@ -5,7 +5,8 @@ import bpy
 
 class InfoProgressBar:
     """
-    Draws a progress bar in the info header area
+    Shows the progress of a long task with the window manager's progress indicator.
+    Use it as a context manager around the task and increase `progress` as it goes
     """
 
     def __init__(self, progress_min=0, progress_max=100):
@@ -14,24 +15,21 @@ class InfoProgressBar:
         self.progress_min = progress_min
         self.progress_max = progress_max
 
-        self._progress = bpy.props.FloatProperty(
-            default=self.progress_min,
-            min=self.progress_min,
-            max=self.progress_max,
-            subtype="PERCENTAGE",
-        )
+        self._progress = self.progress_min
         self._visible = False
 
+    def __enter__(self):
+        self.visible = True
+        return self
+
+    def __exit__(self, *args):
+        self.visible = False
+
     def update(self, context):
-        for area in context.screen.areas:
-            if area.type == "INFO":
-                area.tag_redraw()
+        context.window_manager.progress_update(self._progress)
 
-    def draw(self):
-        if self.progress >= self.progress_max:
-            self.visible = False
-        else:
-            self.layout.prop(self, "_progress", text="Progress", slider=True)
+    def step(self, amount=1):
+        self.progress += amount
 
     @property
     def progress(self):
@@ -41,17 +39,23 @@ class InfoProgressBar:
     def progress(self, value):
         self._progress = min(max(self.progress_min, value), self.progress_max)
 
+        if self._visible:
+            self.update(bpy.context)
+
     @property
     def visible(self):
         return self._visible
 
     @visible.setter
     def visible(self, value):
+        if value == self._visible:
+            return
+
         self._visible = value
 
+        window_manager = bpy.context.window_manager
         if self._visible:
-            bpy.types.INFO_HT_header.append(self.draw)
-            bpy.app.handlers.scene_update_post.add(self.update)
+            window_manager.progress_begin(self.progress_min, self.progress_max)
+            self.update(bpy.context)
         else:
-            bpy.types.INFO_HT_header.remove(self.draw)
-            bpy.app.handlers.scene_update_post.remove(self.update)
+            window_manager.progress_end()
@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2016-2020 by Nathan Lovato, Daniel Oakey, Razvan Radulescu, and contributors
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+
+class StripIndex:
+    """
+    Sorted start and end frames of the strips, for the whole edit and for each channel.
+    Finds the strips and the cuts around a frame with a binary search instead of
+    looping over all the sequences
+    """
+
+    def __init__(self, sequences):
+        strips = [(s.frame_final_start, s.frame_final_end, s.channel, s) for s in sequences]
+
+        by_start = sorted(strips, key=itemgetter(0))
+        self._starts = [s[0] for s in by_start]
+        self._strips_by_start = [s[3] for s in by_start]
+
+        by_end = sorted(strips, key=itemgetter(1))
+        self._ends = [s[1] for s in by_end]
+        self._strips_by_end = [s[3] for s in by_end]
+
+        self.strips_by_name = {s[3].name: s[3] for s in strips}
+
+        # For each channel: starts, ends, running maximum of the ends, and strips.
+        # Strips in a channel rarely overlap, so walking back from the last strip that
+        # starts before a frame while the running maximum reaches it stops after one step.
+        self._channels = {}
+        for start, end, channel, strip in by_start:
+            starts, ends, ends_max, channel_strips = self._channels.setdefault(
+                channel, ([], [], [], [])
+            )
+            starts.append(start)
+            ends.append(end)
+            ends_max.append(max(end, ends_max[-1]) if ends_max else end)
+            channel_strips.append(strip)
+
+    def __len__(self):
+        return len(self._strips_by_start)
+
+    def _channel_overlapping(self, channel, frame_start, frame_end):
+        starts, ends, ends_max, strips = self._channels[channel]
+        index = bisect_right(starts, frame_end) - 1
+        while index >= 0 and ends_max[index] >= frame_start:
+            if ends[index] >= frame_start:
+                yield strips[index]
+            index -= 1
+
+    def overlapping(self, frame_start, frame_end):
+        """
+        Returns the strips that start at or before frame_end and end at or after frame_start
+        """
+        return [
+            strip
+            for channel in self._channels
+            for strip in self._channel_overlapping(channel, frame_start, frame_end)
+        ]
+
+    def under_frame(self, frame):
+        """
+        Returns the strips that start at or before the frame and end at or after it
+        """
+        return self.overlapping(frame, frame)
+
+    def starting_from(self, frame, channels=None):
+        """
+        Returns the strips that start at or after the frame, in the given channels or in all of them
+        """
+        if channels is None:
+            return self._strips_by_start[bisect_left(self._starts, frame) :]
+
+        strips = []
+        for channel in channels:
+            if channel not in self._channels:
+                continue
+            starts, _ends, _ends_max, channel_strips = self._channels[channel]
+            strips.extend(channel_strips[bisect_left(starts, frame) :])
+        return strips
+
+    def ending_after(self, frame):
+        """
+        Returns the strips that end after the frame
+        """
+        return self._strips_by_end[bisect_right(self._ends, frame) :]
+
+    def last_end(self, frame, default=None):
+        """
+        Returns the last frame at or before `frame` where a strip ends
+        """
+        index = bisect_right(self._ends, frame)
+        return self._ends[index - 1] if index else default
+
+    def first_start(self, frame, default=None):
+        """
+        Returns the first frame at or after `frame` where a strip starts
+        """
+        index = bisect_left(self._starts, frame)
+        return self._starts[index] if index < len(self._starts) else default
+
+    def previous_cut(self, frame, default=None):
+        """
+        Returns the closest frame before `frame` where a strip starts or ends
+        """
+        candidates = []
+        index = bisect_left(self._starts, frame)
+        if index:
+            candidates.append(self._starts[index - 1])
+        index = bisect_left(self._ends, frame)
+        if index:
+            candidates.append(self._ends[index - 1])
+        return max(candidates) if candidates else default
+
+    def next_cut(self, frame, default=None):
+        """
+        Returns the closest frame after `frame` where a strip starts or ends
+        """
+        candidates = []
+        index = bisect_right(self._starts, frame)
+        if index < len(self._starts):
+            candidates.append(self._starts[index])
+        index = bisect_right(self._ends, frame)
+        if index < len(self._ends):
+            candidates.append(self._ends[index])
+        return min(candidates) if candidates else default
+
+    def surrounding_cuts(self, frame):
+        """
+        Returns a tuple of (strip_before, strip_after), the strips with the closest
+        cuts at or before and at or after the frame.
+        If the frame is in the middle of a strip, both strips may be the same.
+        """
+        if not self._starts:
+            return None, None
+
+        strip_before = self._strips_by_start[0]
+        frame_before = None
+        index = bisect_right(self._starts, frame)
+        if index:
+            strip_before, frame_before = self._strips_by_start[index - 1], self._starts[index - 1]
+        index = bisect_right(self._ends, frame)
+        if index and (frame_before is None or self._ends[index - 1] >= frame_before):
+            strip_before = self._strips_by_end[index - 1]
+
+        strip_after = self._strips_by_end[-1]
+        frame_after = None
+        index = bisect_left(self._ends, frame)
+        if index < len(self._ends):
+            strip_after, frame_after = self._strips_by_end[index], self._ends[index]
+        index = bisect_left(self._starts, frame)
+        if index < len(self._starts) and (
+            frame_after is None or self._starts[index] <= frame_after
+        ):
+            strip_after = self._strips_by_start[index]
+        return strip_before, strip_after
+
+
+_strip_indices = {}
+
+
+def get_strip_index(context):
+    """
+    Returns the StripIndex of the sequences in the current context.
+    The index is cached until clear_strip_index() is called: on depsgraph updates, undo,
+    and by the functions that move, cut or delete strips
+    """
+    scene = context.scene
+    meta_stack = scene.sequence_editor.meta_stack if scene.sequence_editor else []
+    key = (scene.name, meta_stack[-1].name if meta_stack else "")
+
+    index = _strip_indices.get(key)
+    if index is None:
+        index = StripIndex(context.sequences or [])
+        _strip_indices[key] = index
+    return index
+
+
+def clear_strip_index():
+    _strip_indices.clear()
@@ -543,9 +543,16 @@ def register():
         description="Forces Rigify to delete and rebuild all of the rig widget objects. By default, already existing widgets are reused as-is to facilitate manual editing",
         default=False)
 
+    bpy.types.Armature.rigify_rebuild_changed_rig_widgets = BoolProperty(name="Rebuild Widgets of Changed Rigs",
+        description="Delete and rebuild the widget objects of rigs whose metarig bones or parameters changed since the last generation, and of the rigs below them. Widgets of unchanged rigs are reused as-is. Bones, constraints and drivers are always regenerated for the whole rig",
+        default=False)
+
     bpy.types.Armature.rigify_mirror_widgets = BoolProperty(name="Mirror Widgets",
         description="Make widgets for left and right side bones linked duplicates with negative X scale for the right side, based on bone name symmetry",
         default=True)
+    bpy.types.Armature.rigify_share_widget_meshes = BoolProperty(name="Share Widget Meshes",
+        description="Make newly created widgets with identical shapes use one mesh",
+        default=True)
     bpy.types.Armature.rigify_widgets_collection = PointerProperty(type=bpy.types.Collection,
         name="Widgets Collection",
         description="Defines which collection to place widget objects in. If unset, a new one will be created based on the name of the rig")
@@ -608,6 +615,8 @@ def unregister():
     del ArmStore.rigify_colors_lock
     del ArmStore.rigify_theme_to_add
     del ArmStore.rigify_force_widget_update
+    del ArmStore.rigify_rebuild_changed_rig_widgets
+    del ArmStore.rigify_share_widget_meshes
     del ArmStore.rigify_target_rig
     del ArmStore.rigify_rig_ui
 
@@ -2,6 +2,9 @@
 
 import bpy
 import sys
+import time
+import json
+import hashlib
 import traceback
 import collections
 
@@ -9,7 +12,7 @@ from .utils.errors import MetarigError, RaiseErrorMixin
 from .utils.naming import random_id
 from .utils.metaclass import SingletonPluginMetaclass
 from .utils.rig import list_bone_names_depth_first_sorted, get_rigify_type
-from .utils.misc import clone_parameters, assign_parameters
+from .utils.misc import clone_parameters, assign_parameters, property_to_python
 
 from . import base_rig
 
@@ -163,6 +166,69 @@ class LegacyRig(base_rig.BaseRig):
                 bpy.ops.object.mode_set(mode='OBJECT')
 
 
+#=============================================
+# Generation Timing Report
+#=============================================
+
+
+class GenerateTimingReport:
+    """Wall clock time spent in each generation stage, and by each rig type within it."""
+
+    def __init__(self):
+        # Ordered map from stage names to seconds
+        self.stages = {}
+        # Seconds spent by each rig type in each stage
+        self.rig_types = collections.defaultdict(lambda: collections.defaultdict(float))
+        # Number of rigs of each type
+        self.rig_counts = collections.Counter()
+        self.mode_switches = 0
+        # Other statistics reported by the generator
+        self.counts = {}
+
+        self.start = self.last = time.perf_counter()
+
+    def tick(self, stage):
+        """Record the time since the previous tick as spent in the stage."""
+        t = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + t - self.last
+        self.last = t
+
+        print("%s: %.3f" % (stage, self.stages[stage]))
+
+    def add_rig_time(self, stage, rig_type, seconds):
+        self.rig_types[stage][rig_type] += seconds
+
+    @property
+    def total(self):
+        return self.last - self.start
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'mode_switches': self.mode_switches,
+            'counts': dict(self.counts),
+            'stages': dict(self.stages),
+            'rig_counts': dict(self.rig_counts),
+            'rig_types': {
+                stage: dict(sorted(table.items(), key=lambda item: -item[1]))
+                for stage, table in self.rig_types.items()
+            },
+        }
+
+    def print_report(self, max_types=5):
+        """Print the total time and the slowest rig types of each stage."""
+        print("Rigify: generated in %.3f seconds, %d mode switches." % (self.total, self.mode_switches))
+
+        for stage, table in self.rig_types.items():
+            slowest = sorted(table.items(), key=lambda item: -item[1])[:max_types]
+            if slowest and slowest[0][1] >= 0.001:
+                print("  %s: %s" % (stage, ", ".join("%s %.3f" % item for item in slowest)))
+
+    def save_json(self, filepath):
+        with open(filepath, 'w', encoding='utf-8') as fh:
+            json.dump(self.as_dict(), fh, indent=2)
+
+
 #=============================================
 # Base Generate Engine
 #=============================================
@@ -210,6 +276,15 @@ class BaseGenerator:
         # Table of renamed ORG bones
         self.org_rename_table = dict()
 
+        # Time spent in each stage and rig type
+        self.timing = GenerateTimingReport()
+
+        # Hashes of the metarig input of each rig, by base bone
+        self.rig_hashes = {}
+        # Rigs whose input changed since the previous generation, and their dependents.
+        # Only their widgets are rebuilt, bones are always generated for all rigs.
+        self.changed_rigs = set()
+
 
     def disable_auto_parent(self, bone_name):
         """Prevent automatically parenting the bone to root if parentless."""
@@ -262,6 +337,14 @@ class BaseGenerator:
         return new_name
 
 
+    def __invoke_stage(self, rig, method_name):
+        start = time.perf_counter()
+
+        rig.rigify_invoke_stage(method_name)
+
+        self.timing.add_rig_time(method_name, self.describe_rig_type(rig), time.perf_counter() - start)
+
+
     def __run_object_stage(self, method_name):
         assert(self.context.active_object == self.obj)
         assert(self.obj.mode == 'OBJECT')
@@ -270,7 +353,7 @@ class BaseGenerator:
         self.stage = method_name
 
         for rig in self.rig_list:
-            rig.rigify_invoke_stage(method_name)
+            self.__invoke_stage(rig, method_name)
 
             assert(self.context.active_object == self.obj)
             assert(self.obj.mode == 'OBJECT')
@@ -281,7 +364,7 @@ class BaseGenerator:
             if i >= len(self.plugin_list):
                 break
 
-            self.plugin_list[i].rigify_invoke_stage(method_name)
+            self.__invoke_stage(self.plugin_list[i], method_name)
 
             assert(self.context.active_object == self.obj)
             assert(self.obj.mode == 'OBJECT')
@@ -296,7 +379,7 @@ class BaseGenerator:
         self.stage = method_name
 
         for rig in self.rig_list:
-            rig.rigify_invoke_stage(method_name)
+            self.__invoke_stage(rig, method_name)
 
             assert(self.context.active_object == self.obj)
             assert(self.obj.mode == 'EDIT')
@@ -307,7 +390,7 @@ class BaseGenerator:
             if i >= len(self.plugin_list):
                 break
 
-            self.plugin_list[i].rigify_invoke_stage(method_name)
+            self.__invoke_stage(self.plugin_list[i], method_name)
 
             assert(self.context.active_object == self.obj)
             assert(self.obj.mode == 'EDIT')
@@ -344,7 +427,7 @@ class BaseGenerator:
         self.stage = 'generate_bones'
 
         for rig in self.rig_list:
-            rig.rigify_invoke_stage('generate_bones')
+            self.__invoke_stage(rig, 'generate_bones')
 
             assert(self.context.active_object == self.obj)
             assert(self.obj.mode == 'EDIT')
@@ -356,7 +439,7 @@ class BaseGenerator:
             if i >= len(self.plugin_list):
                 break
 
-            self.plugin_list[i].rigify_invoke_stage('generate_bones')
+            self.__invoke_stage(self.plugin_list[i], 'generate_bones')
 
             assert(self.context.active_object == self.obj)
             assert(self.obj.mode == 'EDIT')
@@ -414,6 +497,16 @@ class BaseGenerator:
         return "%s (%s)" % (rig.__class__, base_bone)
 
 
+    def describe_rig_type(self, rig):
+        """Name of the rig or plugin class used to group the timing report."""
+        if isinstance(rig, LegacyRig):
+            rig_class = rig.wrapped_class
+        else:
+            rig_class = rig.__class__
+
+        return "%s.%s" % (rig_class.__module__, rig_class.__name__)
+
+
     def __create_rigs(self, bone_name, halt_on_missing):
         """Recursively walk bones and create rig instances."""
 
@@ -511,3 +604,69 @@ class BaseGenerator:
         for bone in self.obj.data.bones:
             if bone.parent is None:
                 self.__build_rig_tree_rec(bone, None, handled)
+
+        self.timing.rig_counts.update(self.describe_rig_type(rig) for rig in self.rig_list)
+
+
+    def hash_rigs(self):
+        """Hash the metarig input of all instantiated rigs."""
+        self.rig_hashes = {rig.base_bone: self.hash_rig(rig) for rig in self.rig_list}
+
+
+    def hash_rig(self, rig):
+        """Hash the rig type, parameters and ORG bones of a rig as found in the metarig."""
+        obj = self.obj
+        data = [self.describe_rig_type(rig), rig.base_bone]
+
+        for name in sorted(rig.rigify_org_bones):
+            bone = obj.data.bones[name]
+            pbone = obj.pose.bones[name]
+
+            data.append([
+                name,
+                bone.parent.name if bone.parent else None,
+                bone.use_connect,
+                [list(row) for row in bone.matrix_local],
+                bone.length,
+                list(bone.layers),
+                bone.use_deform,
+                bone.bbone_segments,
+                pbone.rotation_mode,
+                pbone.custom_shape.name if pbone.custom_shape else None,
+                pbone.bone_group.name if pbone.bone_group else None,
+                # Custom properties, including the rig type and parameters
+                property_to_python(dict(pbone)),
+                [
+                    (con.name, con.type,
+                     getattr(getattr(con, 'target', None), 'name', None),
+                     getattr(con, 'subtarget', None))
+                    for con in pbone.constraints
+                ],
+            ])
+
+        text = json.dumps(data, sort_keys=True, default=repr)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+    def find_changed_rigs(self, old_hashes):
+        """
+        Find the rigs whose hash differs from the previous generation,
+        and all rigs below them in the rig tree, which depend on their bones.
+        All rigs are changed if there are no previous hashes. This only selects
+        the widgets to rebuild, the bones of all rigs are still regenerated.
+        """
+        changed = set()
+
+        def rec(rig, parent_changed):
+            if parent_changed or old_hashes is None or old_hashes.get(rig.base_bone) != self.rig_hashes[rig.base_bone]:
+                changed.add(rig)
+                parent_changed = True
+
+            for child in rig.rigify_children:
+                rec(child, parent_changed)
+
+        for rig in self.root_rigs:
+            rec(rig, False)
+
+        self.changed_rigs = changed
+        return changed
@@ -2,16 +2,15 @@
 
 import bpy
 import re
-import time
 
 from .utils.errors import MetarigError
 from .utils.bones import new_bone
 from .utils.layers import ORG_LAYER, MCH_LAYER, DEF_LAYER, ROOT_LAYER
 from .utils.naming import ORG_PREFIX, MCH_PREFIX, DEF_PREFIX, ROOT_NAME, make_original_name, change_name_side, get_name_side, Side
-from .utils.widgets import WGT_PREFIX
+from .utils.widgets import WGT_PREFIX, flush_pending_widgets
 from .utils.widgets_special import create_root_widget
 from .utils.mechanism import refresh_all_drivers
-from .utils.misc import gamma_correct, select_object
+from .utils.misc import gamma_correct, select_object, property_to_python
 from .utils.collections import ensure_collection, list_layer_collections, filter_layer_collections_by_object
 from .utils.rig import get_rigify_type
 
@@ -21,16 +20,6 @@ from . import rig_lists
 
 RIG_MODULE = "rigs"
 
-class Timer:
-    def __init__(self):
-        self.timez = time.time()
-
-    def tick(self, string):
-        t = time.time()
-        print(string + "%.3f" % (t - self.timez))
-        self.timez = t
-
-
 class Generator(base_generate.BaseGenerator):
     def __init__(self, context, metarig):
         super().__init__(context, metarig)
@@ -44,6 +33,19 @@ class Generator(base_generate.BaseGenerator):
         return rig_module.Rig
 
 
+    def __set_mode(self, mode):
+        """Switch the active object to the mode unless it is already in it.
+
+        Every switch to or from Edit mode rebuilds the bone data of the
+        whole armature, so redundant switches are skipped.
+        """
+        active = self.view_layer.objects.active
+
+        if active is None or active.mode != mode:
+            bpy.ops.object.mode_set(mode=mode)
+            self.timing.mode_switches += 1
+
+
     def __switch_to_usable_collection(self, obj, fallback=False):
         collections = filter_layer_collections_by_object(self.usable_collections, obj)
 
@@ -148,6 +150,17 @@ class Generator(base_generate.BaseGenerator):
         self.metarig.data.rigify_widgets_collection = self.widget_collection
 
         self.use_mirror_widgets = self.metarig.data.rigify_mirror_widgets
+        self.use_shared_widgets = self.metarig.data.rigify_share_widget_meshes
+
+        # New widget objects are linked to the collection in bulk by flush_pending_widgets
+        self.pending_widgets = {}
+        self.new_widget_meshes = []
+        self.widget_geometry_cache = {}
+
+        # Rig hashes saved by the previous generation
+        self.use_changed_rig_widgets = self.metarig.data.rigify_rebuild_changed_rig_widgets
+        old_hashes = self.obj.data.get("rigify_rig_hashes") if self.use_changed_rig_widgets else None
+        self.old_rig_hashes = property_to_python(old_hashes) if old_hashes else None
 
         # Build tables for existing widgets
         self.old_widget_table = {}
@@ -192,10 +205,11 @@ class Generator(base_generate.BaseGenerator):
         context = self.context
 
         # Remove all bones from the generated rig armature.
-        bpy.ops.object.mode_set(mode='EDIT')
-        for bone in obj.data.edit_bones:
-            obj.data.edit_bones.remove(bone)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        if obj.data.bones:
+            self.__set_mode('EDIT')
+            for bone in obj.data.edit_bones:
+                obj.data.edit_bones.remove(bone)
+            self.__set_mode('OBJECT')
 
         # Select and duplicate metarig
         select_object(context, metarig, deselect_all=True)
@@ -268,6 +282,27 @@ class Generator(base_generate.BaseGenerator):
         self.original_bones = original_bones
 
 
+    def __remove_changed_rig_widgets(self):
+        """Remove the old widgets of bones generated by changed rigs, so they are rebuilt."""
+        removed = 0
+
+        for bone_name, widget in list(self.old_widget_table.items()):
+            if self.bone_owners.get(bone_name) in self.changed_rigs:
+                del self.old_widget_table[bone_name]
+
+                mesh = widget.data
+                bpy.data.objects.remove(widget)
+                # Mirrored widgets share their mesh, remove it with the last user
+                if mesh is not None and mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+                removed += 1
+
+                # Don't link new widgets to the mirrored mesh of a changed one
+                self.widget_mirror_mesh.pop(change_name_side(bone_name, Side.MIDDLE), None)
+
+        print("Rigify: removed %d widgets of changed rigs." % removed)
+
+
     def __create_root_bone(self):
         obj = self.obj
         metarig = self.metarig
@@ -403,11 +438,11 @@ class Generator(base_generate.BaseGenerator):
         scene = self.scene
         id_store = self.id_store
         view_layer = self.view_layer
-        t = Timer()
+        t = self.timing
 
         self.usable_collections = list_layer_collections(view_layer.layer_collection, selectable=True)
 
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         #------------------------------------------
         # Create/find the rig object and set it up
@@ -430,7 +465,7 @@ class Generator(base_generate.BaseGenerator):
         # Create Widget Collection
         self.ensure_widget_collection()
 
-        t.tick("Create main WGTS: ")
+        t.tick("Create main WGTS")
 
         #------------------------------------------
         # Get parented objects to restore later
@@ -444,7 +479,7 @@ class Generator(base_generate.BaseGenerator):
 
         obj.data.use_mirror_x = False
 
-        t.tick("Duplicate rig: ")
+        t.tick("Duplicate rig")
 
         #------------------------------------------
         # Put the rig_name in the armature custom properties
@@ -453,103 +488,122 @@ class Generator(base_generate.BaseGenerator):
         self.script = rig_ui_template.ScriptGenerator(self)
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.instantiate_rig_tree()
 
-        t.tick("Instantiate rigs: ")
+        if self.use_changed_rig_widgets:
+            self.hash_rigs()
+            changed_rigs = self.find_changed_rigs(self.old_rig_hashes)
+
+            if self.old_rig_hashes:
+                print("Rigify: rebuilding the widgets of %d of %d rigs." % (len(changed_rigs), len(self.rig_list)))
+
+        t.tick("Instantiate rigs")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.invoke_initialize()
 
-        t.tick("Initialize rigs: ")
+        t.tick("Initialize rigs")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='EDIT')
+        # The stages that edit bones before any pose data is
+        # read share one Edit mode session.
+        self.__set_mode('EDIT')
 
         self.invoke_prepare_bones()
 
-        t.tick("Prepare bones: ")
+        t.tick("Prepare bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
-        bpy.ops.object.mode_set(mode='EDIT')
+        self.__set_mode('EDIT')
 
         self.__create_root_bone()
 
         self.invoke_generate_bones()
 
-        t.tick("Generate bones: ")
+        # Bone owners are known now, rebuild the widgets of changed rigs if requested
+        if self.old_rig_hashes:
+            self.__remove_changed_rig_widgets()
+
+        t.tick("Generate bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
-        bpy.ops.object.mode_set(mode='EDIT')
+        self.__set_mode('EDIT')
 
         self.invoke_parent_bones()
 
         self.__parent_bones_to_root()
 
-        t.tick("Parent bones: ")
+        t.tick("Parent bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.invoke_configure_bones()
 
-        t.tick("Configure bones: ")
+        t.tick("Configure bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.invoke_preapply_bones()
 
-        t.tick("Preapply bones: ")
+        t.tick("Preapply bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='EDIT')
+        # The last Edit mode session, all later stages only touch pose data.
+        self.__set_mode('EDIT')
 
         self.invoke_apply_bones()
 
-        t.tick("Apply bones: ")
+        t.tick("Apply bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.invoke_rig_bones()
 
-        t.tick("Rig bones: ")
+        t.tick("Rig bones")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.invoke_generate_widgets()
 
         # Generate the default root widget last in case it's rigged with raw_copy
         create_root_widget(obj, self.root_bone)
 
-        t.tick("Generate widgets: ")
+        num_widgets, num_meshes = flush_pending_widgets(self)
+
+        t.counts['widgets'] = num_widgets
+        t.counts['widget_meshes'] = num_meshes
+
+        print("Rigify: created %d widgets with %d unique meshes." % (num_widgets, num_meshes))
+
+        t.tick("Generate widgets")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.__lock_transforms()
         self.__assign_layers()
         self.__compute_visible_layers()
         self.__restore_driver_vars()
 
-        t.tick("Assign layers: ")
+        t.tick("Assign layers")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.invoke_finalize()
 
-        t.tick("Finalize: ")
+        t.tick("Finalize")
 
         #------------------------------------------
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
 
         self.__assign_widgets()
 
@@ -559,11 +613,11 @@ class Generator(base_generate.BaseGenerator):
         # Create Bone Groups
         create_bone_groups(obj, metarig, self.layer_group_priorities)
 
-        t.tick("The rest: ")
+        t.tick("The rest")
 
         #----------------------------------
         # Deconfigure
-        bpy.ops.object.mode_set(mode='OBJECT')
+        self.__set_mode('OBJECT')
         obj.data.pose_position = 'POSE'
 
         # Restore parent to bones
@@ -580,18 +634,31 @@ class Generator(base_generate.BaseGenerator):
         # Execute the finalize script
 
         if metarig.data.rigify_finalize_script:
-            bpy.ops.object.mode_set(mode='OBJECT')
+            self.__set_mode('OBJECT')
             exec(metarig.data.rigify_finalize_script.as_string(), {})
-            bpy.ops.object.mode_set(mode='OBJECT')
+            self.__set_mode('OBJECT')
+
+        #----------------------------------
+        # Remember the rig hashes to find the rigs whose widgets to rebuild when regenerating,
+        # and drop them otherwise: they would not match the widgets of later generations
+        if self.use_changed_rig_widgets:
+            obj.data["rigify_rig_hashes"] = self.rig_hashes
+        elif "rigify_rig_hashes" in obj.data:
+            del obj.data["rigify_rig_hashes"]
 
         #----------------------------------
         # Restore active collection
         view_layer.active_layer_collection = self.layer_collection
 
+        t.tick("Deconfigure")
+        t.print_report()
+
 
-def generate_rig(context, metarig):
+def generate_rig(context, metarig, timing_filepath=None):
     """ Generates a rig from a metarig.
 
+        If timing_filepath is given, the time spent in each stage
+        and by each rig type is saved to it as JSON.
     """
     # Initial configuration
     rest_backup = metarig.data.pose_position
@@ -606,6 +673,9 @@ def generate_rig(context, metarig):
 
         metarig.data.pose_position = rest_backup
 
+        if timing_filepath:
+            generator.timing.save_json(timing_filepath)
+
     except Exception as e:
         # Cleanup if something goes wrong
         print("Rigify: failed to generate rig.")
@@ -661,7 +731,8 @@ def create_selection_sets(obj, metarig):
 
 def create_bone_groups(obj, metarig, priorities={}):
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    if obj.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
     pb = obj.pose.bones
     layers = metarig.data.rigify_layers
     groups = metarig.data.rigify_colors
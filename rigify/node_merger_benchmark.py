@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+#
+# NodeMerger clustering benchmark.
+#
+# Builds synthetic merge nodes in many small clusters, like the nodes
+# registered by a large metarig, clusters them with the previous
+# iterative range search and with cluster_points(), and checks that
+# both produce identical groups. Run headless with:
+#
+#   blender -b --factory-startup -P node_merger_benchmark.py -- --nodes 20000
+#
+
+import argparse
+import random
+import sys
+import time
+
+from mathutils import Vector
+from mathutils.kdtree import KDTree
+
+from rigify.utils.node_merger import NodeMerger, cluster_points
+
+
+class SyntheticNode:
+    def __init__(self, name, point):
+        self.name = name
+        self.point = point
+
+
+def make_nodes(node_count, seed=0):
+    """
+    Nodes in clusters of 1 to 6 points, spread on a grid of cells far apart
+    compared to the merge epsilon, in random registration order.
+    """
+    rng = random.Random(seed)
+    epsilon = NodeMerger.epsilon
+    spacing = 0.05
+
+    points = []
+    cell = 0
+    while len(points) < node_count:
+        center = Vector((cell % 40, cell // 40 % 40, cell // 1600)) * spacing
+        # Each point of a cluster is within epsilon of the previous one
+        point = center
+        for i in range(min(rng.randint(1, 6), node_count - len(points))):
+            points.append(point.copy())
+            offset = Vector((rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1)))
+            point = point + offset.normalized() * epsilon * 0.5
+        cell += 1
+
+    rng.shuffle(points)
+    return [SyntheticNode('node.{:06d}'.format(i), point) for i, point in enumerate(points)]
+
+
+def cluster_points_iterative(points, epsilon):
+    """The clustering of NodeMerger.initialize before cluster_points()."""
+    tree = KDTree(len(points))
+
+    for i, point in enumerate(points):
+        tree.insert(point, i)
+
+    tree.balance()
+    processed = set()
+    clusters = []
+
+    for i in range(len(points)):
+        if i in processed:
+            continue
+
+        pending = [i]
+        merge_set = set(pending)
+
+        while pending:
+            added = set()
+            for j in pending:
+                point = points[j]
+                eps = max(1, point.length) * epsilon
+                for co, idx, dist in tree.find_range(point, eps):
+                    added.add(idx)
+            pending = added.difference(merge_set)
+            merge_set.update(added)
+
+        processed.update(merge_set)
+        clusters.append(merge_set)
+
+    return clusters
+
+
+def groups(nodes, clusters):
+    # Node names of each group, as NodeMerger.initialize builds them
+    return [sorted((nodes[i].name for i in cluster)) for cluster in clusters]
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Benchmark NodeMerger clustering.')
+    parser.add_argument('--nodes', type=int, default=20000, help='number of synthetic nodes')
+    parser.add_argument('--repeat', type=int, default=3, help='best time of this many runs')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    nodes = make_nodes(args.nodes, args.seed)
+    points = [node.point for node in nodes]
+
+    old_clusters, old_time = timed(cluster_points_iterative, points, NodeMerger.epsilon, repeat=args.repeat)
+    new_clusters, new_time = timed(cluster_points, points, NodeMerger.epsilon, repeat=args.repeat)
+
+    old_groups = groups(nodes, old_clusters)
+    new_groups = groups(nodes, new_clusters)
+    assert new_groups == old_groups, 'cluster_points() groups differ from the iterative clustering'
+
+    print('{} nodes in {} clusters'.format(len(nodes), len(new_groups)))
+    print('iterative range search: {:.3f} s'.format(old_time))
+    print('cluster_points:         {:.3f} s ({:.1f}x)'.format(new_time, old_time / max(new_time, 1e-9)))
+    return 0
+
+
+if __name__ == '__main__':
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    sys.exit(main(argv))
@@ -152,7 +152,11 @@ class DATA_PT_rigify_advanced(bpy.types.Panel):
 
         col.separator()
         col.row().prop(armature_id_store, "rigify_force_widget_update")
+        row = col.row()
+        row.active = not armature_id_store.rigify_force_widget_update
+        row.prop(armature_id_store, "rigify_rebuild_changed_rig_widgets")
         col.row().prop(armature_id_store, "rigify_mirror_widgets")
+        col.row().prop(armature_id_store, "rigify_share_widget_meshes")
         col.separator()
         col.row().prop(armature_id_store, "rigify_finalize_script", text="Run Script")
 
@@ -4,6 +4,7 @@ import bpy
 
 import math
 import json
+import collections
 
 from mathutils import Matrix, Vector
 
@@ -118,6 +119,154 @@ def get_4d_rotlock(bone):
     else:
         return [all(bone.lock_rotation)] * 4
 
+class KeyframeBatch:
+    """
+    Collects the keys inserted by the keying tools while active, and adds
+    them to the F-Curves in bulk on exit instead of one key at a time.
+
+    with KeyframeBatch(obj):
+        ...
+
+    Keys with options that depend on the existing keys of the curve are
+    still inserted one at a time by keyframe_insert_property().
+    """
+
+    active = None
+
+    # 'Only Insert Needed' and cycle aware keying need the curve as it is at insertion time
+    unsupported_options = {'INSERTKEY_NEEDED', 'INSERTKEY_CYCLE_AWARE'}
+
+    def __init__(self, obj):
+        self.obj = obj
+        # Map from (data_path, array_index) to {frame: value}
+        self.keys = collections.defaultdict(dict)
+        self.groups = {}
+        self.options = {}
+
+    def __enter__(self):
+        KeyframeBatch.active = self
+        return self
+
+    def __exit__(self, *args):
+        KeyframeBatch.active = None
+        self.flush()
+
+    def get_frame(self):
+        "Current frame in the time of the active action."
+        frame = bpy.context.scene.frame_current
+        anim_data = self.obj.animation_data
+        if anim_data and anim_data.use_tweak_mode:
+            frame = anim_data.nla_tweak_strip_time_to_scene(frame, invert=True)
+        return frame
+
+    def add(self, ptr, prop, index, group, options):
+        "Record the current value of the property as a key."
+        path = ptr.path_from_id(prop)
+        value = ptr.path_resolve(prop)
+        frame = self.get_frame()
+
+        if isinstance(value, (int, float)):
+            values = [(0, value)]
+        elif index >= 0:
+            values = [(index, value[index])]
+        else:
+            values = enumerate(value)
+
+        for i, item in values:
+            key = (path, i)
+            self.keys[key][frame] = float(item)
+            self.groups[key] = group
+            self.options[key] = options
+
+    def flush(self):
+        "Add all collected keys to the curves of the action."
+        if not self.keys:
+            return
+
+        anim_data = self.obj.animation_data_create()
+        if not anim_data.action:
+            anim_data.action = bpy.data.actions.new(self.obj.name + "Action")
+        fcurves = anim_data.action.fcurves
+
+        for (path, index), keys in self.keys.items():
+            options = self.options[(path, index)]
+            curve = fcurves.find(path, index=index)
+
+            if curve is None:
+                if 'INSERTKEY_AVAILABLE' in options:
+                    continue
+
+                curve = fcurves.new(path, index=index, action_group=self.groups[(path, index)] or "")
+
+                if 'INSERTKEY_XYZ_TO_RGB' in options:
+                    if path.endswith('rotation_quaternion'):
+                        curve.color_mode = 'AUTO_YRGB'
+                    elif path.endswith(('location', 'rotation_euler', 'scale')):
+                        curve.color_mode = 'AUTO_RGB'
+
+            self.write_curve_keys(curve, keys)
+
+        self.keys.clear()
+
+    @staticmethod
+    def write_curve_keys(curve, keys):
+        "Replace or add keys of the curve, given as a {frame: value} dict."
+        points = curve.keyframe_points
+        count = len(points)
+
+        co = [0.0] * (count * 2)
+        handle_left = [0.0] * (count * 2)
+        handle_right = [0.0] * (count * 2)
+        points.foreach_get('co', co)
+        points.foreach_get('handle_left', handle_left)
+        points.foreach_get('handle_right', handle_right)
+
+        key_index = {co[i * 2]: i for i in range(count)}
+        new_keys = []
+
+        for frame, value in keys.items():
+            i = key_index.get(frame)
+            if i is None:
+                new_keys.append((frame, value))
+            else:
+                # Replace the value of an existing key, moving its handles along
+                delta = value - co[i * 2 + 1]
+                co[i * 2 + 1] = value
+                handle_left[i * 2 + 1] += delta
+                handle_right[i * 2 + 1] += delta
+
+        for frame, value in new_keys:
+            co += (frame, value)
+            handle_left += (frame, value)
+            handle_right += (frame, value)
+
+        points.add(len(new_keys))
+        points.foreach_set('co', co)
+        points.foreach_set('handle_left', handle_left)
+        points.foreach_set('handle_right', handle_right)
+
+        # New points are Bezier with automatic handles, apply the user defaults
+        prefs = bpy.context.preferences.edit
+        ipo = prefs.keyframe_new_interpolation_type
+        handle_type = prefs.keyframe_new_handle_type
+
+        if ipo != 'BEZIER' or handle_type != 'AUTO_CLAMPED':
+            for i in range(count, len(points)):
+                point = points[i]
+                point.interpolation = ipo
+                point.handle_left_type = point.handle_right_type = handle_type
+
+        # Sorts the keys and recalculates the handles
+        curve.update()
+
+def keyframe_insert_property(ptr, prop, *, index=-1, group=None, options=set()):
+    "Insert a keyframe, or add it to the active KeyframeBatch."
+    batch = KeyframeBatch.active
+    if batch is not None and ptr.id_data == batch.obj and batch.unsupported_options.isdisjoint(options):
+        batch.add(ptr, prop, index, group, options)
+    else:
+        ptr.keyframe_insert(prop, index=index, group=group, options=options)
+
 def keyframe_transform_properties(obj, bone_name, keyflags, *, ignore_locks=False, no_loc=False, no_rot=False, no_scale=False):
     "Keyframe transformation properties, taking flags and mode into account, and avoiding keying locked channels."
     bone = obj.pose.bones[bone_name]
@@ -125,11 +274,11 @@ def keyframe_transform_properties(obj, bone_name, keyflags, *, ignore_locks=Fals
     def keyframe_channels(prop, locks):
         if ignore_locks or not all(locks):
             if ignore_locks or not any(locks):
-                bone.keyframe_insert(prop, group=bone_name, options=keyflags)
+                keyframe_insert_property(bone, prop, group=bone_name, options=keyflags)
             else:
                 for i, lock in enumerate(locks):
                     if not lock:
-                        bone.keyframe_insert(prop, index=i, group=bone_name, options=keyflags)
+                        keyframe_insert_property(bone, prop, index=i, group=bone_name, options=keyflags)
 
     if not (no_loc or bone.bone.use_connect):
         keyframe_channels('location', bone.lock_location)
@@ -211,7 +360,7 @@ def set_custom_property_value(obj, bone_name, prop, value, *, keyflags=None):
     bone[prop] = value
     rna_idprop_ui_prop_update(bone, prop)
     if keyflags is not None:
-        bone.keyframe_insert(rna_idprop_quote_path(prop), group=bone.name, options=keyflags)
+        keyframe_insert_property(bone, rna_idprop_quote_path(prop), group=bone.name, options=keyflags)
 
 def get_transform_matrix(obj, bone_name, *, space='POSE', with_constraints=True):
     "Retrieve the matrix of the bone before or after constraints in the given space."
@@ -665,9 +814,11 @@ class RigifyBakeKeyframesMixin(RigifyOperatorMixinBase):
         scene = context.scene
         saved_state = self.bake_state
 
-        for frame in self.bake_frames:
-            scene.frame_set(frame)
-            self.apply_frame_state(context, rig, saved_state.get(frame))
+        # Keys are added to the curves in bulk after the last frame
+        with KeyframeBatch(rig):
+            for frame in self.bake_frames:
+                scene.frame_set(frame)
+                self.apply_frame_state(context, rig, saved_state.get(frame))
 
         clean_action_empty_curves(self.bake_rig)
         scene.frame_set(self.bake_current_frame)
@@ -52,38 +52,12 @@ class NodeMerger(GeneratorPlugin):
         self.frozen = True
 
         nodes = self.nodes
-        tree = KDTree(len(nodes))
+        merge_sets = cluster_points([node.point for node in nodes], self.epsilon)
 
-        for i, node in enumerate(nodes):
-            tree.insert(node.point, i)
-
-        tree.balance()
-        processed = set()
         final_nodes = []
         groups = []
 
-        for i in range(len(nodes)):
-            if i in processed:
-                continue
-
-            # Find points to merge
-            pending = [i]
-            merge_set = set(pending)
-
-            while pending:
-                added = set()
-                for j in pending:
-                    point = nodes[j].point
-                    eps = max(1, point.length) * self.epsilon
-                    for co, idx, dist in tree.find_range(point, eps):
-                        added.add(idx)
-                pending = added.difference(merge_set)
-                merge_set.update(added)
-
-            assert merge_set.isdisjoint(processed)
-
-            processed.update(merge_set)
-
+        for merge_set in merge_sets:
             # Group the points
             merge_list = [nodes[i] for i in merge_set]
             merge_list.sort(key=lambda x: x.name)
@@ -111,6 +85,50 @@ class NodeMerger(GeneratorPlugin):
         self.groups = groups
 
 
+def cluster_points(points, epsilon):
+    """
+    Split points into clusters of points within epsilon (scaled by the point
+    distance from the origin when above 1) of another point of the cluster.
+
+    Returns lists of point indices, ordered by their first index.
+    """
+    tree = KDTree(len(points))
+
+    for i, point in enumerate(points):
+        tree.insert(point, i)
+
+    tree.balance()
+
+    # Join the epsilon neighborhoods of all points into connected components,
+    # using a union-find forest rooted at the smallest index of each component.
+    parents = list(range(len(points)))
+
+    def find_root(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for i, point in enumerate(points):
+        eps = max(1, point.length) * epsilon
+        root = find_root(i)
+
+        for co, idx, dist in tree.find_range(point, eps):
+            other = find_root(idx)
+            if other != root:
+                if other < root:
+                    root, other = other, root
+                parents[other] = root
+
+    # Components are ordered by their first point, like registration order
+    clusters = collections.defaultdict(list)
+
+    for i in range(len(points)):
+        clusters[find_root(i)].append(i)
+
+    return list(clusters.values())
+
+
 class MergeGroup(object):
     """
     Standard node group, merges nodes based on certain rules and priorities.
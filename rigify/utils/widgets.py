@@ -3,9 +3,11 @@
 import bpy
 import math
 import inspect
+import hashlib
 import functools
 
-from mathutils import Matrix, Vector, Euler
+from array import array
+from mathutils import Matrix, Vector, Euler, Quaternion, Color
 from itertools import count
 
 from .errors import MetarigError
@@ -83,6 +85,10 @@ def create_widget(rig, bone_name, bone_transform_name=None, *, widget_name=None,
             # If re-generating, check widgets used by the previous rig
             obj = generator.old_widget_table.get(bone_name)
 
+        if not obj and generator and generator.pending_widgets:
+            # Check widgets created by this generator but not linked yet
+            obj = generator.pending_widgets.get(obj_name)
+
         if not obj:
             # Search the scene by name
             obj = scene.objects.get(obj_name)
@@ -133,7 +139,15 @@ def create_widget(rig, bone_name, bone_transform_name=None, *, widget_name=None,
 
     # Create the object
     obj = bpy.data.objects.new(obj_name, mesh)
-    collection.objects.link(obj)
+
+    if generator and generator.pending_widgets is not None:
+        # Linked in bulk by flush_pending_widgets
+        generator.pending_widgets[obj.name] = obj
+
+        if not reuse_mesh:
+            generator.new_widget_meshes.append(mesh)
+    else:
+        collection.objects.link(obj)
 
     # Add the subdivision surface modifier
     if subsurf > 0:
@@ -226,6 +240,108 @@ class GeometryData:
         self.faces = []
 
 
+def _geometry_cache_key(value):
+    """Convert widget arguments to a hashable key."""
+    if isinstance(value, Matrix):
+        return tuple(tuple(row) for row in value)
+    elif isinstance(value, Euler):
+        return (value.order, *value)
+    elif isinstance(value, (Vector, Euler, Quaternion, Color, list, tuple)):
+        return tuple(_geometry_cache_key(v) for v in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((k, _geometry_cache_key(v)) for k, v in value.items()))
+    elif isinstance(value, (int, float, str, bool, type(None))):
+        return value
+    else:
+        return repr(value)
+
+
+def get_cached_geometry(generate_func, kwargs):
+    """
+    Run the geometry function of a widget generator, reusing the result
+    of previous calls with the same arguments while generating a rig.
+    """
+    from ..base_generate import BaseGenerator
+
+    generator = BaseGenerator.instance
+    cache = generator.widget_geometry_cache if generator else None
+
+    if cache is not None:
+        key = (generate_func, _geometry_cache_key(kwargs))
+        geom = cache.get(key)
+        if geom is not None:
+            return geom
+
+    geom = GeometryData()
+
+    generate_func(geom, **kwargs)
+
+    if cache is not None:
+        cache[key] = geom
+
+    return geom
+
+
+def _mesh_geometry_hash(mesh):
+    """Hash the vertices, edges and faces of a mesh."""
+    co = array('f', [0.0]) * (len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", co)
+    edges = array('i', [0]) * (len(mesh.edges) * 2)
+    mesh.edges.foreach_get("vertices", edges)
+    loops = array('i', [0]) * len(mesh.loops)
+    mesh.loops.foreach_get("vertex_index", loops)
+    loop_total = array('i', [0]) * len(mesh.polygons)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+
+    h = hashlib.blake2b(digest_size=16)
+    for data in (co, edges, loops, loop_total):
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data.tobytes())
+    return h.digest()
+
+
+def flush_pending_widgets(generator):
+    """
+    Link the widget objects created since ensure_widget_collection in bulk,
+    and make widgets with identical geometry share one mesh.
+    Return the number of widgets and unique widget meshes created.
+    """
+    objects = generator.pending_widgets
+    meshes = generator.new_widget_meshes
+
+    generator.pending_widgets = None
+    generator.new_widget_meshes = []
+
+    if not objects:
+        return 0, 0
+
+    # Meshes are compared after the rigs have finished adjusting them
+    unique_meshes = {}
+    mesh_remap = {}
+
+    for mesh in meshes:
+        key = _mesh_geometry_hash(mesh) if generator.use_shared_widgets else mesh
+        shared = unique_meshes.setdefault(key, mesh)
+        if shared != mesh:
+            mesh_remap[mesh] = shared
+
+    for mesh, shared in mesh_remap.items():
+        mesh.user_remap(shared)
+        bpy.data.meshes.remove(mesh)
+
+    for mid_name, mesh in generator.widget_mirror_mesh.items():
+        if mesh in mesh_remap:
+            generator.widget_mirror_mesh[mid_name] = mesh_remap[mesh]
+
+    # Add all widgets to the collection at once
+    collection_objects = generator.widget_collection.objects
+
+    for obj in objects.values():
+        collection_objects.link(obj)
+
+    return len(objects), len(unique_meshes)
+
+
 def widget_generator(generate_func=None, *, register=None, subsurf=0):
     if generate_func is None:
         return functools.partial(widget_generator, register=register, subsurf=subsurf)
@@ -241,9 +357,7 @@ def widget_generator(generate_func=None, *, register=None, subsurf=0):
     def wrapper(rig, bone_name, bone_transform_name=None, widget_name=None, widget_force_new=False, **kwargs):
         obj = create_widget(rig, bone_name, bone_transform_name, widget_name=widget_name, widget_force_new=widget_force_new, subsurf=subsurf)
         if obj is not None:
-            geom = GeometryData()
-
-            generate_func(geom, **kwargs)
+            geom = get_cached_geometry(generate_func, kwargs)
 
             mesh = obj.data
             mesh.from_pydata(geom.verts, geom.edges, geom.faces)